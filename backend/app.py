@@ -13,21 +13,43 @@ import uuid
 from contextlib import asynccontextmanager
 from dataclasses import asdict
 from datetime import datetime, timezone
-from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, field_validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from rules import evaluate_baseline, ThresholdConfig
+from rules import BatchEvaluator, NCCIPairIndex, evaluate_baseline, ThresholdConfig
+from rules.dataset_registry import DatasetRegistry, DatasetSnapshot
+from rules.hit_stats import (
+    ensure_rule_stats,
+    ensure_stats_tables,
+    record_results,
+    result_totals,
+)
+from rules.reference_store import load_reference_table
+from rules.rule_hits import (
+    backfill_rule_hits,
+    load_rule_hits,
+    record_rule_hits,
+)
 from rag import get_store
 from claude_client import get_kirk_analysis
+from database import close_databases, get_database
+from kirk_cache import get_analysis_cache
 from kirk_config import KIRK_CONFIG
+from kirk_queue import (
+    KIRK_STATUS_COMPLETED,
+    KIRK_STATUS_FAILED,
+    KIRK_STATUS_PENDING,
+    KIRK_STATUS_SKIPPED,
+    KirkAnalysisQueue,
+)
 from mapping import normalize_claim, denormalize_for_rules
 from mapping.templates import get_template
 from connectors.constants import CONNECTOR_SECRET_FIELDS
@@ -39,9 +61,22 @@ from connectors.database import PostgreSQLConnector, MySQLConnector, SQLServerCo
 from connectors.file import S3Connector, SFTPConnector, AzureBlobConnector  # noqa: F401
 
 from routes import policies_router, mappings_router, rules_router, audit_router
-from routes.audit import log_audit_event, AuditAction
-from utils import sanitize_filename
-from config import DB_PATH
+from routes.audit import (
+    AuditAction,
+    close_audit_sinks,
+    create_audit_indexes,
+    log_audit_event,
+    record_audit_event,
+)
+from utils import keyset_condition, next_cursor, decode_cursor, sanitize_filename
+from config import (
+    DATASET_WATCH_INTERVAL,
+    DB_PATH,
+    KIRK_ASYNC_ANALYSIS,
+    KIRK_CACHE_ENABLED,
+    KIRK_MAX_CONCURRENCY,
+    RULES_BATCH_WORKERS,
+)
 from schemas import SemanticMatchRequest
 from templates import (
     get_template_list,
@@ -61,6 +96,11 @@ MAX_JOBS_LIMIT = 1000
 # Limited to prevent long-running requests and excessive API usage
 MAX_SAMPLE_ANALYSIS_SIZE = 10
 
+# Batch analysis configuration
+# Nightly re-scoring submits whole claim files; cap a single request so one
+# call cannot hold the rules worker pool indefinitely
+MAX_BATCH_ANALYSIS_SIZE = 10000
+
 
 def safe_json_loads(
     data: str | None, default: list | dict | None = None
@@ -77,10 +117,60 @@ def safe_json_loads(
         return default
 
 
+def _decode_cursor_param(cursor: str) -> tuple[str, str]:
+    """Decode a list endpoint's cursor query parameter, or 400."""
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Column order of the result rows passed to store_results()
+RESULT_COLUMNS = (
+    "job_id",
+    "claim_id",
+    "fraud_score",
+    "decision_mode",
+    "rule_hits",
+    "ncci_flags",
+    "coverage_flags",
+    "provider_flags",
+    "roi_estimate",
+    "claude_explanation",
+    "created_at",
+    "dataset_version",
+    "kirk_status",
+)
+
+_INSERT_RESULT_SQL = f"""INSERT OR REPLACE INTO results ({", ".join(RESULT_COLUMNS)})
+    VALUES ({", ".join("?" for _ in RESULT_COLUMNS)})"""
+
+
+def store_results(
+    conn: sqlite3.Connection,
+    rows: list[tuple],
+    provider_npis: dict[str, str | None] | None = None,
+) -> None:
+    """Write result rows (in RESULT_COLUMNS order), their hits and the stats.
+
+    Must run inside the caller's write transaction so result_rule_hits and
+    the aggregates commit together with the results.
+
+    Args:
+        conn: Connection with an open write transaction
+        rows: Result rows in RESULT_COLUMNS order
+        provider_npis: Billing provider NPI per job_id, indexed on each hit
+    """
+    named_rows = [dict(zip(RESULT_COLUMNS, row)) for row in rows]
+    record_results(conn, named_rows)
+    record_rule_hits(conn, named_rows, provider_npis)
+    conn.executemany(_INSERT_RESULT_SQL, rows)
+
+
 def init_db():
     """Initialize SQLite database."""
     Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -106,16 +196,39 @@ def init_db():
                 roi_estimate REAL,
                 claude_explanation TEXT,
                 created_at TEXT,
+                dataset_version TEXT,
+                kirk_status TEXT,
                 FOREIGN KEY (job_id) REFERENCES jobs(job_id)
             )
         """)
 
-        # Create indices for performance
+        # Create indices for performance; (created_at, job_id) also serves
+        # /api/jobs keyset pagination, superseding the created_at-only index
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_results_created_at ON results(created_at DESC)"
+            "CREATE INDEX IF NOT EXISTS idx_results_created_job "
+            "ON results(created_at, job_id)"
         )
+        cursor.execute("DROP INDEX IF EXISTS idx_results_created_at")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
 
+        # Migration: record which reference dataset version scored a result
+        cursor.execute("PRAGMA table_info(results)")
+        result_columns = [row[1] for row in cursor.fetchall()]
+        if "dataset_version" not in result_columns:
+            cursor.execute("ALTER TABLE results ADD COLUMN dataset_version TEXT")
+        # Migration: track Kirk explanations computed in the background
+        if "kirk_status" not in result_columns:
+            cursor.execute("ALTER TABLE results ADD COLUMN kirk_status TEXT")
+
+        # Aggregates for the stats dashboards, maintained as results are
+        # written (backfilled on first read for existing databases)
+        ensure_stats_tables(conn)
+
+        # Migration: one row per rule hit for per-rule / per-provider queries
+        backfilled = backfill_rule_hits(conn)
+        if backfilled:
+            logger.info(f"Backfilled rule hits for {backfilled} results")
+
         # ============================================================
         # Data Source Connector Tables
         # ============================================================
@@ -155,10 +268,19 @@ def init_db():
                 watermark_value TEXT,
                 error_message TEXT,
                 triggered_by TEXT,
+                created_at TEXT,
                 FOREIGN KEY (connector_id) REFERENCES connectors(id)
             )
         """)
 
+        # Migration: created_at orders /api/sync-jobs (matches JobManager's)
+        cursor.execute("PRAGMA table_info(sync_jobs)")
+        if "created_at" not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE sync_jobs ADD COLUMN created_at TEXT")
+            cursor.execute(
+                "UPDATE sync_jobs SET created_at = COALESCE(started_at, datetime('now'))"
+            )
+
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS sync_job_logs (
                 id TEXT PRIMARY KEY,
@@ -193,38 +315,42 @@ def init_db():
         """)
 
         # Audit indices for efficient querying
+        create_audit_indexes(cursor)
+
+        # Connector indices
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_logs(timestamp)"
+            "CREATE INDEX IF NOT EXISTS idx_connectors_type ON connectors(connector_type)"
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_logs(action)"
+            "CREATE INDEX IF NOT EXISTS idx_connectors_status ON connectors(status)"
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_user ON audit_logs(user_id)"
+            "CREATE INDEX IF NOT EXISTS idx_sync_jobs_connector ON sync_jobs(connector_id)"
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_resource ON audit_logs(resource_type, resource_id)"
+            "CREATE INDEX IF NOT EXISTS idx_sync_jobs_status ON sync_jobs(status)"
         )
-
-        # Connector indices
+        # Keyset pagination indices for each /api/sync-jobs filter combination
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_connectors_type ON connectors(connector_type)"
+            "CREATE INDEX IF NOT EXISTS idx_sync_jobs_created "
+            "ON sync_jobs(created_at, id)"
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_connectors_status ON connectors(status)"
+            "CREATE INDEX IF NOT EXISTS idx_sync_jobs_connector_created "
+            "ON sync_jobs(connector_id, created_at, id)"
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_sync_jobs_connector ON sync_jobs(connector_id)"
+            "CREATE INDEX IF NOT EXISTS idx_sync_jobs_status_created "
+            "ON sync_jobs(status, created_at, id)"
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_sync_jobs_status ON sync_jobs(status)"
+            "CREATE INDEX IF NOT EXISTS idx_sync_jobs_connector_status_created "
+            "ON sync_jobs(connector_id, status, created_at, id)"
         )
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_sync_job_logs_job ON sync_job_logs(job_id)"
         )
 
-        conn.commit()
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -233,6 +359,10 @@ async def lifespan(app: FastAPI):
     # Pre-load ChromaDB
     get_store()
 
+    # Load reference datasets and pick up refreshed files without a restart
+    dataset_registry.current()
+    dataset_registry.start_watching(DATASET_WATCH_INTERVAL)
+
     # Pre-load embedding model if configured (reduces first-request latency)
     if os.getenv("PRELOAD_EMBEDDINGS", "false").lower() == "true":
         try:
@@ -259,7 +389,7 @@ async def lifespan(app: FastAPI):
 
         # Restore scheduled jobs for active connectors
         try:
-            with sqlite3.connect(DB_PATH) as conn:
+            with get_database(DB_PATH).read() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT id, sync_schedule FROM connectors WHERE status = 'active' AND sync_schedule IS NOT NULL"
@@ -301,6 +431,14 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    dataset_registry.stop_watching()
+
+    # Stop rules-engine worker processes used by batch analysis
+    close_batch_evaluator()
+
+    # Finish queued Kirk explanations so their results are not left pending
+    kirk_queue.shutdown(wait=True)
+
     # Cleanup scheduler on shutdown
     if scheduler:
         try:
@@ -309,6 +447,11 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Scheduler shutdown error: {e}")
 
+    # Write buffered audit events, then commit queued writes and close
+    # pooled SQLite connections
+    close_audit_sinks()
+    close_databases()
+
 
 app = FastAPI(
     title="Healthcare Payment Integrity Prototype",
@@ -370,6 +513,24 @@ class ClaimSubmission(BaseModel):
     member: dict[str, Any] | None = None
 
 
+class BatchAnalysisRequest(BaseModel):
+    """Request model for batch claim scoring."""
+
+    claims: list[ClaimSubmission]
+
+    @field_validator("claims")
+    @classmethod
+    def validate_batch_size(cls, v: list[ClaimSubmission]) -> list[ClaimSubmission]:
+        """Validate batch size to keep a single request bounded."""
+        if not v:
+            raise ValueError("At least one claim is required.")
+        if len(v) > MAX_BATCH_ANALYSIS_SIZE:
+            raise ValueError(
+                f"Batch size too large. Maximum {MAX_BATCH_ANALYSIS_SIZE} claims per request."
+            )
+        return v
+
+
 class AnalysisResult(BaseModel):
     job_id: str
     claim_id: str
@@ -381,6 +542,8 @@ class AnalysisResult(BaseModel):
     provider_flags: list[str]
     roi_estimate: float | None
     claude_analysis: dict[str, Any]
+    kirk_status: str = KIRK_STATUS_COMPLETED
+    dataset_version: str | None = None
 
 
 # Sample reference datasets (load from files in production)
@@ -426,44 +589,46 @@ SAMPLE_DATASETS = {
 }
 
 
-@lru_cache(maxsize=1)
-def load_datasets() -> dict[str, Any]:
-    """Load reference datasets from files or return samples.
+DATA_DIR = Path("./data")
 
-    Uses LRU cache since datasets change infrequently and loading
-    from disk is expensive for repeated calls.
-    """
-    data_dir = Path("./data")
+
+def read_dataset_files() -> dict[str, Any]:
+    """Load reference datasets from files or return samples."""
+    data_dir = DATA_DIR
 
     datasets = SAMPLE_DATASETS.copy()
 
-    # Try to load from JSON files if they exist
+    # Prefer prebuilt reference tables (memory-mapped, shared across
+    # workers) and fall back to the JSON files if they exist
     for dataset_name in ["ncci_mue", "lcd", "mpfs", "fwa_config"]:
+        table = load_reference_table(data_dir, dataset_name)
+        if table is not None:
+            datasets[dataset_name] = table
+            continue
         json_path = data_dir / f"{dataset_name}.json"
         if json_path.exists():
             with open(json_path) as f:
                 datasets[dataset_name] = json.load(f)
 
-    # Load NCCI PTP (convert list format to dict with tuple keys)
+    # Load NCCI PTP, preferring the prebuilt binary index written by
+    # scripts/download_ncci.py over parsing the JSON edit list
+    ncci_ptp_index_path = data_dir / "ncci_ptp.bin"
     ncci_ptp_path = data_dir / "ncci_ptp.json"
-    if ncci_ptp_path.exists():
+    if ncci_ptp_index_path.exists():
+        datasets["ncci_ptp"] = NCCIPairIndex.load(ncci_ptp_index_path)
+        print(f"Loaded {len(datasets['ncci_ptp']):,} NCCI PTP edits from index")
+    elif ncci_ptp_path.exists():
         with open(ncci_ptp_path) as f:
-            ptp_list = json.load(f)
-            ptp_dict = {}
-            for entry in ptp_list:
-                codes = entry.get("codes", [])
-                if len(codes) == 2:
-                    key = tuple(sorted(codes))
-                    ptp_dict[key] = {
-                        "citation": entry.get("citation"),
-                        "modifier": entry.get("modifier"),
-                    }
-            datasets["ncci_ptp"] = ptp_dict
-            print(f"Loaded {len(ptp_dict):,} NCCI PTP code pairs")
+            datasets["ncci_ptp"] = NCCIPairIndex.from_records(json.load(f))
+            print(f"Loaded {len(datasets['ncci_ptp']):,} NCCI PTP edits")
 
     # Load OIG exclusions (special format with excluded_npis list)
+    oig_table = load_reference_table(data_dir, "oig_exclusions")
     oig_path = data_dir / "oig_exclusions.json"
-    if oig_path.exists():
+    if oig_table is not None:
+        datasets["oig_exclusions"] = oig_table
+        print(f"Loaded {len(oig_table):,} OIG excluded NPIs from table")
+    elif oig_path.exists():
         with open(oig_path) as f:
             oig_data = json.load(f)
             # Convert list to set for fast lookups
@@ -473,6 +638,75 @@ def load_datasets() -> dict[str, Any]:
     return datasets
 
 
+# Versioned reference datasets; reloaded when files in ./data change or via
+# POST /api/datasets/reload
+dataset_registry = DatasetRegistry(read_dataset_files, data_dir=DATA_DIR)
+
+# Background pool for Kirk explanations in async analyze mode
+kirk_queue = KirkAnalysisQueue(KIRK_MAX_CONCURRENCY)
+
+
+def load_datasets() -> dict[str, Any]:
+    """Get the current reference datasets snapshot."""
+    return dataset_registry.current().datasets
+
+
+_batch_evaluator: BatchEvaluator | None = None
+_batch_evaluator_version: str | None = None
+
+
+def get_batch_evaluator(snapshot: DatasetSnapshot) -> BatchEvaluator:
+    """Get the shared batch evaluator for a datasets snapshot.
+
+    Worker processes preload the datasets, so a new snapshot gets a new
+    pool; the previous pool finishes its in-flight batches and exits.
+    """
+    global _batch_evaluator, _batch_evaluator_version
+    if _batch_evaluator is not None and _batch_evaluator_version != snapshot.version:
+        _batch_evaluator.close(wait=False)
+        _batch_evaluator = None
+    if _batch_evaluator is None:
+        _batch_evaluator = BatchEvaluator(
+            snapshot.datasets, max_workers=RULES_BATCH_WORKERS or None
+        )
+        _batch_evaluator_version = snapshot.version
+    return _batch_evaluator
+
+
+def close_batch_evaluator() -> None:
+    """Shut down the shared batch evaluator's worker pool."""
+    global _batch_evaluator, _batch_evaluator_version
+    if _batch_evaluator is not None:
+        _batch_evaluator.close()
+        _batch_evaluator = None
+        _batch_evaluator_version = None
+
+
+def claim_to_dict(claim: ClaimSubmission) -> dict[str, Any]:
+    """Convert a claim submission to the raw dict consumed by the mapper."""
+    return {
+        "claim_id": claim.claim_id,
+        "billed_amount": claim.billed_amount or sum(i.line_amount for i in claim.items),
+        "diagnosis_codes": claim.diagnosis_codes,
+        "items": [item.model_dump() for item in claim.items],
+        "provider": claim.provider or {},
+        "member": claim.member or {},
+    }
+
+
+def resolve_mapping_template(mapping_template: str | None) -> dict[str, str] | None:
+    """Look up a mapping template by name, ignoring unknown names."""
+    if not mapping_template:
+        return None
+    try:
+        custom_mapping = get_template(mapping_template)
+        logger.info(f"Using mapping template: {mapping_template}")
+        return custom_mapping
+    except ValueError as e:
+        logger.warning(f"Invalid mapping template: {e}")
+        return None
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -483,28 +717,73 @@ async def health_check():
     }
 
 
+@app.get("/api/datasets")
+async def get_dataset_version():
+    """Get the version and sizes of the reference datasets in use."""
+    return dataset_registry.current().summary()
+
+
+@app.post("/api/datasets/reload")
+async def reload_datasets(
+    force: bool = Query(
+        default=False,
+        description="Reload even if no dataset file changed",
+    ),
+):
+    """Reload reference datasets from ./data without restarting.
+
+    The new snapshot is built while requests keep scoring against the
+    current one, then swapped in atomically. Each worker process holds its
+    own snapshot; with several workers, rely on the file watcher
+    (DATASET_WATCH_INTERVAL) or call this once per worker.
+    """
+    previous_version = dataset_registry.current().version
+    try:
+        snapshot, reloaded = await run_in_threadpool(dataset_registry.reload, force)
+    except Exception as e:
+        logger.error(f"Reference dataset reload failed: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Dataset reload failed: {e}"
+        ) from e
+
+    record_audit_event(
+        AuditAction.DATASET_RELOAD.value,
+        sync=True,
+        resource_type="datasets",
+        resource_id=snapshot.version,
+        details={
+            "previous_version": previous_version,
+            "reloaded": reloaded,
+            "force": force,
+        },
+    )
+
+    return {
+        **snapshot.summary(),
+        "previous_version": previous_version,
+        "reloaded": reloaded,
+    }
+
+
 @app.post("/api/upload", response_model=dict)
 async def upload_claim(claim: ClaimSubmission):
     """Submit a claim for analysis."""
     job_id = str(uuid.uuid4())
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "INSERT INTO jobs (job_id, claim_id, status, created_at) VALUES (?, ?, ?, ?)",
             (job_id, claim.claim_id, "pending", datetime.now(timezone.utc).isoformat()),
         )
 
-        # Audit log: claim uploaded
-        log_audit_event(
-            conn,
-            action=AuditAction.CLAIM_UPLOAD.value,
-            resource_type="claim",
-            resource_id=claim.claim_id,
-            details={"job_id": job_id, "items_count": len(claim.items)},
-        )
-
-        conn.commit()
+    # Audit log: claim uploaded
+    record_audit_event(
+        AuditAction.CLAIM_UPLOAD.value,
+        resource_type="claim",
+        resource_id=claim.claim_id,
+        details={"job_id": job_id, "items_count": len(claim.items)},
+    )
 
     return {
         "job_id": job_id,
@@ -514,6 +793,142 @@ async def upload_claim(claim: ClaimSubmission):
     }
 
 
+@app.post("/api/analyze/batch")
+async def analyze_claims_batch(
+    batch_request: BatchAnalysisRequest,
+    mapping_template: str | None = Query(
+        default=None,
+        description="Mapping template to use: 'edi_837p', 'edi_837i', or 'csv'",
+    ),
+):
+    """Score many claims in one request using the parallel rules engine.
+
+    Intended for bulk re-scoring (e.g. nightly claim files). Each claim is
+    normalized, scored by the rules engine over a process pool that keeps the
+    reference datasets resident, and persisted as its own job. RAG retrieval
+    and Kirk analysis are skipped; use /api/analyze/{job_id} for a single
+    claim that needs an explanation.
+
+    Args:
+        batch_request: Claims to score (up to MAX_BATCH_ANALYSIS_SIZE)
+        mapping_template: Optional pre-built mapping template name applied
+            to every claim in the batch.
+
+    Returns:
+        Per-claim outcomes in input order plus summary counts.
+    """
+    custom_mapping = resolve_mapping_template(mapping_template)
+    snapshot = dataset_registry.current()
+
+    rules_claims = [
+        denormalize_for_rules(
+            normalize_claim(claim_to_dict(claim), custom_mapping=custom_mapping)
+        )
+        for claim in batch_request.claims
+    ]
+
+    # Rules evaluation is CPU-bound; keep it off the event loop
+    evaluator = get_batch_evaluator(snapshot)
+    batch_outcomes = await run_in_threadpool(
+        evaluator.evaluate,
+        rules_claims,
+        {"base_score": 0.5},
+        ThresholdConfig(),
+    )
+
+    now = datetime.now(timezone.utc).isoformat()
+    results: list[dict[str, Any]] = []
+    job_rows: list[tuple] = []
+    result_rows: list[tuple] = []
+    provider_npis: dict[str, str | None] = {}
+
+    for claim, rules_claim, item in zip(
+        batch_request.claims, rules_claims, batch_outcomes
+    ):
+        job_id = str(uuid.uuid4())
+        outcome = item.outcome
+        if outcome is None:
+            job_rows.append((job_id, claim.claim_id, "failed", now, now))
+            results.append(
+                {
+                    "index": item.index,
+                    "job_id": job_id,
+                    "claim_id": claim.claim_id,
+                    "status": "failed",
+                    "error": item.error,
+                }
+            )
+            continue
+
+        rule_hits = [asdict(h) for h in outcome.rule_result.hits]
+        job_rows.append((job_id, claim.claim_id, "completed", now, now))
+        provider_npis[job_id] = (rules_claim.get("provider") or {}).get("npi")
+        result_rows.append(
+            (
+                job_id,
+                claim.claim_id,
+                outcome.decision.score,
+                outcome.decision.decision_mode,
+                json.dumps(rule_hits),
+                json.dumps(outcome.ncci_flags),
+                json.dumps(outcome.coverage_flags),
+                json.dumps(outcome.provider_flags),
+                outcome.roi_estimate,
+                None,
+                now,
+                snapshot.version,
+                KIRK_STATUS_SKIPPED,
+            )
+        )
+        results.append(
+            {
+                "index": item.index,
+                "job_id": job_id,
+                "claim_id": claim.claim_id,
+                "status": "completed",
+                "fraud_score": outcome.decision.score,
+                "decision_mode": outcome.decision.decision_mode,
+                "rule_hits": rule_hits,
+                "ncci_flags": outcome.ncci_flags,
+                "coverage_flags": outcome.coverage_flags,
+                "provider_flags": outcome.provider_flags,
+                "roi_estimate": outcome.roi_estimate,
+            }
+        )
+
+    failed_count = len(job_rows) - len(result_rows)
+
+    # Store all jobs and results in a single transaction
+    with get_database(DB_PATH).write() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """INSERT INTO jobs (job_id, claim_id, status, created_at, completed_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            job_rows,
+        )
+        store_results(conn, result_rows, provider_npis)
+
+    # Audit log: one entry for the whole batch
+    record_audit_event(
+        AuditAction.CLAIM_ANALYZE.value,
+        resource_type="claim_batch",
+        details={
+            "claims_count": len(job_rows),
+            "completed_count": len(result_rows),
+            "failed_count": failed_count,
+            "dataset_version": snapshot.version,
+        },
+    )
+
+    return {
+        "results": results,
+        "total": len(results),
+        "completed_count": len(result_rows),
+        "failed_count": failed_count,
+        "dataset_version": snapshot.version,
+    }
+
+
 @app.post("/api/analyze/{job_id}")
 async def analyze_claim(
     job_id: str,
@@ -522,39 +937,50 @@ async def analyze_claim(
         default=None,
         description="Mapping template to use: 'edi_837p', 'edi_837i', or 'csv'",
     ),
+    async_explanation: bool | None = Query(
+        default=None,
+        description=(
+            "Return the rules result without waiting for Kirk; poll "
+            "/api/results/{job_id}/explanation. Defaults to KIRK_ASYNC_ANALYSIS."
+        ),
+    ),
+    refresh_explanation: bool = Query(
+        default=False,
+        description=(
+            "Bypass the Kirk analysis cache and request a fresh explanation "
+            "(which then replaces the cached one)"
+        ),
+    ),
 ):
     """Run fraud analysis on a claim.
 
+    Analysis has two phases: the rules-engine score, which is persisted
+    first, and Kirk's explanation. In async mode the score is returned as
+    soon as it is stored (kirk_status "pending") and the explanation is
+    filled in by the background Kirk pool.
+
     Args:
         job_id: Unique job identifier from /api/upload
         claim: Claim data to analyze
         mapping_template: Optional pre-built mapping template name.
             Available templates: 'edi_837p', 'edi_837i', 'csv'.
             If not specified, alias-based mapping is used.
+        async_explanation: Compute Kirk's explanation in the background
+        refresh_explanation: Skip the Kirk analysis cache lookup
     """
+    if async_explanation is None:
+        async_explanation = KIRK_ASYNC_ANALYSIS
 
-    # Load reference datasets
-    datasets = load_datasets()
+    # Take one reference datasets snapshot for the whole analysis so a
+    # concurrent reload cannot change data mid-claim
+    snapshot = dataset_registry.current()
+    datasets = snapshot.datasets
 
     # Convert claim to dict for rules engine
-    raw_claim = {
-        "claim_id": claim.claim_id,
-        "billed_amount": claim.billed_amount or sum(i.line_amount for i in claim.items),
-        "diagnosis_codes": claim.diagnosis_codes,
-        "items": [item.model_dump() for item in claim.items],
-        "provider": claim.provider or {},
-        "member": claim.member or {},
-    }
+    raw_claim = claim_to_dict(claim)
 
     # Normalize claim to OMOP CDM canonical schema
-    custom_mapping = None
-    if mapping_template:
-        try:
-            custom_mapping = get_template(mapping_template)
-            logger.info(f"Using mapping template: {mapping_template}")
-        except ValueError as e:
-            logger.warning(f"Invalid mapping template: {e}")
-
+    custom_mapping = resolve_mapping_template(mapping_template)
     claim_dict = normalize_claim(raw_claim, custom_mapping=custom_mapping)
 
     # Get RAG policy context BEFORE rules evaluation
@@ -568,16 +994,24 @@ async def analyze_claim(
             claim.diagnosis_codes if hasattr(claim, "diagnosis_codes") else []
         )
 
+        # Policies indexed under the claim's exact codes come first; semantic
+        # search is the fallback when no policy lists them
+
         # Search for procedure code coverage
         if procedure_codes:
-            proc_query = f"CPT procedure codes {', '.join(set(procedure_codes))} coverage billing guidelines"
-            proc_results = store.search(proc_query, n_results=3)
+            proc_results = store.search_by_codes(procedure_codes, n_results=3)
+            if not proc_results:
+                # Sorted so claims with the same code set share a cached search
+                proc_query = f"CPT procedure codes {', '.join(sorted(set(procedure_codes)))} coverage billing guidelines"
+                proc_results = store.search(proc_query, n_results=3)
             policy_docs.extend(proc_results)
 
         # Search for diagnosis-related policies
         if diagnosis_codes:
-            diag_query = f"ICD-10 diagnosis {', '.join(diagnosis_codes[:5])} medical necessity coverage"
-            diag_results = store.search(diag_query, n_results=2)
+            diag_results = store.search_by_codes(diagnosis_codes[:5], n_results=2)
+            if not diag_results:
+                diag_query = f"ICD-10 diagnosis {', '.join(diagnosis_codes[:5])} medical necessity coverage"
+                diag_results = store.search(diag_query, n_results=2)
             policy_docs.extend(diag_results)
 
         # Deduplicate by document ID
@@ -610,39 +1044,49 @@ async def analyze_claim(
         policy_docs=policy_docs,  # Pass RAG context to rules
     )
 
-    # Get Kirk's expert analysis
-    claude_result = get_kirk_analysis(
-        claim=claim_dict,
-        rule_hits=outcome.rule_result.hits,
-        fraud_score=outcome.decision.score,
-        decision_mode=outcome.decision.decision_mode,
-        rag_context=rag_context,
-        config=KIRK_CONFIG,
-    )
+    kirk_args = {
+        "claim": claim_dict,
+        "rule_hits": outcome.rule_result.hits,
+        "fraud_score": outcome.decision.score,
+        "decision_mode": outcome.decision.decision_mode,
+        "rag_context": rag_context,
+        "config": KIRK_CONFIG,
+        "use_cache": not refresh_explanation,
+    }
+    if async_explanation:
+        claude_result: dict[str, Any] = {}
+        kirk_status = KIRK_STATUS_PENDING
+    else:
+        # Get Kirk's expert analysis; the Claude client blocks, so keep it
+        # off the event loop
+        claude_result, kirk_status = await run_in_threadpool(
+            run_kirk_analysis, kirk_args
+        )
 
     # Store results
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
 
-        cursor.execute(
-            """INSERT OR REPLACE INTO results
-               (job_id, claim_id, fraud_score, decision_mode, rule_hits,
-                ncci_flags, coverage_flags, provider_flags, roi_estimate,
-                claude_explanation, created_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                job_id,
-                claim.claim_id,
-                outcome.decision.score,
-                outcome.decision.decision_mode,
-                json.dumps([asdict(h) for h in outcome.rule_result.hits]),
-                json.dumps(outcome.ncci_flags),
-                json.dumps(outcome.coverage_flags),
-                json.dumps(outcome.provider_flags),
-                outcome.roi_estimate,
-                json.dumps(claude_result),
-                datetime.now(timezone.utc).isoformat(),
-            ),
+        store_results(
+            conn,
+            [
+                (
+                    job_id,
+                    claim.claim_id,
+                    outcome.decision.score,
+                    outcome.decision.decision_mode,
+                    json.dumps([asdict(h) for h in outcome.rule_result.hits]),
+                    json.dumps(outcome.ncci_flags),
+                    json.dumps(outcome.coverage_flags),
+                    json.dumps(outcome.provider_flags),
+                    outcome.roi_estimate,
+                    json.dumps(claude_result) if claude_result else None,
+                    datetime.now(timezone.utc).isoformat(),
+                    snapshot.version,
+                    kirk_status,
+                )
+            ],
+            {job_id: (rules_claim.get("provider") or {}).get("npi")},
         )
 
         cursor.execute(
@@ -650,21 +1094,23 @@ async def analyze_claim(
             ("completed", datetime.now(timezone.utc).isoformat(), job_id),
         )
 
-        # Audit log: claim analyzed
-        log_audit_event(
-            conn,
-            action=AuditAction.CLAIM_ANALYZE.value,
-            resource_type="claim",
-            resource_id=claim.claim_id,
-            details={
-                "job_id": job_id,
-                "fraud_score": outcome.decision.score,
-                "decision_mode": outcome.decision.decision_mode,
-                "rule_hits_count": len(outcome.rule_result.hits),
-            },
-        )
+    # Audit log: claim analyzed
+    record_audit_event(
+        AuditAction.CLAIM_ANALYZE.value,
+        resource_type="claim",
+        resource_id=claim.claim_id,
+        details={
+            "job_id": job_id,
+            "fraud_score": outcome.decision.score,
+            "decision_mode": outcome.decision.decision_mode,
+            "rule_hits_count": len(outcome.rule_result.hits),
+            "dataset_version": snapshot.version,
+        },
+    )
 
-        conn.commit()
+    # The result row exists now, so the background task can fill it in
+    if async_explanation:
+        kirk_queue.submit(job_id, lambda: store_kirk_analysis(job_id, kirk_args))
 
     return AnalysisResult(
         job_id=job_id,
@@ -677,37 +1123,117 @@ async def analyze_claim(
         provider_flags=outcome.provider_flags,
         roi_estimate=outcome.roi_estimate,
         claude_analysis=claude_result,
+        kirk_status=kirk_status,
+        dataset_version=snapshot.version,
     )
 
 
+def run_kirk_analysis(kirk_args: dict[str, Any]) -> tuple[dict[str, Any], str]:
+    """Get Kirk's analysis and the kirk_status to store with it."""
+    try:
+        claude_result = get_kirk_analysis(**kirk_args)
+    except Exception as e:
+        logger.warning(f"Kirk analysis failed: {e}")
+        return {
+            "explanation": f"Kirk analysis failed: {e}. Rule-based analysis only.",
+            "risk_factors": [h.description for h in kirk_args["rule_hits"]],
+            "recommendations": ["Review flagged items manually"],
+            "model": None,
+            "tokens_used": 0,
+            "error": str(e),
+        }, KIRK_STATUS_FAILED
+    status = KIRK_STATUS_FAILED if claude_result.get("error") else KIRK_STATUS_COMPLETED
+    return claude_result, status
+
+
+def store_kirk_analysis(job_id: str, kirk_args: dict[str, Any]) -> None:
+    """Background task: compute Kirk's analysis and store it on the result."""
+    claude_result, kirk_status = run_kirk_analysis(kirk_args)
+    with get_database(DB_PATH).write() as conn:
+        conn.execute(
+            "UPDATE results SET claude_explanation = ?, kirk_status = ? WHERE job_id = ?",
+            (json.dumps(claude_result), kirk_status, job_id),
+        )
+
+
 @app.get("/api/results/{job_id}")
 async def get_results(job_id: str):
     """Get analysis results for a job."""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).read() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM results WHERE job_id = ?", (job_id,))
         row = cursor.fetchone()
+        rule_hits = load_rule_hits(conn, job_id) if row else []
 
     if not row:
         raise HTTPException(
             status_code=404, detail=f"Results not found for job {job_id}"
         )
 
+    # Hits come from result_rule_hits; the JSON copy covers anything not
+    # normalized (the backfill skips rows it can't parse)
+    if not rule_hits and row[4]:
+        rule_hits = json.loads(row[4])
+
     return {
         "job_id": row[0],
         "claim_id": row[1],
         "fraud_score": row[2],
         "decision_mode": row[3],
-        "rule_hits": json.loads(row[4]) if row[4] else [],
+        "rule_hits": rule_hits,
         "ncci_flags": json.loads(row[5]) if row[5] else [],
         "coverage_flags": json.loads(row[6]) if row[6] else [],
         "provider_flags": json.loads(row[7]) if row[7] else [],
         "roi_estimate": row[8],
         "claude_analysis": json.loads(row[9]) if row[9] else {},
         "created_at": row[10],
+        "dataset_version": row[11],
+        # Results stored before kirk_status existed always had an explanation
+        "kirk_status": row[12] or KIRK_STATUS_COMPLETED,
     }
 
 
+@app.get("/api/results/{job_id}/explanation")
+async def get_result_explanation(job_id: str):
+    """Poll Kirk's explanation for an analyzed claim.
+
+    Returns kirk_status "pending" until the background Kirk pool has stored
+    the explanation, then "completed" (or "failed") with claude_analysis.
+    """
+    with get_database(DB_PATH).read() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT claude_explanation, kirk_status FROM results WHERE job_id = ?",
+            (job_id,),
+        )
+        row = cursor.fetchone()
+
+    if not row:
+        raise HTTPException(
+            status_code=404, detail=f"Results not found for job {job_id}"
+        )
+
+    return {
+        "job_id": job_id,
+        "kirk_status": row[1] or KIRK_STATUS_COMPLETED,
+        "claude_analysis": json.loads(row[0]) if row[0] else {},
+    }
+
+
+@app.get("/api/kirk/cache")
+async def get_kirk_cache_stats():
+    """Hit/miss metrics and size of the Kirk analysis cache."""
+    stats = await run_in_threadpool(get_analysis_cache().stats)
+    return {"enabled": KIRK_CACHE_ENABLED, **stats}
+
+
+@app.delete("/api/kirk/cache")
+async def clear_kirk_cache():
+    """Drop every cached Kirk analysis so each is regenerated on next use."""
+    removed = await run_in_threadpool(get_analysis_cache().clear)
+    return {"removed": removed}
+
+
 # ============================================================
 # Mapping Endpoints (Rate-Limited)
 # Non-rate-limited mapping endpoints are in routes/mappings.py
@@ -722,6 +1248,11 @@ class RerankerRequest(BaseModel):
     sample_values: list[Any] | None = None
 
 
+# Fields per batch rerank request. Fields are packed several to a Claude
+# call, so this covers a whole source schema at a bounded API cost.
+MAX_RERANK_BATCH_SIZE = 200
+
+
 class BatchRerankerRequest(BaseModel):
     """Request model for batch LLM reranking."""
 
@@ -731,8 +1262,11 @@ class BatchRerankerRequest(BaseModel):
     @classmethod
     def validate_batch_size(cls, v: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Validate batch size to prevent excessive LLM API calls."""
-        if len(v) > 20:
-            raise ValueError("Batch size too large. Maximum 20 mappings per request.")
+        if len(v) > MAX_RERANK_BATCH_SIZE:
+            raise ValueError(
+                "Batch size too large. "
+                f"Maximum {MAX_RERANK_BATCH_SIZE} mappings per request."
+            )
         return v
 
 
@@ -778,6 +1312,8 @@ async def batch_rerank_mappings(request: Request, batch_request: BatchRerankerRe
 
     Process multiple field mappings in a single request. Each mapping
     needs a source_field, candidates list, and optional sample_values.
+    Fields are packed several to a Claude call and the calls run
+    concurrently (see MappingReranker.batch_rerank).
     Rate limited to 5 requests/minute due to multiple LLM calls per request.
     """
     from mapping.reranker import get_reranker
@@ -802,7 +1338,8 @@ async def batch_rerank_mappings(request: Request, batch_request: BatchRerankerRe
             }
         )
 
-    results = reranker.batch_rerank(internal_mappings)
+    # Blocking API calls: keep them off the event loop
+    results = await run_in_threadpool(reranker.batch_rerank, internal_mappings)
 
     return {
         "results": [r.to_dict() if r else None for r in results],
@@ -906,23 +1443,38 @@ async def smart_field_mapping(request: Request, smart_request: SemanticMatchRequ
 async def list_jobs(
     limit: int = Query(default=DEFAULT_JOBS_LIMIT, ge=1, le=MAX_JOBS_LIMIT),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None, description="next_cursor from the previous page"
+    ),
 ):
-    """List analyzed claims with pagination."""
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
+    """List analyzed claims, newest first.
+
+    Pass the returned next_cursor to fetch the following page; it seeks by
+    (created_at, job_id) so deep pages cost the same as the first. offset
+    still works for older clients but is ignored when cursor is given.
+    """
+    conditions = "1=1"
+    params: list[Any] = []
+    if cursor:
+        conditions = keyset_condition("r.created_at", "r.job_id")
+        params.extend(_decode_cursor_param(cursor))
+        offset = 0
+
+    with get_database(DB_PATH).read() as conn:
+        rows = conn.execute(
+            f"""
             SELECT r.job_id, r.claim_id, r.fraud_score, r.decision_mode,
                    r.rule_hits, r.ncci_flags, r.coverage_flags, r.provider_flags,
                    r.roi_estimate, r.created_at, j.status
             FROM results r
             JOIN jobs j ON r.job_id = j.job_id
-            ORDER BY r.created_at DESC
+            WHERE {conditions}
+            ORDER BY r.created_at DESC, r.job_id DESC
             LIMIT ? OFFSET ?
         """,
-            (limit, offset),
-        )
-        rows = cursor.fetchall()
+            params + [limit + 1, offset],
+        ).fetchall()
+    page_cursor = next_cursor(rows, limit, key=lambda row: (row[9], row[0]))
 
     jobs = []
     for row in rows:
@@ -951,13 +1503,21 @@ async def list_jobs(
             }
         )
 
-    return {"jobs": jobs, "total": len(jobs), "limit": limit, "offset": offset}
+    return {
+        "jobs": jobs,
+        "total": len(jobs),
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": page_cursor,
+    }
 
 
 @app.get("/api/stats")
 async def get_stats():
     """Get prototype statistics."""
-    with sqlite3.connect(DB_PATH) as conn:
+    db = get_database(DB_PATH)
+    ensure_rule_stats(db)
+    with db.read() as conn:
         cursor = conn.cursor()
 
         cursor.execute("SELECT COUNT(*) FROM jobs")
@@ -966,35 +1526,10 @@ async def get_stats():
         cursor.execute("SELECT COUNT(*) FROM jobs WHERE status = 'completed'")
         completed_jobs = cursor.fetchone()[0]
 
-        cursor.execute("SELECT AVG(fraud_score) FROM results")
-        avg_score = cursor.fetchone()[0] or 0
-
-        # Count flags
-        cursor.execute(
-            "SELECT rule_hits, ncci_flags, coverage_flags, provider_flags FROM results"
-        )
-        rows = cursor.fetchall()
-        total_flags = 0
-        auto_approved = 0
-        for row in rows:
-            rule_hits = safe_json_loads(row[0])
-            ncci_flags = safe_json_loads(row[1])
-            coverage_flags = safe_json_loads(row[2])
-            provider_flags = safe_json_loads(row[3])
-            flags = (
-                len(rule_hits)
-                + len(ncci_flags)
-                + len(coverage_flags)
-                + len(provider_flags)
-            )
-            total_flags += flags
-            if flags == 0:
-                auto_approved += 1
+        # Flag counts and sums come from the materialized aggregates
+        totals = result_totals(conn)
 
-        cursor.execute(
-            "SELECT SUM(roi_estimate) FROM results WHERE roi_estimate IS NOT NULL"
-        )
-        total_roi = cursor.fetchone()[0] or 0
+    avg_score = totals["fraud_score_sum"] / totals["claims"] if totals["claims"] else 0
 
     return {
         "total_jobs": total_jobs,
@@ -1003,9 +1538,9 @@ async def get_stats():
         "rag_documents": get_store().count(),
         # Frontend expected fields
         "claims_analyzed": completed_jobs,
-        "flags_detected": total_flags,
-        "auto_approved": auto_approved,
-        "potential_savings": round(total_roi, 2),
+        "flags_detected": totals["flags"],
+        "auto_approved": totals["auto_approved"],
+        "potential_savings": round(totals["roi_sum"], 2),
     }
 
 
@@ -1089,8 +1624,7 @@ async def list_connectors(
     offset: int = Query(default=0, ge=0),
 ):
     """List all configured connectors."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
 
         query = "SELECT * FROM connectors WHERE 1=1"
@@ -1193,7 +1727,7 @@ async def create_connector(request: ConnectorCreateRequest):
             detail=f"Failed to encrypt credentials: {str(e)[:100]}",
         )
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
         try:
             cursor.execute(
@@ -1235,8 +1769,6 @@ async def create_connector(request: ConnectorCreateRequest):
                     "data_type": request.data_type,
                 },
             )
-
-            conn.commit()
         except sqlite3.IntegrityError:
             raise HTTPException(
                 status_code=400,
@@ -1256,8 +1788,7 @@ async def create_connector(request: ConnectorCreateRequest):
 @app.get("/api/connectors/{connector_id}")
 async def get_connector(connector_id: str):
     """Get connector details by ID."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM connectors WHERE id = ?", (connector_id,))
         row = cursor.fetchone()
@@ -1307,8 +1838,7 @@ async def update_connector(connector_id: str, request: ConnectorUpdateRequest):
     from security import get_credential_manager
 
     # First fetch existing connector
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM connectors WHERE id = ?", (connector_id,))
         existing = cursor.fetchone()
@@ -1372,13 +1902,12 @@ async def update_connector(connector_id: str, request: ConnectorUpdateRequest):
 
     params.append(connector_id)
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
         cursor.execute(
             f"UPDATE connectors SET {', '.join(updates)} WHERE id = ?",
             params,
         )
-        conn.commit()
 
     return {"message": "Connector updated", "connector_id": connector_id}
 
@@ -1388,7 +1917,7 @@ async def delete_connector(connector_id: str):
     """Delete a connector and its credentials."""
     from security import get_credential_manager
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
 
         # Check if connector exists
@@ -1421,8 +1950,6 @@ async def delete_connector(connector_id: str):
             resource_id=connector_id,
         )
 
-        conn.commit()
-
     return {"message": "Connector deleted", "connector_id": connector_id}
 
 
@@ -1432,8 +1959,7 @@ async def test_connector(connector_id: str):
     from security import get_credential_manager
 
     # Get connector details
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM connectors WHERE id = ?", (connector_id,))
         row = cursor.fetchone()
@@ -1455,13 +1981,12 @@ async def test_connector(connector_id: str):
         logger.warning(f"Failed to inject secrets: {e}")
 
     # Update status to testing
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "UPDATE connectors SET status = ? WHERE id = ?",
             ("testing", connector_id),
         )
-        conn.commit()
 
     # Test connection based on connector type
     if connector_type == "database":
@@ -1480,13 +2005,12 @@ async def test_connector(connector_id: str):
 
     # Update connector status based on result
     new_status = "inactive" if result["success"] else "error"
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "UPDATE connectors SET status = ? WHERE id = ?",
             (new_status, connector_id),
         )
-        conn.commit()
 
     return result
 
@@ -1636,8 +2160,7 @@ async def discover_connector_schema(connector_id: str):
     from security import get_credential_manager
 
     # Get connector details
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM connectors WHERE id = ?", (connector_id,))
         row = cursor.fetchone()
@@ -1717,7 +2240,7 @@ async def activate_connector(connector_id: str):
     This updates the connector status and adds a scheduled job to APScheduler
     if a sync_schedule (cron expression) is configured.
     """
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1734,7 +2257,6 @@ async def activate_connector(connector_id: str):
             "UPDATE connectors SET status = ? WHERE id = ?",
             ("active", connector_id),
         )
-        conn.commit()
 
     # Add scheduled job to APScheduler if schedule is configured
     scheduler_status = "no_schedule"
@@ -1790,7 +2312,7 @@ async def deactivate_connector(connector_id: str):
     This updates the connector status and removes any scheduled job
     from APScheduler.
     """
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
 
         cursor.execute("SELECT id FROM connectors WHERE id = ?", (connector_id,))
@@ -1801,7 +2323,6 @@ async def deactivate_connector(connector_id: str):
             "UPDATE connectors SET status = ? WHERE id = ?",
             ("inactive", connector_id),
         )
-        conn.commit()
 
     # Remove scheduled job from APScheduler
     scheduler_status = "not_scheduled"
@@ -1885,8 +2406,7 @@ async def trigger_sync(
     configured source and loads it into the system.
     """
     # Get connector
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM connectors WHERE id = ?", (connector_id,))
         connector = cursor.fetchone()
@@ -1897,7 +2417,7 @@ async def trigger_sync(
     mode = sync_mode or connector["sync_mode"]
 
     # Check if there's already a running job for this connector
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).read() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "SELECT id FROM sync_jobs WHERE connector_id = ? AND status = 'running'",
@@ -1936,7 +2456,7 @@ async def trigger_sync(
         job_id = str(uuid.uuid4())
         now = datetime.now(timezone.utc).isoformat()
 
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_database(DB_PATH).write() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -1955,7 +2475,6 @@ async def trigger_sync(
                     now,
                 ),
             )
-            conn.commit()
 
         return {
             "job_id": job_id,
@@ -1980,12 +2499,16 @@ async def list_sync_jobs(
     status: str | None = None,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None, description="next_cursor from the previous page"
+    ),
 ):
-    """List sync jobs with optional filters."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    """List sync jobs, newest first, with optional filters.
 
+    Pages by (created_at, id) when given the previous page's next_cursor;
+    started_at is unset for pending jobs, so it can't anchor a cursor.
+    """
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         query = """
             SELECT j.*, c.name as connector_name
             FROM sync_jobs j
@@ -2002,11 +2525,18 @@ async def list_sync_jobs(
             query += " AND j.status = ?"
             params.append(status)
 
-        query += " ORDER BY j.started_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        if cursor:
+            query += f" AND {keyset_condition('j.created_at', 'j.id')}"
+            params.extend(_decode_cursor_param(cursor))
+            offset = 0
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        query += " ORDER BY j.created_at DESC, j.id DESC LIMIT ? OFFSET ?"
+        params.extend([limit + 1, offset])
+
+        rows = conn.execute(query, params).fetchall()
+    page_cursor = next_cursor(
+        rows, limit, key=lambda row: (row["created_at"], row["id"])
+    )
 
     jobs = []
     for row in rows:
@@ -2029,14 +2559,19 @@ async def list_sync_jobs(
             }
         )
 
-    return {"jobs": jobs, "total": len(jobs), "limit": limit, "offset": offset}
+    return {
+        "jobs": jobs,
+        "total": len(jobs),
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": page_cursor,
+    }
 
 
 @app.get("/api/sync-jobs/{job_id}")
 async def get_sync_job(job_id: str):
     """Get sync job details."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -2073,7 +2608,7 @@ async def get_sync_job(job_id: str):
 @app.post("/api/sync-jobs/{job_id}/cancel")
 async def cancel_sync_job(job_id: str):
     """Cancel a running or pending sync job."""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).read() as conn:
         cursor = conn.cursor()
 
         cursor.execute("SELECT status FROM sync_jobs WHERE id = ?", (job_id,))
@@ -2102,13 +2637,12 @@ async def cancel_sync_job(job_id: str):
     # Fallback to direct database update
     if not cancelled:
         now = datetime.now(timezone.utc).isoformat()
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_database(DB_PATH).write() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE sync_jobs SET status = ?, completed_at = ?, error_message = ? WHERE id = ?",
                 ("cancelled", now, "Cancelled by user", job_id),
             )
-            conn.commit()
 
     return {"message": "Sync job cancelled", "job_id": job_id, "status": "cancelled"}
 
@@ -2120,8 +2654,7 @@ async def get_sync_job_logs(
     offset: int = Query(default=0, ge=0),
 ):
     """Get logs for a sync job."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
 
         # Verify job exists
@@ -2201,8 +2734,7 @@ async def analyze_connector_samples(
     from security import get_credential_manager
 
     # Verify connector exists
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM connectors WHERE id = ?", (connector_id,))
         connector = cursor.fetchone()
@@ -2579,7 +3111,7 @@ async def apply_template_to_connector(
     connector_id = str(uuid.uuid4())
     now = datetime.now(timezone.utc).isoformat()
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_database(DB_PATH).write() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -2601,7 +3133,6 @@ async def apply_template_to_connector(
                 now,
             ),
         )
-        conn.commit()
 
     return {
         "success": True,
@@ -2628,8 +3159,7 @@ async def export_connector_config(
     Returns the config file content as a downloadable response.
     """
 
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_database(DB_PATH).read(row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
 
         if connector_ids:
@@ -2784,7 +3314,7 @@ async def import_connector_config(
     for config in connector_configs:
         try:
             # Check if connector with same name exists
-            with sqlite3.connect(DB_PATH) as conn:
+            with get_database(DB_PATH).read() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT id FROM connectors WHERE name = ?", (config.name,)
@@ -2797,7 +3327,7 @@ async def import_connector_config(
                     connector_id = existing[0]
                     now = datetime.now(timezone.utc).isoformat()
 
-                    with sqlite3.connect(DB_PATH) as conn:
+                    with get_database(DB_PATH).write() as conn:
                         cursor = conn.cursor()
                         cursor.execute(
                             """
@@ -2822,7 +3352,6 @@ async def import_connector_config(
                                 connector_id,
                             ),
                         )
-                        conn.commit()
 
                     results["updated"].append({"name": config.name, "id": connector_id})
                 else:
@@ -2837,7 +3366,7 @@ async def import_connector_config(
                 connector_id = str(uuid.uuid4())
                 now = datetime.now(timezone.utc).isoformat()
 
-                with sqlite3.connect(DB_PATH) as conn:
+                with get_database(DB_PATH).write() as conn:
                     cursor = conn.cursor()
                     cursor.execute(
                         """
@@ -2862,7 +3391,6 @@ async def import_connector_config(
                             config.created_by or "config_import",
                         ),
                     )
-                    conn.commit()
 
                 results["created"].append({"name": config.name, "id": connector_id})
 
@@ -10,14 +10,34 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
 import warnings
 from typing import Any
 
 import anthropic
 
+from config import KIRK_CACHE_ENABLED
+from kirk_cache import analysis_cache_key, lookup_analysis, store_analysis
 from kirk_config import KIRK_CONFIG, KIRK_SYSTEM_PROMPT, CATEGORY_PROMPTS, KirkConfig
 from rules import RuleHit
 
+_clients: dict[str, anthropic.Anthropic] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str) -> anthropic.Anthropic:
+    """Get a shared Anthropic client for api_key.
+
+    The client holds an HTTP connection pool, so reusing it across claims
+    saves a TLS handshake per call. It is safe to share between threads.
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = anthropic.Anthropic(api_key=api_key)
+            _clients[api_key] = client
+        return client
+
 
 def parse_structured_response(text: str) -> dict[str, Any] | None:
     """Parse structured JSON response from Claude.
@@ -126,7 +146,7 @@ def get_fraud_explanation(
             "tokens_used": 0,
         }
 
-    client = anthropic.Anthropic(api_key=api_key)
+    client = get_client(api_key)
 
     # Build the prompt
     claim_summary = json.dumps(claim, indent=2, default=str)
@@ -290,6 +310,7 @@ def get_kirk_analysis(
     rag_context: str | None = None,
     config: KirkConfig | None = None,
     category: str | None = None,
+    use_cache: bool = True,
 ) -> dict[str, Any]:
     """Get Kirk's expert analysis of the claim.
 
@@ -297,6 +318,10 @@ def get_kirk_analysis(
     powered by Claude Sonnet 4.5. He provides formal, thorough analysis
     with regulatory citations and prioritized recommendations.
 
+    Repeated analyses with an identical prompt share one result through
+    the Kirk cache (see kirk_cache.py); a reused result has "cached": True
+    and tokens_used 0.
+
     Args:
         claim: The claim data dictionary
         rule_hits: List of rule violations detected
@@ -305,6 +330,8 @@ def get_kirk_analysis(
         rag_context: Optional policy context from RAG retrieval
         config: Optional Kirk configuration (uses KIRK_CONFIG if not provided)
         category: Optional category for focused analysis (auto-detected if None)
+        use_cache: Set False to skip the cache lookup and call Claude; the
+            fresh result still replaces the cached one
 
     Returns:
         Dictionary containing:
@@ -334,8 +361,6 @@ def get_kirk_analysis(
             "structured_response": None,
         }
 
-    client = anthropic.Anthropic(api_key=api_key)
-
     # Auto-detect primary category if not provided
     primary_category = category or get_primary_category(rule_hits)
 
@@ -349,6 +374,20 @@ def get_kirk_analysis(
         primary_category=primary_category,
     )
 
+    cache_key = None
+    if KIRK_CACHE_ENABLED:
+        cache_key = analysis_cache_key(user_prompt, config)
+        cached = lookup_analysis(cache_key) if use_cache else None
+        if cached is not None:
+            return {
+                **cached,
+                "risk_factors": [h.description for h in rule_hits],
+                "tokens_used": 0,
+                "cached": True,
+            }
+
+    client = get_client(api_key)
+
     try:
         response = client.messages.create(
             model=config.model,
@@ -379,7 +418,7 @@ def get_kirk_analysis(
                 : config.max_recommendations
             ]
 
-        return {
+        result = {
             "explanation": risk_summary,
             "risk_factors": [h.description for h in rule_hits],
             "recommendations": recommendations,
@@ -389,6 +428,9 @@ def get_kirk_analysis(
             "structured_response": structured,
             "primary_category": primary_category,
         }
+        if cache_key is not None:
+            store_analysis(cache_key, result)
+        return result
 
     except anthropic.APIError as e:
         return {
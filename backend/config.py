@@ -11,3 +11,27 @@ DB_PATH = os.getenv("DB_PATH", "./data/prototype.db")
 
 # ChromaDB configuration
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./data/chroma")
+
+# Batch scoring configuration
+# Number of rules-engine worker processes for /api/analyze/batch (0 = CPU count)
+RULES_BATCH_WORKERS = int(os.getenv("RULES_BATCH_WORKERS", "0"))
+
+# Reference dataset reload configuration
+# Seconds between checks of ./data for refreshed dataset files (0 = disabled;
+# POST /api/datasets/reload still works)
+DATASET_WATCH_INTERVAL = float(os.getenv("DATASET_WATCH_INTERVAL", "60"))
+
+# Kirk (Claude) explanation configuration
+# When true, /api/analyze returns the rules result immediately and the Kirk
+# explanation is filled in by a background pool (poll
+# /api/results/{job_id}/explanation). Callers can override per request.
+KIRK_ASYNC_ANALYSIS = os.getenv("KIRK_ASYNC_ANALYSIS", "false").lower() == "true"
+# Maximum concurrent Claude calls made by the background pool
+KIRK_MAX_CONCURRENCY = int(os.getenv("KIRK_MAX_CONCURRENCY", "4"))
+# Reuse Kirk analyses for repeated, identical prompts (see kirk_cache.py).
+# Callers can bypass per request.
+KIRK_CACHE_ENABLED = os.getenv("KIRK_CACHE_ENABLED", "true").lower() == "true"
+# Hours a cached analysis is served before it is regenerated
+KIRK_CACHE_TTL_HOURS = float(os.getenv("KIRK_CACHE_TTL_HOURS", "168"))
+# Cached analyses kept; the least recently used are evicted beyond this
+KIRK_CACHE_MAX_ENTRIES = int(os.getenv("KIRK_CACHE_MAX_ENTRIES", "10000"))
@@ -70,6 +70,8 @@ class BaseFileConnector(BaseConnector):
             config: File source configuration with keys:
                 - path_pattern: Glob pattern for files (e.g., "claims/*.edi")
                 - file_format: Format type (edi_837, csv, json)
+                - parse_workers: Processes for parsing large EDI files by
+                  ST/SE transaction (optional, default 1 = serial)
                 - archive_processed: Move processed files (optional)
                 - archive_path: Archive destination (optional)
             batch_size: Records per batch
@@ -134,7 +136,9 @@ class BaseFileConnector(BaseConnector):
         ):
             from .parsers.edi_837 import EDI837Parser
 
-            self._parser = EDI837Parser()
+            self._parser = EDI837Parser(
+                workers=int(self.config.get("parse_workers", 1))
+            )
         elif file_format == "csv":
             from .parsers.csv_parser import CSVParser
 
@@ -23,13 +23,73 @@ Segment Reference:
 from __future__ import annotations
 
 import logging
+import os
 import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Iterator
+from itertools import chain
+from typing import Any, Iterable, Iterator, TextIO
 
 logger = logging.getLogger(__name__)
 
+# Characters read per chunk when streaming a file. Memory use is bounded by
+# one chunk plus the claim currently being assembled.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# ISA is fixed width: 106 characters including the segment terminator
+ISA_SEGMENT_LENGTH = 106
+
+# Parallel parsing: files smaller than this are parsed serially, and
+# consecutive transactions are grouped into ranges of about this many bytes
+# so each worker task carries enough claims to outweigh its overhead
+PARALLEL_MIN_FILE_BYTES = 8 * 1024 * 1024
+PARALLEL_RANGE_BYTES = 4 * 1024 * 1024
+
+# Bytes carried between scan chunks so a segment boundary split across two
+# reads is still matched
+_SCAN_OVERLAP = 64
+
+Separators = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class TransactionRange:
+    """Byte range holding one or more whole ST/SE transactions."""
+
+    start: int
+    end: int
+    claim_type: str = "837P"
+
+
+def _claim_type_for(functional_id: str, default: str) -> str:
+    """Map a GS functional identifier code to a claim type."""
+    if functional_id == "HC":
+        return "837P"  # Health Care Claim
+    if functional_id == "HI":
+        return "837I"  # Institutional
+    return default
+
+
+def _parse_transaction_range(
+    file_path: str, transaction_range: TransactionRange, separators: Separators
+) -> list[dict[str, Any]]:
+    """Parse the claims in one byte range (process pool task)."""
+    with open(file_path, "rb") as f:
+        f.seek(transaction_range.start)
+        data = f.read(transaction_range.end - transaction_range.start)
+
+    element_sep, segment_term, subelement_sep = separators
+    parser = EDI837Parser(element_sep, segment_term, subelement_sep)
+    segments = parser._tokenize([data.decode("utf-8", errors="replace")])
+    return [
+        claim.to_dict()
+        for claim in parser._parse_segments(
+            segments, claim_type=transaction_range.claim_type
+        )
+    ]
+
 
 @dataclass
 class EDISegment:
@@ -159,6 +219,9 @@ class EDI837Parser:
         element_separator: str = "*",
         segment_terminator: str = "~",
         subelement_separator: str = ":",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+        parallel_min_bytes: int = PARALLEL_MIN_FILE_BYTES,
     ) -> None:
         """Initialize the parser.
 
@@ -166,16 +229,30 @@ class EDI837Parser:
             element_separator: Character separating elements (default: *)
             segment_terminator: Character ending segments (default: ~)
             subelement_separator: Character separating sub-elements (default: :)
+            chunk_size: Characters read per chunk when streaming a file
+            workers: Worker processes for parsing ST/SE transactions in
+                parallel (1 = serial streaming, 0 = CPU count)
+            parallel_min_bytes: Files smaller than this are always parsed
+                serially
         """
         self.element_sep = element_separator
         self.segment_term = segment_terminator
         self.subelement_sep = subelement_separator
+        self.chunk_size = chunk_size
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.parallel_min_bytes = parallel_min_bytes
 
     def parse(
         self, file_path: str, limit: int | None = None
     ) -> Iterator[dict[str, Any]]:
         """Parse an EDI 837 file.
 
+        The file is streamed in chunks and each claim is yielded as soon as
+        its CLM loop closes, so memory does not grow with file size. With
+        workers > 1, large files are instead split on ST/SE transaction
+        boundaries and parsed in a process pool; claims are still yielded
+        in file order.
+
         Args:
             file_path: Path to EDI file
             limit: Optional limit on number of claims
@@ -183,22 +260,182 @@ class EDI837Parser:
         Yields:
             Claim dictionaries
         """
+        if (
+            self.workers > 1
+            and not limit
+            and os.path.getsize(file_path) >= self.parallel_min_bytes
+        ):
+            yield from self.parse_parallel(file_path)
+            return
+
         with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-            content = f.read()
+            claims_count = 0
+            for claim in self._parse_segments(self.iter_segments(f)):
+                yield claim.to_dict()
+                claims_count += 1
+                if limit and claims_count >= limit:
+                    break
 
-        # Detect separators from ISA segment
-        self._detect_separators(content)
+    def iter_segments(self, stream: TextIO) -> Iterator[EDISegment]:
+        """Tokenize segments from a text stream one chunk at a time.
+
+        Separators are detected from the ISA segment at the start of the
+        stream before any segment is yielded.
 
-        # Split into segments
-        segments = self._split_segments(content)
+        Args:
+            stream: Text stream positioned at the start of the interchange
 
-        # Parse segments into claims
-        claims_count = 0
-        for claim in self._parse_segments(segments):
-            yield claim.to_dict()
-            claims_count += 1
-            if limit and claims_count >= limit:
+        Yields:
+            EDI segments in file order
+        """
+        # Buffer at least the fixed-width ISA segment plus its terminator
+        head = stream.read(self.chunk_size)
+        while len(head) <= ISA_SEGMENT_LENGTH:
+            more = stream.read(self.chunk_size)
+            if not more:
                 break
+            head += more
+
+        # Detect separators from ISA segment
+        self._detect_separators(head)
+
+        chunks = chain([head], iter(lambda: stream.read(self.chunk_size), ""))
+        yield from self._tokenize(chunks)
+
+    def parse_parallel(self, file_path: str) -> Iterator[dict[str, Any]]:
+        """Parse a file's transactions in a process pool.
+
+        The separators detected from the ISA segment are passed to every
+        worker. At most two ranges per worker are in flight, so memory stays
+        bounded while results are merged back in file order.
+
+        Args:
+            file_path: Path to EDI file
+
+        Yields:
+            Claim dictionaries in file order
+        """
+        ranges = self.find_transaction_ranges(file_path)
+        if len(ranges) <= 1:
+            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                for claim in self._parse_segments(self.iter_segments(f)):
+                    yield claim.to_dict()
+            return
+
+        separators = (self.element_sep, self.segment_term, self.subelement_sep)
+        workers = min(self.workers, len(ranges))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: deque[Future[list[dict[str, Any]]]] = deque()
+            remaining = iter(ranges)
+            for transaction_range in remaining:
+                pending.append(
+                    executor.submit(
+                        _parse_transaction_range,
+                        file_path,
+                        transaction_range,
+                        separators,
+                    )
+                )
+                if len(pending) >= workers * 2:
+                    break
+
+            while pending:
+                claims = pending.popleft().result()
+                next_range = next(remaining, None)
+                if next_range is not None:
+                    pending.append(
+                        executor.submit(
+                            _parse_transaction_range,
+                            file_path,
+                            next_range,
+                            separators,
+                        )
+                    )
+                yield from claims
+
+    def find_transaction_ranges(
+        self, file_path: str, range_bytes: int = PARALLEL_RANGE_BYTES
+    ) -> list[TransactionRange]:
+        """Scan a file for ST transaction boundaries.
+
+        Detects separators from the ISA segment, then scans the raw bytes
+        for segment terminators followed by ST (and GS, to track whether
+        each functional group is 837P or 837I). Consecutive transactions of
+        the same claim type are grouped into ranges of about range_bytes.
+
+        Args:
+            file_path: Path to EDI file
+            range_bytes: Target size of each returned range
+
+        Returns:
+            Ranges in file order; empty if the file has no ST segments
+        """
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            self._detect_separators(f.read(ISA_SEGMENT_LENGTH * 2))
+
+        term = re.escape(self.segment_term.encode("utf-8"))
+        sep = re.escape(self.element_sep.encode("utf-8"))
+        pattern = re.compile(rb"%s[\r\n\t ]*(GS|ST)%s" % (term, sep))
+
+        starts: list[int] = []
+        group_starts: list[int] = []
+        with open(file_path, "rb") as f:
+            base = 0
+            carry = b""
+            last = -1
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                buf = carry + chunk
+                for match in pattern.finditer(buf):
+                    pos = base + match.start(1)
+                    if pos <= last:
+                        continue
+                    last = pos
+                    if match.group(1) == b"GS":
+                        group_starts.append(pos)
+                    else:
+                        starts.append(pos)
+                keep = min(len(buf), _SCAN_OVERLAP)
+                carry = buf[-keep:]
+                base += len(buf) - keep
+            file_size = f.tell()
+
+            # Claim type of each transaction comes from its enclosing GS
+            group_types: list[tuple[int, str]] = []
+            claim_type = "837P"
+            for pos in group_starts:
+                f.seek(pos)
+                header = f.read(32).decode("utf-8", errors="replace")
+                functional_id = header.split(self.element_sep)[1:2]
+                claim_type = _claim_type_for(
+                    functional_id[0] if functional_id else "", claim_type
+                )
+                group_types.append((pos, claim_type))
+
+        typed_starts = []
+        group_idx = 0
+        claim_type = "837P"
+        for pos in starts:
+            while group_idx < len(group_types) and group_types[group_idx][0] < pos:
+                claim_type = group_types[group_idx][1]
+                group_idx += 1
+            typed_starts.append((pos, claim_type))
+
+        ranges: list[TransactionRange] = []
+        for idx, (pos, claim_type) in enumerate(typed_starts):
+            end = typed_starts[idx + 1][0] if idx + 1 < len(typed_starts) else file_size
+            previous = ranges[-1] if ranges else None
+            if (
+                previous is not None
+                and previous.claim_type == claim_type
+                and previous.end - previous.start < range_bytes
+            ):
+                ranges[-1] = TransactionRange(previous.start, end, claim_type)
+            else:
+                ranges.append(TransactionRange(pos, end, claim_type))
+        return ranges
 
     def _detect_separators(self, content: str) -> None:
         """Detect separators from ISA segment.
@@ -214,25 +451,42 @@ class EDI837Parser:
             self.element_sep = isa[3]
             # Subelement separator is at position 104
             self.subelement_sep = isa[104]
-            # Segment terminator is after the ISA segment
-            if len(content) > isa_match.end():
-                self.segment_term = content[isa_match.end()]
+            # Segment terminator is the last character of the ISA segment
+            self.segment_term = isa[105]
 
     def _split_segments(self, content: str) -> list[EDISegment]:
         """Split content into segment objects."""
-        # Remove newlines and split by segment terminator
-        content = content.replace("\n", "").replace("\r", "")
-        lines = content.split(self.segment_term)
-
-        segments = []
-        for line in lines:
-            line = line.strip()
-            if line:
-                segments.append(EDISegment.parse(line, self.element_sep))
+        return list(self._tokenize([content]))
 
-        return segments
+    def _tokenize(self, chunks: Iterable[str]) -> Iterator[EDISegment]:
+        """Split a sequence of text chunks into segment objects.
 
-    def _parse_segments(self, segments: list[EDISegment]) -> Iterator[ClaimRecord]:
+        A segment cut by a chunk boundary is carried over to the next chunk,
+        so only one partial segment is ever buffered.
+        """
+        # Line breaks are formatting only, unless they are the terminator
+        strip_chars = [c for c in ("\n", "\r") if c != self.segment_term]
+        pending = ""
+        for chunk in chunks:
+            for char in strip_chars:
+                chunk = chunk.replace(char, "")
+            if not chunk:
+                continue
+
+            lines = (pending + chunk).split(self.segment_term)
+            pending = lines.pop()
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield EDISegment.parse(line, self.element_sep)
+
+        pending = pending.strip()
+        if pending:
+            yield EDISegment.parse(pending, self.element_sep)
+
+    def _parse_segments(
+        self, segments: Iterable[EDISegment], claim_type: str = "837P"
+    ) -> Iterator[ClaimRecord]:
         """Parse segments into claim records.
 
         This implements a state machine to track hierarchical loops:
@@ -241,11 +495,15 @@ class EDI837Parser:
         - Loop 2000C: Patient
         - Loop 2300: Claim
         - Loop 2400: Service Line
+
+        Args:
+            segments: Segments in file order
+            claim_type: Claim type until a GS segment sets it (default 837P,
+                professional); used when parsing a range after its GS
         """
         claim: ClaimRecord | None = None
         current_loop = ""
         service_line: dict[str, Any] = {}
-        claim_type = "837P"  # Default to professional
 
         for segment in segments:
             seg_id = segment.id
@@ -373,6 +373,13 @@ S3_CONFIG_SCHEMA = {
             "description": "CSV files have header row",
             "default": True,
         },
+        "parse_workers": {
+            "type": "integer",
+            "title": "EDI Parse Workers",
+            "description": "Processes for parsing large EDI 837 files by transaction (1 = serial, 0 = CPU count)",
+            "default": 1,
+            "minimum": 0,
+        },
         "archive_processed": {
             "type": "boolean",
             "title": "Archive Processed Files",
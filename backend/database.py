@@ -0,0 +1,291 @@
+"""Shared SQLite access layer.
+
+Modules used to open a fresh sqlite3 connection per call in rollback-journal
+mode, so every request paid connection setup and concurrent writers failed
+with "database is locked". All access now goes through one Database per
+file:
+
+- Reads use a connection per thread that stays open. The database runs in
+  WAL mode, so readers never block the writer or each other, and each
+  connection keeps its own prepared statement cache.
+- Writes use a single writer connection. ``write()`` runs a block as one
+  transaction while holding the writer lock. ``submit()`` queues a task for
+  the writer thread, which commits queued tasks in batches.
+
+Usage:
+    db = get_database(DB_PATH)
+    with db.read(row_factory=sqlite3.Row) as conn:
+        row = conn.execute("SELECT ...", params).fetchone()
+    with db.write() as conn:
+        conn.execute("UPDATE ...", params)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
+# How long a connection waits on a lock held by another process
+BUSY_TIMEOUT_MS = 5000
+
+# Most queued write tasks committed in one transaction
+WRITE_BATCH_SIZE = 100
+
+# Applied to every connection; journal_mode is stored in the file itself
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    # Durable at checkpoints; a power loss can only drop the last commits
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",  # KiB, ~16 MB page cache
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+)
+
+RowFactory = Callable[[sqlite3.Cursor, tuple], Any]
+
+_STOP = object()
+
+
+def connect(path: str, query_only: bool = False) -> sqlite3.Connection:
+    """Open a connection with the shared pragmas applied."""
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=CACHED_STATEMENTS,
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    if query_only:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+class Database:
+    """Pooled readers and a single serialized writer for one SQLite file.
+
+    Args:
+        path: Path to the SQLite database file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._generation = 0
+
+        self._write_lock = threading.RLock()
+        self._writer: sqlite3.Connection | None = None
+        self._write_depth = 0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._queue_lock = threading.Lock()
+        self._writer_thread: threading.Thread | None = None
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation == self._generation:
+            return conn
+        conn = connect(self.path, query_only=True)
+        with self._readers_lock:
+            self._readers.append(conn)
+            self._local.conn = conn
+            self._local.generation = self._generation
+        return conn
+
+    def _writer_conn(self) -> sqlite3.Connection:
+        """The writer connection; callers must hold the write lock."""
+        if self._writer is None:
+            self._writer = connect(self.path)
+        return self._writer
+
+    @contextmanager
+    def read(
+        self, row_factory: RowFactory | None = None
+    ) -> Iterator[sqlite3.Connection]:
+        """Borrow this thread's read-only connection.
+
+        Reads see every committed write. Use the connection from ``write()``
+        instead when a block must read its own uncommitted changes.
+        """
+        conn = self._reader()
+        previous = conn.row_factory
+        conn.row_factory = row_factory
+        try:
+            yield conn
+        finally:
+            conn.row_factory = previous
+
+    @contextmanager
+    def write(
+        self, row_factory: RowFactory | None = None
+    ) -> Iterator[sqlite3.Connection]:
+        """Run a block in one transaction on the writer connection.
+
+        Commits when the outermost block exits and rolls back if it raises.
+        Nested blocks in the same thread join the outer transaction.
+        """
+        with self._write_lock:
+            conn = self._writer_conn()
+            previous = conn.row_factory
+            conn.row_factory = row_factory
+            outermost = self._write_depth == 0
+            if outermost and not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            self._write_depth += 1
+            try:
+                yield conn
+                if outermost:
+                    conn.commit()
+            except BaseException:
+                if outermost:
+                    conn.rollback()
+                raise
+            finally:
+                self._write_depth -= 1
+                conn.row_factory = previous
+
+    def submit(self, task: Callable[[sqlite3.Connection], T]) -> Future[T]:
+        """Queue a write for the writer thread.
+
+        Queued tasks are committed together in one transaction. Each task
+        runs in its own savepoint, so a task that raises only undoes its own
+        changes and gets the exception on its future. Tasks must not commit.
+
+        Returns:
+            Future resolved with the task's return value once committed
+        """
+        future: Future[T] = Future()
+        with self._queue_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._drain_writes, name="sqlite-writer", daemon=True
+                )
+                self._writer_thread.start()
+            self._queue.put((task, future))
+        return future
+
+    def flush(self) -> None:
+        """Block until every write queued so far is committed."""
+        if self._writer_thread is not None:
+            self.submit(lambda conn: None).result()
+
+    def _drain_writes(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: list[tuple[Callable, Future]]) -> None:
+        committed: list[tuple[Future, Any]] = []
+        with self._write_lock:
+            conn = self._writer_conn()
+            conn.row_factory = None
+            # write() blocks inside a task join the batch transaction
+            self._write_depth += 1
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for task, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    conn.execute("SAVEPOINT write_task")
+                    try:
+                        value = task(conn)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write_task")
+                        conn.execute("RELEASE write_task")
+                        future.set_exception(e)
+                        continue
+                    conn.execute("RELEASE write_task")
+                    committed.append((future, value))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Queued write batch failed on {self.path}: {e}")
+                if conn.in_transaction:
+                    conn.rollback()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            finally:
+                self._write_depth -= 1
+        for future, value in committed:
+            future.set_result(value)
+
+    def close(self) -> None:
+        """Commit queued writes and close every connection.
+
+        The database stays usable; connections reopen on next use.
+        """
+        with self._queue_lock:
+            thread, self._writer_thread = self._writer_thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join()
+
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+            self._generation += 1
+        for conn in readers:
+            conn.close()
+
+
+_databases: dict[str, Database] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path: str | os.PathLike[str]) -> Database:
+    """Get the shared Database for a file path."""
+    key = os.path.abspath(path)
+    db = _databases.get(key)
+    if db is None:
+        with _databases_lock:
+            db = _databases.get(key)
+            if db is None:
+                db = Database(str(path))
+                _databases[key] = db
+    return db
+
+
+def close_databases() -> None:
+    """Close every shared Database (e.g. at application shutdown)."""
+    with _databases_lock:
+        databases = list(_databases.values())
+    for db in databases:
+        db.close()
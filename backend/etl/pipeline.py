@@ -2,12 +2,18 @@
 
 Coordinates extraction, transformation, and loading of data
 from source connectors to target storage.
+
+Batches either run through the stages one after another, or (pipelined
+mode) overlap: one thread extracts, a pool of workers transforms, and the
+calling thread is the single writer, with bounded queues in between.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import queue
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Callable
@@ -18,6 +24,13 @@ from .stages.load import LoadStage
 
 logger = logging.getLogger(__name__)
 
+# How often blocked pipeline threads wake up to check for shutdown
+_QUEUE_POLL_SECONDS = 0.1
+
+# Queue markers for the pipelined mode
+_DONE = object()
+_STOPPED = object()
+
 
 @dataclass
 class ETLContext:
@@ -58,6 +71,19 @@ class ETLResult:
     stage_results: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class _RunTotals:
+    """Running counts for one pipeline run, shared between stage threads."""
+
+    extracted: int = 0
+    transformed: int = 0
+    loaded: int = 0
+    failed: int = 0
+    watermark: str | None = None
+    cancelled: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
 class ETLPipeline:
     """Pipeline for orchestrating ETL operations.
 
@@ -70,6 +96,9 @@ class ETLPipeline:
         connector: Any,
         db_path: str | None = None,
         batch_size: int = 1000,
+        pipelined: bool = False,
+        transform_workers: int = 2,
+        max_pending_batches: int = 4,
     ) -> None:
         """Initialize the ETL pipeline.
 
@@ -77,10 +106,17 @@ class ETLPipeline:
             connector: Source connector instance
             db_path: Target database path
             batch_size: Records per batch
+            pipelined: Overlap extract, transform and load across threads
+            transform_workers: Transform threads in pipelined mode
+            max_pending_batches: Batches buffered between stages in
+                pipelined mode before the upstream stage blocks
         """
         self.connector = connector
         self.db_path = db_path or os.getenv("DB_PATH", "./data/prototype.db")
         self.batch_size = batch_size
+        self.pipelined = pipelined
+        self.transform_workers = max(1, transform_workers)
+        self.max_pending_batches = max(1, max_pending_batches)
 
         self._extract_stage: ExtractStage | None = None
         self._transform_stage: TransformStage | None = None
@@ -96,6 +132,7 @@ class ETLPipeline:
         table_name: str | None = None,
         mapping_id: str | None = None,
         watermark_column: str | None = None,
+        columnar_transform: bool = False,
     ) -> "ETLPipeline":
         """Configure the pipeline stages.
 
@@ -104,6 +141,7 @@ class ETLPipeline:
             table_name: Target table name (defaults to synced_{data_type})
             mapping_id: Field mapping configuration ID
             watermark_column: Column for incremental sync
+            columnar_transform: Transform each batch column by column
 
         Returns:
             Self for chaining
@@ -119,6 +157,7 @@ class ETLPipeline:
         self._transform_stage = TransformStage(
             mapping_id=mapping_id,
             data_type=data_type,
+            columnar=columnar_transform,
         )
 
         self._load_stage = LoadStage(
@@ -180,11 +219,7 @@ class ETLPipeline:
             "load": {},
         }
 
-        total_extracted = 0
-        total_transformed = 0
-        total_loaded = 0
-        total_failed = 0
-        final_watermark = context.watermark_value
+        totals = _RunTotals(watermark=context.watermark_value)
 
         try:
             # Connect if needed
@@ -193,80 +228,39 @@ class ETLPipeline:
 
             logger.info(f"Starting ETL pipeline for connector {context.connector_id}")
 
-            # Process batches
-            for extraction in self._extract_stage.extract(
-                sync_mode=context.sync_mode,
-                watermark_value=context.watermark_value,
-            ):
-                # Check for cancellation
-                if cancel_check and cancel_check():
-                    logger.info("ETL pipeline cancelled")
-                    context.status = "cancelled"
-                    break
-
-                total_extracted += extraction.total_in_batch
-
-                # Report extract progress
-                if self._on_progress:
-                    self._on_progress("extract", total_extracted, 0)
-
-                # Transform batch
-                transform_result = self._transform_stage.transform(
-                    records=extraction.records,
-                    on_error=lambda r, e: self._handle_stage_error("transform", e),
-                )
-
-                total_transformed += transform_result.transformed_count
-                total_failed += transform_result.failed_count
-
-                # Report transform progress
-                if self._on_progress:
-                    self._on_progress("transform", total_transformed, total_extracted)
-
-                # Load transformed records
-                if transform_result.records:
-                    load_result = self._load_stage.load(
-                        records=transform_result.records,
-                        source_connector_id=context.connector_id,
-                    )
-
-                    total_loaded += (
-                        load_result.inserted_count + load_result.updated_count
-                    )
-                    total_failed += load_result.failed_count
+            if self.pipelined:
+                self._run_pipelined(context, cancel_check, totals)
+            else:
+                self._run_serial(context, cancel_check, totals)
 
-                    # Report load progress
-                    if self._on_progress:
-                        self._on_progress("load", total_loaded, total_transformed)
-
-                # Update watermark
-                if extraction.watermark_value:
-                    final_watermark = extraction.watermark_value
+            if totals.cancelled:
+                logger.info("ETL pipeline cancelled")
+                context.status = "cancelled"
 
             # Update context
-            context.total_extracted = total_extracted
-            context.total_transformed = total_transformed
-            context.total_loaded = total_loaded
-            context.total_failed = total_failed
+            context.total_extracted = totals.extracted
+            context.total_transformed = totals.transformed
+            context.total_loaded = totals.loaded
+            context.total_failed = totals.failed
             context.completed_at = datetime.now(timezone.utc).isoformat()
 
             if context.status != "cancelled":
-                context.status = "success" if total_failed == 0 else "partial"
+                context.status = "success" if totals.failed == 0 else "partial"
 
             logger.info(
-                f"ETL pipeline completed: extracted={total_extracted}, "
-                f"transformed={total_transformed}, loaded={total_loaded}, "
-                f"failed={total_failed}"
+                f"ETL pipeline completed: extracted={totals.extracted}, "
+                f"transformed={totals.transformed}, loaded={totals.loaded}, "
+                f"failed={totals.failed}"
             )
 
             return ETLResult(
                 success=context.status == "success",
                 context=context,
-                extracted_count=total_extracted,
-                transformed_count=total_transformed,
-                loaded_count=total_loaded,
-                failed_count=total_failed,
-                final_watermark=final_watermark,
+                extracted_count=totals.extracted,
+                transformed_count=totals.transformed,
+                loaded_count=totals.loaded,
+                failed_count=totals.failed,
+                final_watermark=totals.watermark,
                 stage_results=stage_results,
             )
 
@@ -283,11 +277,11 @@ class ETLPipeline:
             return ETLResult(
                 success=False,
                 context=context,
-                extracted_count=total_extracted,
-                transformed_count=total_transformed,
-                loaded_count=total_loaded,
-                failed_count=total_failed,
-                final_watermark=final_watermark,
+                extracted_count=totals.extracted,
+                transformed_count=totals.transformed,
+                loaded_count=totals.loaded,
+                failed_count=totals.failed,
+                final_watermark=totals.watermark,
                 error_message=error_msg,
                 stage_results=stage_results,
             )
@@ -299,6 +293,204 @@ class ETLPipeline:
             except Exception:
                 pass
 
+    def _run_serial(
+        self,
+        context: ETLContext,
+        cancel_check: Callable[[], bool] | None,
+        totals: _RunTotals,
+    ) -> None:
+        """Extract, transform and load each batch in turn."""
+        for extraction in self._extract_stage.extract(
+            sync_mode=context.sync_mode,
+            watermark_value=context.watermark_value,
+        ):
+            # Check for cancellation
+            if cancel_check and cancel_check():
+                totals.cancelled = True
+                break
+
+            self._count_extracted(extraction, totals)
+            transform_result = self._transform_batch(extraction, totals)
+            self._load_batch(context, extraction, transform_result, totals)
+
+    def _run_pipelined(
+        self,
+        context: ETLContext,
+        cancel_check: Callable[[], bool] | None,
+        totals: _RunTotals,
+    ) -> None:
+        """Overlap extraction, transformation and loading of batches.
+
+        One thread pulls batches from the connector, transform_workers
+        threads transform them and the calling thread loads them. Bounded
+        queues between the stages apply backpressure, so a slow writer
+        stalls extraction instead of buffering the whole source.
+
+        Batches are loaded in extraction order, so the watermark only ever
+        advances past batches that are fully loaded. cancel_check is polled
+        before each batch is extracted, as in serial mode; batches already
+        in flight are still loaded. Any stage error stops all threads and
+        is raised here.
+        """
+        # Load the saved mapping once, before workers share the stage
+        transform_stage = self._transform_stage
+        if transform_stage.mapping_id and not transform_stage._loaded_mapping:
+            transform_stage.load_mapping()
+
+        workers = self.transform_workers
+        extracted: queue.Queue = queue.Queue(maxsize=self.max_pending_batches)
+        transformed: queue.Queue = queue.Queue(maxsize=self.max_pending_batches)
+        stop = threading.Event()
+        errors: list[Exception] = []
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=_QUEUE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue) -> Any:
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=_QUEUE_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+            return _STOPPED
+
+        def fail(error: Exception) -> None:
+            errors.append(error)
+            stop.set()
+
+        def extract_batches() -> None:
+            try:
+                batches = self._extract_stage.extract(
+                    sync_mode=context.sync_mode,
+                    watermark_value=context.watermark_value,
+                )
+                for seq, extraction in enumerate(batches):
+                    if stop.is_set():
+                        return
+                    if cancel_check and cancel_check():
+                        totals.cancelled = True
+                        break
+                    self._count_extracted(extraction, totals)
+                    if not put(extracted, (seq, extraction)):
+                        return
+            except Exception as e:
+                fail(e)
+                return
+            for _ in range(workers):
+                put(extracted, _DONE)
+
+        def transform_batches() -> None:
+            try:
+                while True:
+                    item = get(extracted)
+                    if item is _STOPPED:
+                        return
+                    if item is _DONE:
+                        break
+                    seq, extraction = item
+                    result = self._transform_batch(extraction, totals)
+                    if not put(transformed, (seq, extraction, result)):
+                        return
+            except Exception as e:
+                fail(e)
+                return
+            put(transformed, _DONE)
+
+        threads = [
+            threading.Thread(target=extract_batches, name="etl-extract", daemon=True)
+        ] + [
+            threading.Thread(
+                target=transform_batches, name=f"etl-transform-{i}", daemon=True
+            )
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            # Single writer: reorder transformed batches by sequence number
+            pending: dict[int, tuple[Any, Any]] = {}
+            next_seq = 0
+            finished_workers = 0
+            while finished_workers < workers:
+                item = get(transformed)
+                if item is _STOPPED:
+                    break
+                if item is _DONE:
+                    finished_workers += 1
+                    continue
+                seq, extraction, result = item
+                pending[seq] = (extraction, result)
+                while next_seq in pending:
+                    extraction, result = pending.pop(next_seq)
+                    self._load_batch(context, extraction, result, totals)
+                    next_seq += 1
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+    def _count_extracted(self, extraction: Any, totals: _RunTotals) -> None:
+        """Record an extracted batch and report extract progress."""
+        with totals.lock:
+            totals.extracted += extraction.total_in_batch
+
+            # Report extract progress
+            if self._on_progress:
+                self._on_progress("extract", totals.extracted, 0)
+
+    def _transform_batch(self, extraction: Any, totals: _RunTotals) -> Any:
+        """Transform one extracted batch and report transform progress."""
+        transform_result = self._transform_stage.transform(
+            records=extraction.records,
+            on_error=lambda r, e: self._handle_stage_error("transform", e),
+        )
+
+        with totals.lock:
+            totals.transformed += transform_result.transformed_count
+            totals.failed += transform_result.failed_count
+
+            # Report transform progress
+            if self._on_progress:
+                self._on_progress("transform", totals.transformed, totals.extracted)
+
+        return transform_result
+
+    def _load_batch(
+        self,
+        context: ETLContext,
+        extraction: Any,
+        transform_result: Any,
+        totals: _RunTotals,
+    ) -> None:
+        """Load one transformed batch, then advance the watermark past it."""
+        if transform_result.records:
+            load_result = self._load_stage.load(
+                records=transform_result.records,
+                source_connector_id=context.connector_id,
+            )
+
+            with totals.lock:
+                totals.loaded += load_result.inserted_count + load_result.updated_count
+                totals.failed += load_result.failed_count
+
+                # Report load progress
+                if self._on_progress:
+                    self._on_progress("load", totals.loaded, totals.transformed)
+
+        # Update watermark
+        if extraction.watermark_value:
+            totals.watermark = extraction.watermark_value
+
     def _handle_stage_error(self, stage: str, error: Exception) -> None:
         """Handle errors from a stage.
 
@@ -339,6 +531,9 @@ def create_pipeline(
     mapping_id: str | None = None,
     watermark_column: str | None = None,
     batch_size: int = 1000,
+    pipelined: bool = False,
+    transform_workers: int = 2,
+    columnar_transform: bool = False,
 ) -> ETLPipeline:
     """Create and configure an ETL pipeline.
 
@@ -350,6 +545,9 @@ def create_pipeline(
         mapping_id: Field mapping configuration ID
         watermark_column: Column for incremental sync
         batch_size: Records per batch
+        pipelined: Overlap extract, transform and load across threads
+        transform_workers: Transform threads in pipelined mode
+        columnar_transform: Transform each batch column by column
 
     Returns:
         Configured ETLPipeline
@@ -358,6 +556,8 @@ def create_pipeline(
         connector=connector,
         db_path=db_path,
         batch_size=batch_size,
+        pipelined=pipelined,
+        transform_workers=transform_workers,
     )
 
     pipeline.configure(
@@ -365,6 +565,7 @@ def create_pipeline(
         table_name=table_name,
         mapping_id=mapping_id,
         watermark_column=watermark_column,
+        columnar_transform=columnar_transform,
     )
 
     return pipeline
@@ -2,7 +2,7 @@
 
 Handles data loading into target storage including:
 - SQLite storage for claims, eligibility, providers
-- Batch inserts with conflict handling
+- Batch upserts (executemany) with conflict handling
 - Audit trail tracking
 """
 
@@ -12,12 +12,18 @@ import json
 import logging
 import sqlite3
 import uuid
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
+from database import get_database
+
 logger = logging.getLogger(__name__)
 
+# Keep IN (...) lookups under SQLite's bound-parameter limit
+EXISTS_QUERY_CHUNK = 500
+
 
 @dataclass
 class LoadResult:
@@ -58,18 +64,14 @@ class LoadStage:
         self.data_type = data_type
         self.primary_key = primary_key
         self.batch_size = batch_size
+        self._columns: frozenset[str] | None = None
+        self._statements: dict[tuple[tuple[str, ...], bool], str] = {}
+        self._db = get_database(db_path)
         self._ensure_tables()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _ensure_tables(self) -> None:
         """Ensure target tables exist."""
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
 
             # Create data table based on data type
@@ -98,10 +100,6 @@ class LoadStage:
                 )
             """)
 
-            conn.commit()
-        finally:
-            conn.close()
-
     def _create_claims_table(self, cursor: sqlite3.Cursor) -> None:
         """Create claims table."""
         cursor.execute(f"""
@@ -239,6 +237,11 @@ class LoadStage:
     ) -> LoadResult:
         """Load records into target storage.
 
+        Records are written with one prepared INSERT ... ON CONFLICT DO
+        UPDATE statement per run of records sharing the same columns, via
+        executemany. Which records already exist is looked up once per
+        batch so inserted/updated counts stay exact.
+
         Args:
             records: Records to load
             source_connector_id: Source connector for tracking
@@ -249,80 +252,88 @@ class LoadStage:
         """
         inserted = 0
         updated = 0
-        failed = 0
-        errors = []
+        errors: list[dict[str, Any]] = []
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             now = datetime.now(timezone.utc).isoformat()
+            columns = self._get_table_columns(cursor)
 
+            # Prepare rows: (record index, record id, column signature, values)
+            prepared: list[tuple[int, Any, tuple[str, ...], list[Any]]] = []
             for idx, record in enumerate(records):
                 try:
                     # Generate ID if not present
                     if self.primary_key not in record or not record[self.primary_key]:
                         record[self.primary_key] = str(uuid.uuid4())
 
-                    record_id = record[self.primary_key]
-
                     # Add metadata
                     record["source_connector_id"] = source_connector_id
                     record["updated_at"] = now
 
-                    # Check if exists
-                    cursor.execute(
-                        f"SELECT {self.primary_key} FROM {self.table_name} WHERE {self.primary_key} = ?",
-                        (record_id,),
-                    )
-                    existing = cursor.fetchone()
-
-                    if existing and upsert:
-                        # Update existing
-                        self._update_record(cursor, record, now)
+                    cols, values = self._prepare_row(record, columns, now)
+                    prepared.append((idx, record[self.primary_key], cols, values))
+                except Exception as e:
+                    errors.append(self._load_error(idx, record, e))
+
+            existing = self._existing_ids(cursor, [row[1] for row in prepared])
+
+            # Classify in record order so a repeated ID within the batch
+            # counts as an update (or is skipped) exactly as it would one
+            # record at a time
+            seen: set[Any] = set()
+            runs: list[tuple[tuple[str, ...], list[tuple[int, bool, list[Any]]]]] = []
+            for idx, record_id, cols, values in prepared:
+                is_update = record_id in existing or record_id in seen
+                if is_update and not upsert:
+                    # Skip existing when not upserting
+                    continue
+                seen.add(record_id)
+                if not is_update:
+                    records[idx]["created_at"] = now
+                # Keep runs in record order so later records win, as before
+                if not runs or runs[-1][0] != cols:
+                    runs.append((cols, []))
+                runs[-1][1].append((idx, is_update, values))
+
+            for cols, rows in runs:
+                statement = self._upsert_statement(cols, upsert)
+                failed_indexes = self._execute_rows(
+                    cursor, statement, rows, records, errors
+                )
+                for idx, is_update, _ in rows:
+                    if idx in failed_indexes:
+                        continue
+                    if is_update:
                         updated += 1
-                    elif not existing:
-                        # Insert new
-                        record["created_at"] = now
-                        self._insert_record(cursor, record)
-                        inserted += 1
                     else:
-                        # Skip existing when not upserting
-                        continue
-
-                except Exception as e:
-                    failed += 1
-                    errors.append(
-                        {
-                            "record_index": idx,
-                            "error": str(e),
-                            "record_id": record.get(self.primary_key),
-                        }
-                    )
-                    logger.debug(f"Load error at index {idx}: {e}")
-
-            conn.commit()
-
-        finally:
-            conn.close()
+                        inserted += 1
 
+        errors.sort(key=lambda error: error["record_index"])
         return LoadResult(
             inserted_count=inserted,
             updated_count=updated,
-            failed_count=failed,
+            failed_count=len(errors),
             errors=errors,
         )
 
-    def _insert_record(self, cursor: sqlite3.Cursor, record: dict[str, Any]) -> None:
-        """Insert a single record.
+    def _prepare_row(
+        self, record: dict[str, Any], columns: frozenset[str], now: str
+    ) -> tuple[tuple[str, ...], list[Any]]:
+        """Map a record onto table columns.
+
+        Keys that are not table columns are kept in raw_data (when the table
+        has one). created_at is always bound so new rows get it; the upsert
+        statement never overwrites it on existing rows.
 
         Args:
-            cursor: Database cursor
-            record: Record to insert
-        """
-        # Get table columns
-        columns = self._get_table_columns(cursor)
+            record: Record to load
+            columns: Table column names
+            now: Current timestamp
 
-        # Filter record to matching columns
+        Returns:
+            (column names, values) for the statement
+        """
         filtered = {}
         extra_data = {}
 
@@ -336,54 +347,107 @@ class LoadStage:
         if "raw_data" in columns and extra_data:
             filtered["raw_data"] = json.dumps(extra_data)
 
-        # Build insert
-        cols = list(filtered.keys())
-        placeholders = ["?" for _ in cols]
+        if "created_at" in columns:
+            filtered.setdefault("created_at", now)
 
-        cursor.execute(
-            f"INSERT INTO {self.table_name} ({', '.join(cols)}) VALUES ({', '.join(placeholders)})",
-            [filtered[c] for c in cols],
-        )
+        cols = tuple(filtered.keys())
+        return cols, [filtered[c] for c in cols]
 
-    def _update_record(
-        self, cursor: sqlite3.Cursor, record: dict[str, Any], now: str
-    ) -> None:
-        """Update an existing record.
+    def _upsert_statement(self, cols: tuple[str, ...], upsert: bool) -> str:
+        """Build (and cache) the insert statement for a column signature.
 
         Args:
-            cursor: Database cursor
-            record: Record to update
-            now: Current timestamp
-        """
-        # Get table columns
-        columns = self._get_table_columns(cursor)
+            cols: Columns bound by the statement, in value order
+            upsert: Update existing rows on primary key conflict
 
-        # Filter record to matching columns
-        filtered = {}
-        extra_data = {}
-
-        for key, value in record.items():
-            if key in columns and key != self.primary_key:
-                filtered[key] = self._serialize_value(value)
-            elif key not in columns:
-                extra_data[key] = value
+        Returns:
+            SQL statement
+        """
+        key = (cols, upsert)
+        statement = self._statements.get(key)
+        if statement is not None:
+            return statement
+
+        statement = (
+            f"INSERT INTO {self.table_name} ({', '.join(cols)}) "
+            f"VALUES ({', '.join('?' for _ in cols)})"
+        )
+        update_cols = [c for c in cols if c not in (self.primary_key, "created_at")]
+        if upsert and update_cols:
+            set_clause = ", ".join(f"{c} = excluded.{c}" for c in update_cols)
+            statement += f" ON CONFLICT({self.primary_key}) DO UPDATE SET {set_clause}"
+        self._statements[key] = statement
+        return statement
+
+    def _execute_rows(
+        self,
+        cursor: sqlite3.Cursor,
+        statement: str,
+        rows: list[tuple[int, bool, list[Any]]],
+        records: list[dict[str, Any]],
+        errors: list[dict[str, Any]],
+    ) -> set[int]:
+        """Run one statement for a run of rows with executemany.
 
-        # Store extra data in raw_data if column exists
-        if "raw_data" in columns and extra_data:
-            filtered["raw_data"] = json.dumps(extra_data)
+        If any row violates a constraint the whole run is rolled back and
+        replayed one row at a time, so only the offending records fail.
 
-        # Build update
-        set_clause = ", ".join([f"{col} = ?" for col in filtered.keys()])
-        values = list(filtered.values())
-        values.append(record[self.primary_key])
+        Returns:
+            Indexes of records that failed
+        """
+        cursor.execute("SAVEPOINT load_batch")
+        try:
+            cursor.executemany(statement, [values for _, _, values in rows])
+            cursor.execute("RELEASE load_batch")
+            return set()
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK TO load_batch")
+
+        failed: set[int] = set()
+        for idx, _, values in rows:
+            try:
+                cursor.execute(statement, values)
+            except sqlite3.Error as e:
+                failed.add(idx)
+                errors.append(self._load_error(idx, records[idx], e))
+        cursor.execute("RELEASE load_batch")
+        return failed
+
+    def _existing_ids(self, cursor: sqlite3.Cursor, record_ids: list[Any]) -> set[Any]:
+        """Look up which record IDs are already stored.
 
-        cursor.execute(
-            f"UPDATE {self.table_name} SET {set_clause} WHERE {self.primary_key} = ?",
-            values,
-        )
+        Args:
+            cursor: Database cursor
+            record_ids: IDs to check
 
-    def _get_table_columns(self, cursor: sqlite3.Cursor) -> set[str]:
-        """Get column names for the table.
+        Returns:
+            Subset of record_ids present in the table
+        """
+        existing: set[Any] = set()
+        unique_ids = list(dict.fromkeys(record_ids))
+        for start in range(0, len(unique_ids), EXISTS_QUERY_CHUNK):
+            chunk = unique_ids[start : start + EXISTS_QUERY_CHUNK]
+            cursor.execute(
+                f"SELECT {self.primary_key} FROM {self.table_name} "
+                f"WHERE {self.primary_key} IN ({', '.join('?' for _ in chunk)})",
+                chunk,
+            )
+            existing.update(row[0] for row in cursor.fetchall())
+        return existing
+
+    def _load_error(
+        self, idx: int, record: dict[str, Any], error: Exception
+    ) -> dict[str, Any]:
+        """Build an error entry for a record that failed to load."""
+        logger.debug(f"Load error at index {idx}: {error}")
+        return {
+            "record_index": idx,
+            "error": str(error),
+            "record_id": record.get(self.primary_key),
+        }
+
+    def _get_table_columns(self, cursor: sqlite3.Cursor) -> frozenset[str]:
+        """Get column names for the table (read once per stage).
 
         Args:
             cursor: Database cursor
@@ -391,8 +455,10 @@ class LoadStage:
         Returns:
             Set of column names
         """
-        cursor.execute(f"PRAGMA table_info({self.table_name})")
-        return {row[1] for row in cursor.fetchall()}
+        if self._columns is None:
+            cursor.execute(f"PRAGMA table_info({self.table_name})")
+            self._columns = frozenset(row[1] for row in cursor.fetchall())
+        return self._columns
 
     def _serialize_value(self, value: Any) -> Any:
         """Serialize a value for storage.
@@ -418,8 +484,11 @@ class LoadStage:
         old_data: dict[str, Any] | None = None,
         new_data: dict[str, Any] | None = None,
         changed_by: str | None = None,
-    ) -> None:
-        """Add an audit trail entry.
+    ) -> Future[None]:
+        """Queue an audit trail entry.
+
+        Entries go through the database's writer queue, which commits
+        queued writes together instead of once per entry.
 
         Args:
             record_id: ID of modified record
@@ -427,29 +496,29 @@ class LoadStage:
             old_data: Previous data
             new_data: New data
             changed_by: User who made change
+
+        Returns:
+            Future that resolves once the entry is committed
+        """
+        row = (
+            str(uuid.uuid4()),
+            record_id,
+            operation,
+            json.dumps(old_data) if old_data else None,
+            json.dumps(new_data) if new_data else None,
+            datetime.now(timezone.utc).isoformat(),
+            changed_by,
+        )
+        statement = f"""
+            INSERT INTO {self.table_name}_audit
+            (id, record_id, operation, old_data, new_data, changed_at, changed_by)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
         """
-        conn = self._get_conn()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                f"""
-                INSERT INTO {self.table_name}_audit
-                (id, record_id, operation, old_data, new_data, changed_at, changed_by)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(uuid.uuid4()),
-                    record_id,
-                    operation,
-                    json.dumps(old_data) if old_data else None,
-                    json.dumps(new_data) if new_data else None,
-                    datetime.now(timezone.utc).isoformat(),
-                    changed_by,
-                ),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+
+        def insert(conn: sqlite3.Connection) -> None:
+            conn.execute(statement, row)
+
+        return self._db.submit(insert)
 
     def get_record_count(self) -> int:
         """Get total record count.
@@ -457,22 +526,15 @@ class LoadStage:
         Returns:
             Number of records
         """
-        conn = self._get_conn()
-        try:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(f"SELECT COUNT(*) FROM {self.table_name}")
             row = cursor.fetchone()
             return row[0] if row else 0
-        finally:
-            conn.close()
 
     def truncate(self) -> None:
         """Delete all records from the table."""
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(f"DELETE FROM {self.table_name}")
-            conn.commit()
             logger.info(f"Truncated table {self.table_name}")
-        finally:
-            conn.close()
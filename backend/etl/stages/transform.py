@@ -5,6 +5,11 @@ Handles data transformation including:
 - Data type conversions
 - Value normalization
 - OMOP CDM mapping integration
+
+Batches are transformed row by row, or (columnar mode) column by column:
+the batch is split into one list per mapped source field and each
+mapping's default, required check, transform and normalization run over
+its whole column, with failures still reported per row.
 """
 
 from __future__ import annotations
@@ -16,6 +21,9 @@ from typing import Any, Callable
 
 logger = logging.getLogger(__name__)
 
+# Values _normalize_value returns unchanged; skipped in columnar mode
+_PLAIN_TYPES = (str, int, float, bool)
+
 
 @dataclass
 class TransformationResult:
@@ -50,6 +58,7 @@ class TransformStage:
         field_mappings: list[FieldMapping] | None = None,
         mapping_id: str | None = None,
         data_type: str | None = None,
+        columnar: bool = False,
     ) -> None:
         """Initialize the transform stage.
 
@@ -57,10 +66,12 @@ class TransformStage:
             field_mappings: List of field mapping configurations
             mapping_id: ID of saved mapping from mapping module
             data_type: Data type (claims, eligibility, providers)
+            columnar: Apply field mappings column by column per batch
         """
         self.field_mappings = field_mappings or []
         self.mapping_id = mapping_id
         self.data_type = data_type
+        self.columnar = columnar
         self._loaded_mapping: dict[str, Any] | None = None
 
     def load_mapping(self) -> None:
@@ -132,40 +143,169 @@ class TransformStage:
         if self.mapping_id and not self._loaded_mapping:
             self.load_mapping()
 
+        if self.columnar and self.field_mappings:
+            return self._transform_columnar(records, on_error)
+
         transformed = []
         failed = 0
         errors = []
+        source_fields = {m.source_field for m in self.field_mappings}
 
         for idx, record in enumerate(records):
             try:
-                transformed_record = self._transform_record(record)
+                transformed_record = self._transform_record(record, source_fields)
                 transformed.append(transformed_record)
             except Exception as e:
                 failed += 1
-                error_info = {
-                    "record_index": idx,
-                    "error": str(e),
-                    "record_preview": self._preview_record(record),
-                }
-                errors.append(error_info)
+                errors.append(self._record_error(idx, record, e, on_error))
+
+        return TransformationResult(
+            records=transformed,
+            transformed_count=len(transformed),
+            failed_count=failed,
+            errors=errors,
+        )
+
+    def _record_error(
+        self,
+        idx: int,
+        record: dict[str, Any],
+        error: Exception,
+        on_error: Callable[[dict[str, Any], Exception], None] | None,
+    ) -> dict[str, Any]:
+        """Report a record that failed to transform."""
+        if on_error:
+            on_error(record, error)
+
+        logger.debug(f"Transform error at index {idx}: {error}")
 
-                if on_error:
-                    on_error(record, e)
+        return {
+            "record_index": idx,
+            "error": str(error),
+            "record_preview": self._preview_record(record),
+        }
 
-                logger.debug(f"Transform error at index {idx}: {e}")
+    def _transform_columnar(
+        self,
+        records: list[dict[str, Any]],
+        on_error: Callable[[dict[str, Any], Exception], None] | None = None,
+    ) -> TransformationResult:
+        """Transform a batch column by column.
+
+        Produces the same records and errors as the row-by-row path: each
+        mapping's column is read with its default, checked, transformed and
+        normalized in one pass, and a row fails with the first error of
+        its earliest mapping, as it would row by row.
+
+        Args:
+            records: Source records to transform
+            on_error: Optional callback for transformation errors
+
+        Returns:
+            TransformationResult with transformed records
+        """
+        row_errors: dict[int, Exception] = {}
+        targets: list[str] = []
+        columns: list[list[Any]] = []
+
+        for mapping in self.field_mappings:
+            source, default = mapping.source_field, mapping.default_value
+            column = [record.get(source, default) for record in records]
+
+            # Check required fields
+            if mapping.required:
+                for idx, value in enumerate(column):
+                    if value is None and idx not in row_errors:
+                        row_errors[idx] = ValueError(
+                            f"Required field {source} is missing"
+                        )
+
+            # Apply transform if provided
+            if mapping.transform:
+                column = self._transform_column(mapping.transform, column, row_errors)
+
+            # Normalize values
+            targets.append(mapping.target_field)
+            columns.append(
+                [
+                    value
+                    if value is None or type(value) in _PLAIN_TYPES
+                    else self._normalize_value(value)
+                    for value in column
+                ]
+            )
+
+        transformed = []
+        passthrough = not self.mapping_id
+        source_fields = {m.source_field for m in self.field_mappings}
+
+        for idx, (record, values) in enumerate(zip(records, zip(*columns))):
+            if idx in row_errors:
+                continue
+            result = dict(zip(targets, values))
+
+            # Add unmapped fields if no strict mapping
+            if passthrough:
+                for key, value in record.items():
+                    if key not in source_fields and key not in result:
+                        result[key] = self._normalize_value(value)
+
+            transformed.append(result)
+
+        errors = [
+            self._record_error(idx, records[idx], row_errors[idx], on_error)
+            for idx in sorted(row_errors)
+        ]
 
         return TransformationResult(
             records=transformed,
             transformed_count=len(transformed),
-            failed_count=failed,
+            failed_count=len(errors),
             errors=errors,
         )
 
-    def _transform_record(self, record: dict[str, Any]) -> dict[str, Any]:
+    def _transform_column(
+        self,
+        transform: Callable[[Any], Any],
+        column: list[Any],
+        row_errors: dict[int, Exception],
+    ) -> list[Any]:
+        """Apply a transform to every non-None value of a column.
+
+        Built-in transforms have whole-column implementations. If the
+        column raises, it is redone value by value so only the offending
+        rows fail.
+        """
+        column_transform = COLUMN_TRANSFORMS.get(transform)
+        try:
+            if column_transform is not None:
+                return column_transform(column)
+            return [transform(value) if value is not None else None for value in column]
+        except Exception:
+            pass
+
+        result = []
+        for idx, value in enumerate(column):
+            if value is None:
+                result.append(None)
+                continue
+            try:
+                result.append(transform(value))
+            except Exception as e:
+                row_errors.setdefault(idx, e)
+                result.append(None)
+        return result
+
+    def _transform_record(
+        self,
+        record: dict[str, Any],
+        source_fields: set[str] | None = None,
+    ) -> dict[str, Any]:
         """Transform a single record.
 
         Args:
             record: Source record
+            source_fields: Mapped source field names (computed if omitted)
 
         Returns:
             Transformed record
@@ -194,10 +334,11 @@ class TransformStage:
 
         # Add unmapped fields if no strict mapping
         if not self.mapping_id:
+            if source_fields is None:
+                source_fields = {m.source_field for m in self.field_mappings}
             for key, value in record.items():
-                if key not in [m.source_field for m in self.field_mappings]:
-                    if key not in result:
-                        result[key] = self._normalize_value(value)
+                if key not in source_fields and key not in result:
+                    result[key] = self._normalize_value(value)
 
         return result
 
@@ -327,3 +468,39 @@ def to_decimal(value: Any, precision: int = 2) -> float | None:
         return round(float(value), precision)
     except (ValueError, TypeError):
         return None
+
+
+# Whole-column versions of the transforms above for columnar mode. Each
+# leaves None as None, matching the row path which skips None values.
+def _uppercase_column(values: list[Any]) -> list[Any]:
+    return [None if v is None else (str(v).upper() if v else "") for v in values]
+
+
+def _lowercase_column(values: list[Any]) -> list[Any]:
+    return [None if v is None else (str(v).lower() if v else "") for v in values]
+
+
+def _trim_column(values: list[Any]) -> list[Any]:
+    return [None if v is None else (str(v).strip() if v else "") for v in values]
+
+
+def _date_column(values: list[Any]) -> list[Any]:
+    return [
+        None
+        if not v
+        else (v.strftime("%Y-%m-%d") if isinstance(v, datetime) else str(v))
+        for v in values
+    ]
+
+
+def _decimal_column(values: list[Any]) -> list[Any]:
+    return [None if v is None else to_decimal(v) for v in values]
+
+
+COLUMN_TRANSFORMS: dict[Callable[[Any], Any], Callable[[list[Any]], list[Any]]] = {
+    to_uppercase: _uppercase_column,
+    to_lowercase: _lowercase_column,
+    trim_whitespace: _trim_column,
+    to_date: _date_column,
+    to_decimal: _decimal_column,
+}
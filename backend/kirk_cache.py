@@ -0,0 +1,206 @@
+"""Persistent cache of Kirk analyses for repeated prompts.
+
+A Kirk explanation is a multi-second, paid Claude call, and the same claim
+is often analyzed more than once: resubmissions, re-run batches, retried
+jobs and reprocessed uploads. Those get the same analysis, so it is stored
+once in SQLite and reused until it expires.
+
+The cache key is a SHA-256 over the exact user prompt build_kirk_prompt()
+produces, plus the model settings and system prompt. Everything the model
+sees is in the key, so a cached explanation is only ever served for a
+prompt identical to the one it was written for; it can never carry another
+claim's amounts, provider or patient details.
+
+Entries expire after KIRK_CACHE_TTL_HOURS and the least recently used are
+evicted beyond KIRK_CACHE_MAX_ENTRIES.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from config import DB_PATH, KIRK_CACHE_MAX_ENTRIES, KIRK_CACHE_TTL_HOURS
+from database import get_database
+from kirk_config import KIRK_SYSTEM_PROMPT, KirkConfig
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_cache_key(user_prompt: str, config: KirkConfig) -> str:
+    """Hash of everything sent to the model for an analysis."""
+    payload = {
+        "prompt": user_prompt,
+        "model": [config.model, config.max_tokens, config.temperature],
+        "max_recommendations": config.max_recommendations,
+        "system_prompt": KIRK_SYSTEM_PROMPT,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class KirkAnalysisCache:
+    """TTL + LRU cache of Kirk results in a SQLite table.
+
+    Args:
+        db_path: SQLite database holding the kirk_analysis_cache table
+        ttl_seconds: Age after which an entry is no longer served
+        max_entries: Entries kept; the least recently used are evicted
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float, max_entries: int) -> None:
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._db = get_database(db_path)
+        self._lock = threading.Lock()
+        self._table_ready = False
+        self._counts = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def _ensure_table(self) -> None:
+        if self._table_ready:
+            return
+        with self._db.write() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS kirk_analysis_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_kirk_cache_last_used "
+                "ON kirk_analysis_cache(last_used_at)"
+            )
+        self._table_ready = True
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached result for key, or None on a miss."""
+        self._ensure_table()
+        with self._db.read() as conn:
+            row = conn.execute(
+                "SELECT result, created_at FROM kirk_analysis_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+
+        now = time.time()
+        if row is None:
+            self._count("misses")
+            return None
+        if now - row[1] > self.ttl_seconds:
+            self._count("misses")
+            self._count("expired")
+            self._db.submit(
+                lambda conn: conn.execute(
+                    "DELETE FROM kirk_analysis_cache WHERE cache_key = ?", (key,)
+                )
+            )
+            return None
+
+        self._count("hits")
+        # Recency only steers eviction, so record it off the request path
+        self._db.submit(
+            lambda conn: conn.execute(
+                "UPDATE kirk_analysis_cache "
+                "SET last_used_at = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                (now, key),
+            )
+        )
+        return json.loads(row[0])
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        """Store result under key, evicting the least recently used overflow."""
+        self._ensure_table()
+        now = time.time()
+        with self._db.write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO kirk_analysis_cache "
+                "(cache_key, result, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result, default=str), now, now),
+            )
+            evicted = conn.execute(
+                """
+                DELETE FROM kirk_analysis_cache WHERE cache_key IN (
+                    SELECT cache_key FROM kirk_analysis_cache
+                    ORDER BY last_used_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+        self._count("stores")
+        if evicted > 0:
+            self._count("evictions", evicted)
+
+    def clear(self) -> int:
+        """Remove every entry. Returns the number removed."""
+        self._ensure_table()
+        with self._db.write() as conn:
+            return conn.execute("DELETE FROM kirk_analysis_cache").rowcount
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters since startup and the current entry count."""
+        self._ensure_table()
+        with self._db.read() as conn:
+            entries = conn.execute(
+                "SELECT COUNT(*) FROM kirk_analysis_cache"
+            ).fetchone()[0]
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "entries": entries,
+            "hit_rate": counts["hits"] / lookups if lookups else 0.0,
+            "ttl_hours": self.ttl_seconds / 3600,
+            "max_entries": self.max_entries,
+        }
+
+
+_cache: KirkAnalysisCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> KirkAnalysisCache:
+    """Get the process-wide Kirk analysis cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = KirkAnalysisCache(
+                DB_PATH, KIRK_CACHE_TTL_HOURS * 3600, KIRK_CACHE_MAX_ENTRIES
+            )
+        return _cache
+
+
+def lookup_analysis(key: str) -> dict[str, Any] | None:
+    """Cache lookup that treats a database error as a miss."""
+    try:
+        return get_analysis_cache().get(key)
+    except sqlite3.Error as e:
+        logger.warning(f"Kirk cache lookup failed: {e}")
+        return None
+
+
+def store_analysis(key: str, result: dict[str, Any]) -> None:
+    """Cache a result, logging rather than raising on a database error."""
+    try:
+        get_analysis_cache().put(key, result)
+    except sqlite3.Error as e:
+        logger.warning(f"Kirk cache store failed: {e}")
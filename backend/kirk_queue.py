@@ -0,0 +1,80 @@
+"""Background queue for Kirk claim explanations.
+
+Kirk analysis is a blocking Claude API call that takes seconds per claim.
+When analysis runs in async mode, /api/analyze/{job_id} persists and
+returns the rules-engine result straight away and hands the Kirk call to
+this queue. A small thread pool bounds how many Claude calls run at once;
+each task stores its explanation on the result row when it finishes, and
+clients poll the result for its kirk_status.
+
+Queued explanations live in process memory: a job still pending when its
+worker process exits stays pending and can be re-run by analyzing the
+claim again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Kirk explanation states stored in results.kirk_status
+KIRK_STATUS_PENDING = "pending"
+KIRK_STATUS_COMPLETED = "completed"
+KIRK_STATUS_FAILED = "failed"
+KIRK_STATUS_SKIPPED = "skipped"  # Scored without an explanation (batch)
+
+
+class KirkAnalysisQueue:
+    """Runs Kirk explanation tasks on a bounded thread pool.
+
+    Args:
+        max_concurrency: Maximum Claude calls in flight at once
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight: set[str] = set()
+
+    def submit(self, job_id: str, task: Callable[[], None]) -> Future:
+        """Queue a task that computes and stores the explanation for job_id."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="kirk",
+                )
+            self._in_flight.add(job_id)
+            return self._executor.submit(self._run, job_id, task)
+
+    def _run(self, job_id: str, task: Callable[[], None]) -> None:
+        try:
+            task()
+        except Exception:
+            logger.exception(f"Kirk analysis task failed for job {job_id}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(job_id)
+
+    def is_pending(self, job_id: str) -> bool:
+        """Whether job_id is queued or running in this process."""
+        with self._lock:
+            return job_id in self._in_flight
+
+    @property
+    def pending_count(self) -> int:
+        """Number of queued or running explanations."""
+        with self._lock:
+            return len(self._in_flight)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool, by default after finishing queued explanations."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
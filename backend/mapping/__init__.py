@@ -32,6 +32,7 @@ Usage:
 
 from .mapper import (
     FieldMapper,
+    MappingPlan,
     MappingResult,
     normalize_claim,
     normalize_claim_with_review,
@@ -67,6 +68,7 @@ from .persistence import (
 __all__ = [
     # Mapper
     "FieldMapper",
+    "MappingPlan",
     "MappingResult",
     "normalize_claim",
     "normalize_claim_with_review",
@@ -4,6 +4,12 @@ This module provides the FieldMapper class that normalizes incoming claim data
 from various formats (EDI 837P/I, CSV, payer-specific) to a canonical OMOP CDM
 schema that the rules engine can process consistently.
 
+Field resolution (aliases, custom mappings, case transformations) depends
+only on the shape of a claim, and claims from one connector share a shape.
+The mapper therefore compiles a MappingPlan per (claim shape, custom
+mapping) that maps source paths straight to canonical fields, caches it,
+and applies it to every later claim of that shape in a single pass.
+
 Usage:
     mapper = FieldMapper()
     normalized = mapper.transform(raw_claim)
@@ -11,14 +17,41 @@ Usage:
 
 from __future__ import annotations
 
-import copy
 import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 from .omop_schema import ALIAS_LOOKUP, OMOP_CLAIMS_SCHEMA
 
 logger = logging.getLogger(__name__)
 
+# Compiled plans kept across FieldMapper instances (one per claim shape
+# and custom mapping)
+PLAN_CACHE_SIZE = 512
+
+# Value kinds recorded in a claim shape; nested dicts are recorded as their
+# own shape tuple
+_SCALAR = "scalar"
+_LIST = "list"
+_LIST_OF_DICTS = "list_of_dicts"
+
+# Line item source fields -> canonical OMOP fields (first match wins)
+ITEM_FIELD_MAPPING = {
+    "procedure_code": "procedure_source_value",
+    "cpt_code": "procedure_source_value",
+    "hcpcs_code": "procedure_source_value",
+    "quantity": "quantity",
+    "units": "quantity",
+    "modifier": "modifier_source_value",
+    "modifier_1": "modifier_source_value",
+    "line_amount": "line_charge",
+    "charge_amount": "line_charge",
+    "diagnosis_code": "condition_source_value",
+}
+
 
 class MappingResult:
     """Result of a field mapping operation with confidence tracking."""
@@ -47,6 +80,102 @@ class MappingResult:
             self.unmapped_fields.append(field_name)
 
 
+@dataclass(frozen=True)
+class MappingPlan:
+    """Compiled field resolution for one claim shape.
+
+    Attributes:
+        fields: (canonical field, path of keys into the raw claim) pairs
+        sources: (canonical field, flattened source field name) pairs
+        unmapped: Flattened source fields with no canonical field
+    """
+
+    fields: tuple[tuple[str, tuple[str, ...]], ...]
+    sources: tuple[tuple[str, str], ...]
+    unmapped: tuple[str, ...]
+
+    def apply(self, raw_claim: dict[str, Any]) -> dict[str, Any]:
+        """Read every mapped field from a claim of this plan's shape."""
+        mapped: dict[str, Any] = {}
+        for canonical, path in self.fields:
+            value: Any = raw_claim
+            for key in path:
+                value = value[key]
+            mapped[canonical] = value
+        return mapped
+
+
+_plan_cache: OrderedDict[tuple, MappingPlan] = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def clear_plan_cache() -> None:
+    """Drop all compiled mapping plans (e.g. after alias changes)."""
+    with _plan_cache_lock:
+        _plan_cache.clear()
+
+
+def claim_shape(data: dict[str, Any]) -> tuple:
+    """Hashable description of a claim's keys and value kinds.
+
+    Two claims with the same shape flatten to the same source fields, so
+    they resolve to the same mapping plan.
+    """
+    shape = []
+    for key, value in data.items():
+        if isinstance(value, dict):
+            shape.append((key, claim_shape(value)))
+        elif isinstance(value, list):
+            kind = _LIST_OF_DICTS if value and isinstance(value[0], dict) else _LIST
+            shape.append((key, kind))
+        else:
+            shape.append((key, _SCALAR))
+    return tuple(shape)
+
+
+def _flatten_shape(
+    shape: tuple,
+    parent_key: str = "",
+    parent_path: tuple[str, ...] = (),
+    sep: str = ".",
+) -> list[tuple[str, tuple[str, ...]]]:
+    """Flattened source field names and their paths, as _flatten_dict."""
+    items: list[tuple[str, tuple[str, ...]]] = []
+
+    for key, kind in shape:
+        new_key = f"{parent_key}{sep}{key}" if parent_key else key
+        path = (*parent_path, key)
+
+        if isinstance(kind, tuple):
+            # Nested dict, plus its scalar leaves without the parent prefix
+            items.extend(_flatten_shape(kind, new_key, path, sep))
+            for nested_key, nested_kind in kind:
+                if nested_kind == _SCALAR:
+                    items.append((nested_key, (*path, nested_key)))
+        elif kind == _LIST_OF_DICTS:
+            items.append((new_key, path))
+        else:
+            items.append((new_key, path))
+            if parent_key:
+                items.append((key, path))
+
+    return items
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _item_plan(keys: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    """(canonical field, source key) pairs for a line item with these keys."""
+    plan: dict[str, str] = {}
+    for source_key, canonical_key in ITEM_FIELD_MAPPING.items():
+        if source_key in keys and canonical_key not in plan:
+            plan[canonical_key] = source_key
+    # Copy any already-canonical fields
+    for key in keys:
+        if key in OMOP_CLAIMS_SCHEMA and key not in plan:
+            plan[key] = key
+    return tuple(plan.items())
+
+
 class FieldMapper:
     """Transforms incoming claim data to OMOP CDM canonical schema.
 
@@ -83,6 +212,7 @@ class FieldMapper:
         self.semantic_threshold = semantic_threshold
         # Build a lowercase lookup for custom mappings: source_field.lower() -> canonical
         self._custom_lookup = {k.lower(): v for k, v in self.custom_mapping.items()}
+        self._custom_key = tuple(sorted(self._custom_lookup.items()))
         # Track semantic matches for review
         self._semantic_matches: dict[str, tuple[str, float]] = {}
 
@@ -98,18 +228,13 @@ class FieldMapper:
         Raises:
             ValueError: If strict_mode is True and required fields are missing
         """
-        result = MappingResult()
+        plan = self.get_plan(raw_claim)
 
-        # Flatten nested structures for easier mapping
-        flat_data = self._flatten_dict(raw_claim)
-
-        # Process each field in the input
-        for source_field, value in flat_data.items():
-            canonical = self._resolve_field(source_field)
-            if canonical:
-                result.add_mapping(canonical, value, source_field)
-            else:
-                result.add_unmapped(source_field)
+        result = MappingResult()
+        result.mapped_fields = plan.apply(raw_claim)
+        result.mapping_sources = dict(plan.sources)
+        result.confidence_scores = dict.fromkeys(result.mapped_fields, 1.0)
+        result.unmapped_fields = list(plan.unmapped)
 
         # Build the normalized output
         normalized = self._build_normalized_claim(result, raw_claim)
@@ -130,6 +255,60 @@ class FieldMapper:
 
         return normalized
 
+    def get_plan(self, raw_claim: dict[str, Any]) -> MappingPlan:
+        """Get the compiled mapping plan for a claim's shape.
+
+        Plans are cached per (shape, custom mapping). Semantic matching
+        depends on the embedding model, so those plans are compiled per
+        claim and not cached.
+        """
+        shape = claim_shape(raw_claim)
+        if self.use_semantic_matching:
+            return self.compile_plan(shape)
+
+        key = (shape, self._custom_key)
+        with _plan_cache_lock:
+            plan = _plan_cache.get(key)
+            if plan is not None:
+                _plan_cache.move_to_end(key)
+                return plan
+
+        plan = self.compile_plan(shape)
+        with _plan_cache_lock:
+            _plan_cache[key] = plan
+            if len(_plan_cache) > PLAN_CACHE_SIZE:
+                _plan_cache.popitem(last=False)
+        return plan
+
+    def compile_plan(self, shape: tuple) -> MappingPlan:
+        """Resolve every source field of a claim shape once.
+
+        Args:
+            shape: Claim shape from claim_shape()
+
+        Returns:
+            MappingPlan equivalent to resolving each flattened field
+        """
+        # Later duplicates of a flattened name win, as in a dict
+        flat_paths = dict(_flatten_shape(shape))
+
+        fields: dict[str, tuple[str, ...]] = {}
+        sources: dict[str, str] = {}
+        unmapped: list[str] = []
+        for source_field, path in flat_paths.items():
+            canonical = self._resolve_field(source_field)
+            if canonical:
+                fields[canonical] = path
+                sources[canonical] = source_field
+            elif source_field not in unmapped:
+                unmapped.append(source_field)
+
+        return MappingPlan(
+            fields=tuple(fields.items()),
+            sources=tuple(sources.items()),
+            unmapped=tuple(unmapped),
+        )
+
     def _resolve_field(self, field_name: str) -> str | None:
         """Resolve a source field name to its canonical OMOP field.
 
@@ -355,31 +534,12 @@ class FieldMapper:
             if not isinstance(item, dict):
                 continue
 
-            normalized_item: dict[str, Any] = {}
-
-            # Map item fields
-            item_mappings = {
-                "procedure_code": "procedure_source_value",
-                "cpt_code": "procedure_source_value",
-                "hcpcs_code": "procedure_source_value",
-                "quantity": "quantity",
-                "units": "quantity",
-                "modifier": "modifier_source_value",
-                "modifier_1": "modifier_source_value",
-                "line_amount": "line_charge",
-                "charge_amount": "line_charge",
-                "diagnosis_code": "condition_source_value",
+            # Line items of one claim share keys, so this is one cached plan
+            normalized_item = {
+                canonical_key: item[source_key]
+                for canonical_key, source_key in _item_plan(tuple(item))
             }
 
-            for source_key, canonical_key in item_mappings.items():
-                if source_key in item and canonical_key not in normalized_item:
-                    normalized_item[canonical_key] = item[source_key]
-
-            # Copy any already-canonical fields
-            for key, value in item.items():
-                if key in OMOP_CLAIMS_SCHEMA and key not in normalized_item:
-                    normalized_item[key] = value
-
             if normalized_item:
                 normalized_items.append(normalized_item)
 
@@ -468,9 +628,12 @@ def denormalize_for_rules(normalized_claim: dict[str, Any]) -> dict[str, Any]:
     (procedure_code, modifier, line_amount) rather than OMOP CDM field names
     (procedure_source_value, modifier_source_value, line_charge).
 
-    This function creates a deep copy of the normalized claim with both field name
+    This function returns a view of the normalized claim with both field name
     variants present, allowing rules to use their expected field names while
-    preserving the canonical OMOP structure.
+    preserving the canonical OMOP structure. The claim, its member/provider
+    dicts and line items are copied one level deep so adding names never
+    touches the normalized claim; other values are shared, as rules only
+    read them.
 
     Args:
         normalized_claim: Claim normalized to OMOP CDM schema
@@ -478,8 +641,10 @@ def denormalize_for_rules(normalized_claim: dict[str, Any]) -> dict[str, Any]:
     Returns:
         Claim with rules-engine-compatible field names added
     """
-    # Use deepcopy to ensure nested dicts (provider, member, etc.) are not shared
-    denormalized = copy.deepcopy(normalized_claim)
+    denormalized = dict(normalized_claim)
+    for nested in ("member", "provider"):
+        if isinstance(denormalized.get(nested), dict):
+            denormalized[nested] = dict(denormalized[nested])
 
     # Add rules-engine field names at claim level
     for omop_field, rules_field in RULES_FIELD_MAPPING.items():
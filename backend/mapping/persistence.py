@@ -13,13 +13,14 @@ from __future__ import annotations
 
 import json
 import logging
-import sqlite3
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
+from database import get_database
+
 logger = logging.getLogger(__name__)
 
 
@@ -134,13 +135,12 @@ class MappingStore:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._db = get_database(db_path)
         self._init_tables()
 
     def _init_tables(self) -> None:
         """Initialize database tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Enable WAL mode for better concurrent read performance
-            conn.execute("PRAGMA journal_mode=WAL")
+        with self._db.write() as conn:
             cursor = conn.cursor()
 
             # Schema mappings table
@@ -186,7 +186,6 @@ class MappingStore:
                 ON mapping_audit_log(mapping_id, timestamp DESC)
             """)
 
-            conn.commit()
             logger.info("Mapping persistence tables initialized")
 
     def save_mapping(
@@ -238,7 +237,7 @@ class MappingStore:
             created_by=created_by,
         )
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.write() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -258,7 +257,6 @@ class MappingStore:
                     mapping.created_by,
                 ),
             )
-            conn.commit()
 
         # Log the creation
         self._log_action(
@@ -289,7 +287,7 @@ class MappingStore:
         Returns:
             SchemaMapping or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             cursor = conn.cursor()
 
             if version is not None:
@@ -326,7 +324,7 @@ class MappingStore:
         Returns:
             SchemaMapping or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM schema_mappings WHERE id = ?", (mapping_id,))
             row = cursor.fetchone()
@@ -350,7 +348,7 @@ class MappingStore:
         Returns:
             List of SchemaMapping objects
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             cursor = conn.cursor()
 
             if status:
@@ -391,7 +389,7 @@ class MappingStore:
         """
         now = datetime.now(timezone.utc).isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.write() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -401,7 +399,6 @@ class MappingStore:
                 """,
                 (MappingStatus.APPROVED.value, now, approved_by, mapping_id),
             )
-            conn.commit()
 
             if cursor.rowcount == 0:
                 return None
@@ -427,7 +424,7 @@ class MappingStore:
         Returns:
             Updated SchemaMapping or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.write() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -437,7 +434,6 @@ class MappingStore:
                 """,
                 (MappingStatus.REJECTED.value, mapping_id),
             )
-            conn.commit()
 
             if cursor.rowcount == 0:
                 return None
@@ -468,7 +464,7 @@ class MappingStore:
         Returns:
             List of AuditLogEntry objects
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -506,7 +502,7 @@ class MappingStore:
         Returns:
             Updated SchemaMapping or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.write() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -516,7 +512,6 @@ class MappingStore:
                 """,
                 (MappingStatus.ARCHIVED.value, mapping_id),
             )
-            conn.commit()
 
             if cursor.rowcount == 0:
                 return None
@@ -542,7 +537,7 @@ class MappingStore:
         Returns:
             Number of mappings archived
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.write() as conn:
             cursor = conn.cursor()
 
             # Get all non-archived mappings for this schema, ordered by version
@@ -577,8 +572,6 @@ class MappingStore:
                 )
                 archived_count += 1
 
-            conn.commit()
-
         if archived_count > 0:
             logger.info(f"Archived {archived_count} old versions of {source_schema_id}")
 
@@ -586,7 +579,7 @@ class MappingStore:
 
     def _get_next_version(self, source_schema_id: str) -> int:
         """Get the next version number for a source schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -609,7 +602,7 @@ class MappingStore:
         log_id = str(uuid.uuid4())
         now = datetime.now(timezone.utc).isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.write() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -619,7 +612,6 @@ class MappingStore:
                 """,
                 (log_id, mapping_id, action.value, actor, now, json.dumps(details)),
             )
-            conn.commit()
 
     def _row_to_mapping(self, row: tuple) -> SchemaMapping:
         """Convert a database row to a SchemaMapping object."""
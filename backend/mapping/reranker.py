@@ -11,6 +11,10 @@ Usage:
         sample_values=["MRN-12345", "MRN-67890"]
     )
     # Returns: {"target_field": "person_id", "confidence": 92, "reasoning": "..."}
+
+    # A whole source schema: fields are packed several to a prompt and the
+    # prompts sent concurrently, pausing every worker on a rate limit
+    results = reranker.batch_rerank(mappings)
 """
 
 from __future__ import annotations
@@ -18,7 +22,11 @@ from __future__ import annotations
 import json
 import logging
 import os
+import random
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -36,6 +44,29 @@ LOW_CONFIDENCE_THRESHOLD = int(
     os.getenv("MAPPING_LOW_CONFIDENCE", "50")
 )  # Route to human review
 
+# Batch reranking: concurrent Claude requests, source fields packed into
+# each request, and attempts per request on rate limits / overload
+RERANK_MAX_CONCURRENCY = int(os.getenv("RERANK_MAX_CONCURRENCY", "4"))
+RERANK_FIELDS_PER_REQUEST = int(os.getenv("RERANK_FIELDS_PER_REQUEST", "5"))
+RERANK_MAX_ATTEMPTS = int(os.getenv("RERANK_MAX_ATTEMPTS", "4"))
+
+# Backoff between attempts when the API gives no retry-after (seconds)
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 30.0
+
+# Status codes worth retrying: rate limited, server error, overloaded
+_RETRYABLE_STATUS = {429, 500, 502, 503, 529}
+
+_OMOP_CONTEXT = """## OMOP CDM Context
+The target schema is OMOP CDM (Observational Medical Outcomes Partnership Common Data Model) used for healthcare analytics. Key field categories:
+- person_id: Patient/member identifier
+- visit_*: Encounter/visit information
+- procedure_*: Procedure codes and details
+- condition_*: Diagnosis codes
+- provider_id, npi: Provider identifiers
+- *_date, *_datetime: Temporal fields
+- *_source_value: Original source values"""
+
 
 @dataclass
 class RerankerResult:
@@ -71,6 +102,55 @@ class RerankerResult:
         }
 
 
+class _RateLimitGate:
+    """Shared pause for all workers after the API signals a rate limit.
+
+    Once one request is throttled the others would be too, so instead of
+    each retrying on its own schedule every worker waits out the same
+    cooldown before sending its next request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self) -> None:
+        """Block until any active cooldown has passed."""
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all workers for at least seconds from now."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+def _format_candidates(candidates: list[tuple[str, float]]) -> str:
+    return "\n".join(
+        f"{i + 1}. {field} (embedding similarity: {score:.3f})"
+        for i, (field, score) in enumerate(candidates)
+    )
+
+
+def _format_samples(sample_values: list[Any] | None) -> str:
+    if not sample_values:
+        return "No sample values provided"
+    # Limit to 5 samples and truncate long values
+    truncated = [str(v)[:50] for v in sample_values[:5]]
+    return ", ".join(f'"{v}"' for v in truncated)
+
+
+def _embedding_score(candidates: list[tuple[str, float]], target_field: str) -> float:
+    for field, score in candidates:
+        if field == target_field:
+            return score
+    return 0.0
+
+
 class MappingReranker:
     """LLM-based reranker for field mapping candidates.
 
@@ -99,6 +179,7 @@ class MappingReranker:
         self.high_confidence_threshold = high_confidence_threshold
         self.low_confidence_threshold = low_confidence_threshold
         self._client: Any = None
+        self._gate = _RateLimitGate()
 
     def _get_client(self) -> Any:
         """Lazy-load the Anthropic client."""
@@ -109,11 +190,56 @@ class MappingReranker:
                 api_key = os.getenv("ANTHROPIC_API_KEY")
                 if not api_key:
                     raise ValueError("ANTHROPIC_API_KEY not set")
-                self._client = anthropic.Anthropic(api_key=api_key)
+                # Retries are scheduled by _create_message so that a rate
+                # limit pauses every batch worker, not just the one hit
+                self._client = anthropic.Anthropic(api_key=api_key, max_retries=0)
             except ImportError:
                 raise ImportError("anthropic package not installed")
         return self._client
 
+    def _create_message(self, prompt: str, max_tokens: int) -> Any:
+        """Send one request, retrying rate limits and overload with backoff.
+
+        Honors the API's retry-after header when present and otherwise
+        backs off exponentially with jitter. Other errors are raised.
+        """
+        import anthropic
+
+        client = self._get_client()
+        for attempt in range(1, RERANK_MAX_ATTEMPTS + 1):
+            self._gate.wait()
+            try:
+                return client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=0,  # Deterministic for consistency
+                    messages=[{"role": "user", "content": prompt}],
+                )
+            except (anthropic.APIStatusError, anthropic.APIConnectionError) as e:
+                status = getattr(e, "status_code", None)
+                retryable = status is None or status in _RETRYABLE_STATUS
+                if not retryable or attempt == RERANK_MAX_ATTEMPTS:
+                    raise
+                delay = min(
+                    _RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                ) * random.uniform(0.5, 1.0)
+                response = getattr(e, "response", None)
+                retry_after = response.headers.get("retry-after") if response else None
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+                logger.warning(
+                    f"Reranker request failed ({status or 'connection'}), "
+                    f"retrying in {delay:.1f}s (attempt {attempt})"
+                )
+                if status in (429, 529):
+                    self._gate.pause(delay)
+                else:
+                    time.sleep(delay)
+        raise AssertionError("unreachable")
+
     def rerank(
         self,
         source_field: str,
@@ -135,18 +261,8 @@ class MappingReranker:
         if not candidates:
             return None
 
-        # Format candidates for the prompt
-        candidates_text = "\n".join(
-            f"{i + 1}. {field} (embedding similarity: {score:.3f})"
-            for i, (field, score) in enumerate(candidates)
-        )
-
-        # Format sample values
-        samples_text = "No sample values provided"
-        if sample_values:
-            # Limit to 5 samples and truncate long values
-            truncated = [str(v)[:50] for v in sample_values[:5]]
-            samples_text = ", ".join(f'"{v}"' for v in truncated)
+        candidates_text = _format_candidates(candidates)
+        samples_text = _format_samples(sample_values)
 
         prompt = f"""You are a healthcare data mapping expert. Your task is to select the best OMOP CDM field mapping.
 
@@ -157,15 +273,7 @@ Sample values: {samples_text}
 ## Candidate Mappings (from embedding similarity)
 {candidates_text}
 
-## OMOP CDM Context
-The target schema is OMOP CDM (Observational Medical Outcomes Partnership Common Data Model) used for healthcare analytics. Key field categories:
-- person_id: Patient/member identifier
-- visit_*: Encounter/visit information
-- procedure_*: Procedure codes and details
-- condition_*: Diagnosis codes
-- provider_id, npi: Provider identifiers
-- *_date, *_datetime: Temporal fields
-- *_source_value: Original source values
+{_OMOP_CONTEXT}
 
 ## Instructions
 1. Analyze the source field name and sample values
@@ -181,13 +289,7 @@ Respond with ONLY valid JSON:
 {{"target_field": "selected_field_name", "confidence": 85, "reasoning": "Brief explanation of why this mapping is correct"}}"""
 
         try:
-            client = self._get_client()
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=200,
-                temperature=0,  # Deterministic for consistency
-                messages=[{"role": "user", "content": prompt}],
-            )
+            response = self._create_message(prompt, max_tokens=200)
 
             content = response.content[0].text if response.content else ""
             tokens_used = response.usage.input_tokens + response.usage.output_tokens
@@ -198,19 +300,12 @@ Respond with ONLY valid JSON:
                 logger.warning(f"Failed to parse reranker response for {source_field}")
                 return None
 
-            # Find the embedding score for the selected field
-            embedding_score = 0.0
-            for field, score in candidates:
-                if field == result["target_field"]:
-                    embedding_score = score
-                    break
-
             return RerankerResult(
                 target_field=result["target_field"],
                 confidence=result["confidence"],
                 reasoning=result["reasoning"],
                 source_field=source_field,
-                embedding_score=embedding_score,
+                embedding_score=_embedding_score(candidates, result["target_field"]),
                 model=self.model,
                 tokens_used=tokens_used,
             )
@@ -222,28 +317,169 @@ Respond with ONLY valid JSON:
     def batch_rerank(
         self,
         mappings: list[dict[str, Any]],
+        max_concurrency: int = RERANK_MAX_CONCURRENCY,
+        fields_per_request: int = RERANK_FIELDS_PER_REQUEST,
     ) -> list[RerankerResult | None]:
-        """Rerank multiple field mappings.
+        """Rerank multiple field mappings concurrently.
+
+        Mappings are packed fields_per_request to a prompt, and up to
+        max_concurrency prompts are in flight at once. Rate limits pause
+        all workers (see _create_message). A field missing from a packed
+        response is retried on its own with rerank(); if the packed request
+        itself fails, its fields are returned as None.
 
         Args:
             mappings: List of dicts with keys:
                 - source_field: str
                 - candidates: list[tuple[str, float]]
                 - sample_values: list[Any] (optional)
+            max_concurrency: Maximum Claude requests in flight
+            fields_per_request: Source fields packed into one prompt
+                (1 sends each field with the single-field prompt)
 
         Returns:
-            List of RerankerResult objects (None for failed mappings)
+            List of RerankerResult objects in input order (None for failed
+            mappings)
         """
-        results = []
-        for mapping in mappings:
-            result = self.rerank(
-                source_field=mapping["source_field"],
-                candidates=mapping["candidates"],
-                sample_values=mapping.get("sample_values"),
+        results: list[RerankerResult | None] = [None] * len(mappings)
+        pending = [i for i, mapping in enumerate(mappings) if mapping["candidates"]]
+        size = max(1, fields_per_request)
+        groups = [pending[i : i + size] for i in range(0, len(pending), size)]
+        if not groups:
+            return results
+
+        def run(group: list[int]) -> None:
+            if len(group) == 1:
+                mapping = mappings[group[0]]
+                results[group[0]] = self.rerank(
+                    source_field=mapping["source_field"],
+                    candidates=mapping["candidates"],
+                    sample_values=mapping.get("sample_values"),
+                )
+                return
+            for index, result in zip(
+                group, self._rerank_group([mappings[i] for i in group])
+            ):
+                results[index] = result
+
+        workers = max(1, min(max_concurrency, len(groups)))
+        if workers == 1:
+            for group in groups:
+                run(group)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="rerank"
+            ) as executor:
+                list(executor.map(run, groups))
+        return results
+
+    def _rerank_group(
+        self, mappings: list[dict[str, Any]]
+    ) -> list[RerankerResult | None]:
+        """Rerank several source fields with one multi-field prompt."""
+        sections = []
+        for number, mapping in enumerate(mappings, start=1):
+            sections.append(
+                f"""### Field {number}
+Name: "{mapping["source_field"]}"
+Sample values: {_format_samples(mapping.get("sample_values"))}
+Candidates (from embedding similarity):
+{_format_candidates(mapping["candidates"])}"""
             )
+        fields_text = "\n\n".join(sections)
+
+        prompt = f"""You are a healthcare data mapping expert. Your task is to select the best OMOP CDM field mapping for each of {len(mappings)} source fields.
+
+## Source Fields
+{fields_text}
+
+{_OMOP_CONTEXT}
+
+## Instructions
+For EACH field, independently:
+1. Analyze the source field name and sample values
+2. Consider healthcare domain conventions
+3. Select the BEST matching candidate from that field's own list
+4. Provide confidence score (0-100) based on name similarity, value format alignment, healthcare domain knowledge and semantic meaning match
+
+Respond with ONLY a valid JSON array, one object per field in order:
+[{{"field": 1, "target_field": "selected_field_name", "confidence": 85, "reasoning": "Brief explanation"}}]"""
+
+        parsed: dict[int, dict[str, Any]] = {}
+        tokens_used = 0
+        try:
+            response = self._create_message(prompt, max_tokens=150 * len(mappings))
+            content = response.content[0].text if response.content else ""
+            tokens_used = response.usage.input_tokens + response.usage.output_tokens
+            for item in self._parse_batch_response(content):
+                try:
+                    parsed[int(item["field"])] = item
+                except (KeyError, TypeError, ValueError):
+                    continue
+        except Exception as e:
+            # The request itself failed (retries already spent); retrying
+            # each field alone would only multiply calls into the same error
+            fields = ", ".join(m["source_field"] for m in mappings)
+            logger.error(f"Batch reranker error for {fields}: {e}")
+            return [None] * len(mappings)
+
+        results: list[RerankerResult | None] = []
+        answered = sum(1 for n in range(1, len(mappings) + 1) if n in parsed)
+        for number, mapping in enumerate(mappings, start=1):
+            item = parsed.get(number)
+            try:
+                target_field = item["target_field"]
+                result = RerankerResult(
+                    target_field=target_field,
+                    confidence=int(item["confidence"]),
+                    reasoning=item.get("reasoning", ""),
+                    source_field=mapping["source_field"],
+                    embedding_score=_embedding_score(
+                        mapping["candidates"], target_field
+                    ),
+                    model=self.model,
+                    # The request's tokens, split across the fields it answered
+                    tokens_used=tokens_used // answered,
+                )
+            except (KeyError, TypeError, ValueError):
+                # Not answered (or malformed): fall back to a single-field call
+                result = self.rerank(
+                    source_field=mapping["source_field"],
+                    candidates=mapping["candidates"],
+                    sample_values=mapping.get("sample_values"),
+                )
             results.append(result)
         return results
 
+    def _parse_batch_response(self, text: str) -> list[dict[str, Any]]:
+        """Parse the JSON array from a multi-field response.
+
+        Args:
+            text: Raw response text
+
+        Returns:
+            The objects in the array (empty if parsing fails)
+        """
+        if not text:
+            return []
+
+        candidates = [text.strip()]
+        json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+        if json_match:
+            candidates.insert(0, json_match.group(1).strip())
+        array_match = re.search(r"\[[\s\S]*\]", text)
+        if array_match:
+            candidates.append(array_match.group(0))
+
+        for candidate in candidates:
+            try:
+                parsed = json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(parsed, list):
+                return [item for item in parsed if isinstance(item, dict)]
+        return []
+
     def _parse_response(self, text: str) -> dict[str, Any] | None:
         """Parse JSON response from Claude.
 
@@ -6,20 +6,35 @@ healthcare policy documents. Features include:
 - Policy versioning with automatic version tracking
 - Deduplication via content hashing
 - Date-aware policy lookups
+- Retrieval caching: claims with the same codes issue the same queries, so
+  search results (and query embeddings) are cached per collection until
+  the collection is next written
+- Exact code lookups: an in-memory inverted index from the CPT/ICD codes in
+  each current policy's related_codes metadata to its document IDs
+- Source/type/policy-key listings from a sidecar SQLite index (see
+  rag.metadata_index) instead of scanning every document's metadata
 """
 
 from __future__ import annotations
 
+import copy
 import hashlib
+import json
 import logging
 import os
 import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator
 from datetime import datetime, timezone
 from typing import Any
 
 import chromadb
+from chromadb.api.types import EmbeddingFunction
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
+
+from .metadata_index import PolicyMetadataIndex
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +79,16 @@ def _increment_version(current_version: str | None) -> str:
         return f"{current_version}.1"
 
 
+def _version_sort_key(item: dict[str, Any]) -> tuple:
+    """Sort key ordering version dicts by their metadata version number."""
+    version = item.get("metadata", {}).get("version", "0")
+    # Split version and convert to tuple of ints for proper sorting
+    try:
+        return tuple(int(p) for p in version.split("."))
+    except ValueError:
+        return (0,)
+
+
 def _parse_date(date_str: str | None) -> datetime | None:
     """Parse a date string into a datetime object.
 
@@ -93,24 +118,378 @@ def _parse_date(date_str: str | None) -> datetime | None:
     return None
 
 
-# Simple cache for metadata aggregations
-_metadata_cache: dict[str, tuple[float, Any]] = {}
-_CACHE_TTL_SECONDS = 60  # Cache for 1 minute
+# Epoch-second copies of effective_date/expires_date written at index time,
+# so date-effective search can filter inside the vector query. Documents
+# without a (parseable) date get the open-ended bound.
+EFFECTIVE_TS_KEY = "effective_ts"
+EXPIRES_TS_KEY = "expires_ts"
+_NO_EFFECTIVE_TS = -(2**53)
+_NO_EXPIRY_TS = 2**53
+
+# Metadata index record of documents having been given the timestamps
+DATE_MIGRATION = "date_timestamps"
+
+# Extra, doubling re-queries when a date-filtered search comes back short
+DATE_SEARCH_MAX_REQUERIES = 3
+
+
+def _date_to_epoch(date_str: str | None) -> int | None:
+    """Epoch seconds (UTC midnight) of a date string, or None if unparseable."""
+    parsed = _parse_date(date_str)
+    if parsed is None:
+        return None
+    return int(parsed.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _needs_date_timestamps(metadata: dict[str, Any] | None) -> bool:
+    return (
+        not metadata
+        or EFFECTIVE_TS_KEY not in metadata
+        or EXPIRES_TS_KEY not in metadata
+    )
+
+
+def _with_date_timestamps(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Metadata with effective_ts/expires_ts derived from its date strings."""
+    effective = _date_to_epoch(metadata.get("effective_date"))
+    expires = _date_to_epoch(metadata.get("expires_date"))
+    return {
+        **metadata,
+        EFFECTIVE_TS_KEY: _NO_EFFECTIVE_TS if effective is None else effective,
+        EXPIRES_TS_KEY: _NO_EXPIRY_TS if expires is None else expires,
+    }
+
+
+# Sidecar metadata index file, kept in the Chroma persist directory
+METADATA_INDEX_FILENAME = "metadata_index.sqlite3"
+
+# Documents read per page when (re)building the metadata index
+METADATA_INDEX_PAGE_SIZE = 5000
+
+# Documents per versioned bulk write: one version lookup, one embedding
+# call and one collection.add each (capped at Chroma's own max batch size)
+BULK_INDEX_BATCH_SIZE = int(os.getenv("RAG_BULK_INDEX_BATCH_SIZE", "256"))
 
 # Lock for thread-safe version replacement operations
 _version_lock = threading.Lock()
 
+# Retrieval cache sizing (0 entries disables a cache). Search results are
+# dropped whenever the collection is written; the TTL only bounds staleness
+# from writers in other processes (e.g. seed_chromadb.py).
+RAG_RESULT_CACHE_SIZE = int(os.getenv("RAG_RESULT_CACHE_SIZE", "2048"))
+RAG_RESULT_CACHE_TTL_SECONDS = float(os.getenv("RAG_RESULT_CACHE_TTL_SECONDS", "600"))
+RAG_EMBEDDING_CACHE_SIZE = int(os.getenv("RAG_EMBEDDING_CACHE_SIZE", "4096"))
+
+# The code index is kept in step with writes made in this process and
+# rebuilt from the collection in the background this often to pick up
+# writes from others
+RAG_CODE_INDEX_REFRESH_SECONDS = float(
+    os.getenv("RAG_CODE_INDEX_REFRESH_SECONDS", "300")
+)
+
+_MISSING = object()
+
+
+class _LRUCache:
+    """Thread-safe LRU cache with optional expiry and hit/miss counters."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or _MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                self.ttl_seconds is None
+                or time.monotonic() - entry[0] < self.ttl_seconds
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return _MISSING
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class _RetrievalCache:
+    """Search results and query embeddings cached for one collection.
+
+    Shared by every ChromaStore on the same collection in this process, so
+    a write through any of them (e.g. the CMS sync scheduler's store)
+    invalidates results served by the others.
+    """
+
+    def __init__(self) -> None:
+        self.results = _LRUCache(RAG_RESULT_CACHE_SIZE, RAG_RESULT_CACHE_TTL_SECONDS)
+        # Embeddings depend only on the query text, never on the documents
+        self.embeddings = _LRUCache(RAG_EMBEDDING_CACHE_SIZE)
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.invalidations = 0
+
+    def store(self, key: Hashable, results: list[dict[str, Any]], generation: int):
+        """Cache results computed at generation, unless a write happened since."""
+        with self._lock:
+            if generation == self.generation:
+                self.results.put(key, copy.deepcopy(results))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self.results.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "results": self.results.stats(),
+            "embeddings": self.embeddings.stats(),
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.results.ttl_seconds,
+        }
+
+
+def _normalize_code(code: Any) -> str:
+    """Canonical form of a CPT/HCPCS/ICD code ("e11.9 " -> "E119")."""
+    return str(code).strip().upper().replace(".", "")
+
+
+def _index_codes(
+    documents: dict[str, set[str]],
+    doc_codes: dict[str, set[str]],
+    doc_id: str,
+    metadata: dict[str, Any] | None,
+) -> None:
+    """Add a document under each code it is indexed under."""
+    codes = _indexed_codes(metadata)
+    if codes:
+        doc_codes[doc_id] = codes
+        for code in codes:
+            documents.setdefault(code, set()).add(doc_id)
+
+
+def _indexed_codes(metadata: dict[str, Any] | None) -> set[str]:
+    """Codes a document is indexed under: its related_codes, if current."""
+    if not metadata or metadata.get("is_current") is False:
+        return set()
+    raw = metadata.get("related_codes")
+    if not raw:
+        return set()
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    return {code for code in map(_normalize_code, raw) if code}
+
+
+class _CodeIndex:
+    """Inverted index from procedure/diagnosis code to policy document IDs.
+
+    Only current versions are indexed, so a policy replaced through
+    add_document_with_version() drops out as its successor comes in. Built
+    from the collection's metadata on a background thread, then updated by
+    ChromaStore's write methods; lookups keep using the previous index
+    while a refresh runs.
+    """
+
+    def __init__(self, refresh_seconds: float = RAG_CODE_INDEX_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._documents: dict[str, set[str]] = {}
+        self._doc_codes: dict[str, set[str]] = {}
+        self._built_at: float | None = None
+        # Writes made while a rebuild reads the collection (without the
+        # lock), replayed over its result when it is swapped in
+        self._pending: dict[str, dict[str, Any] | None] | None = None
+        self._generation = 0
+        self._refresh: threading.Thread | None = None
+
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def is_stale(self) -> bool:
+        return (
+            self._built_at is None
+            or time.monotonic() - self._built_at >= self.refresh_seconds
+        )
+
+    def rebuild(self, pages: Iterable[tuple[list[str], list[Any]]]) -> None:
+        """Replace the index with the given (ids, metadatas) pages."""
+        with self._rebuild_lock:
+            with self.lock:
+                self._pending = {}
+                generation = self._generation
+            documents: dict[str, set[str]] = {}
+            doc_codes: dict[str, set[str]] = {}
+            try:
+                for ids, metadatas in pages:
+                    for doc_id, metadata in zip(ids, metadatas):
+                        _index_codes(documents, doc_codes, doc_id, metadata)
+            except Exception:
+                with self.lock:
+                    self._pending = None
+                raise
+            with self.lock:
+                pending, self._pending = self._pending or {}, None
+                if generation != self._generation:
+                    return  # Reset meanwhile; this read is out of date
+                self._documents, self._doc_codes = documents, doc_codes
+                self._built_at = time.monotonic()
+                for doc_id, metadata in pending.items():
+                    self._unindex(doc_id)
+                    _index_codes(self._documents, self._doc_codes, doc_id, metadata)
+
+    def start_refresh(
+        self, pages: Callable[[], Iterable[tuple[list[str], list[Any]]]]
+    ) -> None:
+        """Rebuild from pages() on a background thread, unless one is running."""
+        with self.lock:
+            if self._refresh is not None and self._refresh.is_alive():
+                return
+            self._refresh = threading.Thread(
+                target=self._run_refresh,
+                args=(pages,),
+                name="code-index-refresh",
+                daemon=True,
+            )
+            self._refresh.start()
+
+    def _run_refresh(
+        self, pages: Callable[[], Iterable[tuple[list[str], list[Any]]]]
+    ) -> None:
+        try:
+            self.rebuild(pages())
+        except Exception as e:
+            logger.warning(f"Code index refresh failed: {e}")
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until a running refresh finishes."""
+        refresh = self._refresh
+        if refresh is not None:
+            refresh.join(timeout)
+
+    def update(self, ids: list[str], metadatas: list[dict[str, Any] | None]) -> None:
+        """Re-index documents from their (new) metadata."""
+        with self.lock:
+            if self._pending is not None:
+                self._pending.update(zip(ids, metadatas))
+            if self._built_at is None:
+                return  # The pending rebuild picks these up
+            for doc_id, metadata in zip(ids, metadatas):
+                self._unindex(doc_id)
+                _index_codes(self._documents, self._doc_codes, doc_id, metadata)
+
+    def remove(self, ids: list[str]) -> None:
+        with self.lock:
+            if self._pending is not None:
+                self._pending.update(dict.fromkeys(ids))
+            for doc_id in ids:
+                self._unindex(doc_id)
+
+    def _unindex(self, doc_id: str) -> None:
+        for code in self._doc_codes.pop(doc_id, ()):
+            documents = self._documents.get(code)
+            if documents is not None:
+                documents.discard(doc_id)
+                if not documents:
+                    del self._documents[code]
+
+    def reset(self) -> None:
+        """Empty the index, as for a cleared collection."""
+        with self.lock:
+            self._generation += 1
+            self._pending = None
+            self._documents = {}
+            self._doc_codes = {}
+            self._built_at = time.monotonic()
+
+    def lookup(self, codes: list[str]) -> list[tuple[str, list[str]]]:
+        """Documents indexed under any of codes with the codes they matched.
+
+        Ordered by number of codes matched, then document ID.
+        """
+        matches: dict[str, list[str]] = {}
+        with self.lock:
+            for code in dict.fromkeys(map(_normalize_code, codes)):
+                for doc_id in self._documents.get(code, ()):
+                    matches.setdefault(doc_id, []).append(code)
+        return sorted(matches.items(), key=lambda item: (-len(item[1]), item[0]))
+
+
+_retrieval_caches: dict[tuple[str, str], _RetrievalCache] = {}
+_code_indexes: dict[tuple[str, str], _CodeIndex] = {}
+# Collections whose date migration has been started in this process
+_date_migrations_started: set[tuple[str, str]] = set()
+_date_migration_lock = threading.Lock()
+_shared_lock = threading.Lock()
+
+
+def _shared_for_collection(registry: dict, factory: type, persist_dir: str, name: str):
+    """Per-collection state shared by every ChromaStore in the process."""
+    key = (os.path.abspath(persist_dir), name)
+    with _shared_lock:
+        if key not in registry:
+            registry[key] = factory()
+        return registry[key]
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different queries share an entry."""
+    return " ".join(query.split())
+
 
 class ChromaStore:
     """Simple ChromaDB wrapper for policy document retrieval."""
 
     def __init__(
-        self, persist_dir: str | None = None, collection_name: str = "policies"
+        self,
+        persist_dir: str | None = None,
+        collection_name: str = "policies",
+        embedding_function: EmbeddingFunction | None = None,
     ):
         self.persist_dir = persist_dir or os.getenv(
             "CHROMA_PERSIST_DIR", "./data/chroma"
         )
         self.collection_name = collection_name
+        # Kept so search() can embed (and cache) queries itself
+        self.embedding_function = (
+            embedding_function or embedding_functions.DefaultEmbeddingFunction()
+        )
+        self._retrieval_cache = _shared_for_collection(
+            _retrieval_caches, _RetrievalCache, self.persist_dir, collection_name
+        )
+        self._code_index = _shared_for_collection(
+            _code_indexes, _CodeIndex, self.persist_dir, collection_name
+        )
 
         # Initialize ChromaDB client with persistence
         self.client = chromadb.PersistentClient(
@@ -122,8 +501,27 @@ class ChromaStore:
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
             metadata={"description": "Healthcare policy documents for RAG"},
+            embedding_function=self.embedding_function,
         )
 
+        self._metadata_index = PolicyMetadataIndex(
+            os.path.join(self.persist_dir, METADATA_INDEX_FILENAME), collection_name
+        )
+        self._metadata_index_checked = False
+        if self.collection.count() == 0:
+            # Nothing to scan: writes from here on keep the indexes complete
+            if not self._metadata_index.is_built():
+                self._metadata_index.rebuild([])
+            if not self._code_index.is_built():
+                self._code_index.rebuild([])
+            if not self._metadata_index.migration_done(DATE_MIGRATION):
+                self._metadata_index.mark_migrated(DATE_MIGRATION)
+        else:
+            if self._code_index.is_stale():
+                self._code_index.start_refresh(self._metadata_pages)
+            if not self._metadata_index.migration_done(DATE_MIGRATION):
+                self._start_date_migration()
+
     def add_documents(
         self,
         documents: list[str],
@@ -142,13 +540,16 @@ class ChromaStore:
         # Default metadata if not provided
         if metadatas is None:
             metadatas = [{"source": "unknown"} for _ in documents]
+        metadatas = [_with_date_timestamps(meta) for meta in metadatas]
 
         self.collection.add(
             documents=documents,
             metadatas=metadatas,
             ids=ids,
         )
-        self.invalidate_cache()  # Clear cached counts
+        self._metadata_index.upsert(ids, metadatas)
+        self._code_index.update(ids, metadatas)
+        self.invalidate_cache()  # Clear cached search results
 
     def search(
         self,
@@ -169,12 +570,27 @@ class ChromaStore:
 
         Returns:
             List of matching documents with content, metadata, distance, and score.
+            Served from the retrieval cache when the same query and filters
+            were searched since the collection was last written.
         """
+        query = _normalize_query(query)
+        cache = self._retrieval_cache
+        cache_key = (
+            query,
+            n_results,
+            json.dumps(filters, sort_keys=True, default=str) if filters else None,
+        )
+        cached = cache.results.get(cache_key)
+        if cached is not _MISSING:
+            return copy.deepcopy(cached)
+        generation = cache.generation
+
         if self.collection.count() == 0:
+            cache.store(cache_key, [], generation)
             return []
 
         query_kwargs: dict[str, Any] = {
-            "query_texts": [query],
+            "query_embeddings": [self._embed_query(query)],
             "n_results": n_results,
         }
 
@@ -211,8 +627,22 @@ class ChromaStore:
                     }
                 )
 
+        cache.store(cache_key, formatted, generation)
         return formatted
 
+    def _embed_query(self, query: str) -> Any:
+        """Embed a search query, reusing the embedding of a repeated query."""
+        embeddings = self._retrieval_cache.embeddings
+        embedding = embeddings.get(query)
+        if embedding is _MISSING:
+            embedding = self.embedding_function([query])[0]
+            embeddings.put(query, embedding)
+        return embedding
+
+    def retrieval_cache_stats(self) -> dict[str, Any]:
+        """Hit/miss metrics for the search result and query embedding caches."""
+        return self._retrieval_cache.stats()
+
     def count(self) -> int:
         """Return number of documents in collection."""
         return self.collection.count()
@@ -223,7 +653,11 @@ class ChromaStore:
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
             metadata={"description": "Healthcare policy documents for RAG"},
+            embedding_function=self.embedding_function,
         )
+        self._metadata_index.clear()
+        self._code_index.reset()
+        self.invalidate_cache()
 
     def search_by_source(
         self,
@@ -275,54 +709,183 @@ class ChromaStore:
         )
         return self.search(query, n_results, filters)
 
+    def search_by_codes(
+        self,
+        codes: list[str],
+        n_results: int = 5,
+    ) -> list[dict[str, Any]]:
+        """Find current policies whose related_codes include any of codes.
+
+        An exact lookup in the code index rather than a semantic search, so
+        it is both faster and more precise for short code strings. Policies
+        matching more of the codes rank first. The index is refreshed from
+        the collection in the background every RAG_CODE_INDEX_REFRESH_SECONDS
+        to pick up writes from other processes.
+
+        Args:
+            codes: CPT/HCPCS/ICD-10 codes (case and dots are ignored)
+            n_results: Maximum number of results
+
+        Returns:
+            Documents in the same shape as search(), with score 1.0 and the
+            normalized codes they matched under "matched_codes".
+        """
+        if not codes:
+            return []
+        index = self._code_index
+        if index.is_stale():
+            # Read in pages off the request path; until the first build
+            # finishes nothing matches and callers fall back to search()
+            index.start_refresh(self._metadata_pages)
+
+        matches = index.lookup(codes)[:n_results]
+        if not matches:
+            return []
+        found = self.collection.get(
+            ids=[doc_id for doc_id, _ in matches],
+            include=["documents", "metadatas"],
+        )
+        by_id = {
+            doc_id: (found["documents"][i], found["metadatas"][i] or {})
+            for i, doc_id in enumerate(found["ids"])
+        }
+        return [
+            {
+                "content": by_id[doc_id][0],
+                "metadata": by_id[doc_id][1],
+                "distance": 0.0,
+                "score": 1.0,
+                "id": doc_id,
+                "matched_codes": matched,
+            }
+            for doc_id, matched in matches
+            if doc_id in by_id
+        ]
+
     def search_current_policies(
         self,
         query: str,
         reference_date: str,
         n_results: int = 5,
+        filters: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
         """Search for policies effective at a given date.
 
+        The date predicate runs inside the vector query on the numeric
+        effective_ts/expires_ts metadata. Filtered ANN search can come back
+        short of n_results even when enough documents match, so a short
+        query is repeated with double the n_results, up to
+        DATE_SEARCH_MAX_REQUERIES times, while each round finds more.
+
+        Documents indexed before the timestamps existed only match once
+        migrate_date_metadata() has run; it starts in the background when
+        a store opens such a collection.
+
         Args:
             query: Search query text
             reference_date: ISO 8601 date string (e.g., "2024-01-15")
             n_results: Maximum number of results
+            filters: Optional metadata filters, combined with the date predicate
 
         Returns:
             Policies where effective_date <= reference_date and
             (expires_date is null OR expires_date > reference_date)
         """
-        # ChromaDB doesn't support complex date comparisons directly,
-        # so we filter post-query
-        results = self.search(query, n_results * 3)  # Fetch more to filter
-
-        # Parse reference date once
-        ref_dt = _parse_date(reference_date)
-        if not ref_dt:
+        ref_ts = _date_to_epoch(reference_date)
+        if ref_ts is None:
             # If reference date is invalid, return unfiltered results
-            return results[:n_results]
-
-        filtered = []
-        for r in results:
-            meta = r.get("metadata", {})
-            effective_str = meta.get("effective_date")
-            expires_str = meta.get("expires_date")
-
-            # Parse dates for proper comparison (handles multiple formats)
-            effective_dt = _parse_date(effective_str)
-            expires_dt = _parse_date(expires_str)
-
-            # Include if no date constraints or dates are valid
-            if effective_dt and effective_dt > ref_dt:
-                continue  # Not yet effective
-            if expires_dt and expires_dt <= ref_dt:
-                continue  # Already expired
-
-            filtered.append(r)
-            if len(filtered) >= n_results:
+            return self.search(query, n_results, filters)
+
+        conditions = [
+            {EFFECTIVE_TS_KEY: {"$lte": ref_ts}},
+            {EXPIRES_TS_KEY: {"$gt": ref_ts}},
+        ]
+        if filters:
+            conditions.append(filters)
+        where = {"$and": conditions}
+
+        results = self.search(query, n_results, where)
+        fetch = n_results
+        for _ in range(DATE_SEARCH_MAX_REQUERIES):
+            if len(results) >= n_results:
                 break
+            fetch *= 2
+            more = self.search(query, fetch, where)
+            if len(more) <= len(results):
+                break  # Nothing more matches
+            results = more
+        return results[:n_results]
+
+    def migrate_date_metadata(self, batch_size: int = 500) -> int:
+        """Add effective_ts/expires_ts to documents indexed without them.
 
-        return filtered
+        Reads the collection a page at a time and records completion in
+        the metadata index, so it runs once per collection, not once per
+        process. Each batch is re-read and updated under the version lock,
+        so concurrent versioned writes wait only for that batch.
+
+        Returns:
+            Number of documents updated
+        """
+        with _date_migration_lock:
+            if self._metadata_index.migration_done(DATE_MIGRATION):
+                return 0
+            updated = 0
+            for ids, metadatas in self._metadata_pages():
+                stale = [
+                    doc_id
+                    for doc_id, metadata in zip(ids, metadatas)
+                    if _needs_date_timestamps(metadata)
+                ]
+                for start in range(0, len(stale), batch_size):
+                    updated += self._add_date_timestamps(
+                        stale[start : start + batch_size]
+                    )
+            if updated:
+                logger.info(
+                    f"Added date timestamps to {updated} documents "
+                    f"in {self.collection_name}"
+                )
+                self.invalidate_cache()
+            self._metadata_index.mark_migrated(DATE_MIGRATION)
+        return updated
+
+    def _add_date_timestamps(self, ids: list[str]) -> int:
+        # Re-read under the lock so a version written since the page was
+        # read (e.g. is_current cleared) is not overwritten
+        with _version_lock:
+            current = self.collection.get(ids=ids, include=["metadatas"])
+            pending = [
+                (doc_id, _with_date_timestamps(metadata or {}))
+                for doc_id, metadata in zip(
+                    current["ids"], current["metadatas"] or [None] * len(ids)
+                )
+                if _needs_date_timestamps(metadata)
+            ]
+            if pending:
+                self.collection.update(
+                    ids=[doc_id for doc_id, _ in pending],
+                    metadatas=[metadata for _, metadata in pending],
+                )
+        return len(pending)
+
+    def _start_date_migration(self) -> None:
+        """Run migrate_date_metadata() on a background thread, once per process."""
+        key = (os.path.abspath(self.persist_dir), self.collection_name)
+        with _shared_lock:
+            if key in _date_migrations_started:
+                return
+            _date_migrations_started.add(key)
+
+        def run() -> None:
+            try:
+                self.migrate_date_metadata()
+            except Exception as e:
+                logger.warning(f"Date metadata migration failed: {e}")
+                with _shared_lock:
+                    _date_migrations_started.discard(key)  # Retry on next open
+
+        threading.Thread(target=run, name="date-migration", daemon=True).start()
 
     def get_document(self, document_id: str) -> dict[str, Any] | None:
         """Get a single document by ID.
@@ -345,82 +908,72 @@ class ChromaStore:
             logger.warning(f"Failed to get document {document_id}: {e}")
         return None
 
-    def _get_cached_or_compute(
-        self, cache_key: str, compute_fn: callable
-    ) -> dict[str, int]:
-        """Get cached value or compute and cache it.
+    def _ensure_metadata_index(self) -> PolicyMetadataIndex:
+        """The metadata index, rebuilt first if it is missing or out of step.
 
-        Uses module-level cache with TTL to avoid loading all docs repeatedly.
+        Checked once per store; afterwards every write keeps it current.
         """
-        now = time.time()
-        if cache_key in _metadata_cache:
-            cached_time, cached_value = _metadata_cache[cache_key]
-            if now - cached_time < _CACHE_TTL_SECONDS:
-                return cached_value
-
-        # Compute and cache
-        value = compute_fn()
-        _metadata_cache[cache_key] = (now, value)
-        return value
-
-    def _compute_source_counts(self) -> dict[str, int]:
-        """Compute source counts from all documents."""
-        all_docs = self.collection.get()
-        source_counts: dict[str, int] = {}
-
-        if all_docs["metadatas"]:
-            for meta in all_docs["metadatas"]:
-                source = meta.get("source", "unknown")
-                source_counts[source] = source_counts.get(source, 0) + 1
-
-        return source_counts
+        index = self._metadata_index
+        if not self._metadata_index_checked:
+            if not index.is_built() or index.document_count() != self.count():
+                self.rebuild_metadata_index()
+            self._metadata_index_checked = True
+        return index
+
+    def _metadata_pages(self) -> Iterator[tuple[list[str], list[Any]]]:
+        """Every document's (ids, metadatas), METADATA_INDEX_PAGE_SIZE at a time."""
+        offset = 0
+        while True:
+            page = self.collection.get(
+                include=["metadatas"],
+                limit=METADATA_INDEX_PAGE_SIZE,
+                offset=offset,
+            )
+            if not page["ids"]:
+                return
+            yield page["ids"], page["metadatas"] or [None] * len(page["ids"])
+            offset += len(page["ids"])
 
-    def _compute_type_counts(self) -> dict[str, int]:
-        """Compute document type counts from all documents."""
-        all_docs = self.collection.get()
-        type_counts: dict[str, int] = {}
+    def rebuild_metadata_index(self) -> int:
+        """Rebuild the metadata index from the collection, a page at a time.
 
-        if all_docs["metadatas"]:
-            for meta in all_docs["metadatas"]:
-                doc_type = meta.get("document_type", "unknown")
-                type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
+        Returns:
+            Number of documents indexed
+        """
 
-        return type_counts
+        indexed = self._metadata_index.rebuild(self._metadata_pages())
+        logger.info(f"Rebuilt metadata index for {self.collection_name}: {indexed}")
+        return indexed
 
     def list_sources(self) -> dict[str, int]:
         """List all unique sources and their document counts.
 
-        Results are cached for 60 seconds to avoid loading all documents
-        on every call.
+        Read from the sidecar metadata index, so the cost grows with the
+        number of sources rather than documents.
 
         Returns:
             Dictionary mapping source names to document counts.
         """
-        cache_key = f"{self.collection_name}:sources"
-        return self._get_cached_or_compute(cache_key, self._compute_source_counts)
+        return self._ensure_metadata_index().counts("source")
 
     def list_document_types(self) -> dict[str, int]:
         """List all unique document types and their counts.
 
-        Results are cached for 60 seconds to avoid loading all documents
-        on every call.
+        Read from the sidecar metadata index, so the cost grows with the
+        number of types rather than documents.
 
         Returns:
             Dictionary mapping document types to counts.
         """
-        cache_key = f"{self.collection_name}:types"
-        return self._get_cached_or_compute(cache_key, self._compute_type_counts)
+        return self._ensure_metadata_index().counts("document_type")
 
     def invalidate_cache(self) -> None:
-        """Invalidate the metadata cache.
+        """Invalidate the retrieval cache.
 
-        Call this after adding or deleting documents to ensure fresh counts.
+        Call this after adding, updating or deleting documents to ensure
+        fresh search results.
         """
-        keys_to_remove = [
-            k for k in _metadata_cache if k.startswith(self.collection_name)
-        ]
-        for k in keys_to_remove:
-            _metadata_cache.pop(k, None)
+        self._retrieval_cache.invalidate()
 
     def delete_document(self, document_id: str) -> bool:
         """Delete a document by ID.
@@ -437,7 +990,9 @@ class ChromaStore:
             if not existing["ids"]:
                 return False
             self.collection.delete(ids=[document_id])
-            self.invalidate_cache()  # Clear cached counts
+            self._metadata_index.remove([document_id])
+            self._code_index.remove([document_id])
+            self.invalidate_cache()  # Clear cached search results
             return True
         except Exception as e:
             logger.warning(f"Failed to delete document {document_id}: {e}")
@@ -460,7 +1015,9 @@ class ChromaStore:
 
         count = len(all_docs["ids"])
         self.collection.delete(ids=all_docs["ids"])
-        self.invalidate_cache()  # Clear cached counts
+        self._metadata_index.remove(all_docs["ids"])
+        self._code_index.remove(all_docs["ids"])
+        self.invalidate_cache()  # Clear cached search results
         return count
 
     def update_metadata(
@@ -484,17 +1041,28 @@ class ChromaStore:
 
             # Merge existing metadata with updates
             current_metadata = existing["metadatas"][0] if existing["metadatas"] else {}
-            updated_metadata = {**current_metadata, **metadata_updates}
-
-            self.collection.update(
-                ids=[document_id],
-                metadatas=[updated_metadata],
+            updated_metadata = _with_date_timestamps(
+                {**current_metadata, **metadata_updates}
             )
+
+            self._replace_metadatas([document_id], [updated_metadata])
             return True
         except Exception as e:
             logger.warning(f"Failed to update metadata for {document_id}: {e}")
             return False
 
+    def _replace_metadatas(
+        self, ids: list[str], metadatas: list[dict[str, Any]]
+    ) -> None:
+        """Write complete metadata for existing documents and sync indexes."""
+        if not ids:
+            return
+        self.collection.update(ids=ids, metadatas=metadatas)
+        self._metadata_index.upsert(ids, metadatas)
+        self._code_index.update(ids, metadatas)
+        # Filters (and is_current lookups) may now match differently
+        self.invalidate_cache()
+
     # ================================================================
     # Policy Versioning Methods
     # ================================================================
@@ -539,38 +1107,108 @@ class ChromaStore:
             ... )
             {"document_id": "LCD-L38604_v3", "version": "3", ...}
         """
-        content_hash = _compute_content_hash(document)
+        return self.add_documents_with_versions(
+            [{"document": document, "metadata": metadata, "policy_key": policy_key}],
+            replace_existing=replace_existing,
+        )[0]
 
-        # Use lock to prevent race conditions in version replacement
-        with _version_lock:
-            # Check for existing versions of this policy
-            existing_versions = self.get_document_versions(policy_key)
+    def add_documents_with_versions(
+        self,
+        items: list[dict[str, Any]],
+        replace_existing: bool = False,
+        batch_size: int = BULK_INDEX_BATCH_SIZE,
+    ) -> list[dict[str, Any]]:
+        """Add many versioned policy documents, a batch at a time.
+
+        Same semantics as add_document_with_version() applied to each item
+        in order, but each batch costs one version lookup
+        (policy_key $in [...]), one metadata update for the versions it
+        supersedes, and one collection.add, which embeds the whole batch
+        in a single call. Items may repeat a policy_key; later ones version
+        on top of earlier ones.
+
+        Args:
+            items: Dicts with document, metadata and policy_key
+            replace_existing: Mark each policy's previous current version
+                as not current
+            batch_size: Documents per write (capped at Chroma's maximum)
+
+        Returns:
+            One add_document_with_version() style result per item, in order
+        """
+        batch_size = max(1, min(batch_size, self.client.get_max_batch_size()))
+        results: list[dict[str, Any]] = []
+        for start in range(0, len(items), batch_size):
+            # Locked per batch so other writers can interleave between them
+            with _version_lock:
+                results.extend(
+                    self._add_version_batch(
+                        items[start : start + batch_size], replace_existing
+                    )
+                )
+        return results
+
+    def _add_version_batch(
+        self, items: list[dict[str, Any]], replace_existing: bool
+    ) -> list[dict[str, Any]]:
+        """Version and write one batch; caller holds _version_lock."""
+        keys = list(dict.fromkeys(item["policy_key"] for item in items))
+        existing = self.collection.get(
+            where={"policy_key": {"$in": keys}}
+            if len(keys) > 1
+            else {"policy_key": keys[0]},
+            include=["metadatas"],
+        )
+        versions: dict[str, list[dict[str, Any]]] = {key: [] for key in keys}
+        for i, doc_id in enumerate(existing["ids"]):
+            metadata = dict(existing["metadatas"][i] or {})
+            versions[metadata["policy_key"]].append(
+                {"id": doc_id, "metadata": metadata}
+            )
+        for key_versions in versions.values():
+            key_versions.sort(key=_version_sort_key, reverse=True)
+
+        results: list[dict[str, Any]] = []
+        new_docs: list[tuple[str, str, dict[str, Any]]] = []
+        new_ids: set[str] = set()
+        superseded: dict[str, dict[str, Any]] = {}
+        for item in items:
+            policy_key = item["policy_key"]
+            key_versions = versions[policy_key]
+            content_hash = _compute_content_hash(item["document"])
 
             # Check for duplicate content
-            for existing in existing_versions:
-                if existing.get("metadata", {}).get("content_hash") == content_hash:
-                    return {
-                        "document_id": existing["id"],
-                        "version": existing.get("metadata", {}).get("version", "1"),
+            duplicate = next(
+                (
+                    v
+                    for v in key_versions
+                    if v["metadata"].get("content_hash") == content_hash
+                ),
+                None,
+            )
+            if duplicate is not None:
+                results.append(
+                    {
+                        "document_id": duplicate["id"],
+                        "version": duplicate["metadata"].get("version", "1"),
                         "is_duplicate": True,
                         "replaced_id": None,
                         "message": "Identical content already exists",
                     }
+                )
+                continue
 
-            # Determine new version number
-            if existing_versions:
-                latest = existing_versions[0]  # Already sorted by version desc
-                latest_version = latest.get("metadata", {}).get("version", "1")
+            # Determine new version number (versions are sorted newest first)
+            if key_versions:
+                latest_version = key_versions[0]["metadata"].get("version", "1")
                 new_version = _increment_version(latest_version)
             else:
                 new_version = "1"
-
-            # Build document ID with version
             doc_id = f"{policy_key}_v{new_version}"
 
             # Enhance metadata with versioning info
-            enhanced_metadata = {
-                **metadata,
+            metadata = {
+                **item["metadata"],
                 "policy_key": policy_key,
                 "version": new_version,
                 "content_hash": content_hash,
@@ -578,35 +1216,38 @@ class ChromaStore:
                 "created_at": datetime.now(timezone.utc).isoformat(),
             }
 
+            # Handle replacement mode: retire the previous current version
             replaced_id = None
-
-            # Handle replacement mode - atomic with version check
-            if replace_existing and existing_versions:
-                # Mark previous version as not current
-                for old_doc in existing_versions:
-                    if old_doc.get("metadata", {}).get("is_current"):
-                        self.update_metadata(old_doc["id"], {"is_current": False})
-                        replaced_id = old_doc["id"]
+            if replace_existing:
+                for old in key_versions:
+                    if old["metadata"].get("is_current"):
+                        old["metadata"]["is_current"] = False
+                        if old["id"] not in new_ids:
+                            superseded[old["id"]] = old["metadata"]
+                        replaced_id = old["id"]
                         break
 
-            # Add the new document
-            self.add_documents(
-                documents=[document],
-                metadatas=[enhanced_metadata],
-                ids=[doc_id],
+            key_versions.insert(0, {"id": doc_id, "metadata": metadata})
+            new_docs.append((doc_id, item["document"], metadata))
+            new_ids.add(doc_id)
+            results.append(
+                {
+                    "document_id": doc_id,
+                    "version": new_version,
+                    "is_duplicate": False,
+                    "replaced_id": replaced_id,
+                    "message": f"Added version {new_version}",
+                }
             )
 
-            # Invalidate policy_keys cache since we added a new policy
-            policy_keys_cache_key = f"{self.collection_name}:policy_keys"
-            _metadata_cache.pop(policy_keys_cache_key, None)
-
-        return {
-            "document_id": doc_id,
-            "version": new_version,
-            "is_duplicate": False,
-            "replaced_id": replaced_id,
-            "message": f"Added version {new_version}",
-        }
+        self._replace_metadatas(list(superseded), list(superseded.values()))
+        if new_docs:
+            self.add_documents(
+                documents=[document for _, document, _ in new_docs],
+                metadatas=[metadata for _, _, metadata in new_docs],
+                ids=[doc_id for doc_id, _, _ in new_docs],
+            )
+        return results
 
     def get_document_versions(
         self,
@@ -646,16 +1287,7 @@ class ChromaStore:
                 versions.append(entry)
 
             # Sort by version descending (newest first)
-            def version_sort_key(item: dict) -> tuple:
-                version = item.get("metadata", {}).get("version", "0")
-                # Split version and convert to tuple of ints for proper sorting
-                try:
-                    parts = [int(p) for p in version.split(".")]
-                    return tuple(parts)
-                except ValueError:
-                    return (0,)
-
-            versions.sort(key=version_sort_key, reverse=True)
+            versions.sort(key=_version_sort_key, reverse=True)
             return versions
 
         except Exception as e:
@@ -708,19 +1340,7 @@ class ChromaStore:
         Returns:
             List of unique policy_key values.
         """
-        cache_key = f"{self.collection_name}:policy_keys"
-
-        def compute():
-            all_docs = self.collection.get(include=["metadatas"])
-            keys = set()
-            if all_docs["metadatas"]:
-                for meta in all_docs["metadatas"]:
-                    key = meta.get("policy_key")
-                    if key:
-                        keys.add(key)
-            return sorted(keys)
-
-        return self._get_cached_or_compute(cache_key, compute)
+        return list(self._ensure_metadata_index().counts("policy_key"))
 
     def get_version_history(
         self,
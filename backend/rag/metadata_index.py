@@ -0,0 +1,267 @@
+"""Sidecar SQLite index of policy metadata for ChromaStore listings.
+
+Listing sources, document types or policy keys used to pull every
+document's metadata out of Chroma and count it in Python, which at
+hundreds of thousands of chunks takes seconds and a lot of memory per
+call. ChromaStore instead mirrors the listed fields of each document into
+a small SQLite file beside the collection, updated on every add, update
+and delete, along with a running count per field value. Listings then
+read one row per distinct value.
+
+The index is rebuilt from the collection, a page at a time, when it has
+never been built or its document count no longer matches the collection's
+(e.g. documents written by an older version). It also records which
+one-off metadata migrations have run on the collection, so they are not
+repeated after a restart.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from database import get_database
+
+# Mirrored metadata fields and the value counted when one is missing
+INDEXED_FIELDS: dict[str, str | None] = {
+    "source": "unknown",
+    "document_type": "unknown",
+    "policy_key": None,
+}
+
+# Ids per IN (...) lookup, under SQLite's bound-parameter limit
+_ID_CHUNK = 500
+
+
+def _field_values(metadata: dict[str, Any] | None) -> tuple[str | None, ...]:
+    metadata = metadata or {}
+    values = []
+    for field, default in INDEXED_FIELDS.items():
+        value = metadata.get(field)
+        values.append(default if value in (None, "") else str(value))
+    return tuple(values)
+
+
+class PolicyMetadataIndex:
+    """Per-document field values and per-value counts for one collection.
+
+    Args:
+        db_path: SQLite file holding the index (shared by collections)
+        collection_name: Chroma collection being mirrored
+    """
+
+    def __init__(self, db_path: str, collection_name: str) -> None:
+        self.collection_name = collection_name
+        self._db = get_database(db_path)
+        with self._db.write() as conn:
+            self._ensure_tables(conn)
+
+    @staticmethod
+    def _ensure_tables(conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS policy_metadata_docs (
+                collection TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                source TEXT,
+                document_type TEXT,
+                policy_key TEXT,
+                PRIMARY KEY (collection, doc_id)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS policy_metadata_counts (
+                collection TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (collection, field, value)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS policy_metadata_meta (
+                collection TEXT PRIMARY KEY,
+                built_at TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS policy_metadata_migrations (
+                collection TEXT NOT NULL,
+                name TEXT NOT NULL,
+                done_at TEXT NOT NULL,
+                PRIMARY KEY (collection, name)
+            )
+        """)
+
+    def _apply(
+        self,
+        conn: sqlite3.Connection,
+        ids: Sequence[str],
+        values: Sequence[tuple[str | None, ...] | None],
+    ) -> None:
+        """Replace documents' rows (None removes) and adjust the counts."""
+        deltas: Counter[tuple[str, str]] = Counter()
+        for start in range(0, len(ids), _ID_CHUNK):
+            chunk = list(ids[start : start + _ID_CHUNK])
+            placeholders = ", ".join("?" for _ in chunk)
+            params = [self.collection_name, *chunk]
+            for row in conn.execute(
+                f"SELECT {', '.join(INDEXED_FIELDS)} FROM policy_metadata_docs "
+                f"WHERE collection = ? AND doc_id IN ({placeholders})",
+                params,
+            ):
+                for field, value in zip(INDEXED_FIELDS, row):
+                    if value is not None:
+                        deltas[(field, value)] -= 1
+            conn.execute(
+                "DELETE FROM policy_metadata_docs "
+                f"WHERE collection = ? AND doc_id IN ({placeholders})",
+                params,
+            )
+
+        rows = []
+        for doc_id, doc_values in zip(ids, values):
+            if doc_values is None:
+                continue
+            rows.append((self.collection_name, doc_id, *doc_values))
+            for field, value in zip(INDEXED_FIELDS, doc_values):
+                if value is not None:
+                    deltas[(field, value)] += 1
+        conn.executemany(
+            "INSERT OR REPLACE INTO policy_metadata_docs "
+            f"(collection, doc_id, {', '.join(INDEXED_FIELDS)}) "
+            f"VALUES (?, ?, {', '.join('?' for _ in INDEXED_FIELDS)})",
+            rows,
+        )
+        self._add_counts(conn, deltas)
+
+    def _add_counts(
+        self, conn: sqlite3.Connection, deltas: Counter[tuple[str, str]]
+    ) -> None:
+        conn.executemany(
+            """
+            INSERT INTO policy_metadata_counts (collection, field, value, count)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (collection, field, value)
+            DO UPDATE SET count = count + excluded.count
+            """,
+            [
+                (self.collection_name, field, value, delta)
+                for (field, value), delta in deltas.items()
+                if delta
+            ],
+        )
+        conn.execute(
+            "DELETE FROM policy_metadata_counts WHERE collection = ? AND count <= 0",
+            (self.collection_name,),
+        )
+
+    def upsert(
+        self, ids: Sequence[str], metadatas: Sequence[dict[str, Any] | None]
+    ) -> None:
+        """Record documents' current metadata."""
+        if not ids:
+            return
+        with self._db.write() as conn:
+            self._apply(conn, ids, [_field_values(meta) for meta in metadatas])
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """Forget deleted documents."""
+        if not ids:
+            return
+        with self._db.write() as conn:
+            self._apply(conn, ids, [None] * len(ids))
+
+    def clear(self) -> None:
+        """Forget every document, leaving an empty but built index."""
+        self.rebuild([])
+
+    def rebuild(
+        self, pages: Iterable[tuple[Sequence[str], Sequence[dict[str, Any] | None]]]
+    ) -> int:
+        """Replace the index with the given (ids, metadatas) pages.
+
+        Returns:
+            Number of documents indexed
+        """
+        indexed = 0
+        counts: Counter[tuple[str, str]] = Counter()
+        with self._db.write() as conn:
+            for table in ("policy_metadata_docs", "policy_metadata_counts"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE collection = ?",
+                    (self.collection_name,),
+                )
+            for ids, metadatas in pages:
+                rows = []
+                for doc_id, metadata in zip(ids, metadatas):
+                    values = _field_values(metadata)
+                    rows.append((self.collection_name, doc_id, *values))
+                    for field, value in zip(INDEXED_FIELDS, values):
+                        if value is not None:
+                            counts[(field, value)] += 1
+                conn.executemany(
+                    "INSERT OR REPLACE INTO policy_metadata_docs "
+                    f"(collection, doc_id, {', '.join(INDEXED_FIELDS)}) "
+                    f"VALUES (?, ?, {', '.join('?' for _ in INDEXED_FIELDS)})",
+                    rows,
+                )
+                indexed += len(rows)
+            self._add_counts(conn, counts)
+            conn.execute(
+                "INSERT OR REPLACE INTO policy_metadata_meta (collection, built_at) "
+                "VALUES (?, ?)",
+                (self.collection_name, datetime.now(timezone.utc).isoformat()),
+            )
+        return indexed
+
+    def is_built(self) -> bool:
+        with self._db.read() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM policy_metadata_meta WHERE collection = ?",
+                (self.collection_name,),
+            ).fetchone()
+        return row is not None
+
+    def migration_done(self, name: str) -> bool:
+        """Whether the named one-off collection migration has completed."""
+        with self._db.read() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM policy_metadata_migrations "
+                "WHERE collection = ? AND name = ?",
+                (self.collection_name, name),
+            ).fetchone()
+        return row is not None
+
+    def mark_migrated(self, name: str) -> None:
+        """Record that the named migration has completed for the collection."""
+        with self._db.write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO policy_metadata_migrations "
+                "(collection, name, done_at) VALUES (?, ?, ?)",
+                (
+                    self.collection_name,
+                    name,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+    def document_count(self) -> int:
+        with self._db.read() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM policy_metadata_docs WHERE collection = ?",
+                (self.collection_name,),
+            ).fetchone()[0]
+
+    def counts(self, field: str) -> dict[str, int]:
+        """Documents per distinct value of field."""
+        with self._db.read() as conn:
+            return dict(
+                conn.execute(
+                    "SELECT value, count FROM policy_metadata_counts "
+                    "WHERE collection = ? AND field = ? ORDER BY value",
+                    (self.collection_name, field),
+                ).fetchall()
+            )
@@ -20,17 +20,27 @@ from __future__ import annotations
 import csv
 import io
 import json
+import logging
 import os
 import sqlite3
 import threading
+import time
+import zlib
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Generator
+from typing import Any, Generator, Iterator
 
-from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from config import DB_PATH
+from database import connect, get_database
+from utils import CountCache, decode_cursor, keyset_condition, next_cursor
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/audit", tags=["audit"])
 
 # Thread-safe initialization flag with lock
@@ -38,9 +48,19 @@ router = APIRouter(prefix="/api/audit", tags=["audit"])
 _audit_table_initialized = False
 _audit_table_lock = threading.Lock()
 
-# Maximum rows for export to prevent memory issues
-# Configurable via AUDIT_MAX_EXPORT_ROWS environment variable
-MAX_EXPORT_ROWS = int(os.environ.get("AUDIT_MAX_EXPORT_ROWS", "10000"))
+# Rows fetched and encoded per chunk of a streamed export
+# Configurable via AUDIT_EXPORT_FETCH_SIZE environment variable
+EXPORT_FETCH_SIZE = int(os.environ.get("AUDIT_EXPORT_FETCH_SIZE", "1000"))
+
+# Buffered audit events are group-committed every AUDIT_BATCH_SIZE events
+# or AUDIT_FLUSH_INTERVAL_MS milliseconds, whichever comes first
+AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", "100"))
+AUDIT_FLUSH_INTERVAL_MS = int(os.environ.get("AUDIT_FLUSH_INTERVAL_MS", "200"))
+
+# How long a count=cached total may be reused for the same filters
+AUDIT_COUNT_CACHE_TTL_S = float(os.environ.get("AUDIT_COUNT_CACHE_TTL_S", "30"))
+
+_count_cache = CountCache(ttl_seconds=AUDIT_COUNT_CACHE_TTL_S)
 
 
 class AuditAction(str, Enum):
@@ -70,6 +90,7 @@ class AuditAction(str, Enum):
     AUTH_LOGIN = "auth.login"
     AUTH_LOGOUT = "auth.logout"
     EXPORT_AUDIT = "audit.export"
+    DATASET_RELOAD = "dataset.reload"
 
 
 class AuditLogEntry(BaseModel):
@@ -90,13 +111,18 @@ class AuditLogEntry(BaseModel):
 
 
 class AuditLogListResponse(BaseModel):
-    """Response for audit log listing."""
+    """Response for audit log listing.
+
+    total is None when the request asked for count=none; next_cursor is
+    None on the last page.
+    """
 
     entries: list[AuditLogEntry]
-    total: int
+    total: int | None
     limit: int
     offset: int
     filters_applied: dict[str, Any]
+    next_cursor: str | None = None
 
 
 class AuditStats(BaseModel):
@@ -109,29 +135,34 @@ class AuditStats(BaseModel):
     date_range: dict[str, str]
 
 
-def get_db():
-    """Get database connection."""
-    import os
+def _db_path() -> str:
+    """The audit database: DB_PATH as set now, else the configured default."""
+    return os.environ.get("DB_PATH", DB_PATH)
+
 
-    db_path = os.environ.get("DB_PATH", "prototype.db")
-    return sqlite3.connect(db_path, check_same_thread=False)
+def get_db() -> sqlite3.Connection:
+    """Get a standalone connection with the shared pragmas applied."""
+    return connect(_db_path())
 
 
 @contextmanager
-def get_db_context() -> Generator[sqlite3.Connection, None, None]:
-    """Context manager for database connections.
+def get_db_context(write: bool = False) -> Generator[sqlite3.Connection, None, None]:
+    """Context manager for pooled database connections.
 
-    Ensures connections are properly closed even if exceptions occur.
+    Connections are read-only unless write is set; a write block commits
+    when it exits and rolls back if it raises. The audit_logs table is
+    created on first use.
     Usage:
         with get_db_context() as conn:
             cursor = conn.cursor()
             ...
     """
-    conn = get_db()
-    try:
+    db = get_database(_db_path())
+    if not _audit_table_initialized:
+        with db.write() as conn:
+            init_audit_table(conn)
+    with db.write() if write else db.read() as conn:
         yield conn
-    finally:
-        conn.close()
 
 
 def validate_iso_date(date_str: str, param_name: str) -> str:
@@ -176,6 +207,36 @@ def validate_iso_date(date_str: str, param_name: str) -> str:
         )
 
 
+# Indices for each list filter, ending in (timestamp, id) so a filtered
+# page is an index range scan in cursor order and COUNT(*) never touches
+# the table
+AUDIT_INDEXES = {
+    "idx_audit_time_id": "timestamp, id",
+    "idx_audit_action_time_id": "action, timestamp, id",
+    "idx_audit_user_time_id": "user_id, timestamp, id",
+    "idx_audit_resource_time_id": "resource_type, resource_id, timestamp, id",
+    "idx_audit_status_time_id": "status, timestamp, id",
+}
+
+# Single-column indices superseded by AUDIT_INDEXES; dropped so audit
+# inserts don't maintain both
+_LEGACY_AUDIT_INDEXES = (
+    "idx_audit_timestamp",
+    "idx_audit_action",
+    "idx_audit_user",
+    "idx_audit_resource",
+    "idx_audit_action_time",
+)
+
+
+def create_audit_indexes(cursor: sqlite3.Cursor) -> None:
+    """Create the audit_logs indices (and drop the ones they replace)."""
+    for name, columns in AUDIT_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON audit_logs({columns})")
+    for name in _LEGACY_AUDIT_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
 def init_audit_table(conn: sqlite3.Connection) -> None:
     """Initialize the audit_logs table if it doesn't exist.
 
@@ -197,8 +258,14 @@ def init_audit_table(conn: sqlite3.Connection) -> None:
         if _audit_table_initialized:
             return
 
-        cursor = conn.cursor()
-        cursor.execute("""
+        _create_audit_table(conn)
+        _audit_table_initialized = True
+
+
+def _create_audit_table(conn: sqlite3.Connection) -> None:
+    """Create the audit_logs table and its indexes if they don't exist."""
+    cursor = conn.cursor()
+    cursor.execute("""
             CREATE TABLE IF NOT EXISTS audit_logs (
                 id TEXT PRIMARY KEY,
                 timestamp TEXT NOT NULL,
@@ -215,27 +282,49 @@ def init_audit_table(conn: sqlite3.Connection) -> None:
             )
         """)
 
-        # Create indices for common queries
-        # Consider adding composite index for (action, timestamp) for common filter patterns
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_logs(timestamp)"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_logs(action)"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_user ON audit_logs(user_id)"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_resource ON audit_logs(resource_type, resource_id)"
-        )
-        # Composite index for common filter: action + timestamp
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_action_time ON audit_logs(action, timestamp)"
-        )
+    create_audit_indexes(cursor)
 
-        conn.commit()
-        _audit_table_initialized = True
+
+_INSERT_AUDIT_SQL = """
+    INSERT INTO audit_logs (
+        id, timestamp, action, user_id, user_email,
+        resource_type, resource_id, details,
+        ip_address, user_agent, status, error_message
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+AuditRow = tuple[Any, ...]
+
+
+def _audit_row(
+    action: str,
+    user_id: str | None = None,
+    user_email: str | None = None,
+    resource_type: str | None = None,
+    resource_id: str | None = None,
+    details: dict[str, Any] | None = None,
+    ip_address: str | None = None,
+    user_agent: str | None = None,
+    status: str = "success",
+    error_message: str | None = None,
+) -> AuditRow:
+    """Build the audit_logs row for an event, stamped with a new ID and time."""
+    import uuid
+
+    return (
+        str(uuid.uuid4()),
+        datetime.now(timezone.utc).isoformat(),
+        action,
+        user_id,
+        user_email,
+        resource_type,
+        resource_id,
+        json.dumps(details) if details else None,
+        ip_address,
+        user_agent,
+        status,
+        error_message,
+    )
 
 
 def log_audit_event(
@@ -251,42 +340,194 @@ def log_audit_event(
     status: str = "success",
     error_message: str | None = None,
 ) -> str:
-    """Log an audit event to the database.
+    """Log an audit event to the database in the caller's transaction.
+
+    The entry commits together with the caller's changes, so use this when
+    the audit record must be atomic with the change it describes. It only
+    commits itself when the connection had no open transaction. For events
+    that can be written in the background, use record_audit_event().
 
     Returns the audit log entry ID.
     """
-    import uuid
+    row = _audit_row(
+        action,
+        user_id=user_id,
+        user_email=user_email,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        details=details,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        status=status,
+        error_message=error_message,
+    )
 
-    audit_id = str(uuid.uuid4())
-    timestamp = datetime.now(timezone.utc).isoformat()
+    owns_transaction = not conn.in_transaction
+    conn.execute(_INSERT_AUDIT_SQL, row)
+    if owns_transaction:
+        conn.commit()
 
-    cursor = conn.cursor()
-    cursor.execute(
+    return row[0]
+
+
+class AuditSink:
+    """Buffers audit events and writes them in group commits.
+
+    A background thread writes buffered events in one transaction once
+    batch_size events are waiting or the oldest has waited flush_interval_ms,
+    so request handlers never wait on an audit fsync. close() writes
+    whatever is still buffered.
+
+    Args:
+        db_path: Path to the SQLite database
+        batch_size: Buffered events that trigger an immediate flush
+        flush_interval_ms: Longest an event waits in the buffer
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval_ms: int = AUDIT_FLUSH_INTERVAL_MS,
+    ) -> None:
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(1, flush_interval_ms) / 1000
+        self._pending: list[AuditRow] = []
+        self._first_pending_at = 0.0
+        self._condition = threading.Condition()
+        # Serializes flushes so events are written in the order recorded
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        # Per sink, as init_audit_table() only covers the current DB_PATH
+        self._table_ready = False
+
+    def record(self, action: str, sync: bool = False, **fields: Any) -> str:
+        """Buffer an audit event.
+
+        Args:
+            action: The action being logged
+            sync: Write the event (and everything buffered before it)
+                before returning, for compliance-critical actions
+            **fields: Other log_audit_event fields (user_id, details, ...)
+
+        Returns:
+            The audit log entry ID
         """
-        INSERT INTO audit_logs (
-            id, timestamp, action, user_id, user_email,
-            resource_type, resource_id, details,
-            ip_address, user_agent, status, error_message
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            audit_id,
-            timestamp,
-            action,
-            user_id,
-            user_email,
-            resource_type,
-            resource_id,
-            json.dumps(details) if details else None,
-            ip_address,
-            user_agent,
-            status,
-            error_message,
-        ),
-    )
-    conn.commit()
+        row = _audit_row(action, **fields)
+        with self._condition:
+            if self._closed:
+                sync = True
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending.append(row)
+            if not sync:
+                self._ensure_thread()
+                if len(self._pending) >= self.batch_size:
+                    self._condition.notify()
+        if sync:
+            self.flush()
+        return row[0]
+
+    def flush(self) -> None:
+        """Write every buffered event now."""
+        with self._flush_lock:
+            with self._condition:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return
+            try:
+                with get_database(self.db_path).write() as conn:
+                    if not self._table_ready:
+                        _create_audit_table(conn)
+                        self._table_ready = True
+                    conn.executemany(_INSERT_AUDIT_SQL, rows)
+            except sqlite3.Error:
+                # Keep the events for the next flush rather than drop them
+                with self._condition:
+                    self._pending[:0] = rows
+                raise
+
+    def close(self) -> None:
+        """Stop the flush thread and write any buffered events."""
+        with self._condition:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            self._condition.notify()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _ensure_thread(self) -> None:
+        # Caller holds self._condition
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="audit-sink", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if len(self._pending) >= self.batch_size:
+                        break
+                    if self._pending:
+                        wait = self._first_pending_at + self.flush_interval
+                        timeout = wait - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    else:
+                        timeout = None
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Audit flush failed, will retry: {e}")
+                time.sleep(self.flush_interval)
+
+
+_audit_sinks: dict[str, AuditSink] = {}
+_audit_sinks_lock = threading.Lock()
+
+
+def get_audit_sink(db_path: str | None = None) -> AuditSink:
+    """Get the audit sink for db_path (default: the current DB_PATH)."""
+    db_path = db_path or _db_path()
+    key = os.path.abspath(db_path)
+    with _audit_sinks_lock:
+        sink = _audit_sinks.get(key)
+        if sink is None:
+            sink = AuditSink(db_path)
+            _audit_sinks[key] = sink
+        return sink
+
+
+def record_audit_event(
+    action: str, sync: bool = False, db_path: str | None = None, **fields: Any
+) -> str:
+    """Record an audit event through the buffered sink.
 
-    return audit_id
+    Events are written in group commits shortly after the call. Pass
+    sync=True for compliance-critical actions that must be on disk before
+    the request completes, and db_path to write to a database other than
+    the current DB_PATH.
+
+    Returns the audit log entry ID.
+    """
+    return get_audit_sink(db_path).record(action, sync=sync, **fields)
+
+
+def close_audit_sinks() -> None:
+    """Write all buffered audit events and stop the sinks (at shutdown)."""
+    with _audit_sinks_lock:
+        sinks = list(_audit_sinks.values())
+        _audit_sinks.clear()
+    for sink in sinks:
+        sink.close()
 
 
 @router.get("", response_model=AuditLogListResponse)
@@ -304,17 +545,39 @@ async def list_audit_logs(
     ),
     start_date: str | None = Query(default=None, description="Start date (ISO format)"),
     end_date: str | None = Query(default=None, description="End date (ISO format)"),
+    cursor: str | None = Query(
+        default=None, description="next_cursor from the previous page"
+    ),
+    count: str = Query(
+        default="exact",
+        pattern="^(exact|cached|none)$",
+        description="Total count: exact, cached (up to "
+        f"{AUDIT_COUNT_CACHE_TTL_S:g}s stale) or none",
+    ),
 ) -> AuditLogListResponse:
-    """List audit log entries with filtering and pagination."""
+    """List audit log entries with filtering and pagination.
+
+    Entries are newest first. Pass next_cursor back as cursor to page by
+    (timestamp, id), which stays fast at any depth; offset is still
+    accepted but ignored when a cursor is given. The separate COUNT(*) can
+    be served from a short-lived cache (count=cached) or skipped
+    (count=none) when the caller doesn't need an exact total.
+    """
     # Validate date parameters
     if start_date:
         validate_iso_date(start_date, "start_date")
     if end_date:
         validate_iso_date(end_date, "end_date")
+    cursor_values: tuple[str, str] | None = None
+    if cursor:
+        try:
+            cursor_values = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     with get_db_context() as conn:
         init_audit_table(conn)
-        cursor = conn.cursor()
+        db_cursor = conn.cursor()
 
         # Build query with filters
         conditions = []
@@ -351,28 +614,48 @@ async def list_audit_logs(
         where_clause = " AND ".join(conditions) if conditions else "1=1"
 
         # SAFETY NOTE: The where_clause is constructed from hardcoded column names only
-        # (action, user_id, resource_type, resource_id, status, timestamp).
+        # (action, user_id, resource_type, resource_id, status, timestamp, id).
         # User input is passed via parameterized queries (?), preventing SQL injection.
-        # Get total count
-        cursor.execute(f"SELECT COUNT(*) FROM audit_logs WHERE {where_clause}", params)
-        total = cursor.fetchone()[0]
+        def count_entries() -> int:
+            db_cursor.execute(
+                f"SELECT COUNT(*) FROM audit_logs WHERE {where_clause}", params
+            )
+            return db_cursor.fetchone()[0]
+
+        total: int | None = None
+        if count == "exact":
+            total = count_entries()
+        elif count == "cached":
+            db_path = os.path.abspath(_db_path())
+            total = _count_cache.get(
+                (db_path, where_clause, tuple(params)), count_entries
+            )
+
+        page_where = where_clause
+        page_params = list(params)
+        if cursor_values:
+            page_where += f" AND {keyset_condition('timestamp', 'id')}"
+            page_params.extend(cursor_values)
+            offset = 0
 
         # Get entries
-        cursor.execute(
+        db_cursor.execute(
             f"""
             SELECT id, timestamp, action, user_id, user_email,
                    resource_type, resource_id, details,
                    ip_address, user_agent, status, error_message
             FROM audit_logs
-            WHERE {where_clause}
-            ORDER BY timestamp DESC
+            WHERE {page_where}
+            ORDER BY timestamp DESC, id DESC
             LIMIT ? OFFSET ?
             """,
-            params + [limit, offset],
+            page_params + [limit + 1, offset],
         )
+        rows = db_cursor.fetchall()
+        page_cursor = next_cursor(rows, limit, key=lambda row: (row[1], row[0]))
 
         entries = []
-        for row in cursor.fetchall():
+        for row in rows:
             details = None
             if row[7]:
                 try:
@@ -411,6 +694,7 @@ async def list_audit_logs(
             "start_date": start_date,
             "end_date": end_date,
         },
+        next_cursor=page_cursor,
     )
 
 
@@ -506,164 +790,217 @@ async def get_audit_stats(
     )
 
 
+# Header row of CSV exports, in _EXPORT_COLUMNS order
+_CSV_HEADER = [
+    "ID",
+    "Timestamp",
+    "Action",
+    "User ID",
+    "User Email",
+    "Resource Type",
+    "Resource ID",
+    "Details",
+    "IP Address",
+    "User Agent",
+    "Status",
+    "Error Message",
+]
+
+_EXPORT_COLUMNS = """id, timestamp, action, user_id, user_email,
+                   resource_type, resource_id, details,
+                   ip_address, user_agent, status, error_message"""
+
+
+def _export_rows(
+    db_path: str, where_clause: str, params: list[Any], limit: int | None
+) -> Generator[list[tuple], None, None]:
+    """Yield matching audit rows, newest first, EXPORT_FETCH_SIZE at a time.
+
+    Uses its own read-only connection rather than the per-thread pool:
+    StreamingResponse pulls each chunk from whichever worker thread is free,
+    and the cursor has to survive across them. The read transaction gives
+    the whole export one consistent snapshot.
+    """
+    conn = connect(db_path, query_only=True)
+    try:
+        # SAFETY NOTE: where_clause uses hardcoded column names; user input is parameterized
+        cursor = conn.execute(
+            f"""
+            SELECT {_EXPORT_COLUMNS}
+            FROM audit_logs
+            WHERE {where_clause}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+            """,
+            params + [limit if limit is not None else -1],
+        )
+        while batch := cursor.fetchmany(EXPORT_FETCH_SIZE):
+            yield batch
+    finally:
+        conn.close()
+
+
+def _export_entry(row: tuple) -> dict[str, Any]:
+    """JSON export entry for an audit row."""
+    details = None
+    if row[7]:
+        try:
+            details = json.loads(row[7])
+        except json.JSONDecodeError:
+            details = {"raw": row[7]}
+
+    return {
+        "id": row[0],
+        "timestamp": row[1],
+        "action": row[2],
+        "user_id": row[3],
+        "user_email": row[4],
+        "resource_type": row[5],
+        "resource_id": row[6],
+        "details": details,
+        "ip_address": row[8],
+        "user_agent": row[9],
+        "status": row[10] or "success",
+        "error_message": row[11],
+    }
+
+
+def _encode_csv(batches: Iterator[list[tuple]]) -> Iterator[str]:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(_CSV_HEADER)
+    for batch in batches:
+        writer.writerows(batch)
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate()
+    yield output.getvalue()
+
+
+def _encode_json(batches: Iterator[list[tuple]], exported_at: str) -> Iterator[str]:
+    yield '{"audit_logs": ['
+    separator = "\n"
+    for batch in batches:
+        chunk = []
+        for row in batch:
+            chunk.append(separator + json.dumps(_export_entry(row)))
+            separator = ",\n"
+        yield "".join(chunk)
+    yield f'\n], "exported_at": {json.dumps(exported_at)}}}\n'
+
+
+def _gzip_chunks(chunks: Iterator[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 @router.get("/export")
 async def export_audit_logs(
     format: str = Query(default="csv", description="Export format: csv or json"),
     start_date: str | None = Query(default=None, description="Start date (ISO format)"),
     end_date: str | None = Query(default=None, description="End date (ISO format)"),
     action: str | None = Query(default=None, description="Filter by action type"),
-    limit: int = Query(
-        default=MAX_EXPORT_ROWS,
-        ge=1,
-        le=MAX_EXPORT_ROWS,
-        description=f"Maximum rows to export (max {MAX_EXPORT_ROWS})",
+    limit: int | None = Query(
+        default=None, ge=1, description="Maximum rows to export (default: all)"
     ),
-) -> Response:
+    compress: bool = Query(default=False, description="Gzip the export file"),
+    before: str | None = Query(
+        default=None,
+        description="Resume an interrupted export: timestamp of the last row received",
+    ),
+    before_id: str | None = Query(
+        default=None, description="ID of the last row received (with before)"
+    ),
+) -> StreamingResponse:
     """Export audit logs for compliance review.
 
-    Returns CSV or JSON format for external analysis tools.
-    Limited to MAX_EXPORT_ROWS rows to prevent memory issues.
-    For larger exports, use date range filters to batch the export.
+    Returns CSV or JSON format for external analysis tools, newest entries
+    first. Rows are read EXPORT_FETCH_SIZE at a time and encoded as they
+    are sent, so memory use does not grow with the size of the export;
+    compress=true gzips the stream on the fly (a .gz download).
+
+    An interrupted export can be resumed: pass the timestamp and ID of the
+    last row received as before and before_id, and the new export starts
+    with the row after it.
     """
     # Validate date parameters
     if start_date:
         validate_iso_date(start_date, "start_date")
     if end_date:
         validate_iso_date(end_date, "end_date")
-
-    with get_db_context() as conn:
-        init_audit_table(conn)
-        cursor = conn.cursor()
-
-        # Log the export action itself
-        log_audit_event(
-            conn,
-            action=AuditAction.EXPORT_AUDIT.value,
-            resource_type="audit_logs",
-            details={
-                "format": format,
-                "start_date": start_date,
-                "end_date": end_date,
-                "action_filter": action,
-            },
+    if before_id and not before:
+        raise HTTPException(
+            status_code=400, detail="before_id requires before (a timestamp)"
         )
 
-        # Build query with filters
-        conditions = []
-        params: list[Any] = []
+    # Log the export action itself; sync also writes any buffered events
+    # (creating the table if needed) so the export is complete
+    record_audit_event(
+        AuditAction.EXPORT_AUDIT.value,
+        sync=True,
+        resource_type="audit_logs",
+        details={
+            "format": format,
+            "start_date": start_date,
+            "end_date": end_date,
+            "action_filter": action,
+            "resume_before": before,
+        },
+    )
 
-        if start_date:
-            conditions.append("timestamp >= ?")
-            params.append(start_date)
+    # Build query with filters
+    conditions = []
+    params: list[Any] = []
 
-        if end_date:
-            conditions.append("timestamp <= ?")
-            params.append(end_date)
+    if start_date:
+        conditions.append("timestamp >= ?")
+        params.append(start_date)
 
-        if action:
-            conditions.append("action = ?")
-            params.append(action)
+    if end_date:
+        conditions.append("timestamp <= ?")
+        params.append(end_date)
 
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
+    if action:
+        conditions.append("action = ?")
+        params.append(action)
 
-        # SAFETY NOTE: where_clause uses hardcoded column names; user input is parameterized
-        cursor.execute(
-            f"""
-            SELECT id, timestamp, action, user_id, user_email,
-                   resource_type, resource_id, details,
-                   ip_address, user_agent, status, error_message
-            FROM audit_logs
-            WHERE {where_clause}
-            ORDER BY timestamp DESC
-            LIMIT ?
-            """,
-            params + [limit],
-        )
+    if before and before_id:
+        conditions.append(keyset_condition("timestamp", "id"))
+        params.extend([before, before_id])
+    elif before:
+        conditions.append("timestamp < ?")
+        params.append(before)
 
-        rows = cursor.fetchall()
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
 
+    now = datetime.now(timezone.utc)
+    batches = _export_rows(_db_path(), where_clause, params, limit)
     if format == "json":
-        # JSON export
-        entries = []
-        for row in rows:
-            details = None
-            if row[7]:
-                try:
-                    details = json.loads(row[7])
-                except json.JSONDecodeError:
-                    details = {"raw": row[7]}
-
-            entries.append(
-                {
-                    "id": row[0],
-                    "timestamp": row[1],
-                    "action": row[2],
-                    "user_id": row[3],
-                    "user_email": row[4],
-                    "resource_type": row[5],
-                    "resource_id": row[6],
-                    "details": details,
-                    "ip_address": row[8],
-                    "user_agent": row[9],
-                    "status": row[10] or "success",
-                    "error_message": row[11],
-                }
-            )
-
-        content = json.dumps(
-            {
-                "audit_logs": entries,
-                "exported_at": datetime.now(timezone.utc).isoformat(),
-            },
-            indent=2,
-        )
-        filename = (
-            f"audit_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.json"
-        )
-
-        return Response(
-            content=content,
-            media_type="application/json",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
-
+        chunks = _encode_json(batches, now.isoformat())
+        media_type = "application/json"
+        extension = "json"
     else:
         # CSV export (default)
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Header row
-        writer.writerow(
-            [
-                "ID",
-                "Timestamp",
-                "Action",
-                "User ID",
-                "User Email",
-                "Resource Type",
-                "Resource ID",
-                "Details",
-                "IP Address",
-                "User Agent",
-                "Status",
-                "Error Message",
-            ]
-        )
-
-        # Data rows
-        for row in rows:
-            writer.writerow(row)
-
-        content = output.getvalue()
-        filename = (
-            f"audit_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.csv"
-        )
-
-        return Response(
-            content=content,
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        chunks = _encode_csv(batches)
+        media_type = "text/csv"
+        extension = "csv"
+
+    filename = f"audit_export_{now.strftime('%Y%m%d_%H%M%S')}.{extension}"
+    body: Iterator[str] | Iterator[bytes] = chunks
+    if compress:
+        body = _gzip_chunks(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 @router.get("/actions")
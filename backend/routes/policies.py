@@ -6,12 +6,17 @@ including upload, filtering, and deletion of policy documents.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import json
 import logging
+import queue
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, model_validator
 
 from rag import get_store
@@ -21,6 +26,15 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["policies"])
 
+# Documents per JSON bulk upload; larger corpora use the NDJSON stream
+BULK_UPLOAD_MAX_DOCUMENTS = 1000
+
+# Largest single document line accepted by the streaming upload
+STREAM_MAX_LINE_BYTES = 5 * 1024 * 1024
+
+# Parsed documents handed to the indexer at a time while streaming
+STREAM_BATCH_SIZE = 256
+
 
 # Pydantic models for request/response
 class SearchQuery(BaseModel):
@@ -101,7 +115,10 @@ async def search_policies(query: SearchQuery):
     # Use date-aware search if effective_date specified
     if query.effective_date:
         results = store.search_current_policies(
-            query.query, query.effective_date, n_results=query.n_results
+            query.query,
+            query.effective_date,
+            n_results=query.n_results,
+            filters=filters,
         )
     else:
         results = store.search(query.query, n_results=query.n_results, filters=filters)
@@ -272,6 +289,12 @@ async def list_policy_types():
     }
 
 
+@router.get("/policies/cache")
+async def get_retrieval_cache_stats():
+    """Hit/miss metrics for the RAG search result and query embedding caches."""
+    return get_store().retrieval_cache_stats()
+
+
 @router.get("/policies/{document_id}")
 async def get_policy_document(document_id: str):
     """Get a specific policy document by ID.
@@ -643,12 +666,80 @@ async def get_policy_sync_history(
         )
 
 
+def _policy_document(doc: Any, index: int, source_type: Any) -> tuple[Any, dict | None]:
+    """Convert one uploaded document to a PolicyDocument.
+
+    Returns:
+        (PolicyDocument, None), or (None, skip record) if it is invalid
+    """
+    from scheduler.cms_policy_sync import PolicyDocument
+
+    if not isinstance(doc, dict):
+        return None, {
+            "index": index,
+            "title": f"document_{index}",
+            "reason": "not a JSON object",
+        }
+    if not doc.get("content") or not doc.get("title"):
+        reason = []
+        if not doc.get("content"):
+            reason.append("missing content")
+        if not doc.get("title"):
+            reason.append("missing title")
+        return None, {
+            "index": index,
+            "title": doc.get("title", f"document_{index}"),
+            "reason": ", ".join(reason),
+        }
+
+    return (
+        PolicyDocument(
+            content=doc["content"],
+            title=doc["title"],
+            source=source_type,
+            source_url=doc.get("source_url"),
+            policy_key=doc.get("policy_key"),
+            effective_date=doc.get("effective_date"),
+            expires_date=doc.get("expires_date"),
+            authority=doc.get("authority", "CMS"),
+            document_type=doc.get("document_type", "policy"),
+            keywords=doc.get("keywords"),
+            related_codes=doc.get("related_codes"),
+        ),
+        None,
+    )
+
+
+def _policy_source(source_type: str) -> Any:
+    from scheduler.cms_policy_sync import PolicySource
+
+    try:
+        return PolicySource(source_type)
+    except ValueError:
+        return PolicySource.CUSTOM
+
+
+def _bulk_upload_response(result: Any, skipped_docs: list[dict]) -> dict[str, Any]:
+    return {
+        "success": not result.errors,
+        "documents_processed": result.documents_found,
+        "documents_added": result.documents_added,
+        "documents_updated": result.documents_updated,
+        "documents_skipped": result.documents_skipped + len(skipped_docs),
+        "skipped_documents": skipped_docs[:20],  # Limit to first 20 skipped
+        "errors": result.errors[:10] if result.errors else [],  # Limit errors returned
+        "duration_seconds": round(result.duration_seconds, 2),
+    }
+
+
 @router.post("/policies/bulk-upload")
 async def bulk_upload_policies(request: BulkPolicyUploadRequest):
     """Bulk upload policy documents for sync.
 
     This endpoint accepts a list of policy documents and indexes them
-    into ChromaDB using the policy sync infrastructure.
+    into ChromaDB using the policy sync infrastructure, in batches with
+    one embedding call and one write each. For corpora larger than
+    BULK_UPLOAD_MAX_DOCUMENTS use /policies/bulk-upload/stream.
 
     Each document should have:
     - content: The policy text
@@ -661,67 +752,36 @@ async def bulk_upload_policies(request: BulkPolicyUploadRequest):
 
     Security Note:
         This endpoint should be protected with authentication and rate limiting
-        in production. Currently limited to 100 documents per request to prevent
-        abuse, but additional controls (API keys, request quotas) are recommended.
+        in production. Currently limited to BULK_UPLOAD_MAX_DOCUMENTS documents
+        per request to prevent abuse, but additional controls (API keys,
+        request quotas) are recommended.
 
     Returns:
         Summary of sync results including skipped documents with reasons.
     """
     try:
-        from scheduler.cms_policy_sync import (
-            CMSPolicySyncer,
-            PolicyDocument,
-            PolicySource,
-        )
+        from scheduler.cms_policy_sync import CMSPolicySyncer
 
         if not request.documents:
             raise HTTPException(status_code=400, detail="No documents provided")
 
-        if len(request.documents) > 100:
+        if len(request.documents) > BULK_UPLOAD_MAX_DOCUMENTS:
             raise HTTPException(
                 status_code=400,
-                detail="Maximum 100 documents per request. Use multiple requests for larger batches.",
+                detail=f"Maximum {BULK_UPLOAD_MAX_DOCUMENTS} documents per request. "
+                "Use /api/policies/bulk-upload/stream for larger uploads.",
             )
 
         # Convert to PolicyDocument objects, tracking skipped docs
+        source_type = _policy_source(request.source_type)
         policy_docs = []
         skipped_docs = []
         for i, doc in enumerate(request.documents):
-            if not doc.get("content") or not doc.get("title"):
-                reason = []
-                if not doc.get("content"):
-                    reason.append("missing content")
-                if not doc.get("title"):
-                    reason.append("missing title")
-                skipped_docs.append(
-                    {
-                        "index": i,
-                        "title": doc.get("title", f"document_{i}"),
-                        "reason": ", ".join(reason),
-                    }
-                )
-                continue
-
-            try:
-                source_type = PolicySource(request.source_type)
-            except ValueError:
-                source_type = PolicySource.CUSTOM
-
-            policy_docs.append(
-                PolicyDocument(
-                    content=doc["content"],
-                    title=doc["title"],
-                    source=source_type,
-                    source_url=doc.get("source_url"),
-                    policy_key=doc.get("policy_key"),
-                    effective_date=doc.get("effective_date"),
-                    expires_date=doc.get("expires_date"),
-                    authority=doc.get("authority", "CMS"),
-                    document_type=doc.get("document_type", "policy"),
-                    keywords=doc.get("keywords"),
-                    related_codes=doc.get("related_codes"),
-                )
-            )
+            policy_doc, skipped = _policy_document(doc, i, source_type)
+            if skipped:
+                skipped_docs.append(skipped)
+            else:
+                policy_docs.append(policy_doc)
 
         if not policy_docs:
             raise HTTPException(
@@ -729,28 +789,16 @@ async def bulk_upload_policies(request: BulkPolicyUploadRequest):
                 detail="No valid documents found. Each document requires 'content' and 'title'.",
             )
 
-        # Sync using the CMS syncer
+        # Sync using the CMS syncer, off the event loop
         syncer = CMSPolicySyncer()
-        result = syncer.sync_source(
-            source=PolicySource(request.source_type)
-            if request.source_type in [s.value for s in PolicySource]
-            else PolicySource.CUSTOM,
+        result = await run_in_threadpool(
+            syncer.sync_source,
+            source=source_type,
             documents=policy_docs,
             force=True,
         )
 
-        return {
-            "success": not result.errors,
-            "documents_processed": result.documents_found,
-            "documents_added": result.documents_added,
-            "documents_updated": result.documents_updated,
-            "documents_skipped": result.documents_skipped + len(skipped_docs),
-            "skipped_documents": skipped_docs[:20],  # Limit to first 20 skipped
-            "errors": result.errors[:10]
-            if result.errors
-            else [],  # Limit errors returned
-            "duration_seconds": round(result.duration_seconds, 2),
-        }
+        return _bulk_upload_response(result, skipped_docs)
 
     except HTTPException:
         raise
@@ -761,6 +809,102 @@ async def bulk_upload_policies(request: BulkPolicyUploadRequest):
         )
 
 
+async def _ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    """Non-empty lines of a streamed request body."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > STREAM_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Document line exceeds {STREAM_MAX_LINE_BYTES} bytes",
+            )
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+@router.post("/policies/bulk-upload/stream")
+async def stream_bulk_upload_policies(
+    request: Request,
+    source_type: str = Query(
+        "mln_matters", description="Policy source for all documents"
+    ),
+):
+    """Bulk upload an unbounded number of policy documents as NDJSON.
+
+    The body is newline-delimited JSON, one document object per line with
+    the fields accepted by /policies/bulk-upload. Documents are indexed in
+    batches while the body is still arriving, so the upload is never held
+    in memory; reading pauses while the indexer catches up.
+
+    Returns:
+        Summary of sync results including skipped documents with reasons.
+    """
+    try:
+        from scheduler.cms_policy_sync import CMSPolicySyncer
+    except ImportError:
+        raise HTTPException(status_code=503, detail="Policy sync module not available")
+
+    source = _policy_source(source_type)
+    skipped_docs: list[dict] = []
+    # Bounded so a fast client can't outrun the indexer
+    batches: queue.Queue = queue.Queue(maxsize=2)
+
+    def documents():
+        while (batch := batches.get()) is not None:
+            yield from batch
+
+    sync = asyncio.ensure_future(
+        run_in_threadpool(
+            CMSPolicySyncer().sync_source,
+            source=source,
+            documents=documents(),
+            force=True,
+        )
+    )
+
+    def hand_over(batch: list | None) -> None:
+        # Stop waiting if the sync has ended (it no longer drains the queue)
+        while not sync.done():
+            try:
+                batches.put(batch, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    try:
+        batch: list = []
+        index = 0
+        async for line in _ndjson_lines(request):
+            try:
+                doc = json.loads(line)
+            except json.JSONDecodeError:
+                doc = None
+            policy_doc, skipped = _policy_document(doc, index, source)
+            if skipped:
+                if doc is None:
+                    skipped["reason"] = "invalid JSON"
+                skipped_docs.append(skipped)
+            else:
+                batch.append(policy_doc)
+            index += 1
+            if len(batch) >= STREAM_BATCH_SIZE:
+                await run_in_threadpool(hand_over, batch)
+                batch = []
+        if batch:
+            await run_in_threadpool(hand_over, batch)
+    finally:
+        # End the document stream even if reading the body failed
+        await run_in_threadpool(hand_over, None)
+
+    result = await sync
+    return _bulk_upload_response(result, skipped_docs)
+
+
 @router.get("/policies/sync/sources")
 async def list_sync_sources():
     """List available policy sync sources.
@@ -8,13 +8,14 @@ from __future__ import annotations
 
 import json
 import logging
-import sqlite3
 from collections import defaultdict
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query
 
 from config import DB_PATH
+from database import get_database
+from rules.hit_stats import ensure_rule_stats, result_totals
 
 logger = logging.getLogger(__name__)
 
@@ -44,11 +45,11 @@ async def get_rule_stats(limit: int = Query(default=50, le=100)):
     - Top N most triggered rules
     """
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            # Get total claims count
-            cursor = conn.execute("SELECT COUNT(*) FROM results")
-            row = cursor.fetchone()
-            total_claims = row[0] if row else 0
+        db = get_database(DB_PATH)
+        ensure_rule_stats(db)
+        with db.read() as conn:
+            totals = result_totals(conn)
+            total_claims = totals["claims"]
 
             if total_claims == 0:
                 return {
@@ -59,44 +60,46 @@ async def get_rule_stats(limit: int = Query(default=50, le=100)):
                     "average_rules_per_claim": 0,
                 }
 
-            # Aggregate rule statistics by iterating through results
-            rule_counts: dict[str, int] = defaultdict(int)
-            type_counts: dict[str, int] = defaultdict(int)
-            severity_counts: dict[str, int] = defaultdict(int)
-            total_hits = 0
-
-            cursor = conn.execute("SELECT rule_hits FROM results")
-            for (rule_hits_json,) in cursor:
-                hits = safe_json_loads(rule_hits_json, [])
-                for hit in hits:
-                    rule_id = hit.get("rule_id", "unknown")
-                    rule_type = hit.get("rule_type", "unknown")
-                    severity = hit.get("severity", "medium")
-
-                    rule_counts[rule_id] += 1
-                    type_counts[rule_type] += 1
-                    severity_counts[severity] += 1
-                    total_hits += 1
-
-            # Build response
+            # Read the materialized per-rule aggregates
+            total_hits = totals["rule_hits"]
+            cursor = conn.execute(
+                """
+                SELECT rule_id, SUM(hit_count) AS count
+                FROM rule_hit_stats
+                GROUP BY rule_id
+                ORDER BY count DESC
+                LIMIT ?
+                """,
+                (limit,),
+            )
             rules_by_frequency = [
                 {
                     "rule_id": rule_id,
                     "count": count,
                     "percentage": round(count / total_claims * 100, 2),
                 }
-                for rule_id, count in sorted(
-                    rule_counts.items(), key=lambda x: x[1], reverse=True
-                )[:limit]
+                for rule_id, count in cursor
             ]
+            type_counts = dict(
+                conn.execute(
+                    "SELECT rule_type, SUM(hit_count) FROM rule_hit_stats "
+                    "GROUP BY rule_type"
+                )
+            )
+            severity_counts = dict(
+                conn.execute(
+                    "SELECT severity, SUM(hit_count) FROM rule_hit_stats "
+                    "GROUP BY severity"
+                )
+            )
 
             return {
                 "total_claims_analyzed": total_claims,
                 "total_rule_hits": total_hits,
                 "average_rules_per_claim": round(total_hits / total_claims, 2),
                 "rules_by_frequency": rules_by_frequency,
-                "rules_by_type": dict(type_counts),
-                "rules_by_severity": dict(severity_counts),
+                "rules_by_type": type_counts,
+                "rules_by_severity": severity_counts,
             }
 
     except Exception as e:
@@ -149,7 +152,7 @@ async def get_field_coverage():
     helping identify data quality issues.
     """
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with get_database(DB_PATH).read() as conn:
             cursor = conn.execute(
                 """
                 SELECT j.claim_data
@@ -258,43 +261,36 @@ async def get_rule_effectiveness():
     and their average weight contribution.
     """
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.execute("SELECT rule_hits, fraud_score FROM results")
-
-            rule_impacts: dict[str, list[float]] = defaultdict(list)
-            rule_weights: dict[str, list[float]] = defaultdict(list)
-
-            for rule_hits_json, fraud_score in cursor:
-                hits = safe_json_loads(rule_hits_json, [])
-                for hit in hits:
-                    rule_id = hit.get("rule_id", "unknown")
-                    weight = hit.get("weight", 0)
-
-                    rule_impacts[rule_id].append(fraud_score)
-                    rule_weights[rule_id].append(weight)
-
-            if not rule_impacts:
-                return {
-                    "rules": [],
-                    "total_rules_fired": 0,
-                }
+        db = get_database(DB_PATH)
+        ensure_rule_stats(db)
+        with db.read() as conn:
+            cursor = conn.execute(
+                """
+                SELECT rule_id, SUM(hit_count), SUM(weight_sum), SUM(score_sum)
+                FROM rule_hit_stats
+                GROUP BY rule_id
+                """
+            )
 
-            # Calculate effectiveness metrics
+            # Calculate effectiveness metrics from the per-rule sums
             effectiveness = []
-            for rule_id in rule_impacts:
-                impacts = rule_impacts[rule_id]
-                weights = rule_weights[rule_id]
-
+            for rule_id, times_fired, weight_sum, score_sum in cursor:
                 effectiveness.append(
                     {
                         "rule_id": rule_id,
-                        "times_fired": len(impacts),
-                        "avg_weight": round(sum(weights) / len(weights), 4),
-                        "total_weight_contribution": round(sum(weights), 4),
-                        "avg_claim_score": round(sum(impacts) / len(impacts), 4),
+                        "times_fired": times_fired,
+                        "avg_weight": round(weight_sum / times_fired, 4),
+                        "total_weight_contribution": round(weight_sum, 4),
+                        "avg_claim_score": round(score_sum / times_fired, 4),
                     }
                 )
 
+            if not effectiveness:
+                return {
+                    "rules": [],
+                    "total_rules_fired": 0,
+                }
+
             # Sort by total impact
             effectiveness.sort(
                 key=lambda x: abs(x["total_weight_contribution"]), reverse=True
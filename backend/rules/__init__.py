@@ -1,15 +1,31 @@
 """Rules engine for healthcare fraud detection."""
 
-from .engine import evaluate_baseline
-from .models import BaselineOutcome, DecisionOutcome, RuleContext, RuleHit, RuleResult
+from .engine import BatchEvaluator, evaluate_baseline, evaluate_batch
+from .models import (
+    BaselineOutcome,
+    BatchItemOutcome,
+    DecisionOutcome,
+    RuleContext,
+    RuleHit,
+    RuleResult,
+)
+from .ncci_index import NCCIPairIndex, PairEdit
+from .reference_store import ReferenceTable, write_reference_table
 from .thresholds import ThresholdConfig
 
 __all__ = [
     "evaluate_baseline",
+    "evaluate_batch",
+    "BatchEvaluator",
     "BaselineOutcome",
+    "BatchItemOutcome",
     "DecisionOutcome",
     "RuleContext",
     "RuleHit",
     "RuleResult",
+    "NCCIPairIndex",
+    "PairEdit",
+    "ReferenceTable",
+    "write_reference_table",
     "ThresholdConfig",
 ]
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(rule_ids=["COB_WRONG_PRIMARY"])
 def cob_wrong_primary_rule(context: RuleContext) -> list[RuleHit]:
     """Check if claim is submitted to wrong primary payer."""
     claim = context.claim
@@ -44,6 +46,7 @@ def cob_wrong_primary_rule(context: RuleContext) -> list[RuleHit]:
     return []
 
 
+@requires(rule_ids=["COB_INCOMPLETE"])
 def cob_incomplete_rule(context: RuleContext) -> list[RuleHit]:
     """Check if COB information is incomplete when multiple payers exist."""
     claim = context.claim
@@ -6,8 +6,10 @@ from collections.abc import Sequence
 from typing import Any
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(datasets=["lcd"], claim_fields=["items"], rule_ids=["LCD_MISMATCH"])
 def lcd_coverage_rule(context: RuleContext) -> list[RuleHit]:
     """Check if procedures have covered diagnoses per LCD/NCD."""
     dataset = context.datasets.get("lcd", {})
@@ -39,6 +41,11 @@ def lcd_coverage_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["lcd"],
+    claim_fields=["items"],
+    rule_ids=["LCD_AGE_CONFLICT", "LCD_GENDER_CONFLICT"],
+)
 def lcd_age_gender_rule(context: RuleContext) -> list[RuleHit]:
     """Check for age or gender conflicts with LCD guidance."""
     dataset = context.datasets.get("lcd", {})
@@ -98,6 +105,7 @@ def lcd_age_gender_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(datasets=["lcd"], claim_fields=["items"], rule_ids=["LCD_EXPERIMENTAL"])
 def lcd_experimental_rule(context: RuleContext) -> list[RuleHit]:
     """Flag experimental or investigational procedures."""
     dataset = context.datasets.get("lcd", {})
@@ -121,6 +129,9 @@ def lcd_experimental_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["mpfs"], claim_fields=["items"], rule_ids=["GLOBAL_SURGERY_NO_MODIFIER"]
+)
 def global_surgery_modifier_rule(context: RuleContext) -> list[RuleHit]:
     """Check for missing modifiers on global surgery codes with E/M services."""
     mpfs: dict[str, dict[str, Any]] = context.datasets.get("mpfs", {})
@@ -5,8 +5,10 @@ from __future__ import annotations
 from collections import Counter
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(claim_fields=["items"], rule_ids=["DUPLICATE_LINE"])
 def duplicate_line_rule(context: RuleContext) -> list[RuleHit]:
     """Detect duplicate procedure codes on the same claim."""
     items = context.claim.get("items", [])
@@ -34,6 +36,7 @@ def duplicate_line_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(datasets=["claim_history"], rule_ids=["DUPLICATE_EXACT"])
 def duplicate_exact_rule(context: RuleContext) -> list[RuleHit]:
     """Detect exact duplicate claims (same provider, member, service, date, amount)."""
     claim_history = context.datasets.get("claim_history", {})
@@ -68,6 +71,7 @@ def duplicate_exact_rule(context: RuleContext) -> list[RuleHit]:
     return []
 
 
+@requires(claim_fields=["items"], rule_ids=["DUPLICATE_SAME_DAY"])
 def duplicate_same_day_rule(context: RuleContext) -> list[RuleHit]:
     """Detect same-service same-day duplicates without modifier."""
     items = context.claim.get("items", [])
@@ -104,6 +108,11 @@ def duplicate_same_day_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["cross_claim_history"],
+    claim_fields=["member.member_id", "provider.npi"],
+    rule_ids=["DUPLICATE_CROSS_CLAIM"],
+)
 def duplicate_cross_claim_rule(context: RuleContext) -> list[RuleHit]:
     """Detect services billed on separate claims for the same date."""
     cross_claim_history = context.datasets.get("cross_claim_history", {})
@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 from utils import parse_flexible_date
 
 
+@requires(
+    datasets=["member_eligibility"],
+    claim_fields=["member.member_id"],
+    rule_ids=["ELIGIBILITY_INACTIVE"],
+)
 def eligibility_inactive_rule(context: RuleContext) -> list[RuleHit]:
     """Check if member was eligible on date of service."""
     member_eligibility = context.datasets.get("member_eligibility", {})
@@ -82,6 +88,11 @@ def eligibility_inactive_rule(context: RuleContext) -> list[RuleHit]:
     return []
 
 
+@requires(
+    datasets=["benefit_exclusions"],
+    claim_fields=["member.plan_id", "items"],
+    rule_ids=["ELIGIBILITY_NON_COVERED"],
+)
 def eligibility_non_covered_rule(context: RuleContext) -> list[RuleHit]:
     """Check if services are covered under member's benefit plan."""
     benefit_exclusions = context.datasets.get("benefit_exclusions", {})
@@ -118,6 +129,11 @@ def eligibility_non_covered_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["benefit_limits"],
+    claim_fields=["member.member_id", "member.plan_id", "items"],
+    rule_ids=["ELIGIBILITY_LIMIT_EXCEEDED"],
+)
 def eligibility_benefit_limit_rule(context: RuleContext) -> list[RuleHit]:
     """Check if service exceeds annual or lifetime benefit limits."""
     benefit_limits = context.datasets.get("benefit_limits", {})
@@ -198,6 +214,11 @@ def eligibility_benefit_limit_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["auth_required_codes"],
+    claim_fields=["member.member_id", "items"],
+    rule_ids=["ELIGIBILITY_NO_AUTH"],
+)
 def eligibility_no_auth_rule(context: RuleContext) -> list[RuleHit]:
     """Check if prior authorization is required but missing."""
     auth_required = context.datasets.get("auth_required_codes", set())
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(claim_fields=["items"])
 def high_dollar_rule(context: RuleContext) -> list[RuleHit]:
     """Flag claims exceeding high-dollar thresholds."""
     tiers = context.config.get("high_dollar_tiers", [(10000, 0.1), (25000, 0.15)])
@@ -31,6 +33,7 @@ def high_dollar_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(datasets=["mpfs"], claim_fields=["items"], rule_ids=["REIMB_OUTLIER"])
 def reimbursement_outlier_rule(context: RuleContext) -> list[RuleHit]:
     """Flag line items exceeding MPFS benchmark by configured percentile."""
     mpfs: dict[str, dict[str, dict[str, float]]] = context.datasets.get("mpfs", {})
@@ -67,6 +70,7 @@ def reimbursement_outlier_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(claim_fields=["items"], rule_ids=["MISC_CODE"])
 def misc_code_rule(context: RuleContext) -> list[RuleHit]:
     """Flag unlisted/miscellaneous procedure codes.
 
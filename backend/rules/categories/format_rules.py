@@ -6,9 +6,11 @@ import re
 from datetime import datetime
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 from utils import parse_flexible_date
 
 
+@requires(rule_ids=["FORMAT_MISSING_FIELD"])
 def format_missing_field_rule(context: RuleContext) -> list[RuleHit]:
     """Check for missing or invalid required claim fields."""
     hits: list[RuleHit] = []
@@ -66,6 +68,7 @@ def format_missing_field_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(rule_ids=["FORMAT_INVALID_DATE"])
 def format_invalid_date_rule(context: RuleContext) -> list[RuleHit]:
     """Validate date formats and logical date relationships."""
     hits: list[RuleHit] = []
@@ -149,6 +152,7 @@ def format_invalid_date_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(rule_ids=["FORMAT_INVALID_CODE"])
 def format_invalid_code_rule(context: RuleContext) -> list[RuleHit]:
     """Validate ICD-10 and CPT/HCPCS code formats."""
     hits: list[RuleHit] = []
@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(
+    datasets=["oig_exclusions"], claim_fields=["provider"], rule_ids=["OIG_EXCLUSION"]
+)
 def oig_exclusion_rule(context: RuleContext) -> list[RuleHit]:
     """Check if provider NPI is on OIG exclusion list."""
     exclusions = context.datasets.get("oig_exclusions", set())
@@ -26,6 +30,7 @@ def oig_exclusion_rule(context: RuleContext) -> list[RuleHit]:
     return []
 
 
+@requires(datasets=["fwa_watchlist"], claim_fields=["provider"], rule_ids=["FWA_WATCH"])
 def fwa_watchlist_rule(context: RuleContext) -> list[RuleHit]:
     """Check if provider NPI is on internal fraud watchlist."""
     watchlist = context.datasets.get("fwa_watchlist", set())
@@ -47,6 +52,11 @@ def fwa_watchlist_rule(context: RuleContext) -> list[RuleHit]:
     return []
 
 
+@requires(
+    datasets=["provider_history"],
+    claim_fields=["provider"],
+    rule_ids=["FWA_VOLUME_SPIKE"],
+)
 def fwa_volume_spike_rule(context: RuleContext) -> list[RuleHit]:
     """Detect sudden spikes in provider billing volume."""
     provider_history = context.datasets.get("provider_history", {})
@@ -85,6 +95,11 @@ def fwa_volume_spike_rule(context: RuleContext) -> list[RuleHit]:
     return []
 
 
+@requires(
+    datasets=["procedure_categories"],
+    claim_fields=["items", "diagnosis_codes"],
+    rule_ids=["FWA_PATTERN_SUSPICIOUS"],
+)
 def fwa_pattern_rule(context: RuleContext) -> list[RuleHit]:
     """Detect suspicious billing patterns (same diagnosis on unrelated services)."""
     hits: list[RuleHit] = []
@@ -3,8 +3,15 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..ncci_index import as_pair_index
+from ..registry import requires
 
 
+@requires(
+    datasets=[("valid_modifiers", "modifier_rules")],
+    claim_fields=["items"],
+    rule_ids=["MODIFIER_INVALID"],
+)
 def modifier_invalid_rule(context: RuleContext) -> list[RuleHit]:
     """Check for invalid modifier use on procedures."""
     modifier_rules = context.datasets.get("modifier_rules", {})
@@ -65,6 +72,9 @@ def modifier_invalid_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["modifier_rules"], claim_fields=["items"], rule_ids=["MODIFIER_MISSING"]
+)
 def modifier_missing_rule(context: RuleContext) -> list[RuleHit]:
     """Check for required modifiers that are missing."""
     modifier_rules = context.datasets.get("modifier_rules", {})
@@ -131,9 +141,10 @@ def modifier_missing_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(claim_fields=["items"], rule_ids=["MODIFIER_59_ABUSE"])
 def modifier_59_abuse_rule(context: RuleContext) -> list[RuleHit]:
     """Check for inappropriate use of modifier 59 or X modifiers."""
-    ncci_ptp = context.datasets.get("ncci_ptp", {})
+    ncci_ptp = as_pair_index(context.datasets.get("ncci_ptp"))
     hits: list[RuleHit] = []
 
     items = context.claim.get("items", [])
@@ -156,12 +167,10 @@ def modifier_59_abuse_rule(context: RuleContext) -> list[RuleHit]:
             other_code = other_item.get("procedure_code")
             if not other_code:
                 continue
-            key = tuple(sorted((code, other_code)))
-            if key in ncci_ptp:
-                ptp_info = ncci_ptp[key]
-                if ptp_info.get("modifier") == "1":
-                    has_ncci_conflict = True
-                    break
+            edit = ncci_ptp.lookup(code, other_code)
+            if edit is not None and edit.modifier == "1":
+                has_ncci_conflict = True
+                break
 
         if not has_ncci_conflict:
             hits.append(
@@ -185,6 +194,10 @@ def modifier_59_abuse_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    claim_fields=["items"],
+    rule_ids=["MODIFIER_BILATERAL_CONFLICT", "MODIFIER_BILATERAL_INVALID"],
+)
 def modifier_bilateral_rule(context: RuleContext) -> list[RuleHit]:
     """Check for bilateral modifier issues."""
     bilateral_codes = context.datasets.get("bilateral_codes", set())
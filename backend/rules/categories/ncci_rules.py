@@ -3,41 +3,46 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..ncci_index import NO_DATE, as_pair_index, date_to_int
+from ..registry import requires
+from utils import parse_flexible_date
 
 
+def _claim_service_date(context: RuleContext) -> int:
+    """Claim date of service as YYYYMMDD, or NO_DATE to skip date checks."""
+    dos = context.claim.get("service_date") or context.claim.get("dos")
+    if not dos:
+        return NO_DATE
+    return date_to_int(parse_flexible_date(dos))
+
+
+@requires(datasets=["ncci_ptp"], claim_fields=["items"], rule_ids=["NCCI_PTP"])
 def ncci_ptp_rule(context: RuleContext) -> list[RuleHit]:
     """Check for NCCI Procedure-to-Procedure (PTP) edit violations."""
-    dataset = context.datasets.get("ncci_ptp", {})
+    index = as_pair_index(context.datasets.get("ncci_ptp"))
     codes = [item.get("procedure_code") for item in context.claim.get("items", [])]
     hits: list[RuleHit] = []
-    for i, code_a in enumerate(codes):
-        if not code_a:
-            continue
-        for j, code_b in enumerate(codes):
-            if j <= i or not code_b:
-                continue
-            key = tuple(sorted((code_a, code_b)))
-            if key in dataset:
-                rationale = dataset[key]
-                hits.append(
-                    RuleHit(
-                        rule_id="NCCI_PTP",
-                        rule_type="ncci",
-                        description=f"PTP edit between {code_a} and {code_b}",
-                        weight=0.18,
-                        severity="critical",
-                        flag="ncci_ptp",
-                        citation=rationale.get("citation"),
-                        metadata={
-                            "category": "ncci",
-                            "line_indexes": [i, j],
-                            "modifier": rationale.get("modifier"),
-                        },
-                    )
-                )
+    for i, j, edit in index.line_pair_edits(codes, _claim_service_date(context)):
+        hits.append(
+            RuleHit(
+                rule_id="NCCI_PTP",
+                rule_type="ncci",
+                description=f"PTP edit between {codes[i]} and {codes[j]}",
+                weight=0.18,
+                severity="critical",
+                flag="ncci_ptp",
+                citation=edit.citation,
+                metadata={
+                    "category": "ncci",
+                    "line_indexes": [i, j],
+                    "modifier": edit.modifier,
+                },
+            )
+        )
     return hits
 
 
+@requires(datasets=["ncci_mue"], claim_fields=["items"], rule_ids=["NCCI_MUE"])
 def ncci_mue_rule(context: RuleContext) -> list[RuleHit]:
     """Check for NCCI Medically Unlikely Edit (MUE) violations."""
     dataset = context.datasets.get("ncci_mue", {})
@@ -67,6 +72,9 @@ def ncci_mue_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["ncci_addon"], claim_fields=["items"], rule_ids=["NCCI_ADDON_NO_PRIMARY"]
+)
 def ncci_addon_no_primary_rule(context: RuleContext) -> list[RuleHit]:
     """Check for add-on codes billed without their primary procedure."""
     addon_codes = context.datasets.get("ncci_addon", {})
@@ -105,37 +113,34 @@ def ncci_addon_no_primary_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["ncci_mutex"],
+    claim_fields=["items"],
+    rule_ids=["NCCI_MUTUALLY_EXCLUSIVE"],
+)
 def ncci_mutually_exclusive_rule(context: RuleContext) -> list[RuleHit]:
     """Check for mutually exclusive procedure codes billed together."""
-    mutex_pairs = context.datasets.get("ncci_mutex", {})
-    if not mutex_pairs:
+    index = as_pair_index(context.datasets.get("ncci_mutex"))
+    if not index:
         return []
 
-    items = context.claim.get("items", [])
-    codes = [(idx, item.get("procedure_code")) for idx, item in enumerate(items)]
+    codes = [item.get("procedure_code") for item in context.claim.get("items", [])]
     hits: list[RuleHit] = []
 
-    for i, (idx_a, code_a) in enumerate(codes):
-        if not code_a:
-            continue
-        for idx_b, code_b in codes[i + 1 :]:
-            if not code_b:
-                continue
-            key = tuple(sorted((code_a, code_b)))
-            if key in mutex_pairs:
-                hits.append(
-                    RuleHit(
-                        rule_id="NCCI_MUTUALLY_EXCLUSIVE",
-                        rule_type="ncci",
-                        description=f"Mutually exclusive procedures {code_a} and {code_b} billed together",
-                        weight=0.17,
-                        severity="critical",
-                        flag="ncci_mutex",
-                        citation="CMS NCCI Mutually Exclusive Edits",
-                        metadata={
-                            "category": "ncci",
-                            "line_indexes": [idx_a, idx_b],
-                        },
-                    )
-                )
+    for idx_a, idx_b, _ in index.line_pair_edits(codes, _claim_service_date(context)):
+        hits.append(
+            RuleHit(
+                rule_id="NCCI_MUTUALLY_EXCLUSIVE",
+                rule_type="ncci",
+                description=f"Mutually exclusive procedures {codes[idx_a]} and {codes[idx_b]} billed together",
+                weight=0.17,
+                severity="critical",
+                flag="ncci_mutex",
+                citation="CMS NCCI Mutually Exclusive Edits",
+                metadata={
+                    "category": "ncci",
+                    "line_indexes": [idx_a, idx_b],
+                },
+            )
+        )
     return hits
@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 from utils import parse_flexible_date
 
 
+@requires(
+    datasets=[("experimental_codes", "lcd")],
+    claim_fields=["items"],
+    rule_ids=["NECESSITY_EXPERIMENTAL"],
+)
 def necessity_experimental_rule(context: RuleContext) -> list[RuleHit]:
     """Flag experimental or investigational procedures."""
     experimental_codes = context.datasets.get("experimental_codes", set())
@@ -49,6 +55,11 @@ def necessity_experimental_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["frequency_limits"],
+    claim_fields=["member.member_id", "items"],
+    rule_ids=["NECESSITY_FREQUENCY_EXCEEDED", "NECESSITY_FREQUENCY_TOO_SOON"],
+)
 def necessity_frequency_rule(context: RuleContext) -> list[RuleHit]:
     """Check if services exceed frequency limits per policy."""
     frequency_limits = context.datasets.get("frequency_limits", {})
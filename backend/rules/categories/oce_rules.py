@@ -3,8 +3,14 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(
+    datasets=["oce_revenue_combinations"],
+    claim_fields=["items"],
+    rule_ids=["OCE_REVENUE_CODE_CONFLICT", "OCE_REVENUE_CODE_INVALID"],
+)
 def oce_revenue_code_rule(context: RuleContext) -> list[RuleHit]:
     """Check for invalid revenue code combinations."""
     revenue_combinations = context.datasets.get("oce_revenue_combinations", {})
@@ -68,6 +74,11 @@ def oce_revenue_code_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["inpatient_only_codes"],
+    claim_fields=["items"],
+    rule_ids=["OCE_INPATIENT_ONLY"],
+)
 def oce_inpatient_only_rule(context: RuleContext) -> list[RuleHit]:
     """Check for inpatient-only procedures in outpatient setting."""
     inpatient_only = context.datasets.get("inpatient_only_codes", set())
@@ -108,6 +119,7 @@ def oce_inpatient_only_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(rule_ids=["OCE_OBSERVATION_EXCESSIVE", "OCE_OBSERVATION_EXTENDED"])
 def oce_observation_hours_rule(context: RuleContext) -> list[RuleHit]:
     """Check if observation hours exceed limits."""
     claim = context.claim
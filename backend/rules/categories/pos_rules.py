@@ -3,8 +3,14 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(
+    datasets=[("valid_pos_codes", "pos_restrictions")],
+    claim_fields=["items"],
+    rule_ids=["POS_INVALID"],
+)
 def pos_invalid_rule(context: RuleContext) -> list[RuleHit]:
     """Check for invalid place of service for the procedure."""
     pos_restrictions = context.datasets.get("pos_restrictions", {})
@@ -86,6 +92,11 @@ def pos_invalid_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["provider_pos_rules"],
+    claim_fields=["place_of_service"],
+    rule_ids=["POS_PROVIDER_MISMATCH"],
+)
 def pos_provider_mismatch_rule(context: RuleContext) -> list[RuleHit]:
     """Check for mismatch between place of service and provider type."""
     provider_pos_rules = context.datasets.get("provider_pos_rules", {})
@@ -3,8 +3,14 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(
+    datasets=[("fee_schedule", "provider_contracts")],
+    claim_fields=["items"],
+    rule_ids=["PRICING_EXCEEDS_FEE"],
+)
 def pricing_exceeds_fee_rule(context: RuleContext) -> list[RuleHit]:
     """Check if billed amount exceeds fee schedule or contract."""
     fee_schedule = context.datasets.get("fee_schedule", {})
@@ -55,6 +61,9 @@ def pricing_exceeds_fee_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["unit_limits"], claim_fields=["items"], rule_ids=["PRICING_UNITS_EXCEED"]
+)
 def pricing_units_exceed_rule(context: RuleContext) -> list[RuleHit]:
     """Check if units exceed contract or policy limits."""
     unit_limits = context.datasets.get("unit_limits", {})
@@ -92,6 +101,10 @@ def pricing_units_exceed_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["drg_rules"],
+    rule_ids=["PRICING_DRG_MISMATCH", "PRICING_DRG_WEIGHT_MISMATCH"],
+)
 def pricing_drg_mismatch_rule(context: RuleContext) -> list[RuleHit]:
     """Check if DRG assignment matches diagnoses and procedures."""
     drg_rules = context.datasets.get("drg_rules", {})
@@ -178,6 +191,11 @@ def pricing_drg_mismatch_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["revenue_code_rules"],
+    claim_fields=["items"],
+    rule_ids=["PRICING_REVENUE_CODE_MISMATCH"],
+)
 def pricing_revenue_code_rule(context: RuleContext) -> list[RuleHit]:
     """Check for revenue code and CPT/HCPCS mismatches."""
     revenue_code_rules = context.datasets.get("revenue_code_rules", {})
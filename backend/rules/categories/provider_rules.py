@@ -5,8 +5,18 @@ from __future__ import annotations
 from typing import Any
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(
+    datasets=[("utilization", "fwa_config")],
+    rule_ids=[
+        "FWA_HIGH_RISK_SPECIALTY",
+        "GEOGRAPHIC_DISTANCE_OUTLIER",
+        "UTIL_AMOUNT_OUTLIER",
+        "UTIL_VOLUME_OUTLIER",
+    ],
+)
 def provider_outlier_rule(context: RuleContext) -> list[RuleHit]:
     """Check for provider-related outliers (specialty, geographic, billing patterns)."""
     utilization: dict[str, dict[str, Any]] = context.datasets.get("utilization", {})
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 
 
+@requires(claim_fields=["items"], rule_ids=["SPECIALTY_DENTAL_ON_MEDICAL"])
 def specialty_dental_rule(context: RuleContext) -> list[RuleHit]:
     """Check for dental procedures on medical claims."""
     dental_codes = context.datasets.get("dental_codes", set())
@@ -43,6 +45,11 @@ def specialty_dental_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["dme_codes"],
+    claim_fields=["items"],
+    rule_ids=["SPECIALTY_DME_NO_CMN", "SPECIALTY_DME_RENTAL_EXCEED"],
+)
 def specialty_dme_rule(context: RuleContext) -> list[RuleHit]:
     """Check for DME without certificate of medical necessity."""
     dme_codes = context.datasets.get("dme_codes", {})
@@ -116,6 +123,10 @@ def specialty_dme_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    claim_fields=["items"],
+    rule_ids=["SPECIALTY_TELEHEALTH_CODE", "SPECIALTY_TELEHEALTH_PROVIDER"],
+)
 def specialty_telehealth_rule(context: RuleContext) -> list[RuleHit]:
     """Check for telehealth billing compliance."""
     telehealth_codes = context.datasets.get("telehealth_codes", set())
@@ -193,6 +204,11 @@ def specialty_telehealth_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["comprehensive_codes"],
+    claim_fields=["items"],
+    rule_ids=["SPECIALTY_UNBUNDLING"],
+)
 def specialty_unbundling_rule(context: RuleContext) -> list[RuleHit]:
     """Check for unbundled billing of comprehensive codes."""
     comprehensive_codes = context.datasets.get("comprehensive_codes", {})
@@ -231,6 +247,11 @@ def specialty_unbundling_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["incidental_rules"],
+    claim_fields=["items"],
+    rule_ids=["SPECIALTY_INCIDENTAL"],
+)
 def specialty_incidental_rule(context: RuleContext) -> list[RuleHit]:
     """Check for incidental services billed separately."""
     incidental_rules = context.datasets.get("incidental_rules", {})
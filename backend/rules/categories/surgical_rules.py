@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 from utils import parse_flexible_date
 
 
+@requires(
+    datasets=["global_surgery", "surgical_history"],
+    claim_fields=["member.member_id", "items"],
+    rule_ids=["SURGICAL_GLOBAL_PERIOD"],
+)
 def surgical_global_period_rule(context: RuleContext) -> list[RuleHit]:
     """Check for separate billing during global surgical period."""
     global_surgery_data = context.datasets.get("global_surgery", {})
@@ -74,6 +80,7 @@ def surgical_global_period_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(claim_fields=["items"], rule_ids=["SURGICAL_MULTIPLE_NO_51"])
 def surgical_multiple_procedure_rule(context: RuleContext) -> list[RuleHit]:
     """Check for multiple procedures without proper discount modifier."""
     multiple_procedure_codes = context.datasets.get("multiple_procedure_codes", set())
@@ -130,6 +137,11 @@ def surgical_multiple_procedure_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["assistant_allowed_codes"],
+    claim_fields=["items"],
+    rule_ids=["SURGICAL_ASSISTANT_NOT_ALLOWED"],
+)
 def surgical_assistant_rule(context: RuleContext) -> list[RuleHit]:
     """Check for assistant surgeon billing compliance."""
     assistant_allowed = context.datasets.get("assistant_allowed_codes", set())
@@ -172,6 +184,11 @@ def surgical_assistant_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=["cosurgeon_allowed_codes"],
+    claim_fields=["items"],
+    rule_ids=["SURGICAL_COSURGEON_NOT_ALLOWED"],
+)
 def surgical_cosurgeon_rule(context: RuleContext) -> list[RuleHit]:
     """Check for co-surgeon billing compliance."""
     cosurgeon_allowed = context.datasets.get("cosurgeon_allowed_codes", set())
@@ -210,6 +227,15 @@ def surgical_cosurgeon_rule(context: RuleContext) -> list[RuleHit]:
     return hits
 
 
+@requires(
+    datasets=[("bilateral_allowed_codes", "bilateral_indicators")],
+    claim_fields=["items"],
+    rule_ids=[
+        "SURGICAL_BILATERAL_150",
+        "SURGICAL_BILATERAL_NOT_ALLOWED",
+        "SURGICAL_BILATERAL_NOT_APPLICABLE",
+    ],
+)
 def surgical_bilateral_rule(context: RuleContext) -> list[RuleHit]:
     """Check for bilateral procedure billing compliance."""
     bilateral_allowed = context.datasets.get("bilateral_allowed_codes", set())
@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 from ..models import RuleContext, RuleHit
+from ..registry import requires
 from utils import parse_flexible_date
 
 
+@requires(
+    claim_fields=["received_date"],
+    rule_ids=["TIMELY_FILING_LATE", "TIMELY_FILING_WARNING"],
+)
 def timely_filing_late_rule(context: RuleContext) -> list[RuleHit]:
     """Check if claim was submitted within the filing deadline."""
     claim = context.claim
@@ -66,6 +71,10 @@ def timely_filing_late_rule(context: RuleContext) -> list[RuleHit]:
     return []
 
 
+@requires(
+    claim_fields=["received_date"],
+    rule_ids=["TIMELY_FILING_INVALID_EXCEPTION", "TIMELY_FILING_NO_EXCEPTION"],
+)
 def timely_filing_no_exception_rule(context: RuleContext) -> list[RuleHit]:
     """Check if late submission has a valid exception documented."""
     claim = context.claim
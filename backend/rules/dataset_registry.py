@@ -0,0 +1,178 @@
+"""Versioned registry of reference dataset snapshots.
+
+The registry holds the current snapshot of reference datasets (NCCI, MPFS,
+LCD, OIG, ...) and can replace it without a process restart. A reload
+builds the new snapshot in the caller's thread (or the watcher thread)
+while requests keep using the old one, then swaps the reference under a
+lock. Callers take one snapshot per request, so in-flight evaluations
+finish on the data they started with.
+
+Snapshots are versioned by a fingerprint of the files in the data
+directory, so results can record exactly which reference data scored them
+and unchanged files keep the same version across restarts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Files in the data directory that make up the reference datasets
+DATASET_FILE_PATTERNS = ("*.json", "*.ref", "*.bin")
+
+# Version used when no dataset files are present (built-in samples only)
+SAMPLE_VERSION = "sample"
+
+FileFingerprint = tuple[tuple[str, int, int, int], ...]
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """An immutable set of loaded reference datasets."""
+
+    version: str
+    datasets: Mapping[str, Any]
+    loaded_at: str
+    files: FileFingerprint = ()
+
+    def summary(self) -> dict[str, Any]:
+        """Version info and dataset sizes for API responses."""
+        sizes: dict[str, int | None] = {}
+        for name, dataset in self.datasets.items():
+            try:
+                sizes[name] = len(dataset)
+            except TypeError:
+                sizes[name] = None
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "files": [name for name, *_ in self.files],
+            "datasets": sizes,
+        }
+
+
+def fingerprint_files(
+    data_dir: Path | None, patterns: Iterable[str] = DATASET_FILE_PATTERNS
+) -> FileFingerprint:
+    """Name, size, mtime and inode of every dataset file in data_dir."""
+    if data_dir is None or not data_dir.is_dir():
+        return ()
+    entries = []
+    for pattern in patterns:
+        for path in data_dir.glob(pattern):
+            try:
+                stat = path.stat()
+            except OSError:
+                # Removed between glob and stat; the next check picks it up
+                continue
+            entries.append((path.name, stat.st_size, stat.st_mtime_ns, stat.st_ino))
+    return tuple(sorted(entries))
+
+
+def version_for(files: FileFingerprint) -> str:
+    """Stable version identifier for a file fingerprint."""
+    if not files:
+        return SAMPLE_VERSION
+    digest = hashlib.sha256(repr(files).encode("utf-8")).hexdigest()
+    return digest[:12]
+
+
+class DatasetRegistry:
+    """Holds the current DatasetSnapshot and swaps in reloaded ones.
+
+    Args:
+        loader: Builds the datasets mapping from the data directory
+        data_dir: Directory whose dataset files are fingerprinted/watched
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], dict[str, Any]],
+        data_dir: Path | None = None,
+    ) -> None:
+        self._loader = loader
+        self.data_dir = data_dir
+        self._snapshot: DatasetSnapshot | None = None
+        self._swap_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watch_thread: threading.Thread | None = None
+        self._watch_stop = threading.Event()
+
+    def current(self) -> DatasetSnapshot:
+        """Get the current snapshot, loading it on first use."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot, _ = self.reload(force=False)
+        return snapshot
+
+    def reload(self, force: bool = True) -> tuple[DatasetSnapshot, bool]:
+        """Rebuild the snapshot and swap it in if the files changed.
+
+        Args:
+            force: Reload even if the file fingerprint is unchanged
+
+        Returns:
+            (current snapshot, whether a new snapshot was swapped in)
+        """
+        # Serialize reloads; readers are never blocked by a reload
+        with self._reload_lock:
+            files = fingerprint_files(self.data_dir)
+            current = self._snapshot
+            if current is not None and not force and current.files == files:
+                return current, False
+
+            snapshot = DatasetSnapshot(
+                version=version_for(files),
+                datasets=self._loader(),
+                loaded_at=datetime.now(timezone.utc).isoformat(),
+                files=files,
+            )
+            with self._swap_lock:
+                self._snapshot = snapshot
+
+        if current is not None:
+            logger.info(
+                f"Reference datasets reloaded: {current.version} -> {snapshot.version}"
+            )
+        return snapshot, True
+
+    def check_for_changes(self) -> bool:
+        """Reload if dataset files changed since the current snapshot."""
+        _, swapped = self.reload(force=False)
+        return swapped
+
+    def start_watching(self, interval: float) -> None:
+        """Poll the data directory every interval seconds in a daemon thread."""
+        if interval <= 0 or self._watch_thread is not None:
+            return
+        self._watch_stop.clear()
+
+        def _watch() -> None:
+            while not self._watch_stop.wait(interval):
+                try:
+                    self.check_for_changes()
+                except Exception as e:
+                    # Keep serving the previous snapshot if a reload fails
+                    # (e.g. a download script is still writing a file)
+                    logger.warning(f"Reference dataset reload failed: {e}")
+
+        self._watch_thread = threading.Thread(
+            target=_watch, name="dataset-watcher", daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        """Stop the watcher thread if it is running."""
+        if self._watch_thread is None:
+            return
+        self._watch_stop.set()
+        self._watch_thread.join(timeout=5)
+        self._watch_thread = None
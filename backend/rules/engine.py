@@ -2,14 +2,42 @@
 
 from __future__ import annotations
 
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import replace
+from functools import partial
 from typing import Any
 
 from . import ruleset
-from .models import BaselineOutcome, DecisionOutcome, RuleContext, RuleResult
+from .models import (
+    BaselineOutcome,
+    BatchItemOutcome,
+    DecisionOutcome,
+    RuleContext,
+    RuleResult,
+)
+from .plan import get_rule_plan
 from .registry import default_registry
 from .thresholds import ThresholdConfig
 
+# Batches smaller than this are scored in-process; pool dispatch costs more
+# than it saves for a handful of claims.
+MIN_PARALLEL_BATCH_SIZE = 32
+
+# Reference datasets installed in each pool worker by _init_batch_worker
+_worker_datasets: dict[str, Any] | None = None
+
+_default_rules_registered = False
+
+
+def _ensure_default_rules() -> None:
+    """Populate the default registry once per process."""
+    global _default_rules_registered
+    if not _default_rules_registered:
+        ruleset.register_default_rules(default_registry)
+        _default_rules_registered = True
+
 
 def evaluate_baseline(
     claim: dict[str, Any],
@@ -44,24 +72,28 @@ def evaluate_baseline(
     provider_flags: list[str] = []
 
     # ensure default registry is populated
-    ruleset.register_default_rules(default_registry)
+    _ensure_default_rules()
 
-    rule_overrides: dict[str, dict[str, Any]] = config.get("rule_overrides", {})
+    # Compiled once per datasets/config snapshot: drops rules whose datasets
+    # are absent and pre-resolves rule_overrides
+    plan = get_rule_plan(default_registry, datasets, config)
 
-    for rule in default_registry.active_rules():
+    for rule in plan.rules_for(claim):
         hits = rule(context)
         if not hits:
             continue
         for hit in hits:
-            override = rule_overrides.get(hit.rule_id)
+            if hit.rule_id in plan.disabled_rule_ids:
+                continue
+            override = plan.overrides.get(hit.rule_id)
             adjusted_hit = hit
             if override:
-                if not override.get("enabled", True):
-                    continue
                 adjusted_hit = replace(
                     hit,
-                    weight=float(override.get("weight", hit.weight)),
-                    severity=str(override.get("severity", hit.severity)),
+                    weight=hit.weight if override.weight is None else override.weight,
+                    severity=hit.severity
+                    if override.severity is None
+                    else override.severity,
                 )
             rule_result.add_hit(adjusted_hit)
             if adjusted_hit.metadata.get("category") == "ncci":
@@ -89,3 +121,143 @@ def evaluate_baseline(
     )
 
     return outcome
+
+
+def _init_batch_worker(datasets: dict[str, Any]) -> None:
+    """Pool initializer: keep the reference datasets resident in the worker."""
+    global _worker_datasets
+    _worker_datasets = datasets
+    _ensure_default_rules()
+
+
+def _evaluate_item(
+    item: tuple[int, dict[str, Any]],
+    datasets: dict[str, Any] | None = None,
+    config: dict[str, Any] | None = None,
+    threshold_config: ThresholdConfig | None = None,
+) -> BatchItemOutcome:
+    """Score one claim, capturing failures so one bad claim cannot sink a batch."""
+    index, claim = item
+    claim_id = claim.get("claim_id") if isinstance(claim, dict) else None
+    try:
+        outcome = evaluate_baseline(
+            claim=claim,
+            datasets=datasets if datasets is not None else _worker_datasets or {},
+            config=config,
+            threshold_config=threshold_config,
+        )
+    except Exception as e:
+        return BatchItemOutcome(
+            index=index, claim_id=claim_id, error=f"{type(e).__name__}: {e}"
+        )
+    return BatchItemOutcome(index=index, claim_id=claim_id, outcome=outcome)
+
+
+class BatchEvaluator:
+    """Score many claims in parallel over a process pool.
+
+    The reference datasets are handed to each worker once, through the pool
+    initializer, so per-claim tasks only ship the claim itself. The pool is
+    created lazily and reused across calls until close() is called.
+
+    Usage:
+        evaluator = BatchEvaluator(datasets, max_workers=4)
+        outcomes = evaluator.evaluate(claims, config={"base_score": 0.5})
+        evaluator.close()
+    """
+
+    def __init__(
+        self,
+        datasets: dict[str, Any],
+        max_workers: int | None = None,
+        min_parallel_size: int = MIN_PARALLEL_BATCH_SIZE,
+    ) -> None:
+        """Initialize the evaluator.
+
+        Args:
+            datasets: Reference datasets preloaded into every worker
+            max_workers: Pool size (defaults to CPU count; 1 disables the pool)
+            min_parallel_size: Batches below this size are scored in-process
+        """
+        self.datasets = datasets
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel_size = min_parallel_size
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_batch_worker,
+                initargs=(self.datasets,),
+            )
+        return self._executor
+
+    def evaluate(
+        self,
+        claims: Sequence[dict[str, Any]],
+        config: dict[str, Any] | None = None,
+        threshold_config: ThresholdConfig | None = None,
+    ) -> list[BatchItemOutcome]:
+        """Score claims and return one outcome per claim, in input order.
+
+        Args:
+            claims: Claims in rules-engine field format
+            config: Rule configuration shared by every claim
+            threshold_config: Score thresholds shared by every claim
+
+        Returns:
+            List of BatchItemOutcome aligned with the input claims
+        """
+        items = list(enumerate(claims))
+        if not items:
+            return []
+
+        if self.max_workers <= 1 or len(items) < self.min_parallel_size:
+            return [
+                _evaluate_item(item, self.datasets, config, threshold_config)
+                for item in items
+            ]
+
+        task = partial(_evaluate_item, config=config, threshold_config=threshold_config)
+        chunksize = max(1, len(items) // (self.max_workers * 4))
+        return list(self._get_executor().map(task, items, chunksize=chunksize))
+
+    def close(self, wait: bool = True) -> None:
+        """Shut down the worker pool.
+
+        In-flight batches always complete; wait=False returns without
+        blocking on them.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self) -> BatchEvaluator:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def evaluate_batch(
+    claims: Sequence[dict[str, Any]],
+    datasets: dict[str, Any],
+    config: dict[str, Any] | None = None,
+    threshold_config: ThresholdConfig | None = None,
+    max_workers: int | None = None,
+) -> list[BatchItemOutcome]:
+    """Evaluate many claims against baseline rules using a one-off pool.
+
+    Long-lived callers should hold a BatchEvaluator instead so the pool and
+    its preloaded datasets are reused between batches.
+
+    Args:
+        claims: Claims in rules-engine field format
+        datasets: Reference datasets (NCCI, LCD, etc.)
+        config: Rule configuration overrides
+        threshold_config: Score thresholds for decision making
+        max_workers: Pool size (defaults to CPU count)
+    """
+    with BatchEvaluator(datasets, max_workers=max_workers) as evaluator:
+        return evaluator.evaluate(claims, config, threshold_config)
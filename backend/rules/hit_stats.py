@@ -0,0 +1,289 @@
+"""Materialized rule-hit statistics.
+
+Dashboards used to re-read every results row and parse its rule_hits JSON
+on each request. Instead, two aggregate tables are kept up to date in the
+same transaction that writes results:
+
+- result_stats: per-day claim count, rule-hit/flag totals, auto-approved
+  count and fraud score / ROI sums
+- rule_hit_stats: per-day hit count, weight sum and claim score sum for
+  each (rule_id, rule_type, severity)
+
+Reads then scale with the number of distinct rules and days, not with the
+number of claims ever analyzed. A database that has results but no
+aggregates yet (an upgraded install, or a restored backup) is backfilled by
+rebuild_rule_stats() on first read, or ahead of time with
+scripts/rebuild_rule_stats.py.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+from typing import Any
+
+from database import Database
+
+logger = logging.getLogger(__name__)
+
+# Results rows read per fetch while rebuilding
+REBUILD_FETCH_SIZE = 5000
+
+# Results columns the aggregates are computed from
+STATS_SOURCE_COLUMNS = (
+    "created_at",
+    "fraud_score",
+    "rule_hits",
+    "ncci_flags",
+    "coverage_flags",
+    "provider_flags",
+    "roi_estimate",
+)
+
+# stats_meta key recording when the aggregates were last rebuilt
+_BUILT_KEY = "rule_stats_built_at"
+
+_built_paths: set[str] = set()
+_build_lock = threading.Lock()
+
+_UPSERT_RESULT_STATS = """
+    INSERT INTO result_stats
+        (day, claims, rule_hits, flags, auto_approved, fraud_score_sum, roi_sum)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(day) DO UPDATE SET
+        claims = claims + excluded.claims,
+        rule_hits = rule_hits + excluded.rule_hits,
+        flags = flags + excluded.flags,
+        auto_approved = auto_approved + excluded.auto_approved,
+        fraud_score_sum = fraud_score_sum + excluded.fraud_score_sum,
+        roi_sum = roi_sum + excluded.roi_sum
+"""
+
+_UPSERT_RULE_HIT_STATS = """
+    INSERT INTO rule_hit_stats
+        (day, rule_id, rule_type, severity, hit_count, weight_sum, score_sum)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(day, rule_id, rule_type, severity) DO UPDATE SET
+        hit_count = hit_count + excluded.hit_count,
+        weight_sum = weight_sum + excluded.weight_sum,
+        score_sum = score_sum + excluded.score_sum
+"""
+
+
+def ensure_stats_tables(conn: sqlite3.Connection) -> None:
+    """Create the aggregate tables if they don't exist."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS result_stats (
+            day TEXT PRIMARY KEY,
+            claims INTEGER NOT NULL DEFAULT 0,
+            rule_hits INTEGER NOT NULL DEFAULT 0,
+            flags INTEGER NOT NULL DEFAULT 0,
+            auto_approved INTEGER NOT NULL DEFAULT 0,
+            fraud_score_sum REAL NOT NULL DEFAULT 0,
+            roi_sum REAL NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rule_hit_stats (
+            day TEXT NOT NULL,
+            rule_id TEXT NOT NULL,
+            rule_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            hit_count INTEGER NOT NULL DEFAULT 0,
+            weight_sum REAL NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, rule_id, rule_type, severity)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stats_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+
+
+def _json_list(value: Any) -> list:
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+class _StatsDelta:
+    """Accumulates signed changes to both aggregate tables."""
+
+    def __init__(self) -> None:
+        self.days: dict[str, list[float]] = defaultdict(lambda: [0, 0, 0, 0, 0.0, 0.0])
+        self.rules: dict[tuple[str, str, str, str], list[float]] = defaultdict(
+            lambda: [0, 0.0, 0.0]
+        )
+        self.removed = False
+
+    def add(self, row: Mapping[str, Any], sign: int = 1) -> None:
+        """Add (or with sign=-1, remove) one results row's contribution."""
+        if sign < 0:
+            self.removed = True
+        day = str(row.get("created_at") or "")[:10] or "unknown"
+        score = row.get("fraud_score") or 0.0
+        hits = [
+            hit for hit in _json_list(row.get("rule_hits")) if isinstance(hit, dict)
+        ]
+        flags = (
+            len(hits)
+            + len(_json_list(row.get("ncci_flags")))
+            + len(_json_list(row.get("coverage_flags")))
+            + len(_json_list(row.get("provider_flags")))
+        )
+
+        totals = self.days[day]
+        totals[0] += sign
+        totals[1] += sign * len(hits)
+        totals[2] += sign * flags
+        totals[3] += sign * (flags == 0)
+        totals[4] += sign * score
+        totals[5] += sign * (row.get("roi_estimate") or 0.0)
+
+        for hit in hits:
+            key = (
+                day,
+                str(hit.get("rule_id", "unknown")),
+                str(hit.get("rule_type", "unknown")),
+                str(hit.get("severity", "medium")),
+            )
+            rule = self.rules[key]
+            rule[0] += sign
+            rule[1] += sign * (hit.get("weight") or 0.0)
+            rule[2] += sign * score
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        """Write the accumulated changes."""
+        conn.executemany(
+            _UPSERT_RESULT_STATS,
+            [(day, *totals) for day, totals in self.days.items()],
+        )
+        conn.executemany(
+            _UPSERT_RULE_HIT_STATS,
+            [(*key, *values) for key, values in self.rules.items()],
+        )
+        if self.removed:
+            conn.execute("DELETE FROM rule_hit_stats WHERE hit_count <= 0")
+            conn.execute("DELETE FROM result_stats WHERE claims <= 0")
+
+
+def record_results(conn: sqlite3.Connection, rows: Iterable[Mapping[str, Any]]) -> None:
+    """Fold results rows into the aggregates before they are written.
+
+    Call in the transaction that inserts the rows, before the INSERT OR
+    REPLACE: any existing row with the same job_id is subtracted first so
+    re-analyzed claims are not counted twice.
+
+    Args:
+        conn: Connection with an open write transaction
+        rows: Results rows keyed by column name (STATS_SOURCE_COLUMNS and
+            job_id)
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    delta = _StatsDelta()
+    job_ids = [row["job_id"] for row in rows]
+    columns = ", ".join(STATS_SOURCE_COLUMNS)
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start : start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor = conn.execute(
+            f"SELECT {columns} FROM results WHERE job_id IN ({placeholders})",
+            chunk,
+        )
+        for previous in cursor:
+            delta.add(dict(zip(STATS_SOURCE_COLUMNS, previous)), sign=-1)
+
+    for row in rows:
+        delta.add(row)
+    delta.apply(conn)
+
+
+def rebuild_rule_stats(conn: sqlite3.Connection) -> int:
+    """Recompute the aggregates from every results row.
+
+    Args:
+        conn: Connection with an open write transaction
+
+    Returns:
+        Number of results rows scanned
+    """
+    ensure_stats_tables(conn)
+    conn.execute("DELETE FROM result_stats")
+    conn.execute("DELETE FROM rule_hit_stats")
+
+    # Older databases may lack some flag columns; count those as empty
+    present = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+    select = ", ".join(
+        column if column in present else f"NULL AS {column}"
+        for column in STATS_SOURCE_COLUMNS
+    )
+
+    delta = _StatsDelta()
+    scanned = 0
+    if present:
+        cursor = conn.execute(f"SELECT {select} FROM results")
+        while batch := cursor.fetchmany(REBUILD_FETCH_SIZE):
+            for row in batch:
+                delta.add(dict(zip(STATS_SOURCE_COLUMNS, row)))
+            scanned += len(batch)
+    delta.apply(conn)
+
+    conn.execute(
+        "INSERT OR REPLACE INTO stats_meta (key, value) VALUES (?, ?)",
+        (_BUILT_KEY, datetime.now(timezone.utc).isoformat()),
+    )
+    return scanned
+
+
+def ensure_rule_stats(db: Database) -> None:
+    """Backfill the aggregates for db if they have never been built."""
+    if db.path in _built_paths:
+        return
+    with _build_lock:
+        if db.path in _built_paths:
+            return
+        with db.write() as conn:
+            ensure_stats_tables(conn)
+            built = conn.execute(
+                "SELECT value FROM stats_meta WHERE key = ?", (_BUILT_KEY,)
+            ).fetchone()
+            if built is None:
+                scanned = rebuild_rule_stats(conn)
+                logger.info(f"Built rule-hit statistics from {scanned} results")
+        _built_paths.add(db.path)
+
+
+def result_totals(conn: sqlite3.Connection) -> dict[str, float]:
+    """Totals across all days from result_stats."""
+    row = conn.execute("""
+        SELECT COALESCE(SUM(claims), 0), COALESCE(SUM(rule_hits), 0),
+               COALESCE(SUM(flags), 0), COALESCE(SUM(auto_approved), 0),
+               COALESCE(SUM(fraud_score_sum), 0), COALESCE(SUM(roi_sum), 0)
+        FROM result_stats
+    """).fetchone()
+    keys = (
+        "claims",
+        "rule_hits",
+        "flags",
+        "auto_approved",
+        "fraud_score_sum",
+        "roi_sum",
+    )
+    return dict(zip(keys, row))
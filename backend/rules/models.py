@@ -57,6 +57,20 @@ class BaselineOutcome:
     roi_estimate: float | None
 
 
+@dataclass(frozen=True)
+class BatchItemOutcome:
+    """Outcome for a single claim scored as part of a batch."""
+
+    index: int
+    claim_id: str | None
+    outcome: BaselineOutcome | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.outcome is not None
+
+
 @dataclass(frozen=True)
 class RuleContext:
     """Inputs required to evaluate baseline rules."""
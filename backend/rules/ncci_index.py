@@ -0,0 +1,487 @@
+"""Compact NCCI code-pair index for PTP and mutually exclusive edits.
+
+Edits are stored in compressed sparse row form: every distinct code gets an
+integer id (ids follow lexical order), and each column-1 code owns a sorted
+slice of column-2 ids with parallel arrays for the modifier indicator,
+effective/deletion dates and citation. A claim is checked per line by
+probing the column-1 slice of each billed code, instead of building and
+hashing a tuple for every line pair.
+
+The index can be saved to and loaded from a prebuilt binary file. Loading
+memory-maps the file, so the edit arrays are shared read-only between
+worker processes rather than copied into each one.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+# Binary file layout (little-endian):
+#   header: magic, n_codes, n_labels, n_pairs, codes_len, labels_len
+#   codes blob, labels blob (NUL-separated strings), padded to 4 bytes
+#   col1_starts: uint32[n_codes + 1]
+#   col2, effective, deletion: uint32[n_pairs] each
+#   citation, modifier: uint16[n_pairs] each (ids into the labels table)
+INDEX_MAGIC = b"HPINCCI1"
+_HEADER = struct.Struct("<8s5I")
+
+# Dates are stored as YYYYMMDD integers; 0 means "not set"
+NO_DATE = 0
+NO_LABEL = 0xFFFF
+
+
+def date_to_int(value: Any) -> int:
+    """Convert YYYYMMDD / YYYY-MM-DD strings, dates or ints to YYYYMMDD."""
+    if not value:
+        return NO_DATE
+    if isinstance(value, int):
+        return value
+    if hasattr(value, "strftime"):
+        return int(value.strftime("%Y%m%d"))
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    return int(digits[:8]) if len(digits) >= 8 else NO_DATE
+
+
+@dataclass(frozen=True)
+class PairEdit:
+    """A single column-1/column-2 edit."""
+
+    column1: str
+    column2: str
+    modifier: str | None = None
+    effective_date: int = NO_DATE
+    deletion_date: int = NO_DATE
+    citation: str | None = None
+
+    def active_on(self, service_date: int) -> bool:
+        """Whether the edit applies to a YYYYMMDD date of service."""
+        if not service_date:
+            return True
+        if self.effective_date and service_date < self.effective_date:
+            return False
+        if self.deletion_date and service_date >= self.deletion_date:
+            return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access for callers written against the legacy format."""
+        return getattr(self, key, default)
+
+
+def _pick(current: PairEdit | None, candidate: PairEdit) -> PairEdit:
+    # When both directions of a pair are present keep the most restrictive
+    # edit, matching how download_ncci.py deduplicates (modifier 0 first).
+    if current is None:
+        return candidate
+    if (candidate.modifier or "9") < (current.modifier or "9"):
+        return candidate
+    return current
+
+
+class NCCIPairIndex:
+    """Read-only column-1 -> column-2 edit index.
+
+    Build with from_records() (download_ncci.py output), from_pairs() (legacy
+    tuple-keyed dicts) or load() (prebuilt binary file).
+    """
+
+    def __init__(
+        self,
+        codes: Sequence[str],
+        labels: Sequence[str],
+        col1_starts: Sequence[int],
+        col2: Sequence[int],
+        effective: Sequence[int],
+        deletion: Sequence[int],
+        citation_ids: Sequence[int],
+        modifier_ids: Sequence[int],
+        _mmap: mmap.mmap | None = None,
+        _path: Path | None = None,
+    ) -> None:
+        self._codes = list(codes)
+        self._code_ids = {code: idx for idx, code in enumerate(self._codes)}
+        self._labels = list(labels)
+        self._col1_starts = col1_starts
+        self._col2 = col2
+        self._effective = effective
+        self._deletion = deletion
+        self._citation_ids = citation_ids
+        self._modifier_ids = modifier_ids
+        self._mmap = _mmap
+        self._path = _path
+
+    def __reduce__(self) -> tuple:
+        # Memory views cannot be pickled; a mapped index is re-mapped from
+        # its file in the receiving process so the pages stay shared.
+        if self._path is not None:
+            return (type(self).load, (self._path,))
+        return (
+            type(self),
+            (
+                self._codes,
+                self._labels,
+                array("I", self._col1_starts),
+                array("I", self._col2),
+                array("I", self._effective),
+                array("I", self._deletion),
+                array("H", self._citation_ids),
+                array("H", self._modifier_ids),
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> NCCIPairIndex:
+        """Build an index from edit records.
+
+        Records use the download_ncci.py schema: column1/column2 (or a
+        two-element "codes" list), modifier, effective_date, deletion_date
+        and an optional citation.
+        """
+        edits: dict[tuple[str, str], tuple[str, int, int, str | None]] = {}
+        for record in records:
+            codes = record.get("codes") or [None, None]
+            col1 = record.get("column1") or codes[0]
+            col2 = record.get("column2") or (codes[1] if len(codes) > 1 else None)
+            if not col1 or not col2:
+                continue
+            modifier = record.get("modifier")
+            entry = (
+                "" if modifier is None else str(modifier),
+                date_to_int(record.get("effective_date")),
+                date_to_int(record.get("deletion_date")),
+                record.get("citation") or None,
+            )
+            existing = edits.get((col1, col2))
+            if existing is None or (entry[0] or "9") < (existing[0] or "9"):
+                edits[(col1, col2)] = entry
+        return cls._build(edits)
+
+    @classmethod
+    def from_pairs(cls, pairs: Mapping[tuple[str, str], Any]) -> NCCIPairIndex:
+        """Build an index from a legacy {(code_a, code_b): info} mapping."""
+        edits: dict[tuple[str, str], tuple[str, int, int, str | None]] = {}
+        for key, info in pairs.items():
+            if not isinstance(key, tuple) or len(key) != 2:
+                continue
+            info = info if isinstance(info, Mapping) else {}
+            modifier = info.get("modifier")
+            edits[(key[0], key[1])] = (
+                "" if modifier is None else str(modifier),
+                date_to_int(info.get("effective_date")),
+                date_to_int(info.get("deletion_date")),
+                info.get("citation"),
+            )
+        return cls._build(edits)
+
+    @classmethod
+    def _build(
+        cls, edits: Mapping[tuple[str, str], tuple[str, int, int, str | None]]
+    ) -> NCCIPairIndex:
+        codes = sorted({code for pair in edits for code in pair})
+        code_ids = {code: idx for idx, code in enumerate(codes)}
+        # Citations and modifier indicators are few distinct strings, so
+        # both are stored once in a shared labels table
+        labels = sorted(
+            {e[3] for e in edits.values() if e[3]}
+            | {e[0] for e in edits.values() if e[0]}
+        )
+        if len(labels) >= NO_LABEL:
+            raise ValueError(f"Too many distinct edit labels: {len(labels)}")
+        label_ids = {text: idx for idx, text in enumerate(labels)}
+
+        col1_starts = array("I", [0] * (len(codes) + 1))
+        col2 = array("I")
+        effective = array("I")
+        deletion = array("I")
+        citation_ids = array("H")
+        modifier_ids = array("H")
+
+        ordered = sorted(
+            edits.items(), key=lambda kv: (code_ids[kv[0][0]], code_ids[kv[0][1]])
+        )
+        for (col1, col2_code), (modifier, eff, dele, citation) in ordered:
+            col1_starts[code_ids[col1] + 1] += 1
+            col2.append(code_ids[col2_code])
+            effective.append(eff)
+            deletion.append(dele)
+            citation_ids.append(label_ids[citation] if citation else NO_LABEL)
+            modifier_ids.append(label_ids[modifier] if modifier else NO_LABEL)
+        for idx in range(len(codes)):
+            col1_starts[idx + 1] += col1_starts[idx]
+
+        return cls(
+            codes,
+            labels,
+            col1_starts,
+            col2,
+            effective,
+            deletion,
+            citation_ids,
+            modifier_ids,
+        )
+
+    # ------------------------------------------------------------------
+    # Binary persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write the index to a prebuilt binary file."""
+        codes_blob = "\0".join(self._codes).encode("utf-8")
+        labels_blob = "\0".join(self._labels).encode("utf-8")
+        n_pairs = len(self._col2)
+
+        def _le(values: Sequence[int], typecode: str) -> bytes:
+            arr = array(typecode, values)
+            if sys.byteorder != "little":
+                arr.byteswap()
+            return arr.tobytes()
+
+        with open(path, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    INDEX_MAGIC,
+                    len(self._codes),
+                    len(self._labels),
+                    n_pairs,
+                    len(codes_blob),
+                    len(labels_blob),
+                )
+            )
+            f.write(codes_blob)
+            f.write(labels_blob)
+            f.write(b"\0" * (-(len(codes_blob) + len(labels_blob)) % 4))
+            f.write(_le(self._col1_starts, "I"))
+            f.write(_le(self._col2, "I"))
+            f.write(_le(self._effective, "I"))
+            f.write(_le(self._deletion, "I"))
+            f.write(_le(self._citation_ids, "H"))
+            f.write(_le(self._modifier_ids, "H"))
+
+    @classmethod
+    def load(cls, path: str | Path) -> NCCIPairIndex:
+        """Load a prebuilt binary index, memory-mapping the edit arrays."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n_codes, n_labels, n_pairs, codes_len, labels_len = _HEADER.unpack_from(
+            mm, 0
+        )
+        if magic != INDEX_MAGIC:
+            mm.close()
+            raise ValueError(f"Not an NCCI pair index file: {path}")
+
+        offset = _HEADER.size
+        codes_blob = mm[offset : offset + codes_len].decode("utf-8")
+        offset += codes_len
+        labels_blob = mm[offset : offset + labels_len].decode("utf-8")
+        offset += labels_len
+        offset += -(codes_len + labels_len) % 4
+
+        def _section(typecode: str, count: int) -> Sequence[int]:
+            nonlocal offset
+            size = array(typecode).itemsize * count
+            view = memoryview(mm)[offset : offset + size]
+            offset += size
+            if sys.byteorder == "little":
+                return view.cast(typecode)
+            arr = array(typecode, view.tobytes())
+            arr.byteswap()
+            return arr
+
+        col1_starts = _section("I", n_codes + 1)
+        col2 = _section("I", n_pairs)
+        effective = _section("I", n_pairs)
+        deletion = _section("I", n_pairs)
+        citation_ids = _section("H", n_pairs)
+        modifier_ids = _section("H", n_pairs)
+
+        return cls(
+            codes_blob.split("\0") if n_codes else [],
+            labels_blob.split("\0") if n_labels else [],
+            col1_starts,
+            col2,
+            effective,
+            deletion,
+            citation_ids,
+            modifier_ids,
+            _mmap=mm,
+            _path=Path(path),
+        )
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._col2)
+
+    def __bool__(self) -> bool:
+        return len(self._col2) > 0
+
+    def _edit_at(self, col1_id: int, pos: int) -> PairEdit:
+        citation_id = self._citation_ids[pos]
+        modifier_id = self._modifier_ids[pos]
+        return PairEdit(
+            column1=self._codes[col1_id],
+            column2=self._codes[self._col2[pos]],
+            modifier=None if modifier_id == NO_LABEL else self._labels[modifier_id],
+            effective_date=self._effective[pos],
+            deletion_date=self._deletion[pos],
+            citation=None if citation_id == NO_LABEL else self._labels[citation_id],
+        )
+
+    def _find(self, col1_id: int, col2_id: int) -> int | None:
+        lo, hi = self._col1_starts[col1_id], self._col1_starts[col1_id + 1]
+        if lo == hi:
+            return None
+        pos = bisect_left(self._col2, col2_id, lo, hi)
+        if pos < hi and self._col2[pos] == col2_id:
+            return pos
+        return None
+
+    def column2_codes(self, code: str) -> list[str]:
+        """Column-2 codes edited against a column-1 code."""
+        col1_id = self._code_ids.get(code)
+        if col1_id is None:
+            return []
+        lo, hi = self._col1_starts[col1_id], self._col1_starts[col1_id + 1]
+        return [self._codes[self._col2[pos]] for pos in range(lo, hi)]
+
+    def lookup(self, code_a: str, code_b: str) -> PairEdit | None:
+        """Find the edit between two codes, in either column order."""
+        id_a = self._code_ids.get(code_a)
+        id_b = self._code_ids.get(code_b)
+        if id_a is None or id_b is None:
+            return None
+        edit = None
+        pos = self._find(id_a, id_b)
+        if pos is not None:
+            edit = self._edit_at(id_a, pos)
+        pos = self._find(id_b, id_a)
+        if pos is not None:
+            edit = _pick(edit, self._edit_at(id_b, pos))
+        return edit
+
+    def __contains__(self, pair: object) -> bool:
+        if not isinstance(pair, tuple) or len(pair) != 2:
+            return False
+        return self.lookup(pair[0], pair[1]) is not None
+
+    def line_pair_edits(
+        self, codes: Sequence[str | None], service_date: int = NO_DATE
+    ) -> list[tuple[int, int, PairEdit]]:
+        """Find edits between the lines of one claim.
+
+        Each distinct billed code is looked up once as a column-1 code and
+        its column-2 slice is intersected with the codes on the claim, so
+        the cost is per line rather than per line pair.
+
+        Args:
+            codes: Procedure code per claim line (None/empty lines ignored)
+            service_date: YYYYMMDD date of service; edits not in effect on
+                that date are skipped. 0 disables the date check.
+
+        Returns:
+            (line_a, line_b, edit) with line_a < line_b, ordered by line_a
+            then line_b.
+        """
+        lines_by_id: dict[int, list[int]] = {}
+        for line, code in enumerate(codes):
+            if not code:
+                continue
+            code_id = self._code_ids.get(code)
+            if code_id is not None:
+                lines_by_id.setdefault(code_id, []).append(line)
+        if not lines_by_id:
+            return []
+
+        claim_ids = sorted(lines_by_id)
+        pair_edits: dict[tuple[int, int], PairEdit] = {}
+        for col1_id in claim_ids:
+            lo, hi = self._col1_starts[col1_id], self._col1_starts[col1_id + 1]
+            if lo == hi:
+                continue
+            if hi - lo <= len(claim_ids):
+                positions = (
+                    pos for pos in range(lo, hi) if self._col2[pos] in lines_by_id
+                )
+            else:
+                positions = (
+                    pos
+                    for pos in (self._find(col1_id, other) for other in claim_ids)
+                    if pos is not None
+                )
+            for pos in positions:
+                edit = self._edit_at(col1_id, pos)
+                if not edit.active_on(service_date):
+                    continue
+                col2_id = self._col2[pos]
+                key = (min(col1_id, col2_id), max(col1_id, col2_id))
+                pair_edits[key] = _pick(pair_edits.get(key), edit)
+
+        results: list[tuple[int, int, PairEdit]] = []
+        for (id_a, id_b), edit in pair_edits.items():
+            for line_a in lines_by_id[id_a]:
+                for line_b in lines_by_id[id_b]:
+                    if line_a < line_b:
+                        results.append((line_a, line_b, edit))
+                    elif line_b < line_a and id_a != id_b:
+                        results.append((line_b, line_a, edit))
+        results.sort(key=lambda r: (r[0], r[1]))
+        return results
+
+    def close(self) -> None:
+        """Release the memory map of a loaded index."""
+        if self._mmap is not None:
+            self._col1_starts = self._col2 = self._effective = array("I")
+            self._deletion = array("I")
+            self._citation_ids = self._modifier_ids = array("H")
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views handed out by lookups are still alive; the map is
+                # released once they are garbage collected.
+                pass
+            self._mmap = None
+            self._path = None
+
+
+# Legacy tuple-keyed dicts converted by as_pair_index, keyed by id() with a
+# strong reference to the source mapping so ids cannot be recycled.
+_converted: dict[int, tuple[Mapping[Any, Any], NCCIPairIndex]] = {}
+_converted_lock = Lock()
+_MAX_CONVERTED = 8
+
+
+def as_pair_index(dataset: Any) -> NCCIPairIndex:
+    """Return dataset as an NCCIPairIndex, converting legacy dicts once."""
+    if isinstance(dataset, NCCIPairIndex):
+        return dataset
+    if not dataset:
+        return _EMPTY_INDEX
+    with _converted_lock:
+        cached = _converted.get(id(dataset))
+        if cached is not None and cached[0] is dataset:
+            return cached[1]
+    index = NCCIPairIndex.from_pairs(dataset)
+    with _converted_lock:
+        if len(_converted) >= _MAX_CONVERTED:
+            _converted.pop(next(iter(_converted)))
+        _converted[id(dataset)] = (dataset, index)
+    return index
+
+
+_EMPTY_INDEX = NCCIPairIndex._build({})
@@ -0,0 +1,149 @@
+"""Compiled rule plans.
+
+A rule plan is the subset of registered rules that can fire for a given
+datasets/config snapshot, with rule_overrides resolved ahead of time. Plans
+are cached, so per-claim evaluation only runs rules whose reference data is
+actually loaded.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+from .registry import RuleCallable, RuleRegistry, RuleRequirements, get_requirements
+
+# Maximum number of compiled plans kept in memory
+MAX_CACHED_PLANS = 32
+
+
+@dataclass(frozen=True)
+class RuleOverride:
+    """Pre-resolved rule_overrides entry (None keeps the hit's own value)."""
+
+    weight: float | None = None
+    severity: str | None = None
+
+
+@dataclass(frozen=True)
+class RulePlan:
+    """Rules to run for one datasets/config snapshot."""
+
+    steps: tuple[tuple[RuleCallable, RuleRequirements], ...]
+    skipped: tuple[str, ...] = ()
+    disabled_rule_ids: frozenset[str] = frozenset()
+    overrides: Mapping[str, RuleOverride] = field(default_factory=dict)
+
+    @property
+    def rules(self) -> tuple[RuleCallable, ...]:
+        return tuple(rule for rule, _ in self.steps)
+
+    def rules_for(self, claim: Mapping[str, Any]) -> list[RuleCallable]:
+        """Rules in the plan whose required claim fields are present."""
+        return [
+            rule
+            for rule, requirements in self.steps
+            if not requirements.claim_fields or requirements.satisfied_by_claim(claim)
+        ]
+
+
+def available_datasets(datasets: Mapping[str, Any]) -> frozenset[str]:
+    """Keys of datasets that are loaded and non-empty."""
+    return frozenset(key for key, value in datasets.items() if value)
+
+
+def _resolve_overrides(
+    rule_overrides: Mapping[str, Mapping[str, Any]],
+) -> tuple[frozenset[str], dict[str, RuleOverride]]:
+    disabled: set[str] = set()
+    overrides: dict[str, RuleOverride] = {}
+    for rule_id, override in rule_overrides.items():
+        if not override:
+            continue
+        if not override.get("enabled", True):
+            disabled.add(rule_id)
+            continue
+        overrides[rule_id] = RuleOverride(
+            weight=float(override["weight"]) if "weight" in override else None,
+            severity=str(override["severity"]) if "severity" in override else None,
+        )
+    return frozenset(disabled), overrides
+
+
+def compile_rule_plan(
+    registry: RuleRegistry,
+    datasets: Mapping[str, Any],
+    config: Mapping[str, Any] | None = None,
+) -> RulePlan:
+    """Build a rule plan for a datasets/config snapshot.
+
+    Rules are dropped when a required dataset is missing or empty, or when
+    every rule_id they can emit is disabled via config["rule_overrides"].
+    """
+    config = config or {}
+    available = available_datasets(datasets)
+    disabled, overrides = _resolve_overrides(config.get("rule_overrides", {}))
+
+    steps: list[tuple[RuleCallable, RuleRequirements]] = []
+    skipped: list[str] = []
+    for rule in registry.active_rules():
+        requirements = get_requirements(rule)
+        if not requirements.satisfied_by_datasets(available) or (
+            requirements.rule_ids and disabled.issuperset(requirements.rule_ids)
+        ):
+            skipped.append(getattr(rule, "__name__", repr(rule)))
+            continue
+        steps.append((rule, requirements))
+
+    return RulePlan(
+        steps=tuple(steps),
+        skipped=tuple(skipped),
+        disabled_rule_ids=disabled,
+        overrides=overrides,
+    )
+
+
+_plan_cache: OrderedDict[tuple, RulePlan] = OrderedDict()
+_plan_cache_lock = Lock()
+
+
+def get_rule_plan(
+    registry: RuleRegistry,
+    datasets: Mapping[str, Any],
+    config: Mapping[str, Any] | None = None,
+) -> RulePlan:
+    """Get the cached rule plan for a datasets/config snapshot.
+
+    The cache key is the registry version, the set of non-empty dataset keys
+    and the rule_overrides, so swapping in a dataset or changing overrides
+    yields a fresh plan.
+    """
+    rule_overrides = (config or {}).get("rule_overrides") or {}
+    key = (
+        id(registry),
+        registry.version,
+        available_datasets(datasets),
+        json.dumps(rule_overrides, sort_keys=True, default=str),
+    )
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+
+    plan = compile_rule_plan(registry, datasets, config)
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        while len(_plan_cache) > MAX_CACHED_PLANS:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def clear_rule_plan_cache() -> None:
+    """Drop all cached rule plans."""
+    with _plan_cache_lock:
+        _plan_cache.clear()
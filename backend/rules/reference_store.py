@@ -0,0 +1,202 @@
+"""Memory-mapped reference dataset tables.
+
+Reference datasets (MUE limits, MPFS, LCD, OIG exclusions) are compiled by
+the download scripts into a read-only table file: a sorted key table with
+offsets into a blob of JSON-encoded values. Loading a table memory-maps the
+file instead of parsing it, so every uvicorn or batch worker shares the same
+page-cache copy and startup does no JSON decoding. Values are decoded on
+access.
+
+A ReferenceTable is a read-only Mapping, so rules keep using
+context.datasets.get(...) / `in` / [] exactly as with dicts and sets.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+# File layout (little-endian):
+#   header: magic, flags, n_keys, keys_len, values_len
+#   key_offsets, value_offsets: uint64[n_keys + 1] each
+#   keys blob (UTF-8, sorted by bytes), values blob (JSON per key)
+TABLE_MAGIC = b"HPIREF01"
+_HEADER = struct.Struct("<8sIIQQ")
+
+# Set when the table was written from a set of keys (no values)
+FLAG_KEYS_ONLY = 0x1
+
+# Decoded values kept per table
+VALUE_CACHE_SIZE = 4096
+
+TABLE_SUFFIX = ".ref"
+
+
+def write_reference_table(
+    path: str | Path, data: Mapping[str, Any] | Iterable[str]
+) -> int:
+    """Compile a mapping (or a collection of keys) into a table file.
+
+    Args:
+        path: Output file path, conventionally data/<dataset>.ref
+        data: Mapping of string keys to JSON-serializable values, or an
+            iterable of keys for set-style datasets such as OIG exclusions
+
+    Returns:
+        Number of keys written
+    """
+    keys_only = not isinstance(data, Mapping)
+    if keys_only:
+        items = sorted((str(key).encode("utf-8"), b"") for key in set(data))
+    else:
+        items = sorted(
+            (
+                str(key).encode("utf-8"),
+                json.dumps(value, separators=(",", ":"), default=_json_default).encode(
+                    "utf-8"
+                ),
+            )
+            for key, value in data.items()
+        )
+
+    key_offsets = array("Q", [0])
+    value_offsets = array("Q", [0])
+    for key, value in items:
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(value))
+    keys_len, values_len = key_offsets[-1], value_offsets[-1]
+    if sys.byteorder != "little":
+        key_offsets.byteswap()
+        value_offsets.byteswap()
+
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                TABLE_MAGIC,
+                FLAG_KEYS_ONLY if keys_only else 0,
+                len(items),
+                keys_len,
+                values_len,
+            )
+        )
+        f.write(key_offsets.tobytes())
+        f.write(value_offsets.tobytes())
+        for key, _ in items:
+            f.write(key)
+        for _, value in items:
+            f.write(value)
+    # Replace atomically so running workers never map a half-written file
+    tmp_path.replace(path)
+    return len(items)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ReferenceTable(Mapping[str, Any]):
+    """Read-only, memory-mapped string-keyed table.
+
+    Lookups binary-search the sorted key table directly in the mapped file;
+    only the values that are actually read get JSON-decoded (and cached).
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, flags, n_keys, _, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != TABLE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a reference table file: {self.path}")
+
+        self.keys_only = bool(flags & FLAG_KEYS_ONLY)
+        self._n_keys = n_keys
+        offsets_size = 8 * (n_keys + 1)
+        self._key_offsets = self._offsets(_HEADER.size, n_keys + 1)
+        self._value_offsets = self._offsets(_HEADER.size + offsets_size, n_keys + 1)
+        self._keys_start = _HEADER.size + 2 * offsets_size
+        self._values_start = self._keys_start + self._key_offsets[n_keys]
+        self._decode = lru_cache(maxsize=VALUE_CACHE_SIZE)(self._decode_value)
+
+    @classmethod
+    def load(cls, path: str | Path) -> ReferenceTable:
+        """Memory-map a table file."""
+        return cls(path)
+
+    def __reduce__(self) -> tuple:
+        # Re-map from the file in the receiving process (e.g. batch workers)
+        return (type(self), (self.path,))
+
+    def _offsets(self, start: int, count: int) -> Any:
+        view = memoryview(self._mmap)[start : start + 8 * count]
+        if sys.byteorder == "little":
+            return view.cast("Q")
+        offsets = array("Q", view.tobytes())
+        offsets.byteswap()
+        return offsets
+
+    def _key_at(self, idx: int) -> bytes:
+        start = self._keys_start + self._key_offsets[idx]
+        end = self._keys_start + self._key_offsets[idx + 1]
+        return self._mmap[start:end]
+
+    def _find(self, key: Any) -> int | None:
+        if not isinstance(key, str):
+            return None
+        target = key.encode("utf-8")
+        lo, hi = 0, self._n_keys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n_keys and self._key_at(lo) == target:
+            return lo
+        return None
+
+    def _decode_value(self, idx: int) -> Any:
+        if self.keys_only:
+            return True
+        start = self._values_start + self._value_offsets[idx]
+        end = self._values_start + self._value_offsets[idx + 1]
+        return json.loads(self._mmap[start:end])
+
+    def __getitem__(self, key: str) -> Any:
+        idx = self._find(key)
+        if idx is None:
+            raise KeyError(key)
+        return self._decode(idx)
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for idx in range(self._n_keys):
+            yield self._key_at(idx).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._n_keys
+
+    def __repr__(self) -> str:
+        return f"ReferenceTable({str(self.path)!r}, keys={self._n_keys})"
+
+
+def load_reference_table(data_dir: Path, name: str) -> ReferenceTable | None:
+    """Load data_dir/<name>.ref if it exists."""
+    path = data_dir / f"{name}{TABLE_SUFFIX}"
+    if not path.exists():
+        return None
+    return ReferenceTable.load(path)
@@ -2,20 +2,97 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
 
 from .models import RuleContext, RuleHit
 
 RuleCallable = Callable[[RuleContext], list[RuleHit]]
 
+# Attribute set on rule functions by @requires
+REQUIREMENTS_ATTR = "__rule_requirements__"
+
+
+@dataclass(frozen=True)
+class RuleRequirements:
+    """Inputs a rule needs before it can produce any hit.
+
+    Attributes:
+        datasets: Dataset keys that must be non-empty. A nested tuple lists
+            alternatives, any one of which is enough (e.g. a rule that fires
+            from either a code list or a per-code rules table).
+        claim_fields: Claim fields (dotted paths for nested values, e.g.
+            "member.member_id") that must be present and non-empty.
+        rule_ids: Every rule_id the rule can emit. When all of them are
+            disabled through rule_overrides the rule is skipped entirely.
+    """
+
+    datasets: tuple[str | tuple[str, ...], ...] = ()
+    claim_fields: tuple[str, ...] = ()
+    rule_ids: tuple[str, ...] = ()
+
+    def satisfied_by_datasets(self, available: frozenset[str]) -> bool:
+        for requirement in self.datasets:
+            alternatives = (
+                (requirement,) if isinstance(requirement, str) else requirement
+            )
+            if not available.intersection(alternatives):
+                return False
+        return True
+
+    def satisfied_by_claim(self, claim: Mapping[str, Any]) -> bool:
+        for field_path in self.claim_fields:
+            value: Any = claim
+            for part in field_path.split("."):
+                value = value.get(part) if isinstance(value, Mapping) else None
+            if not value:
+                return False
+        return True
+
+
+def requires(
+    datasets: Iterable[str | tuple[str, ...]] = (),
+    claim_fields: Iterable[str] = (),
+    rule_ids: Iterable[str] = (),
+) -> Callable[[RuleCallable], RuleCallable]:
+    """Declare what a rule needs so compiled rule plans can skip it.
+
+    Only declare a requirement when its absence guarantees the rule returns
+    no hits; undeclared rules always run.
+    """
+
+    def decorator(rule: RuleCallable) -> RuleCallable:
+        setattr(
+            rule,
+            REQUIREMENTS_ATTR,
+            RuleRequirements(
+                datasets=tuple(datasets),
+                claim_fields=tuple(claim_fields),
+                rule_ids=tuple(rule_ids),
+            ),
+        )
+        return rule
+
+    return decorator
+
+
+def get_requirements(rule: RuleCallable) -> RuleRequirements:
+    """Get the declared requirements of a rule (empty if undeclared)."""
+    return getattr(rule, REQUIREMENTS_ATTR, None) or RuleRequirements()
+
 
 class RuleRegistry:
     def __init__(self) -> None:
         self._rules: list[RuleCallable] = []
+        self._rule_set: set[RuleCallable] = set()
+        self.version = 0
 
     def register(self, rule: RuleCallable) -> None:
-        if rule not in self._rules:
+        if rule not in self._rule_set:
             self._rules.append(rule)
+            self._rule_set.add(rule)
+            self.version += 1
 
     def extend(self, rules: Iterable[RuleCallable]) -> None:
         for rule in rules:
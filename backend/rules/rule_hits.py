@@ -0,0 +1,210 @@
+"""Normalized per-hit storage for analysis results.
+
+results.rule_hits holds each claim's hits as one JSON blob, so questions
+like "every claim that hit NCCI_PTP last week" or "providers with the most
+OIG hits" meant scanning and decoding the whole table. Each hit is also
+written as a row of result_rule_hits, in the transaction that writes the
+results row, with indexes on rule_id, flag, severity, provider NPI and
+created_at for investigators' ad-hoc queries.
+
+The JSON column is still written so older readers keep working; get_results
+reassembles hits from this table and only falls back to the JSON for rows
+that predate it. Existing databases are backfilled once by
+backfill_rule_hits(), run from init_db.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+from typing import Any
+
+from rules.hit_stats import REBUILD_FETCH_SIZE, _json_list, ensure_stats_tables
+
+# stats_meta key recording when existing results were backfilled
+_BACKFILLED_KEY = "rule_hits_backfilled_at"
+
+# Stored hit columns, in RuleHit field order (the last two are JSON)
+HIT_COLUMNS = (
+    "rule_id",
+    "rule_type",
+    "description",
+    "weight",
+    "severity",
+    "flag",
+    "citation",
+    "affected_codes",
+    "metadata",
+)
+
+_INSERT_HIT_SQL = f"""INSERT INTO result_rule_hits
+    (job_id, hit_index, claim_id, provider_npi, created_at, {", ".join(HIT_COLUMNS)})
+    VALUES ({", ".join("?" for _ in range(5 + len(HIT_COLUMNS)))})"""
+
+
+def ensure_rule_hits_table(conn: sqlite3.Connection) -> None:
+    """Create result_rule_hits and its query indexes if they don't exist."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS result_rule_hits (
+            job_id TEXT NOT NULL,
+            hit_index INTEGER NOT NULL,
+            claim_id TEXT,
+            provider_npi TEXT,
+            created_at TEXT,
+            rule_id TEXT NOT NULL,
+            rule_type TEXT,
+            description TEXT,
+            weight REAL,
+            severity TEXT,
+            flag TEXT,
+            citation TEXT,
+            affected_codes TEXT,
+            metadata TEXT,
+            PRIMARY KEY (job_id, hit_index)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rule_hits_rule "
+        "ON result_rule_hits(rule_id, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rule_hits_flag "
+        "ON result_rule_hits(flag, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rule_hits_severity "
+        "ON result_rule_hits(severity, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rule_hits_npi "
+        "ON result_rule_hits(provider_npi, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rule_hits_created_at "
+        "ON result_rule_hits(created_at)"
+    )
+
+
+def _hit_rows(row: Mapping[str, Any], provider_npi: str | None) -> list[tuple]:
+    """Child rows for one results row's rule_hits."""
+    hits = [hit for hit in _json_list(row.get("rule_hits")) if isinstance(hit, dict)]
+    hit_rows = []
+    for index, hit in enumerate(hits):
+        metadata = hit.get("metadata") if isinstance(hit.get("metadata"), dict) else {}
+        values = [hit.get(column) for column in HIT_COLUMNS]
+        values[0] = str(values[0] or "unknown")
+        values[-2] = json.dumps(hit.get("affected_codes") or [])
+        values[-1] = json.dumps(metadata)
+        hit_rows.append(
+            (
+                row["job_id"],
+                index,
+                row.get("claim_id"),
+                provider_npi or metadata.get("npi"),
+                row.get("created_at"),
+                *values,
+            )
+        )
+    return hit_rows
+
+
+def record_rule_hits(
+    conn: sqlite3.Connection,
+    rows: Iterable[Mapping[str, Any]],
+    provider_npis: Mapping[str, str | None] | None = None,
+) -> None:
+    """Replace the normalized hits for results rows being written.
+
+    Call in the transaction that inserts the results rows.
+
+    Args:
+        conn: Connection with an open write transaction
+        rows: Results rows keyed by column name (job_id, claim_id,
+            created_at and rule_hits are used)
+        provider_npis: Billing provider NPI per job_id. Hits without one
+            fall back to an "npi" in the hit's metadata.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    provider_npis = provider_npis or {}
+
+    job_ids = [row["job_id"] for row in rows]
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start : start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        conn.execute(
+            f"DELETE FROM result_rule_hits WHERE job_id IN ({placeholders})", chunk
+        )
+
+    conn.executemany(
+        _INSERT_HIT_SQL,
+        [
+            hit_row
+            for row in rows
+            for hit_row in _hit_rows(row, provider_npis.get(row["job_id"]))
+        ],
+    )
+
+
+def backfill_rule_hits(conn: sqlite3.Connection, force: bool = False) -> int:
+    """Populate result_rule_hits from existing results rows, once.
+
+    Provider NPIs are not stored on results, so backfilled hits only carry
+    one when the hit's own metadata recorded it.
+
+    Args:
+        conn: Connection with an open write transaction
+        force: Rebuild even if the backfill has already run
+
+    Returns:
+        Number of results rows scanned (0 if already backfilled)
+    """
+    ensure_rule_hits_table(conn)
+    ensure_stats_tables(conn)
+    if not force:
+        done = conn.execute(
+            "SELECT value FROM stats_meta WHERE key = ?", (_BACKFILLED_KEY,)
+        ).fetchone()
+        if done is not None:
+            return 0
+
+    conn.execute("DELETE FROM result_rule_hits")
+    scanned = 0
+    cursor = conn.execute(
+        "SELECT job_id, claim_id, created_at, rule_hits FROM results "
+        "WHERE rule_hits IS NOT NULL AND rule_hits NOT IN ('', '[]')"
+    )
+    columns = ("job_id", "claim_id", "created_at", "rule_hits")
+    while batch := cursor.fetchmany(REBUILD_FETCH_SIZE):
+        hit_rows = [
+            hit_row
+            for values in batch
+            for hit_row in _hit_rows(dict(zip(columns, values)), None)
+        ]
+        conn.executemany(_INSERT_HIT_SQL, hit_rows)
+        scanned += len(batch)
+
+    conn.execute(
+        "INSERT OR REPLACE INTO stats_meta (key, value) VALUES (?, ?)",
+        (_BACKFILLED_KEY, datetime.now(timezone.utc).isoformat()),
+    )
+    return scanned
+
+
+def load_rule_hits(conn: sqlite3.Connection, job_id: str) -> list[dict[str, Any]]:
+    """Reassemble a result's hits, in their original order."""
+    cursor = conn.execute(
+        f"SELECT {', '.join(HIT_COLUMNS)} FROM result_rule_hits "
+        "WHERE job_id = ? ORDER BY hit_index",
+        (job_id,),
+    )
+    hits = []
+    for values in cursor:
+        hit = dict(zip(HIT_COLUMNS, values))
+        hit["affected_codes"] = json.loads(hit["affected_codes"] or "[]")
+        hit["metadata"] = json.loads(hit["metadata"] or "{}")
+        hits.append(hit)
+    return hits
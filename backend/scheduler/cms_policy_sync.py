@@ -25,13 +25,20 @@ import logging
 import os
 import sqlite3
 import uuid
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+from itertools import islice
 from typing import Any
 
+from database import get_database
+
 logger = logging.getLogger(__name__)
 
+# Documents indexed per ChromaStore.add_documents_with_versions batch
+SYNC_BATCH_SIZE = int(os.getenv("POLICY_SYNC_BATCH_SIZE", "256"))
+
 
 class PolicySource(str, Enum):
     """CMS policy sources supported by the sync job."""
@@ -98,18 +105,12 @@ class CMSPolicySyncManager:
             db_path: Path to SQLite database for state tracking
         """
         self.db_path = db_path or os.getenv("DB_PATH", "./data/prototype.db")
+        self._db = get_database(self.db_path)
         self._ensure_tables()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _ensure_tables(self) -> None:
         """Ensure policy sync tables exist."""
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
 
             # Policy sync history table
@@ -152,10 +153,6 @@ class CMSPolicySyncManager:
                 ON policy_sync_history(status)
             """)
 
-            conn.commit()
-        finally:
-            conn.close()
-
     def start_sync(
         self,
         source: PolicySource,
@@ -175,8 +172,7 @@ class CMSPolicySyncManager:
         sync_id = str(uuid.uuid4())
         started_at = datetime.now(timezone.utc).isoformat()
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -192,11 +188,8 @@ class CMSPolicySyncManager:
                     json.dumps(config) if config else None,
                 ),
             )
-            conn.commit()
             logger.info(f"Started policy sync {sync_id} for source {source.value}")
             return sync_id
-        finally:
-            conn.close()
 
     def complete_sync(
         self,
@@ -214,8 +207,7 @@ class CMSPolicySyncManager:
         if result.documents_found == 0 and result.errors:
             status = SyncStatus.FAILED
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -251,13 +243,10 @@ class CMSPolicySyncManager:
                     (result.source.value, completed_at, completed_at),
                 )
 
-            conn.commit()
             logger.info(
                 f"Completed sync {sync_id}: {result.documents_added} added, "
                 f"{result.documents_updated} updated, {result.documents_skipped} skipped"
             )
-        finally:
-            conn.close()
 
     def fail_sync(self, sync_id: str, error_message: str) -> None:
         """Mark a sync job as failed.
@@ -268,8 +257,7 @@ class CMSPolicySyncManager:
         """
         completed_at = datetime.now(timezone.utc).isoformat()
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -279,10 +267,7 @@ class CMSPolicySyncManager:
                 """,
                 (SyncStatus.FAILED.value, completed_at, error_message, sync_id),
             )
-            conn.commit()
             logger.error(f"Sync {sync_id} failed: {error_message}")
-        finally:
-            conn.close()
 
     def get_last_sync(self, source: PolicySource) -> dict[str, Any] | None:
         """Get the last sync info for a source.
@@ -293,8 +278,7 @@ class CMSPolicySyncManager:
         Returns:
             Sync history dict or None
         """
-        conn = self._get_conn()
-        try:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -307,8 +291,6 @@ class CMSPolicySyncManager:
             )
             row = cursor.fetchone()
             return dict(row) if row else None
-        finally:
-            conn.close()
 
     def get_source_state(self, source: PolicySource) -> dict[str, Any] | None:
         """Get the current state for a policy source.
@@ -319,8 +301,7 @@ class CMSPolicySyncManager:
         Returns:
             Source state dict or None
         """
-        conn = self._get_conn()
-        try:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM policy_source_state WHERE source = ?",
@@ -328,8 +309,6 @@ class CMSPolicySyncManager:
             )
             row = cursor.fetchone()
             return dict(row) if row else None
-        finally:
-            conn.close()
 
     def get_sync_history(
         self,
@@ -347,8 +326,7 @@ class CMSPolicySyncManager:
         Returns:
             List of sync history dicts
         """
-        conn = self._get_conn()
-        try:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
 
             query = "SELECT * FROM policy_sync_history WHERE 1=1"
@@ -363,8 +341,6 @@ class CMSPolicySyncManager:
 
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
-        finally:
-            conn.close()
 
     def should_sync(self, source: PolicySource, min_interval_hours: int = 6) -> bool:
         """Check if a source should be synced based on time interval.
@@ -444,36 +420,37 @@ class CMSPolicySyncer:
             error_message: Error message if status is error
         """
         try:
-            from routes.audit import log_audit_event, get_db, init_audit_table
+            from routes.audit import record_audit_event
 
-            conn = get_db()
-            init_audit_table(conn)
-            log_audit_event(
-                conn,
-                action=action,
+            record_audit_event(
+                action,
+                db_path=self.db_path,
                 resource_type="policy",
                 details=details,
                 status=status,
                 error_message=error_message,
             )
-            conn.close()
         except Exception as e:
             logger.warning(f"Failed to log audit event: {e}")
 
     def sync_source(
         self,
         source: PolicySource,
-        documents: list[PolicyDocument] | None = None,
+        documents: Iterable[PolicyDocument] | None = None,
         force: bool = False,
     ) -> SyncResult:
         """Synchronize documents from a policy source.
 
         If documents is None, this will fetch from configured sources.
         If documents is provided, those documents will be indexed.
+        Documents are indexed SYNC_BATCH_SIZE at a time, so they may be
+        an iterator (e.g. a streamed upload) rather than a list. If a batch
+        fails, its documents are retried one by one and errors are reported
+        per document.
 
         Args:
             source: The policy source to sync
-            documents: Optional list of documents to index (for manual/batch upload)
+            documents: Optional documents to index (for manual/batch upload)
             force: Force sync even if interval hasn't elapsed
 
         Returns:
@@ -511,29 +488,45 @@ class CMSPolicySyncer:
                 documents = self._fetch_from_source(source)
 
             store = self._get_store()
+            found = 0
             added = 0
             updated = 0
             skipped = 0
             errors: list[str] = []
 
-            for doc in documents:
+            documents = iter(documents)
+            while batch := list(islice(documents, SYNC_BATCH_SIZE)):
+                found += len(batch)
                 try:
-                    result = self._index_document(store, doc)
+                    results = self._index_documents(store, batch)
+                except Exception as e:
+                    # Retry one at a time so a bad document only fails itself
+                    logger.warning(
+                        f"Failed to index batch of {len(batch)} documents, "
+                        f"retrying individually: {e}"
+                    )
+                    results = []
+                    for doc in batch:
+                        try:
+                            results.append(self._index_document(store, doc))
+                        except Exception as doc_error:
+                            errors.append(
+                                f"Failed to index {doc.title}: {str(doc_error)}"
+                            )
+                            logger.error(f"Failed to index document: {doc_error}")
+                for result in results:
                     if result.get("is_duplicate"):
                         skipped += 1
                     elif result.get("replaced_id"):
                         updated += 1
                     else:
                         added += 1
-                except Exception as e:
-                    errors.append(f"Failed to index {doc.title}: {str(e)}")
-                    logger.error(f"Failed to index document: {e}")
 
             duration = time.time() - start_time
 
             result = SyncResult(
                 source=source,
-                documents_found=len(documents),
+                documents_found=found,
                 documents_added=added,
                 documents_updated=updated,
                 documents_skipped=skipped,
@@ -599,20 +592,8 @@ class CMSPolicySyncer:
         logger.info(f"Fetch from {source.value} - no automatic fetch configured")
         return []
 
-    def _index_document(
-        self,
-        store,
-        doc: PolicyDocument,
-    ) -> dict[str, Any]:
-        """Index a single policy document into ChromaDB.
-
-        Args:
-            store: ChromaDB store instance
-            doc: The document to index
-
-        Returns:
-            Result dict from add_document_with_version
-        """
+    def _index_entry(self, doc: PolicyDocument) -> dict[str, Any]:
+        """Build the versioned-store entry (document, metadata, policy_key)."""
         # Generate policy key if not provided
         policy_key = doc.policy_key
         if not policy_key:
@@ -628,12 +609,15 @@ class CMSPolicySyncer:
         # Build metadata
         metadata = {
             "source": doc.source.value,
-            "source_url": doc.source_url,
             "title": doc.title,
             "authority": doc.authority,
             "document_type": doc.document_type,
         }
 
+        # Chroma rejects None metadata values
+        if doc.source_url:
+            metadata["source_url"] = doc.source_url
+
         if doc.effective_date:
             metadata["effective_date"] = doc.effective_date
         if doc.expires_date:
@@ -643,12 +627,43 @@ class CMSPolicySyncer:
         if doc.related_codes:
             metadata["related_codes"] = ",".join(doc.related_codes)
 
+        return {"document": doc.content, "metadata": metadata, "policy_key": policy_key}
+
+    def _index_document(
+        self,
+        store,
+        doc: PolicyDocument,
+    ) -> dict[str, Any]:
+        """Index a single policy document into ChromaDB.
+
+        Args:
+            store: ChromaDB store instance
+            doc: The document to index
+
+        Returns:
+            Result dict from add_document_with_version
+        """
+        return self._index_documents(store, [doc])[0]
+
+    def _index_documents(
+        self,
+        store,
+        docs: list[PolicyDocument],
+    ) -> list[dict[str, Any]]:
+        """Index a batch of policy documents into ChromaDB.
+
+        Args:
+            store: ChromaDB store instance
+            docs: The documents to index
+
+        Returns:
+            Result dicts from add_documents_with_versions, in order
+        """
         # Use versioning to handle updates
-        return store.add_document_with_version(
-            document=doc.content,
-            metadata=metadata,
-            policy_key=policy_key,
+        return store.add_documents_with_versions(
+            [self._index_entry(doc) for doc in docs],
             replace_existing=True,  # Keep latest as current
+            batch_size=SYNC_BATCH_SIZE,
         )
 
     def sync_all_sources(self, force: bool = False) -> dict[str, SyncResult]:
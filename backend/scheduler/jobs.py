@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
+from database import get_database
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,18 +49,12 @@ class SyncJobManager:
             db_path: Path to SQLite database
         """
         self.db_path = db_path
+        self._db = get_database(db_path)
         self._ensure_tables()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _ensure_tables(self) -> None:
         """Ensure sync job tables exist."""
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
 
             # Sync jobs table
@@ -125,10 +121,6 @@ class SyncJobManager:
                     WHERE created_at IS NULL
                 """)
 
-            conn.commit()
-        finally:
-            conn.close()
-
     def create_job(
         self,
         connector_id: str,
@@ -150,8 +142,7 @@ class SyncJobManager:
         job_id = str(uuid.uuid4())
         created_at = datetime.now(timezone.utc).isoformat()
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -170,11 +161,8 @@ class SyncJobManager:
                     created_at,
                 ),
             )
-            conn.commit()
             logger.info(f"Created sync job {job_id} for connector {connector_id}")
             return job_id
-        finally:
-            conn.close()
 
     def start_job(self, job_id: str) -> None:
         """Mark a job as started.
@@ -184,8 +172,7 @@ class SyncJobManager:
         """
         started_at = datetime.now(timezone.utc).isoformat()
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -195,10 +182,7 @@ class SyncJobManager:
                 """,
                 (JobStatus.RUNNING.value, started_at, job_id),
             )
-            conn.commit()
             logger.info(f"Started sync job {job_id}")
-        finally:
-            conn.close()
 
     def complete_job(
         self,
@@ -218,8 +202,7 @@ class SyncJobManager:
         completed_at = datetime.now(timezone.utc).isoformat()
         status = JobStatus.SUCCESS if success else JobStatus.FAILED
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -230,10 +213,7 @@ class SyncJobManager:
                 """,
                 (status.value, completed_at, error_message, watermark_value, job_id),
             )
-            conn.commit()
             logger.info(f"Completed sync job {job_id} with status {status.value}")
-        finally:
-            conn.close()
 
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a running or pending job.
@@ -246,8 +226,7 @@ class SyncJobManager:
         """
         completed_at = datetime.now(timezone.utc).isoformat()
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -264,13 +243,10 @@ class SyncJobManager:
                     JobStatus.RUNNING.value,
                 ),
             )
-            conn.commit()
             cancelled = cursor.rowcount > 0
             if cancelled:
                 logger.info(f"Cancelled sync job {job_id}")
             return cancelled
-        finally:
-            conn.close()
 
     def update_progress(
         self,
@@ -287,8 +263,7 @@ class SyncJobManager:
             processed_records: Records processed so far
             failed_records: Records that failed processing
         """
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
 
             # Build dynamic update
@@ -315,9 +290,6 @@ class SyncJobManager:
                     """,
                     params,
                 )
-                conn.commit()
-        finally:
-            conn.close()
 
     def get_job(self, job_id: str) -> dict[str, Any] | None:
         """Get job details.
@@ -328,14 +300,11 @@ class SyncJobManager:
         Returns:
             Job dict or None
         """
-        conn = self._get_conn()
-        try:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM sync_jobs WHERE id = ?", (job_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
-        finally:
-            conn.close()
 
     def get_jobs(
         self,
@@ -355,8 +324,7 @@ class SyncJobManager:
         Returns:
             List of job dicts
         """
-        conn = self._get_conn()
-        try:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
 
             query = "SELECT * FROM sync_jobs WHERE 1=1"
@@ -374,8 +342,6 @@ class SyncJobManager:
 
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
-        finally:
-            conn.close()
 
     def get_running_jobs(self, connector_id: str | None = None) -> list[dict[str, Any]]:
         """Get currently running jobs.
@@ -408,8 +374,7 @@ class SyncJobManager:
         log_id = str(uuid.uuid4())
         timestamp = datetime.now(timezone.utc).isoformat()
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -425,9 +390,6 @@ class SyncJobManager:
                     json.dumps(context) if context else None,
                 ),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def get_logs(
         self, job_id: str, limit: int = 100, offset: int = 0
@@ -444,8 +406,7 @@ class SyncJobManager:
         """
         import json
 
-        conn = self._get_conn()
-        try:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -463,8 +424,6 @@ class SyncJobManager:
                     log["context"] = json.loads(log["context"])
                 logs.append(log)
             return logs
-        finally:
-            conn.close()
 
     def get_last_successful_watermark(self, connector_id: str) -> str | None:
         """Get the watermark from the last successful sync.
@@ -475,8 +434,7 @@ class SyncJobManager:
         Returns:
             Watermark value or None
         """
-        conn = self._get_conn()
-        try:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -489,8 +447,6 @@ class SyncJobManager:
             )
             row = cursor.fetchone()
             return row["watermark_value"] if row else None
-        finally:
-            conn.close()
 
     def cleanup_old_jobs(self, days: int = 30) -> int:
         """Delete old completed jobs.
@@ -505,8 +461,7 @@ class SyncJobManager:
 
         cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
 
-        conn = self._get_conn()
-        try:
+        with self._db.write(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
 
             # Delete logs first (foreign key)
@@ -541,11 +496,8 @@ class SyncJobManager:
             )
 
             deleted = cursor.rowcount
-            conn.commit()
             logger.info(f"Cleaned up {deleted} old sync jobs")
             return deleted
-        finally:
-            conn.close()
 
 
 # Global job manager instance
@@ -8,58 +8,19 @@ from __future__ import annotations
 
 import json
 import logging
-import os
 import sqlite3
 import threading
 import traceback
-from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any, Iterator
+from typing import Any
 
 from .jobs import JobType, SyncJobManager, get_job_manager
 from connectors.constants import CONNECTOR_SECRET_FIELDS
+from database import get_database
 
 logger = logging.getLogger(__name__)
 
 
-# Thread-local storage for database connections
-_thread_local = threading.local()
-
-
-@contextmanager
-def get_db_connection(db_path: str | None = None) -> Iterator[sqlite3.Connection]:
-    """Get a database connection with proper management.
-
-    Uses thread-local storage to reuse connections within the same thread.
-    Connections are properly closed when the context exits.
-
-    Args:
-        db_path: Path to SQLite database
-
-    Yields:
-        SQLite connection
-    """
-    path = db_path or os.getenv("DB_PATH", "./data/prototype.db")
-
-    # Get or create connection for this thread
-    if not hasattr(_thread_local, "connections"):
-        _thread_local.connections = {}
-
-    if path not in _thread_local.connections:
-        conn = sqlite3.connect(path)
-        conn.row_factory = sqlite3.Row
-        _thread_local.connections[path] = conn
-
-    try:
-        yield _thread_local.connections[path]
-    except Exception:
-        # On error, close and remove the connection
-        conn = _thread_local.connections.pop(path, None)
-        if conn:
-            conn.close()
-        raise
-
-
 class SyncWorker:
     """Worker for executing sync jobs.
 
@@ -79,6 +40,8 @@ class SyncWorker:
             db_path: Database path for default job manager
         """
         self.job_manager = job_manager or get_job_manager(db_path)
+        # Connectors live in the same database as the jobs
+        self._db = get_database(self.job_manager.db_path)
         self._running_jobs: dict[str, threading.Event] = {}
         self._lock = threading.Lock()
 
@@ -320,7 +283,7 @@ class SyncWorker:
         Returns:
             Connector config dict or None
         """
-        with get_db_connection() as conn:
+        with self._db.read(row_factory=sqlite3.Row) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM connectors WHERE id = ?", (connector_id,))
             row = cursor.fetchone()
@@ -456,7 +419,7 @@ class SyncWorker:
             status: Sync status (success, failed)
             watermark: Final watermark value
         """
-        with get_db_connection() as conn:
+        with self._db.write() as conn:
             cursor = conn.cursor()
             now = datetime.now(timezone.utc).isoformat()
             cursor.execute(
@@ -467,7 +430,6 @@ class SyncWorker:
                 """,
                 (now, status, connector_id),
             )
-            conn.commit()
 
 
 # Global worker instance
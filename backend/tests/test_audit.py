@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import csv
+import gzip
+import io
 import json
 import os
 import tempfile
@@ -197,6 +200,56 @@ class TestListAuditLogs:
         assert data["total"] == 1
         assert data["entries"][0]["status"] == "error"
 
+    def test_cursor_pagination(self, client, test_db):
+        """Test walking pages with next_cursor returns every entry once."""
+        with patch.dict(os.environ, {"DB_PATH": test_db}):
+            from routes.audit import get_db, init_audit_table, log_audit_event
+
+            conn = get_db()
+            init_audit_table(conn)
+
+            for i in range(7):
+                log_audit_event(conn, action="test.page", details={"i": i})
+
+            conn.close()
+
+        seen = []
+        params = {"action": "test.page", "limit": 3}
+        while True:
+            data = client.get("/api/audit", params=params).json()
+            seen.extend(entry["id"] for entry in data["entries"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        assert data["total"] == 7
+        assert len(seen) == len(set(seen)) == 7
+
+    def test_count_modes(self, client, test_db):
+        """Test cached totals are reused and count=none skips counting."""
+        with patch.dict(os.environ, {"DB_PATH": test_db}):
+            from routes.audit import get_db, init_audit_table, log_audit_event
+
+            conn = get_db()
+            init_audit_table(conn)
+            log_audit_event(conn, action="test.count")
+
+            assert client.get("/api/audit?count=cached").json()["total"] == 1
+
+            log_audit_event(conn, action="test.count")
+            conn.close()
+
+        assert client.get("/api/audit?count=cached").json()["total"] == 1
+        assert client.get("/api/audit?count=exact").json()["total"] == 2
+        assert client.get("/api/audit?count=none").json()["total"] is None
+        assert client.get("/api/audit?count=bogus").status_code == 422
+
+    def test_invalid_cursor_returns_400(self, client):
+        """Test a malformed cursor is rejected."""
+        response = client.get("/api/audit?cursor=%%%")
+
+        assert response.status_code == 400
+
 
 class TestAuditStats:
     """Tests for get_audit_stats endpoint."""
@@ -306,6 +359,55 @@ class TestExportAuditLogs:
 
         assert len(data["audit_logs"]) == 5
 
+    def test_streams_in_chunks_and_resumes(self, client, test_db, monkeypatch):
+        """Test a chunked export can be resumed after its last row."""
+        monkeypatch.setattr("routes.audit.EXPORT_FETCH_SIZE", 2)
+        with patch.dict(os.environ, {"DB_PATH": test_db}):
+            from routes.audit import get_db, init_audit_table, log_audit_event
+
+            conn = get_db()
+            init_audit_table(conn)
+
+            for i in range(7):
+                log_audit_event(conn, action="test.stream", details={"i": i})
+            conn.close()
+
+        full = client.get("/api/audit/export?format=json&action=test.stream").json()
+        first = client.get("/api/audit/export?action=test.stream&limit=3").text
+        last_row = list(csv.reader(io.StringIO(first)))[-1]
+        rest = client.get(
+            "/api/audit/export",
+            params={
+                "format": "json",
+                "action": "test.stream",
+                "before": last_row[1],
+                "before_id": last_row[0],
+            },
+        ).json()
+
+        ids = [entry["id"] for entry in full["audit_logs"]]
+        assert len(ids) == 7
+        assert [entry["id"] for entry in rest["audit_logs"]] == ids[3:]
+
+    def test_exports_gzip(self, client, test_db):
+        """Test compressed export."""
+        with patch.dict(os.environ, {"DB_PATH": test_db}):
+            from routes.audit import get_db, init_audit_table, log_audit_event
+
+            conn = get_db()
+            init_audit_table(conn)
+
+            log_audit_event(conn, action="test.gzip", status="success")
+            conn.close()
+
+        response = client.get("/api/audit/export?format=csv&compress=true")
+
+        assert response.headers["content-type"] == "application/gzip"
+        assert ".csv.gz" in response.headers["content-disposition"]
+        content = gzip.decompress(response.content).decode()
+        assert content.startswith("ID,Timestamp,Action")
+        assert "test.gzip" in content
+
 
 class TestListAuditActions:
     """Tests for list_audit_actions endpoint."""
@@ -369,3 +471,93 @@ class TestInitAuditTable:
             assert "status" in columns
 
             conn.close()
+
+
+def _audit_actions(db_path: str) -> list[str]:
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT action FROM audit_logs ORDER BY timestamp")
+        return [row[0] for row in rows]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    import time
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestAuditSink:
+    """Tests for buffered, group-committed audit writes."""
+
+    @pytest.fixture(autouse=True)
+    def reset_table_flag(self):
+        import routes.audit as audit_module
+
+        audit_module._audit_table_initialized = False
+
+    def test_flushes_when_batch_is_full(self, test_db):
+        from routes.audit import AuditSink
+
+        sink = AuditSink(test_db, batch_size=3, flush_interval_ms=60_000)
+        sink.record("test.one")
+        sink.record("test.two")
+
+        assert _audit_actions(test_db) == []
+
+        sink.record("test.three")
+        assert _wait_for(lambda: len(_audit_actions(test_db)) == 3)
+        sink.close()
+
+    def test_flushes_after_interval(self, test_db):
+        from routes.audit import AuditSink
+
+        sink = AuditSink(test_db, batch_size=100, flush_interval_ms=20)
+        sink.record("test.timed", details={"key": "value"})
+
+        assert _wait_for(lambda: _audit_actions(test_db) == ["test.timed"])
+        sink.close()
+
+    def test_sync_record_writes_buffered_events_first(self, test_db):
+        from routes.audit import AuditSink
+
+        sink = AuditSink(test_db, batch_size=100, flush_interval_ms=60_000)
+        sink.record("test.buffered")
+        sink.record("test.critical", sync=True)
+
+        assert _audit_actions(test_db) == ["test.buffered", "test.critical"]
+        sink.close()
+
+    def test_close_writes_pending_events(self, test_db):
+        from routes.audit import AuditSink
+
+        sink = AuditSink(test_db, batch_size=100, flush_interval_ms=60_000)
+        for i in range(5):
+            sink.record(f"test.pending{i}")
+
+        sink.close()
+
+        assert len(_audit_actions(test_db)) == 5
+
+    def test_log_audit_event_joins_open_transaction(self, test_db):
+        with patch.dict(os.environ, {"DB_PATH": test_db}):
+            from routes.audit import get_db, init_audit_table, log_audit_event
+
+            conn = get_db()
+            init_audit_table(conn)
+            conn.execute("BEGIN")
+            log_audit_event(conn, action="test.rolled_back")
+            conn.rollback()
+            conn.close()
+
+        assert _audit_actions(test_db) == []
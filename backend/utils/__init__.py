@@ -1,6 +1,21 @@
 """Shared utility functions for the Healthcare Payment Integrity backend."""
 
 from .date_parser import parse_flexible_date
+from .pagination import (
+    CountCache,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    next_cursor,
+)
 from .sanitization import sanitize_filename
 
-__all__ = ["parse_flexible_date", "sanitize_filename"]
+__all__ = [
+    "CountCache",
+    "decode_cursor",
+    "encode_cursor",
+    "keyset_condition",
+    "next_cursor",
+    "parse_flexible_date",
+    "sanitize_filename",
+]
@@ -0,0 +1,98 @@
+"""Keyset pagination helpers for list endpoints.
+
+LIMIT/OFFSET makes SQLite walk and discard every skipped row, so deep pages
+of an ever-growing table get slower and slower. List endpoints instead hand
+out an opaque cursor holding the (timestamp, id) of the last row returned;
+the next page seeks straight to it through an index on the same columns.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+def encode_cursor(timestamp: str | None, row_id: str) -> str:
+    """Build the cursor that continues after the given row."""
+    raw = json.dumps([timestamp, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Parse a cursor from encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(timestamp, str) or not isinstance(row_id, str):
+        raise ValueError("Invalid pagination cursor")
+    return timestamp, row_id
+
+
+def keyset_condition(timestamp_column: str, id_column: str) -> str:
+    """WHERE condition selecting rows after a cursor in descending order.
+
+    Bind the two values from decode_cursor(). Column names must be trusted
+    identifiers, never user input.
+    """
+    return f"({timestamp_column}, {id_column}) < (?, ?)"
+
+
+def next_cursor(
+    rows: list[Any], limit: int, key: Callable[[Any], tuple[str | None, str]]
+) -> str | None:
+    """Cursor for the page after rows, or None on the last page.
+
+    Expects rows fetched with LIMIT limit + 1 and trims the extra row, which
+    only signals that another page exists.
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    return encode_cursor(*key(rows[-1]))
+
+
+class CountCache:
+    """Short-lived cache of COUNT(*) results keyed by query and params.
+
+    Counting every row matching a filter costs as much as reading them, so
+    list endpoints can opt into a total that is up to ttl_seconds stale.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], int]) -> int:
+        """Return the cached count for key, computing it if missing or stale."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        count = compute()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl_seconds, count)
+        return count
+
+    def clear(self) -> None:
+        """Drop all cached counts."""
+        with self._lock:
+            self._entries.clear()
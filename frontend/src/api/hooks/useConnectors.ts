@@ -246,6 +246,7 @@ export function useSyncJobs(params?: {
   status?: string;
   limit?: number;
   offset?: number;
+  cursor?: string;
 }) {
   return useQuery({
     queryKey: ['sync-jobs', 'list', params],
@@ -255,6 +256,7 @@ export function useSyncJobs(params?: {
         total: number;
         limit: number;
         offset: number;
+        next_cursor: string | null;
       }>('/api/sync-jobs', { params });
       return response.data;
     },
@@ -103,8 +103,12 @@ export interface AnalysisResult {
   provider_flags: string[];
   roi_estimate: number | null;
   claude_analysis: ClaudeAnalysis;
+  kirk_status?: KirkStatus;
 }
 
+// Kirk explanation state (pending while computed in the background)
+export type KirkStatus = 'pending' | 'completed' | 'failed' | 'skipped';
+
 // Upload response
 export interface UploadResponse {
   job_id: string;
@@ -153,6 +157,7 @@ export interface JobSummary {
 export interface JobsResponse {
   jobs: JobSummary[];
   total: number;
+  next_cursor?: string | null;
 }
 
 // Search types
@@ -360,10 +365,12 @@ export interface AuditLogEntry {
 
 export interface AuditLogListResponse {
   entries: AuditLogEntry[];
-  total: number;
+  // null when the request asked for count=none
+  total: number | null;
   limit: number;
   offset: number;
   filters_applied: Record<string, unknown>;
+  next_cursor?: string | null;
 }
 
 export interface AuditStats {
@@ -195,7 +195,8 @@ export function AuditLog() {
     }
   };
 
-  const totalPages = logsData ? Math.ceil(logsData.total / limit) : 0;
+  const total = logsData?.total ?? 0;
+  const totalPages = Math.ceil(total / limit);
 
   return (
     <div className="p-8 space-y-8">
@@ -484,7 +485,7 @@ export function AuditLog() {
             {totalPages > 0 && (
               <div className="flex items-center justify-between p-4 border-t border-navy-700">
                 <p className="text-sm text-navy-400">
-                  Showing {page * limit + 1} - {Math.min((page + 1) * limit, logsData.total)} of {logsData.total}
+                  Showing {page * limit + 1} - {Math.min((page + 1) * limit, total)} of {total}
                 </p>
                 {totalPages > 1 && (
                   <div className="flex items-center gap-2">
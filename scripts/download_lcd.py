@@ -11,6 +11,7 @@ https://www.cms.gov/medicare-coverage-database/downloads/downloads.aspx
 
 Output:
 - data/lcd.json: LCD coverage information with procedure codes
+- data/lcd.ref: Prebuilt reference table loaded by the API (memory-mapped)
 """
 
 from __future__ import annotations
@@ -27,6 +28,11 @@ from pathlib import Path
 from typing import Any
 from urllib.request import urlopen, Request
 
+# Add backend to path for the reference table writer
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from rules.reference_store import write_reference_table  # noqa: E402
+
 # Increase CSV field limit for HTML content
 csv.field_size_limit(sys.maxsize)
 
@@ -322,6 +328,10 @@ def main():
     print(f"  Written {len(lcd_data):,} LCD policies to: {output_path}")
     print(f"  File size: {file_size / 1024:.1f} KB")
 
+    table_path = output_dir / "lcd.ref"
+    write_reference_table(table_path, lcd_data)
+    print(f"  Written reference table to: {table_path}")
+
     print("\n" + "=" * 60)
     print("LCD data download complete!")
     print("=" * 60)
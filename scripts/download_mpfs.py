@@ -12,6 +12,7 @@ https://www.cms.gov/medicare/payment/fee-schedules/physician/pfs-relative-value-
 
 Output:
 - data/mpfs.json: Procedure codes with RVUs and national payment rates
+- data/mpfs.ref: Prebuilt reference table loaded by the API (memory-mapped)
 """
 
 from __future__ import annotations
@@ -20,11 +21,17 @@ import csv
 import io
 import json
 import ssl
+import sys
 import zipfile
 from pathlib import Path
 from typing import Any
 from urllib.request import urlopen, Request
 
+# Add backend to path for the reference table writer
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from rules.reference_store import write_reference_table  # noqa: E402
+
 # CMS MPFS RVU file URL (updated annually, with quarterly corrections)
 # Check https://www.cms.gov/medicare/payment/fee-schedules/physician/pfs-relative-value-files for latest
 CMS_MPFS_URL = "https://www.cms.gov/files/zip/rvu25a-updated-01/10/2025.zip"
@@ -308,6 +315,10 @@ def main():
     print(f"  Written {len(mpfs_data):,} procedure codes to: {output_path}")
     print(f"  File size: {file_size / 1024:.1f} KB")
 
+    table_path = output_dir / "mpfs.ref"
+    write_reference_table(table_path, mpfs_data)
+    print(f"  Written reference table to: {table_path}")
+
     print("\n" + "=" * 60)
     print("MPFS data download complete!")
     print("=" * 60)
@@ -10,7 +10,9 @@ Data sources:
 
 Output:
 - data/ncci_ptp.json: PTP column 1/2 code pairs with modifier indicators
+- data/ncci_ptp.bin: Prebuilt PTP index loaded by the API (memory-mapped)
 - data/ncci_mue.json: MUE (Medically Unlikely Edits) unit limits
+- data/ncci_mue.ref: Prebuilt MUE reference table loaded by the API
 """
 
 from __future__ import annotations
@@ -18,12 +20,19 @@ from __future__ import annotations
 import io
 import json
 import ssl
+import sys
 import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 from urllib.request import urlopen, Request
 
+# Add backend to path for the prebuilt index/table writers
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from rules.ncci_index import NCCIPairIndex  # noqa: E402
+from rules.reference_store import write_reference_table  # noqa: E402
+
 # CMS Medicaid NCCI file URLs (updated quarterly)
 # Check https://www.cms.gov/medicare/coding-billing/ncci-medicaid/medicaid-ncci-edit-files for latest
 CMS_BASE = "https://www.cms.gov/files/zip"
@@ -557,6 +566,15 @@ def main():
         f"  Written {len(ptp_pairs):,} PTP pairs to: {ptp_output} ({ptp_size / 1024 / 1024:.1f} MB)"
     )
 
+    # Prebuilt binary index, memory-mapped by the API at startup
+    ptp_index_output = output_dir / "ncci_ptp.bin"
+    ptp_index = NCCIPairIndex.from_records(ptp_pairs)
+    ptp_index.save(ptp_index_output)
+    ptp_index_size = ptp_index_output.stat().st_size
+    print(
+        f"  Written {len(ptp_index):,} PTP edits to: {ptp_index_output} ({ptp_index_size / 1024 / 1024:.1f} MB)"
+    )
+
     mue_output = output_dir / "ncci_mue.json"
     with open(mue_output, "w") as f:
         json.dump(mue_limits, f, indent=2)
@@ -565,6 +583,10 @@ def main():
         f"  Written {len(mue_limits):,} MUE limits to: {mue_output} ({mue_size:,} bytes)"
     )
 
+    mue_table_output = output_dir / "ncci_mue.ref"
+    write_reference_table(mue_table_output, mue_limits)
+    print(f"  Written MUE reference table to: {mue_table_output}")
+
     print("\n" + "=" * 60)
     print("NCCI data download complete!")
     print("=" * 60)
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""Load and process OIG LEIE (List of Excluded Individuals/Entities) data."""
+"""Load and process OIG LEIE (List of Excluded Individuals/Entities) data.
+
+Writes data/oig_exclusions.json and a prebuilt data/oig_exclusions.ref
+reference table of excluded NPIs that the API memory-maps at startup.
+"""
 
 from __future__ import annotations
 
@@ -8,6 +12,11 @@ import json
 import sys
 from pathlib import Path
 
+# Add backend to path for the reference table writer
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from rules.reference_store import write_reference_table  # noqa: E402
+
 
 def load_leie(source_path: str, output_path: str) -> dict:
     """
@@ -70,6 +79,9 @@ def load_leie(source_path: str, output_path: str) -> dict:
     with open(output_path, "w") as f:
         json.dump(output_data, f, indent=2)
 
+    # Write the excluded NPI set as a reference table next to it
+    write_reference_table(Path(output_path).with_suffix(".ref"), excluded_npis)
+
     return output_data["metadata"]
 
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Rebuild the materialized rule-hit statistics from the results table.
+
+The API keeps result_stats and rule_hit_stats up to date as claims are
+analyzed and backfills them on the first dashboard request. Run this ahead
+of time on a large existing database, or after editing results rows by hand.
+
+Usage:
+    python scripts/rebuild_rule_stats.py [path/to/prototype.db]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path for the database and stats modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from config import DB_PATH  # noqa: E402
+from database import get_database  # noqa: E402
+from rules.hit_stats import rebuild_rule_stats  # noqa: E402
+
+
+def main():
+    """Main entry point."""
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(DB_PATH)
+
+    if not db_path.exists():
+        print(f"Error: Database not found: {db_path}")
+        return 1
+
+    print(f"Rebuilding rule-hit statistics in: {db_path}")
+    start = time.perf_counter()
+    db = get_database(db_path)
+    with db.write() as conn:
+        scanned = rebuild_rule_stats(conn)
+    db.close()
+
+    print(f"  Results scanned: {scanned:,}")
+    print(f"  Elapsed: {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
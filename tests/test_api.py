@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import os
 import tempfile
+import threading
+import time
 from unittest.mock import patch
 
 import pytest
@@ -182,3 +184,254 @@ class TestAnalyzeEndpoint:
 
         # Sample claim has fraud indicators
         assert len(data["rule_hits"]) > 0 or data["fraud_score"] > 0.5
+
+
+class TestAsyncKirkAnalysis:
+    """Test analysis with Kirk's explanation computed in the background."""
+
+    KIRK_RESULT = {
+        "explanation": "Background explanation",
+        "model": "claude-sonnet-4-5-20241022",
+        "tokens_used": 100,
+        "risk_factors": [],
+        "recommendations": [],
+        "agent": "Kirk",
+    }
+
+    def _poll_explanation(self, client: TestClient, job_id: str) -> dict:
+        deadline = time.monotonic() + 5
+        while True:
+            data = client.get(f"/api/results/{job_id}/explanation").json()
+            if data["kirk_status"] != "pending" or time.monotonic() > deadline:
+                return data
+            time.sleep(0.02)
+
+    @patch("app.get_kirk_analysis")
+    def test_async_analyze_returns_score_before_explanation(
+        self, mock_kirk, client: TestClient, sample_claim: dict
+    ):
+        """Test the score is returned and the explanation filled in later."""
+        release = threading.Event()
+
+        def slow_kirk(**kwargs):
+            release.wait(timeout=5)
+            return self.KIRK_RESULT
+
+        mock_kirk.side_effect = slow_kirk
+        job_id = client.post("/api/upload", json=sample_claim).json()["job_id"]
+
+        response = client.post(
+            f"/api/analyze/{job_id}?async_explanation=true", json=sample_claim
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["kirk_status"] == "pending"
+        assert data["claude_analysis"] == {}
+        assert "fraud_score" in data
+        stored = client.get(f"/api/results/{job_id}").json()
+        assert stored["kirk_status"] == "pending"
+        assert stored["fraud_score"] == data["fraud_score"]
+
+        release.set()
+        explanation = self._poll_explanation(client, job_id)
+
+        assert explanation["kirk_status"] == "completed"
+        assert explanation["claude_analysis"]["explanation"] == "Background explanation"
+        assert client.get(f"/api/results/{job_id}").json()["kirk_status"] == "completed"
+
+    @patch("app.get_kirk_analysis")
+    def test_async_kirk_failure_is_reported(
+        self, mock_kirk, client: TestClient, sample_claim: dict
+    ):
+        """Test a failing Kirk call marks the explanation failed."""
+        mock_kirk.side_effect = RuntimeError("overloaded")
+        job_id = client.post("/api/upload", json=sample_claim).json()["job_id"]
+
+        client.post(f"/api/analyze/{job_id}?async_explanation=true", json=sample_claim)
+        explanation = self._poll_explanation(client, job_id)
+
+        assert explanation["kirk_status"] == "failed"
+        assert explanation["claude_analysis"]["error"] == "overloaded"
+
+    @patch("app.get_kirk_analysis")
+    def test_sync_analyze_includes_explanation(
+        self, mock_kirk, client: TestClient, sample_claim: dict
+    ):
+        """Test the default mode still waits for Kirk."""
+        mock_kirk.return_value = self.KIRK_RESULT
+        job_id = client.post("/api/upload", json=sample_claim).json()["job_id"]
+
+        data = client.post(f"/api/analyze/{job_id}", json=sample_claim).json()
+
+        assert data["kirk_status"] == "completed"
+        assert data["claude_analysis"]["explanation"] == "Background explanation"
+
+    def test_explanation_not_found(self, client: TestClient):
+        """Test polling an unknown job returns 404."""
+        response = client.get("/api/results/missing-job/explanation")
+
+        assert response.status_code == 404
+
+
+class TestBatchAnalyzeEndpoint:
+    """Test the batch analysis endpoint."""
+
+    def test_batch_returns_results_in_order(
+        self, client: TestClient, sample_claim: dict, clean_claim: dict
+    ):
+        """Test batch endpoint scores every claim and preserves input order."""
+        claims = [sample_claim, clean_claim, sample_claim]
+
+        response = client.post("/api/analyze/batch", json={"claims": claims})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["completed_count"] == 3
+        assert [r["claim_id"] for r in data["results"]] == [
+            c["claim_id"] for c in claims
+        ]
+        assert all("fraud_score" in r for r in data["results"])
+
+    def test_batch_results_are_persisted(self, client: TestClient, sample_claim: dict):
+        """Test each batch claim is retrievable via the results endpoint."""
+        response = client.post("/api/analyze/batch", json={"claims": [sample_claim]})
+        job_id = response.json()["results"][0]["job_id"]
+
+        result = client.get(f"/api/results/{job_id}")
+
+        assert result.status_code == 200
+        assert result.json()["claim_id"] == sample_claim["claim_id"]
+
+    def test_batch_rejects_empty_claims(self, client: TestClient):
+        """Test batch endpoint rejects an empty claim list."""
+        response = client.post("/api/analyze/batch", json={"claims": []})
+
+        assert response.status_code == 422
+
+
+class TestJobsPagination:
+    """Test keyset pagination of /api/jobs."""
+
+    def test_cursor_walks_every_job_once(self, client: TestClient, sample_claim: dict):
+        """Test cursor pages are disjoint and ordered, even with equal timestamps."""
+        # One batch shares a created_at, so ties fall back to job_id
+        client.post("/api/analyze/batch", json={"claims": [sample_claim] * 5})
+        expected = [job["job_id"] for job in client.get("/api/jobs").json()["jobs"]]
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+            data = client.get("/api/jobs", params=params).json()
+            seen.extend(job["job_id"] for job in data["jobs"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen[: len(expected)] == expected
+        assert len(seen) == len(set(seen)) >= 5
+
+    def test_invalid_cursor_returns_400(self, client: TestClient):
+        """Test a malformed cursor is rejected."""
+        response = client.get("/api/jobs", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+
+class TestDatasetEndpoints:
+    """Test the reference dataset version and reload endpoints."""
+
+    def test_get_dataset_version(self, client: TestClient):
+        """Test the current dataset version and sizes are reported."""
+        response = client.get("/api/datasets")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version"]
+        assert "ncci_ptp" in data["datasets"]
+
+    def test_reload_without_changes_keeps_snapshot(self, client: TestClient):
+        """Test reload is a no-op when no dataset file changed."""
+        version = client.get("/api/datasets").json()["version"]
+
+        response = client.post("/api/datasets/reload")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["reloaded"] is False
+        assert data["version"] == version
+
+    def test_forced_reload(self, client: TestClient):
+        """Test a forced reload swaps in a new snapshot."""
+        response = client.post("/api/datasets/reload?force=true")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["reloaded"] is True
+        assert data["version"] == data["previous_version"]
+
+    def test_results_record_dataset_version(
+        self, client: TestClient, sample_claim: dict
+    ):
+        """Test scored results record the dataset version used."""
+        version = client.get("/api/datasets").json()["version"]
+
+        response = client.post("/api/analyze/batch", json={"claims": [sample_claim]})
+        data = response.json()
+        job_id = data["results"][0]["job_id"]
+
+        assert data["dataset_version"] == version
+        assert client.get(f"/api/results/{job_id}").json()["dataset_version"] == version
+
+
+class TestPolicyBulkUploadStream:
+    """Test the streaming NDJSON policy upload."""
+
+    def test_streams_documents_in_batches(self, client: TestClient, tmp_path):
+        """Test streamed documents are indexed and bad lines are skipped."""
+        import json
+
+        from rag import ChromaStore
+        from routes import policies
+        from tests.test_retrieval_cache import CountingEmbedding
+
+        store = ChromaStore(
+            persist_dir=str(tmp_path),
+            collection_name="stream_test",
+            embedding_function=CountingEmbedding(),
+        )
+        lines = [
+            json.dumps({"title": f"Policy {i}", "content": f"Text {i}"})
+            for i in range(7)
+        ]
+        lines[3] = "{not json"
+        lines.append(json.dumps({"title": "No content"}))
+        body = ("\n".join(lines) + "\n").encode()
+
+        def chunks():
+            for start in range(0, len(body), 50):
+                yield body[start : start + 50]
+
+        with (
+            patch(
+                "scheduler.cms_policy_sync.CMSPolicySyncer._get_store",
+                return_value=store,
+            ),
+            patch.object(policies, "STREAM_BATCH_SIZE", 2),
+        ):
+            response = client.post(
+                "/api/policies/bulk-upload/stream?source_type=lcd_updates",
+                content=chunks(),
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["documents_processed"] == 6
+        assert data["documents_added"] == 6
+        assert [d["reason"] for d in data["skipped_documents"]] == [
+            "invalid JSON",
+            "missing content",
+        ]
+        assert store.list_sources() == {"lcd_updates": 6}
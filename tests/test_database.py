@@ -0,0 +1,97 @@
+"""Tests for the shared SQLite access layer."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+from database import Database, get_database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "shared.db"))
+    with database.write() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    yield database
+    database.close()
+
+
+def _names(db: Database) -> list[str]:
+    with db.read() as conn:
+        return [row[0] for row in conn.execute("SELECT name FROM items ORDER BY id")]
+
+
+class TestDatabase:
+    """Tests for pooled reads and the serialized writer."""
+
+    def test_uses_wal_and_read_only_readers(self, db: Database):
+        with db.read() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO items (name) VALUES ('x')")
+
+    def test_reader_is_reused_per_thread(self, db: Database):
+        with db.read() as first:
+            pass
+        with db.read(row_factory=sqlite3.Row) as second:
+            assert second.execute("SELECT 1 AS one").fetchone()["one"] == 1
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db._reader()))
+        thread.start()
+        thread.join()
+
+        assert first is second
+        assert other[0] is not first
+        assert second.row_factory is None
+
+    def test_write_commits_or_rolls_back(self, db: Database):
+        with db.write() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+            with db.write() as nested:
+                nested.execute("INSERT INTO items (name) VALUES ('b')")
+
+        with pytest.raises(RuntimeError):
+            with db.write() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('c')")
+                raise RuntimeError("abort")
+
+        assert _names(db) == ["a", "b"]
+
+    def test_submitted_writes_commit_in_batches(self, db: Database):
+        futures = [
+            db.submit(
+                lambda conn, i=i: (
+                    conn.execute(
+                        "INSERT INTO items (name) VALUES (?)", (f"n{i}",)
+                    ).lastrowid
+                )
+            )
+            for i in range(20)
+        ]
+        duplicate = db.submit(
+            lambda conn: conn.execute("INSERT INTO items (name) VALUES ('n0')")
+        )
+        db.flush()
+
+        assert [f.result() for f in futures] == list(range(1, 21))
+        with pytest.raises(sqlite3.IntegrityError):
+            duplicate.result()
+        assert _names(db) == [f"n{i}" for i in range(20)]
+
+    def test_close_reopens_on_next_use(self, db: Database):
+        with db.write() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+        db.submit(lambda conn: conn.execute("INSERT INTO items (name) VALUES ('b')"))
+
+        db.close()
+
+        assert _names(db) == ["a", "b"]
+
+    def test_registry_shares_instances(self, tmp_path):
+        path = tmp_path / "registry.db"
+
+        assert get_database(path) is get_database(str(path))
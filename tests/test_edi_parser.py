@@ -0,0 +1,183 @@
+"""Tests for the EDI 837 claim file parser."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from connectors.file.parsers.edi_837 import EDI837Parser
+
+ISA = (
+    "ISA*00*          *00*          *ZZ*SENDER         *ZZ*RECEIVER       "
+    "*240101*1200*^*00501*000000001*0*P*:~"
+)
+
+
+def _transaction(control: str, claims: list[tuple[str, str, list[str]]]) -> str:
+    """Build one ST/SE transaction with (claim_id, charge, procedures) claims."""
+    segments = [
+        f"ST*837*{control}*005010X222A1",
+        "BHT*0019*00*0123*20240101*1200*CH",
+        "HL*1**20*1",
+        "NM1*85*2*BILLING CLINIC*****XX*1234567893",
+        "HL*2*1*22*0",
+        "NM1*IL*1*DOE*JANE****MI*MEM001",
+        "DMG*D8*19800101*F",
+    ]
+    for claim_id, charge, procedures in claims:
+        segments.append(f"CLM*{claim_id}*{charge}***11:B:1*Y*A*Y*Y")
+        segments.append("HI*ABK:M545*ABF:M5416")
+        for procedure in procedures:
+            segments.append(f"SV1*HC:{procedure}:25*100*UN*1***1")
+            segments.append("DTP*472*D8*20240105")
+    segments.append(f"SE*{len(segments) + 1}*{control}")
+    return "~\n".join(segments) + "~\n"
+
+
+def _interchange(transactions: list[str]) -> str:
+    return (
+        ISA
+        + "\nGS*HC*SENDER*RECEIVER*20240101*1200*1*X*005010X222A1~\n"
+        + "".join(transactions)
+        + "GE*1*1~\nIEA*1*000000001~\n"
+    )
+
+
+@pytest.fixture
+def edi_content() -> str:
+    return _interchange(
+        [
+            _transaction(
+                "0001",
+                [
+                    ("CLM001", "200", ["99213", "36415"]),
+                    ("CLM002", "150", ["99214"]),
+                ],
+            ),
+            _transaction("0002", [("CLM003", "100", ["99215"])]),
+        ]
+    )
+
+
+class TestEDI837Parser:
+    """Tests for streaming EDI 837 parsing."""
+
+    def test_parse_file(self, tmp_path, edi_content: str):
+        path = tmp_path / "claims.837"
+        path.write_text(edi_content)
+
+        claims = list(EDI837Parser().parse(str(path)))
+
+        assert [c["claim_id"] for c in claims] == ["CLM001", "CLM002", "CLM003"]
+        first = claims[0]
+        assert first["total_charge"] == 200.0
+        assert first["principal_diagnosis"] == "M545"
+        assert [line["procedure_code"] for line in first["service_lines"]] == [
+            "99213",
+            "36415",
+        ]
+        assert first["service_lines"][0]["modifier_1"] == "25"
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+    def test_chunked_tokenizer_matches_whole_file(
+        self, edi_content: str, chunk_size: int
+    ):
+        whole = EDI837Parser()
+        expected = whole._split_segments(edi_content)
+
+        streamed = list(
+            EDI837Parser(chunk_size=chunk_size).iter_segments(io.StringIO(edi_content))
+        )
+
+        assert streamed == expected
+
+    def test_parse_limit(self, tmp_path, edi_content: str):
+        path = tmp_path / "claims.837"
+        path.write_text(edi_content)
+
+        claims = list(EDI837Parser(chunk_size=16).parse(str(path), limit=2))
+
+        assert [c["claim_id"] for c in claims] == ["CLM001", "CLM002"]
+
+    def test_detects_custom_separators(self, tmp_path, edi_content: str):
+        custom = edi_content.replace("*", "|").replace("~", "'").replace(":", ">")
+        path = tmp_path / "claims.837"
+        path.write_text(custom)
+
+        parser = EDI837Parser(chunk_size=32)
+        claims = list(parser.parse(str(path)))
+
+        assert parser.element_sep == "|"
+        assert parser.segment_term == "'"
+        assert parser.subelement_sep == ">"
+        assert [c["claim_id"] for c in claims] == ["CLM001", "CLM002", "CLM003"]
+        assert claims[0]["place_of_service"] == "11"
+
+    def test_claims_are_yielded_incrementally(self, edi_content: str):
+        parser = EDI837Parser(chunk_size=8)
+        stream = io.StringIO(edi_content)
+
+        claims = parser._parse_segments(parser.iter_segments(stream))
+        first = next(claims)
+
+        assert first.claim_id == "CLM001"
+        # Only enough input to close the first claim has been consumed
+        assert stream.tell() < edi_content.index("CLM003")
+
+
+class TestParallelEDI837Parser:
+    """Tests for parsing EDI 837 transactions in a process pool."""
+
+    @pytest.fixture
+    def large_edi_path(self, tmp_path):
+        transactions = [
+            _transaction(
+                f"{n:04d}",
+                [(f"CLM{n:04d}{i}", "100", ["99213", "99214"]) for i in range(3)],
+            )
+            for n in range(20)
+        ]
+        path = tmp_path / "claims.837"
+        path.write_text(_interchange(transactions))
+        return path
+
+    def test_finds_transaction_ranges(self, large_edi_path):
+        parser = EDI837Parser(chunk_size=50)
+
+        ranges = parser.find_transaction_ranges(str(large_edi_path), range_bytes=1)
+
+        content = large_edi_path.read_bytes()
+        assert len(ranges) == 20
+        assert all(content[r.start : r.start + 3] == b"ST*" for r in ranges)
+        assert all(a.end == b.start for a, b in zip(ranges, ranges[1:]))
+        assert ranges[-1].end == len(content)
+
+    def test_groups_small_transactions(self, large_edi_path):
+        ranges = EDI837Parser().find_transaction_ranges(
+            str(large_edi_path), range_bytes=2000
+        )
+
+        assert 1 < len(ranges) < 20
+
+    def test_parallel_matches_serial(self, large_edi_path):
+        serial = list(EDI837Parser().parse(str(large_edi_path)))
+
+        parser = EDI837Parser(workers=2, parallel_min_bytes=0)
+        parallel = list(parser.parse_parallel(str(large_edi_path)))
+
+        assert len(serial) == 60
+        assert parallel == serial
+
+    def test_claim_type_follows_functional_group(self, tmp_path):
+        content = _interchange(
+            [_transaction("0001", [("CLM001", "100", ["99213"])])]
+        ).replace("GS*HC*", "GS*HI*")
+        path = tmp_path / "claims.837"
+        path.write_text(content)
+
+        parser = EDI837Parser(workers=2, parallel_min_bytes=0)
+        ranges = parser.find_transaction_ranges(str(path))
+
+        assert [r.claim_type for r in ranges] == ["837I"]
+        assert next(parser.parse(str(path)))["claim_type"] == "837I"
@@ -0,0 +1,338 @@
+"""Tests for ETL pipeline stages."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from backend.etl.pipeline import ETLContext, create_pipeline
+from etl.stages.load import LoadStage
+from etl.stages.transform import (
+    TransformStage,
+    to_date,
+    to_decimal,
+    to_uppercase,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / "etl.db")
+
+
+def _rows(db_path: str, table: str) -> dict[str, dict]:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(f"SELECT * FROM {table}").fetchall()
+        return {row["id"]: dict(row) for row in rows}
+    finally:
+        conn.close()
+
+
+class FakeConnector:
+    """In-memory source connector yielding fixed batches."""
+
+    def __init__(self, batches: list[list[dict]]):
+        self.batches = batches
+        self.is_connected = False
+        self.batches_pulled = 0
+
+    @property
+    def _connected(self) -> bool:
+        return self.is_connected
+
+    def connect(self) -> None:
+        self.is_connected = True
+
+    def disconnect(self) -> None:
+        self.is_connected = False
+
+    def extract(self, mode, watermark):
+        for batch in self.batches:
+            self.batches_pulled += 1
+            yield [dict(r) for r in batch]
+
+
+def _batches(count: int, size: int = 3) -> list[list[dict]]:
+    return [
+        [
+            {"id": f"E{b}-{i}", "member_id": f"M{b}", "updated": f"2024-01-{b + 1:02d}"}
+            for i in range(size)
+        ]
+        for b in range(count)
+    ]
+
+
+def _context() -> ETLContext:
+    return ETLContext(
+        connector_id="conn-1",
+        connector_type="test",
+        data_type="eligibility",
+        sync_mode="incremental",
+    )
+
+
+class TestLoadStage:
+    """Tests for bulk loading records into SQLite."""
+
+    def test_inserts_then_upserts(self, db_path: str):
+        stage = LoadStage(db_path, "eligibility", "eligibility")
+        records = [
+            {"id": f"E{i}", "member_id": f"M{i}", "status": "active"} for i in range(5)
+        ]
+
+        first = stage.load([dict(r) for r in records], source_connector_id="c1")
+        created = _rows(db_path, "eligibility")["E0"]["created_at"]
+        second = stage.load(
+            [{"id": "E0", "member_id": "M0", "status": "termed"}, {"id": "E9"}],
+            source_connector_id="c1",
+        )
+
+        assert (first.inserted_count, first.updated_count, first.failed_count) == (
+            5,
+            0,
+            0,
+        )
+        assert (second.inserted_count, second.updated_count) == (1, 1)
+        rows = _rows(db_path, "eligibility")
+        assert len(rows) == 6
+        assert rows["E0"]["status"] == "termed"
+        assert rows["E0"]["created_at"] == created
+        assert rows["E1"]["status"] == "active"
+
+    def test_skips_existing_without_upsert(self, db_path: str):
+        stage = LoadStage(db_path, "eligibility", "eligibility")
+        stage.load([{"id": "E1", "status": "active"}])
+
+        result = stage.load(
+            [{"id": "E1", "status": "termed"}, {"id": "E2", "status": "active"}],
+            upsert=False,
+        )
+
+        assert (result.inserted_count, result.updated_count) == (1, 0)
+        assert _rows(db_path, "eligibility")["E1"]["status"] == "active"
+
+    def test_repeated_id_in_batch_counts_as_update(self, db_path: str):
+        stage = LoadStage(db_path, "eligibility", "eligibility")
+
+        result = stage.load(
+            [{"id": "E1", "status": "active"}, {"id": "E1", "status": "termed"}]
+        )
+
+        assert (result.inserted_count, result.updated_count) == (1, 1)
+        assert _rows(db_path, "eligibility")["E1"]["status"] == "termed"
+
+    def test_constraint_failure_only_fails_offending_record(self, db_path: str):
+        stage = LoadStage(db_path, "claims", "claims")
+
+        result = stage.load(
+            [
+                {"id": "A", "claim_id": "CLM1"},
+                {"id": "B", "claim_id": "CLM1"},
+                {"id": "C", "claim_id": "CLM2"},
+            ]
+        )
+
+        assert (result.inserted_count, result.updated_count) == (2, 0)
+        assert result.failed_count == 1
+        assert result.errors[0]["record_index"] == 1
+        assert result.errors[0]["record_id"] == "B"
+        assert set(_rows(db_path, "claims")) == {"A", "C"}
+
+    def test_extra_fields_go_to_raw_data(self, db_path: str):
+        stage = LoadStage(db_path, "providers", "providers")
+
+        result = stage.load([{"npi": "1234567893", "network": "PPO"}])
+
+        assert result.inserted_count == 1
+        (row,) = _rows(db_path, "providers").values()
+        assert row["npi"] == "1234567893"
+        assert json.loads(row["raw_data"]) == {"network": "PPO"}
+
+    def test_audit_entries_are_queued(self, db_path: str):
+        stage = LoadStage(db_path, "eligibility", "eligibility")
+
+        futures = [
+            stage.add_audit_entry(f"E{i}", "insert", new_data={"id": f"E{i}"})
+            for i in range(3)
+        ]
+
+        for future in futures:
+            future.result(timeout=5)
+        rows = _rows(db_path, "eligibility_audit")
+        assert sorted(row["record_id"] for row in rows.values()) == ["E0", "E1", "E2"]
+
+
+class TestColumnarTransform:
+    """Tests for the column-by-column transform mode."""
+
+    RECORDS = [
+        {"mbr": "m1", "amt": "10.456", "dos": datetime(2024, 1, 5), "plan": "gold"},
+        {"mbr": None, "amt": "3", "dos": "2024-01-06"},
+        {"mbr": "m3", "amt": "n/a", "dos": None, "extra": b"raw"},
+        {"mbr": "m4", "amt": 7, "dos": "2024-01-08", "plan": "bad"},
+    ]
+
+    def _stage(self, columnar: bool) -> TransformStage:
+        def check_plan(value):
+            if value == "bad":
+                raise ValueError("unknown plan")
+            return value
+
+        stage = TransformStage(columnar=columnar)
+        stage.add_mapping("mbr", "member_id", transform=to_uppercase, required=True)
+        stage.add_mapping("amt", "amount", transform=to_decimal)
+        stage.add_mapping("dos", "service_date", transform=to_date)
+        stage.add_mapping(
+            "plan", "plan_name", transform=check_plan, default_value="std"
+        )
+        return stage
+
+    def test_matches_row_by_row(self):
+        row_errors, column_errors = [], []
+        rows = self._stage(columnar=False).transform(
+            [dict(r) for r in self.RECORDS],
+            on_error=lambda r, e: row_errors.append(str(e)),
+        )
+        columns = self._stage(columnar=True).transform(
+            [dict(r) for r in self.RECORDS],
+            on_error=lambda r, e: column_errors.append(str(e)),
+        )
+
+        assert columns.records == rows.records
+        assert columns.errors == rows.errors
+        assert column_errors == row_errors
+        assert (columns.transformed_count, columns.failed_count) == (2, 2)
+
+    def test_column_values(self):
+        result = self._stage(columnar=True).transform([dict(r) for r in self.RECORDS])
+
+        first, third = result.records
+        assert first == {
+            "member_id": "M1",
+            "amount": 10.46,
+            "service_date": "2024-01-05",
+            "plan_name": "gold",
+        }
+        assert third["amount"] is None
+        assert third["plan_name"] == "std"
+        assert third["extra"] == "raw"
+        assert [e["record_index"] for e in result.errors] == [1, 3]
+        assert result.errors[0]["error"] == "Required field mbr is missing"
+
+
+class TestPipelinedETL:
+    """Tests for overlapping extract, transform and load."""
+
+    @pytest.mark.parametrize("pipelined", [False, True])
+    def test_loads_all_batches(self, db_path: str, pipelined: bool):
+        pipeline = create_pipeline(
+            FakeConnector(_batches(10)),
+            "eligibility",
+            db_path=db_path,
+            watermark_column="updated",
+            pipelined=pipelined,
+            transform_workers=3,
+        )
+        progress = []
+        pipeline.on_progress(lambda stage, done, total: progress.append((stage, done)))
+
+        result = pipeline.run(_context())
+
+        assert result.success
+        assert result.extracted_count == result.loaded_count == 30
+        assert result.final_watermark == "2024-01-10"
+        assert len(_rows(db_path, "synced_eligibility")) == 30
+        loads = [done for stage, done in progress if stage == "load"]
+        assert loads == sorted(loads) and loads[-1] == 30
+
+    def test_loads_in_extraction_order(self, db_path: str, monkeypatch):
+        pipeline = create_pipeline(
+            FakeConnector(_batches(8)),
+            "eligibility",
+            db_path=db_path,
+            watermark_column="updated",
+            pipelined=True,
+            transform_workers=4,
+        )
+        transform = pipeline._transform_stage.transform
+
+        def slow_first_batches(records, on_error=None):
+            # Earlier batches finish transforming last
+            time.sleep(0.05 if records[0]["member_id"] in ("M0", "M1") else 0)
+            return transform(records, on_error=on_error)
+
+        monkeypatch.setattr(pipeline._transform_stage, "transform", slow_first_batches)
+        loaded = []
+        load = pipeline._load_stage.load
+
+        def record_load(records, source_connector_id=None):
+            loaded.append(records[0]["member_id"])
+            return load(records, source_connector_id=source_connector_id)
+
+        monkeypatch.setattr(pipeline._load_stage, "load", record_load)
+
+        result = pipeline.run(_context())
+
+        assert loaded == [f"M{b}" for b in range(8)]
+        assert result.final_watermark == "2024-01-08"
+
+    def test_backpressure_and_cancel(self, db_path: str, monkeypatch):
+        connector = FakeConnector(_batches(50))
+        pipeline = create_pipeline(
+            connector,
+            "eligibility",
+            db_path=db_path,
+            pipelined=True,
+            transform_workers=1,
+        )
+        pipeline.max_pending_batches = 1
+        release = threading.Event()
+        load = pipeline._load_stage.load
+
+        def blocked_load(records, source_connector_id=None):
+            release.wait(timeout=5)
+            return load(records, source_connector_id=source_connector_id)
+
+        monkeypatch.setattr(pipeline._load_stage, "load", blocked_load)
+        cancel = threading.Event()
+        pulled_while_blocked = []
+
+        def cancel_after_backpressure():
+            time.sleep(0.3)
+            pulled_while_blocked.append(connector.batches_pulled)
+            cancel.set()
+            release.set()
+
+        threading.Thread(target=cancel_after_backpressure).start()
+        result = pipeline.run(_context(), cancel_check=cancel.is_set)
+
+        # Writer was stuck on the first batch: only a bounded number were pulled
+        assert pulled_while_blocked[0] <= 5
+        assert result.context.status == "cancelled"
+        assert result.loaded_count == result.extracted_count < 150
+
+    def test_stage_error_fails_run(self, db_path: str, monkeypatch):
+        pipeline = create_pipeline(
+            FakeConnector(_batches(20)),
+            "eligibility",
+            db_path=db_path,
+            pipelined=True,
+        )
+
+        def broken_load(records, source_connector_id=None):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(pipeline._load_stage, "load", broken_load)
+
+        result = pipeline.run(_context())
+
+        assert not result.success
+        assert result.context.status == "failed"
+        assert result.error_message == "disk full"
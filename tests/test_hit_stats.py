@@ -0,0 +1,135 @@
+"""Tests for the materialized rule-hit statistics."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from database import Database
+from rules.hit_stats import (
+    ensure_rule_stats,
+    ensure_stats_tables,
+    rebuild_rule_stats,
+    record_results,
+    result_totals,
+)
+
+
+def _result(job_id: str, score: float, hits: list[dict], day: str = "2024-03-01"):
+    return {
+        "job_id": job_id,
+        "created_at": f"{day}T10:00:00+00:00",
+        "fraud_score": score,
+        "rule_hits": json.dumps(hits),
+        "ncci_flags": json.dumps([]),
+        "coverage_flags": json.dumps(["LCD"] if not hits else []),
+        "provider_flags": json.dumps([]),
+        "roi_estimate": 10.0 * len(hits),
+    }
+
+
+HIT_A = {"rule_id": "NCCI_PTP", "rule_type": "ncci", "severity": "high", "weight": 0.2}
+HIT_B = {"rule_id": "MUE", "rule_type": "ncci", "severity": "medium", "weight": 0.1}
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "stats.db"))
+    with database.write() as conn:
+        conn.execute("""
+            CREATE TABLE results (
+                job_id TEXT PRIMARY KEY, created_at TEXT, fraud_score REAL,
+                rule_hits TEXT, ncci_flags TEXT, coverage_flags TEXT,
+                provider_flags TEXT, roi_estimate REAL
+            )
+        """)
+        ensure_stats_tables(conn)
+    yield database
+    database.close()
+
+
+def _store(db: Database, rows: list[dict]) -> None:
+    columns = list(rows[0])
+    with db.write() as conn:
+        record_results(conn, rows)
+        conn.executemany(
+            f"INSERT OR REPLACE INTO results ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            [[row[c] for c in columns] for row in rows],
+        )
+
+
+def _snapshot(db: Database):
+    with db.read() as conn:
+        rules = conn.execute(
+            "SELECT day, rule_id, rule_type, severity, hit_count, "
+            "ROUND(weight_sum, 6), ROUND(score_sum, 6) "
+            "FROM rule_hit_stats ORDER BY 1, 2, 3, 4"
+        ).fetchall()
+        return result_totals(conn), rules
+
+
+class TestRuleHitStats:
+    """Tests for incrementally maintained aggregates."""
+
+    def test_record_results_updates_aggregates(self, db: Database):
+        _store(
+            db,
+            [
+                _result("j1", 0.8, [HIT_A, HIT_B]),
+                _result("j2", 0.6, [HIT_A], day="2024-03-02"),
+                _result("j3", 0.1, []),
+            ],
+        )
+
+        totals, rules = _snapshot(db)
+
+        assert totals["claims"] == 3
+        assert totals["rule_hits"] == 3
+        assert totals["flags"] == 4
+        assert totals["auto_approved"] == 0
+        assert totals["roi_sum"] == 30.0
+        assert [(r[0], r[1], r[4]) for r in rules] == [
+            ("2024-03-01", "MUE", 1),
+            ("2024-03-01", "NCCI_PTP", 1),
+            ("2024-03-02", "NCCI_PTP", 1),
+        ]
+
+    def test_replaced_result_is_not_counted_twice(self, db: Database):
+        _store(db, [_result("j1", 0.8, [HIT_A, HIT_B])])
+        _store(db, [_result("j1", 0.4, [HIT_B])])
+
+        totals, rules = _snapshot(db)
+
+        assert totals["claims"] == 1
+        assert totals["rule_hits"] == 1
+        assert [(r[1], r[4], r[6]) for r in rules] == [("MUE", 1, 0.4)]
+
+    def test_incremental_matches_rebuild(self, db: Database):
+        _store(db, [_result(f"j{i}", i / 10, [HIT_A] * (i % 3)) for i in range(9)])
+        _store(db, [_result("j4", 0.9, [HIT_B])])
+        incremental = _snapshot(db)
+
+        with db.write() as conn:
+            scanned = rebuild_rule_stats(conn)
+
+        totals, rules = _snapshot(db)
+        assert scanned == 9
+        assert rules == incremental[1]
+        assert totals == pytest.approx(incremental[0])
+
+    def test_backfills_existing_results_once(self, db: Database):
+        with db.write() as conn:
+            conn.execute(
+                "INSERT INTO results (job_id, created_at, fraud_score, rule_hits) "
+                "VALUES ('old', '2023-01-01', 0.5, ?)",
+                (json.dumps([HIT_A]),),
+            )
+
+        ensure_rule_stats(db)
+        ensure_rule_stats(db)
+
+        totals, rules = _snapshot(db)
+        assert totals["claims"] == 1
+        assert rules[0][1] == "NCCI_PTP"
@@ -9,7 +9,11 @@ from __future__ import annotations
 import os
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import anthropic
+import pytest
 
 # Add backend to path for imports
 backend_path = str(Path(__file__).parent.parent / "backend")
@@ -18,6 +22,7 @@ if backend_path not in sys.path:
 
 from kirk_config import KIRK_CONFIG, KIRK_SYSTEM_PROMPT, KirkConfig  # noqa: E402
 from claude_client import build_kirk_prompt, format_rule_hits, get_kirk_analysis  # noqa: E402
+from kirk_cache import KirkAnalysisCache, analysis_cache_key  # noqa: E402
 from rules import RuleHit  # noqa: E402
 
 
@@ -305,3 +310,123 @@ class TestKirkResponseFormat:
             )
 
         assert result["agent"] == "Kirk"
+
+
+def _claim(claim_id: str, amount: float, code: str = "99214") -> dict:
+    return {
+        "visit_occurrence_id": claim_id,
+        "total_charge": amount,
+        "visit_start_date": "2024-01-0" + claim_id[-1],
+        "provider": {"npi": f"12345678{claim_id[-1]}0", "specialty": "cardiology"},
+        "items": [{"procedure_source_value": code, "quantity": 1}],
+    }
+
+
+HITS = [
+    RuleHit(
+        rule_id="NCCI_PTP",
+        rule_type="ncci",
+        description="Procedure pair not allowed",
+        weight=0.2,
+        severity="high",
+        flag="ncci_ptp",
+    )
+]
+
+
+class TestKirkAnalysisCache:
+    """Test reuse of Kirk analyses for identical prompts."""
+
+    @pytest.fixture
+    def cache(self, tmp_path, monkeypatch) -> KirkAnalysisCache:
+        cache = KirkAnalysisCache(str(tmp_path / "kirk.db"), 3600, 100)
+        monkeypatch.setattr("kirk_cache._cache", cache)
+        return cache
+
+    @pytest.fixture
+    def client(self) -> MagicMock:
+        client = MagicMock()
+        client.messages.create.return_value = SimpleNamespace(
+            content=[SimpleNamespace(text='{"risk_summary": "Unbundled E/M"}')],
+            usage=SimpleNamespace(input_tokens=100, output_tokens=50),
+        )
+        with (
+            patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}),
+            patch("claude_client.get_client", return_value=client),
+        ):
+            yield client
+
+    def _key(self, claim: dict, score: float = 0.62, hits=HITS) -> str:
+        prompt = build_kirk_prompt(claim, hits, score, "recommendation")
+        return analysis_cache_key(prompt, KIRK_CONFIG)
+
+    def test_key_covers_everything_in_the_prompt(self):
+        key = self._key(_claim("C1", 150.0))
+
+        assert self._key(_claim("C1", 150.0)) == key
+        assert self._key(_claim("C2", 150.0)) != key
+        assert self._key(_claim("C1", 175.0)) != key
+        assert self._key(_claim("C1", 150.0), score=0.63) != key
+        assert self._key(_claim("C1", 150.0, code="99215")) != key
+        assert self._key(_claim("C1", 150.0), hits=[]) != key
+
+    def test_repeat_claim_is_served_from_cache(self, cache, client):
+        args = {
+            "rule_hits": HITS,
+            "fraud_score": 0.62,
+            "decision_mode": "recommendation",
+        }
+
+        first = get_kirk_analysis(claim=_claim("C1", 150.0), **args)
+        second = get_kirk_analysis(claim=_claim("C1", 150.0), **args)
+        other = get_kirk_analysis(claim=_claim("C2", 150.0), **args)
+        refreshed = get_kirk_analysis(
+            claim=_claim("C1", 150.0), use_cache=False, **args
+        )
+
+        assert client.messages.create.call_count == 3
+        assert "cached" not in other
+        assert "cached" not in first and "cached" not in refreshed
+        assert second["cached"] is True
+        assert second["tokens_used"] == 0
+        assert second["explanation"] == first["explanation"] == "Unbundled E/M"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+    def test_api_errors_are_not_cached(self, cache, client):
+        client.messages.create.side_effect = anthropic.APIError(
+            "overloaded", request=MagicMock(), body=None
+        )
+
+        result = get_kirk_analysis(
+            claim=_claim("C1", 150.0),
+            rule_hits=HITS,
+            fraud_score=0.62,
+            decision_mode="recommendation",
+        )
+
+        assert "error" in result
+        assert cache.stats()["entries"] == 0
+
+    def test_ttl_and_lru_eviction(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("kirk_cache.time.time", lambda: now[0])
+        cache = KirkAnalysisCache(
+            str(tmp_path / "lru.db"), ttl_seconds=60, max_entries=2
+        )
+
+        cache.put("a", {"explanation": "a"})
+        now[0] += 1
+        cache.put("b", {"explanation": "b"})
+        now[0] += 1
+        assert cache.get("a") == {"explanation": "a"}
+        cache._db.flush()
+        now[0] += 1
+        cache.put("c", {"explanation": "c"})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        now[0] += 120
+        assert cache.get("c") is None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["expired"] == 1
@@ -609,10 +609,14 @@ class TestReranker:
             resp.usage.output_tokens = 25
             return resp
 
-        mock_client.messages.create.side_effect = [
-            create_response("person_id", 90),
-            create_response("npi", 85),
-        ]
+        # Requests run concurrently, so answer by prompt rather than order
+        def respond(**kwargs):
+            prompt = kwargs["messages"][0]["content"]
+            if "MemberID" in prompt:
+                return create_response("person_id", 90)
+            return create_response("npi", 85)
+
+        mock_client.messages.create.side_effect = respond
         mock_get_client.return_value = mock_client
 
         reranker = MappingReranker()
@@ -620,13 +624,150 @@ class TestReranker:
             [
                 {"source_field": "MemberID", "candidates": [("person_id", 0.9)]},
                 {"source_field": "ProviderNPI", "candidates": [("npi", 0.88)]},
-            ]
+            ],
+            fields_per_request=1,
         )
 
         assert len(results) == 2
         assert results[0].target_field == "person_id"
         assert results[1].target_field == "npi"
 
+    @patch("mapping.reranker.MappingReranker._get_client")
+    def test_reranker_batch_packs_fields(self, mock_get_client):
+        """Test several fields are answered by one grouped prompt."""
+        from mapping.reranker import MappingReranker
+
+        mock_client = MagicMock()
+        grouped = MagicMock()
+        grouped.content = [
+            MagicMock(
+                text="""```json
+[{"field": 2, "target_field": "npi", "confidence": 88, "reasoning": "NPI"},
+ {"field": 1, "target_field": "person_id", "confidence": 91, "reasoning": "ID"}]
+```"""
+            )
+        ]
+        grouped.usage.input_tokens = 300
+        grouped.usage.output_tokens = 100
+        mock_client.messages.create.return_value = grouped
+        mock_get_client.return_value = mock_client
+
+        reranker = MappingReranker()
+        results = reranker.batch_rerank(
+            [
+                {"source_field": "MemberID", "candidates": [("person_id", 0.9)]},
+                {"source_field": "Unmappable", "candidates": []},
+                {"source_field": "ProviderNPI", "candidates": [("npi", 0.88)]},
+            ]
+        )
+
+        assert mock_client.messages.create.call_count == 1
+        assert results[0].target_field == "person_id"
+        assert results[0].embedding_score == 0.9
+        assert results[1] is None
+        assert results[2].target_field == "npi"
+        assert results[2].tokens_used == 200
+
+    @patch("mapping.reranker.MappingReranker._get_client")
+    def test_reranker_batch_falls_back_for_missing_fields(self, mock_get_client):
+        """Test a field left out of a grouped answer is reranked alone."""
+        from mapping.reranker import MappingReranker
+
+        def create_response(text):
+            resp = MagicMock()
+            resp.content = [MagicMock(text=text)]
+            resp.usage.input_tokens = 50
+            resp.usage.output_tokens = 25
+            return resp
+
+        mock_client = MagicMock()
+        mock_client.messages.create.side_effect = [
+            create_response(
+                '[{"field": 1, "target_field": "person_id", '
+                '"confidence": 90, "reasoning": "ID"}]'
+            ),
+            create_response(
+                '{"target_field": "npi", "confidence": 80, "reasoning": "NPI"}'
+            ),
+        ]
+        mock_get_client.return_value = mock_client
+
+        reranker = MappingReranker()
+        results = reranker.batch_rerank(
+            [
+                {"source_field": "MemberID", "candidates": [("person_id", 0.9)]},
+                {"source_field": "ProviderNPI", "candidates": [("npi", 0.88)]},
+            ]
+        )
+
+        assert mock_client.messages.create.call_count == 2
+        fallback_prompt = mock_client.messages.create.call_args.kwargs["messages"][0]
+        assert "ProviderNPI" in fallback_prompt["content"]
+        assert [r.target_field for r in results] == ["person_id", "npi"]
+
+    @patch("mapping.reranker.MappingReranker._get_client")
+    def test_reranker_batch_failed_request_is_not_split(self, mock_get_client):
+        """Test a grouped request that errors does not retry field by field."""
+        from mapping.reranker import MappingReranker
+
+        mock_client = MagicMock()
+        mock_client.messages.create.side_effect = RuntimeError("overloaded")
+        mock_get_client.return_value = mock_client
+
+        reranker = MappingReranker()
+        results = reranker.batch_rerank(
+            [
+                {"source_field": "MemberID", "candidates": [("person_id", 0.9)]},
+                {"source_field": "ProviderNPI", "candidates": [("npi", 0.88)]},
+            ]
+        )
+
+        assert mock_client.messages.create.call_count == 1
+        assert results == [None, None]
+
+    @patch("mapping.reranker.time")
+    @patch("mapping.reranker.MappingReranker._get_client")
+    def test_reranker_retries_rate_limit(self, mock_get_client, mock_time):
+        """Test a 429 is retried after the retry-after delay."""
+        import anthropic
+        import httpx
+
+        from mapping.reranker import MappingReranker
+
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        rate_limited = anthropic.RateLimitError(
+            "rate limited",
+            response=httpx.Response(429, headers={"retry-after": "7"}, request=request),
+            body=None,
+        )
+        ok = MagicMock()
+        ok.content = [
+            MagicMock(
+                text='{"target_field": "person_id", "confidence": 90, "reasoning": "ID"}'
+            )
+        ]
+        ok.usage.input_tokens = 50
+        ok.usage.output_tokens = 25
+
+        mock_client = MagicMock()
+        mock_client.messages.create.side_effect = [rate_limited, ok]
+        mock_get_client.return_value = mock_client
+
+        clock = [100.0]
+        mock_time.monotonic.side_effect = lambda: clock[0]
+        mock_time.sleep.side_effect = lambda seconds: clock.__setitem__(
+            0, clock[0] + seconds
+        )
+
+        reranker = MappingReranker()
+        result = reranker.rerank("MemberID", [("person_id", 0.9)])
+
+        assert result is not None
+        assert result.target_field == "person_id"
+        assert mock_client.messages.create.call_count == 2
+        # The retry waited out the retry-after on the shared cooldown
+        assert clock[0] >= 107.0
+
 
 class TestMappingPersistence:
     """Tests for the MappingStore persistence layer."""
@@ -974,3 +1115,75 @@ class TestDenormalizeForRules:
         normalized = {"items": []}
         result = denormalize_for_rules(normalized)
         assert result["items"] == []
+
+
+class TestMappingPlan:
+    """Tests for compiled, cached field-mapping plans."""
+
+    NESTED_CLAIM = {
+        "claim_id": "CLM001",
+        "ServiceDate": "2024-01-15",
+        "member": {"member_id": "M001", "age": 42, "gender": "F"},
+        "provider": {"npi": "1234567890", "specialty": "cardiology"},
+        "claim": {"billed_amount": 250.0, "codes": ["J06.9"]},
+        "items": [{"procedure_code": "99213", "units": 2, "line_amount": 100.0}],
+        "UnknownField": "x",
+    }
+
+    def test_plan_matches_field_by_field_resolution(self):
+        """Test the compiled plan maps exactly what per-field resolution does."""
+        mapper = FieldMapper(custom_mapping={"UnknownField": "place_of_service"})
+
+        expected = {}
+        for source_field, value in mapper._flatten_dict(self.NESTED_CLAIM).items():
+            canonical = mapper._resolve_field(source_field)
+            if canonical:
+                expected[canonical] = value
+
+        plan = mapper.get_plan(self.NESTED_CLAIM)
+
+        assert plan.apply(self.NESTED_CLAIM) == expected
+        assert list(plan.apply(self.NESTED_CLAIM)) == list(expected)
+
+    def test_plan_cached_per_shape_and_custom_mapping(self):
+        """Test claims of the same shape share one plan across mappers."""
+        other = {**self.NESTED_CLAIM, "claim_id": "CLM002"}
+
+        plan = FieldMapper().get_plan(self.NESTED_CLAIM)
+
+        assert FieldMapper().get_plan(other) is plan
+        assert FieldMapper(custom_mapping={"x": "y"}).get_plan(other) is not plan
+        reshaped = {**self.NESTED_CLAIM, "member": "M001"}
+        assert FieldMapper().get_plan(reshaped) is not plan
+
+    def test_transform_uses_values_of_each_claim(self):
+        """Test a cached plan reads values from the claim being transformed."""
+        first = normalize_claim(self.NESTED_CLAIM)
+        second = normalize_claim(
+            {**self.NESTED_CLAIM, "claim_id": "CLM002", "ServiceDate": "2024-02-01"}
+        )
+
+        assert first["visit_occurrence_id"] == "CLM001"
+        assert second["visit_occurrence_id"] == "CLM002"
+        assert second["visit_start_date"] == "2024-02-01"
+        assert second["items"] == [
+            {
+                "procedure_source_value": "99213",
+                "quantity": 2,
+                "line_charge": 100.0,
+            }
+        ]
+
+    def test_rules_view_does_not_modify_normalized_claim(self):
+        """Test the rules view adds legacy names without touching the claim."""
+        from mapping import denormalize_for_rules
+
+        normalized = normalize_claim(self.NESTED_CLAIM)
+        item_keys = set(normalized["items"][0])
+
+        rules_claim = denormalize_for_rules(normalized)
+
+        assert rules_claim["items"][0]["procedure_code"] == "99213"
+        assert rules_claim["items"][0]["procedure_source_value"] == "99213"
+        assert set(normalized["items"][0]) == item_keys
+        assert rules_claim["member"] is not normalized["member"]
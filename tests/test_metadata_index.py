@@ -0,0 +1,117 @@
+"""Tests for the sidecar policy metadata index."""
+
+import shutil
+import tempfile
+
+import pytest
+
+from rag.chroma_store import METADATA_INDEX_FILENAME, ChromaStore
+from rag.metadata_index import PolicyMetadataIndex
+from tests.test_retrieval_cache import CountingEmbedding
+
+
+@pytest.fixture
+def temp_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def index(temp_dir):
+    return PolicyMetadataIndex(f"{temp_dir}/index.sqlite3", "policies")
+
+
+class TestPolicyMetadataIndex:
+    """Tests for incremental counts and rebuilds."""
+
+    def test_counts_follow_upserts_and_removals(self, index):
+        index.rebuild([])
+        index.upsert(
+            ["a", "b", "c"],
+            [
+                {"source": "LCD", "document_type": "policy", "policy_key": "L1"},
+                {"source": "LCD", "policy_key": "L2"},
+                None,
+            ],
+        )
+        index.upsert(["b"], [{"source": "NCCI", "document_type": "edit"}])
+        index.remove(["a", "missing"])
+
+        assert index.counts("source") == {"NCCI": 1, "unknown": 1}
+        assert index.counts("document_type") == {"edit": 1, "unknown": 1}
+        assert index.counts("policy_key") == {}
+        assert index.document_count() == 2
+
+    def test_rebuild_replaces_contents(self, index):
+        assert not index.is_built()
+        index.upsert(["stale"], [{"source": "OLD"}])
+
+        indexed = index.rebuild(
+            [
+                (["a", "b"], [{"source": "LCD"}, {"source": "CMS"}]),
+                (["c"], [{"source": "LCD", "policy_key": "K"}]),
+            ]
+        )
+
+        assert indexed == 3
+        assert index.is_built()
+        assert index.counts("source") == {"CMS": 1, "LCD": 2}
+        assert index.counts("policy_key") == {"K": 1}
+
+    def test_collections_are_kept_apart(self, index, temp_dir):
+        other = PolicyMetadataIndex(f"{temp_dir}/index.sqlite3", "other")
+        index.upsert(["a"], [{"source": "LCD"}])
+        other.upsert(["a"], [{"source": "CMS"}])
+
+        assert index.counts("source") == {"LCD": 1}
+        assert other.counts("source") == {"CMS": 1}
+
+
+class TestChromaStoreListings:
+    """Tests for listings served from the metadata index."""
+
+    def test_listings_track_writes_without_scanning(self, temp_dir):
+        store = ChromaStore(
+            persist_dir=temp_dir,
+            collection_name="listing_test",
+            embedding_function=CountingEmbedding(),
+        )
+        store.add_documents(
+            ["NCCI edits", "LCD policy"],
+            [{"source": "NCCI", "document_type": "edit"}, {"source": "LCD"}],
+            ["ncci", "lcd"],
+        )
+        store.add_document_with_version("v1", {"source": "LCD"}, "LCD-1")
+        store.add_document_with_version(
+            "v2", {"source": "LCD"}, "LCD-1", replace_existing=True
+        )
+        store.update_metadata("ncci", {"source": "CMS"})
+        store.delete_document("lcd")
+
+        def no_scan(*args, **kwargs):
+            raise AssertionError("listing scanned the collection")
+
+        store.collection.get = no_scan
+        assert store.list_sources() == {"CMS": 1, "LCD": 2}
+        assert store.list_document_types() == {"edit": 1, "unknown": 2}
+        assert store.list_policy_keys() == ["LCD-1"]
+
+    def test_rebuilds_index_that_is_out_of_step(self, temp_dir):
+        store = ChromaStore(
+            persist_dir=temp_dir,
+            collection_name="rebuild_test",
+            embedding_function=CountingEmbedding(),
+        )
+        # Written before the index existed
+        store.collection.add(
+            ids=["a", "b"],
+            documents=["A", "B"],
+            metadatas=[{"source": "LCD"}, {"source": "CMS", "policy_key": "K"}],
+        )
+        PolicyMetadataIndex(
+            f"{temp_dir}/{METADATA_INDEX_FILENAME}", "rebuild_test"
+        ).rebuild([])
+
+        assert store.list_sources() == {"CMS": 1, "LCD": 1}
+        assert store.list_policy_keys() == ["K"]
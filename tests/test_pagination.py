@@ -0,0 +1,45 @@
+"""Tests for the keyset pagination helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from utils.pagination import CountCache, decode_cursor, encode_cursor, next_cursor
+
+
+class TestCursor:
+    """Tests for cursor encoding and page trimming."""
+
+    def test_round_trip(self):
+        cursor = encode_cursor("2024-03-01T10:00:00+00:00", "job/1")
+
+        assert decode_cursor(cursor) == ("2024-03-01T10:00:00+00:00", "job/1")
+
+    @pytest.mark.parametrize("cursor", ["", "%%%", "bm90IGpzb24", "WzEsMl0"])
+    def test_rejects_malformed(self, cursor: str):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    def test_next_cursor_trims_lookahead_row(self):
+        rows = [("t3", "c"), ("t2", "b"), ("t1", "a")]
+
+        cursor = next_cursor(rows, 2, key=lambda row: row)
+
+        assert rows == [("t3", "c"), ("t2", "b")]
+        assert decode_cursor(cursor) == ("t2", "b")
+        assert next_cursor(rows, 2, key=lambda row: row) is None
+
+
+class TestCountCache:
+    """Tests for the short-lived count cache."""
+
+    def test_reuses_until_expired(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("utils.pagination.time.monotonic", lambda: now[0])
+        cache = CountCache(ttl_seconds=30)
+        counts = iter([1, 2])
+
+        assert cache.get("q", lambda: next(counts)) == 1
+        assert cache.get("q", lambda: next(counts)) == 1
+        now[0] += 31
+        assert cache.get("q", lambda: next(counts)) == 2
@@ -323,3 +323,114 @@ class TestVersioningEdgeCases:
         # Different hashes due to whitespace
         assert result2["is_duplicate"] is False
         assert result2["version"] == "2"
+
+
+class TestBulkVersioning:
+    """Test batched versioned writes."""
+
+    @pytest.fixture
+    def temp_store(self):
+        """Create a temporary store with an offline embedding function."""
+        from tests.test_retrieval_cache import CountingEmbedding
+
+        temp_dir = tempfile.mkdtemp()
+        store = ChromaStore(
+            persist_dir=temp_dir,
+            collection_name="test_policies",
+            embedding_function=CountingEmbedding(),
+        )
+        yield store
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_one_lookup_and_write_per_batch(self, temp_store):
+        """Each batch should cost one version lookup and one add."""
+        temp_store.add_document_with_version("A v1", {"source": "LCD"}, "A")
+        calls = {"get": 0, "add": 0}
+        collection = temp_store.collection
+        get, add = collection.get, collection.add
+
+        def counting(name, fn):
+            def wrapper(**kwargs):
+                calls[name] += 1
+                return fn(**kwargs)
+
+            return wrapper
+
+        collection.get = counting("get", get)
+        collection.add = counting("add", add)
+        items = [
+            {
+                "document": f"{key} text",
+                "metadata": {"source": "LCD"},
+                "policy_key": key,
+            }
+            for key in ["A", "B", "C", "D", "E"]
+        ]
+
+        results = temp_store.add_documents_with_versions(
+            items, replace_existing=True, batch_size=3
+        )
+
+        assert calls == {"get": 2, "add": 2}
+        assert [r["document_id"] for r in results] == [
+            "A_v2",
+            "B_v1",
+            "C_v1",
+            "D_v1",
+            "E_v1",
+        ]
+        assert results[0]["replaced_id"] == "A_v1"
+        assert temp_store.embedding_function.calls == 6
+
+    def test_matches_sequential_semantics(self, temp_store):
+        """Repeats within a batch should version on top of each other."""
+        results = temp_store.add_documents_with_versions(
+            [
+                {"document": "v1", "metadata": {}, "policy_key": "K"},
+                {"document": "v2", "metadata": {}, "policy_key": "K"},
+                {"document": "v1", "metadata": {}, "policy_key": "K"},
+                {"document": "v3", "metadata": {}, "policy_key": "K"},
+            ],
+            replace_existing=True,
+        )
+
+        assert [(r["document_id"], r["is_duplicate"]) for r in results] == [
+            ("K_v1", False),
+            ("K_v2", False),
+            ("K_v1", True),
+            ("K_v3", False),
+        ]
+        history = temp_store.get_version_history("K")
+        assert [(v["version"], v["is_current"]) for v in history] == [
+            ("3", True),
+            ("2", False),
+            ("1", False),
+        ]
+
+    def test_sync_retries_failed_batch_per_document(self, temp_store, tmp_path):
+        """A bad document should fail alone, not its whole batch."""
+        from unittest.mock import patch
+
+        from scheduler.cms_policy_sync import (
+            CMSPolicySyncer,
+            PolicyDocument,
+            PolicySource,
+        )
+
+        docs = [
+            PolicyDocument(
+                content=f"Text {i}", title=f"Policy {i}", source=PolicySource.LCD
+            )
+            for i in range(3)
+        ]
+        docs[1].content = None
+        syncer = CMSPolicySyncer(db_path=str(tmp_path / "sync.db"))
+
+        with patch.object(syncer, "_get_store", return_value=temp_store):
+            result = syncer.sync_source(PolicySource.LCD, documents=docs, force=True)
+
+        assert result.documents_found == 3
+        assert result.documents_added == 2
+        assert len(result.errors) == 1
+        assert result.errors[0].startswith("Failed to index Policy 1:")
+        assert temp_store.list_sources() == {"lcd_updates": 2}
@@ -0,0 +1,312 @@
+"""Tests for ChromaStore retrieval: caching, code index and date filtering."""
+
+import shutil
+import tempfile
+
+import chromadb
+import pytest
+from chromadb.api.types import EmbeddingFunction
+from chromadb.config import Settings
+
+from rag.chroma_store import DATE_MIGRATION, METADATA_INDEX_FILENAME, ChromaStore
+from rag.metadata_index import PolicyMetadataIndex
+
+
+class CountingEmbedding(EmbeddingFunction):
+    """Deterministic offline embedding that counts texts embedded."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, input):
+        self.calls += len(input)
+        return [
+            [float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in input
+        ]
+
+
+@pytest.fixture
+def temp_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def store(temp_dir):
+    """A small store whose collection.query calls are counted."""
+    store = ChromaStore(
+        persist_dir=temp_dir,
+        collection_name="cache_test",
+        embedding_function=CountingEmbedding(),
+    )
+    store.add_documents(
+        documents=["NCCI procedure pair edits", "LCD medical necessity"],
+        metadatas=[{"source": "NCCI"}, {"source": "LCD"}],
+        ids=["ncci", "lcd"],
+    )
+    query = store.collection.query
+    store.query_calls = 0
+
+    def counting_query(**kwargs):
+        store.query_calls += 1
+        return query(**kwargs)
+
+    store.collection.query = counting_query
+    return store
+
+
+class TestRetrievalCache:
+    """Tests for result/embedding caching and write invalidation."""
+
+    def test_repeated_search_is_served_from_cache(self, store):
+        first = store.search("CPT 99213  coverage", n_results=2)
+        first[0]["metadata"]["source"] = "mutated"
+        second = store.search(" CPT 99213 coverage", n_results=2)
+
+        assert store.query_calls == 1
+        assert store.embedding_function.calls == 3  # two documents, one query
+        assert second[0]["metadata"]["source"] != "mutated"
+        stats = store.retrieval_cache_stats()
+        assert stats["results"]["hits"] == 1
+        assert stats["results"]["hit_rate"] == 0.5
+
+    def test_filters_and_result_count_are_part_of_the_key(self, store):
+        store.search("coverage", n_results=1)
+        store.search("coverage", n_results=1, filters={"source": "LCD"})
+        store.search("coverage", n_results=2)
+
+        assert store.query_calls == 3
+        # The query embedding is computed once and reused
+        assert store.retrieval_cache_stats()["embeddings"]["hits"] == 2
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda s: s.add_documents(["Modifier 25 policy"], ids=["mod25"]),
+            lambda s: s.delete_document("lcd"),
+            lambda s: s.bulk_delete_by_source("NCCI"),
+            lambda s: s.update_metadata("lcd", {"source": "CMS"}),
+            lambda s: s.add_document_with_version(
+                "Versioned policy", {"source": "CMS"}, "CMS-1"
+            ),
+        ],
+    )
+    def test_writes_invalidate_results(self, store, write):
+        store.search("coverage", n_results=2)
+        write(store)
+        store.search("coverage", n_results=2)
+
+        assert store.query_calls == 2
+
+    def test_writes_through_another_store_invalidate(self, store, temp_dir):
+        store.search("coverage", n_results=2)
+        other = ChromaStore(
+            persist_dir=temp_dir,
+            collection_name="cache_test",
+            embedding_function=CountingEmbedding(),
+        )
+        other.delete_document("ncci")
+
+        results = store.search("coverage", n_results=2)
+
+        assert store.query_calls == 2
+        assert [r["id"] for r in results] == ["lcd"]
+
+
+@pytest.fixture
+def coded_store(temp_dir):
+    store = ChromaStore(
+        persist_dir=temp_dir,
+        collection_name="code_test",
+        embedding_function=CountingEmbedding(),
+    )
+    store.add_documents(
+        documents=["E/M visit levels", "Diabetes management", "Unrelated"],
+        metadatas=[
+            {"source": "LCD", "related_codes": "99213,99214"},
+            {"source": "LCD", "related_codes": "99214, E11.9"},
+            {"source": "CMS"},
+        ],
+        ids=["em", "diabetes", "other"],
+    )
+    return store
+
+
+class TestCodeIndex:
+    """Tests for exact code lookups through the inverted code index."""
+
+    def test_ranks_by_codes_matched(self, coded_store):
+        results = coded_store.search_by_codes(["99214", "e119"])
+
+        assert [r["id"] for r in results] == ["diabetes", "em"]
+        assert results[0]["matched_codes"] == ["99214", "E119"]
+        assert results[0]["content"] == "Diabetes management"
+        assert coded_store.search_by_codes(["00000"]) == []
+
+    def test_tracks_writes_and_current_versions(self, coded_store):
+        assert [r["id"] for r in coded_store.search_by_codes(["99213"])] == ["em"]
+
+        coded_store.add_document_with_version(
+            "Office visit v1", {"related_codes": "99213"}, "OV", replace_existing=True
+        )
+        coded_store.add_document_with_version(
+            "Office visit v2", {"related_codes": "99212"}, "OV", replace_existing=True
+        )
+        coded_store.delete_document("em")
+
+        # v1 is no longer current, so only v2 is indexed
+        assert coded_store.search_by_codes(["99213"]) == []
+        assert [r["id"] for r in coded_store.search_by_codes(["99212"])] == ["OV_v2"]
+
+        coded_store.bulk_delete_by_source("LCD")
+        assert coded_store.search_by_codes(["E11.9"]) == []
+
+    def test_rebuilds_after_refresh_interval(self, coded_store):
+        coded_store.search_by_codes(["99213"])
+        # A write the index never saw, as if from another process
+        coded_store.collection.update(
+            ids=["other"], metadatas=[{"source": "CMS", "related_codes": "99213"}]
+        )
+        assert [r["id"] for r in coded_store.search_by_codes(["99213"])] == ["em"]
+
+        coded_store._code_index.refresh_seconds = 0
+        # Served from the current index while the refresh runs
+        assert [r["id"] for r in coded_store.search_by_codes(["99213"])] == ["em"]
+        coded_store._code_index.wait(timeout=10)
+        coded_store._code_index.refresh_seconds = 300
+        assert {r["id"] for r in coded_store.search_by_codes(["99213"])} == {
+            "em",
+            "other",
+        }
+
+    def test_refresh_keeps_writes_made_while_reading(self, coded_store):
+        index = coded_store._code_index
+
+        def pages():
+            # The collection as read before "late" was added and "em" deleted
+            yield ["em"], [{"related_codes": "99213"}]
+            coded_store.add_documents(
+                ["Late policy"], [{"related_codes": "99213"}], ["late"]
+            )
+            coded_store.delete_document("em")
+
+        index.rebuild(pages())
+
+        assert [r["id"] for r in coded_store.search_by_codes(["99213"])] == ["late"]
+
+    def test_first_build_runs_in_background(self, coded_store, temp_dir, monkeypatch):
+        # A new process: nothing built yet for the populated collection
+        monkeypatch.setattr("rag.chroma_store._code_indexes", {})
+        store = ChromaStore(
+            persist_dir=temp_dir,
+            collection_name="code_test",
+            embedding_function=CountingEmbedding(),
+        )
+        store._code_index.wait(timeout=10)
+
+        assert store._code_index is not coded_store._code_index
+        assert [r["id"] for r in store.search_by_codes(["99213"])] == ["em"]
+
+
+@pytest.fixture
+def dated_store(temp_dir):
+    store = ChromaStore(
+        persist_dir=temp_dir,
+        collection_name="date_test",
+        embedding_function=CountingEmbedding(),
+    )
+    store.add_documents(
+        documents=["In effect", "Not yet effective", "Expired", "Undated", "Open"],
+        metadatas=[
+            {"source": "LCD", "effective_date": "2024-01-01"},
+            {"source": "LCD", "effective_date": "2025-01-01"},
+            {
+                "source": "CMS",
+                "effective_date": "01/01/2023",
+                "expires_date": "2024-06-01",
+            },
+            {"source": "CMS"},
+            {"source": "CMS", "effective_date": "20230101", "expires_date": "bad"},
+        ],
+        ids=["current", "future", "expired", "undated", "open"],
+    )
+    return store
+
+
+class TestDateEffectiveSearch:
+    """Tests for date predicates pushed into the vector query."""
+
+    def test_filters_by_effective_window(self, dated_store):
+        results = dated_store.search_current_policies("policy", "2024-06-01", 5)
+
+        assert {r["id"] for r in results} == {"current", "undated", "open"}
+        assert results[0]["metadata"]["effective_ts"] is not None
+
+    def test_combines_with_metadata_filters(self, dated_store):
+        results = dated_store.search_current_policies(
+            "policy", "2024-03-01", 5, filters={"source": "CMS"}
+        )
+
+        assert {r["id"] for r in results} == {"expired", "undated", "open"}
+
+    def test_migrates_documents_indexed_without_timestamps(self, temp_dir):
+        # Written by an older version, before the timestamps existed
+        client = chromadb.PersistentClient(
+            path=temp_dir, settings=Settings(anonymized_telemetry=False)
+        )
+        client.create_collection("legacy_dates").add(
+            ids=["legacy", "legacy_current"],
+            documents=["Legacy", "Legacy current"],
+            embeddings=[[1.0, 0.0, 1.0], [2.0, 0.0, 1.0]],
+            metadatas=[
+                {"source": "LCD", "expires_date": "2024-01-01"},
+                {"source": "LCD", "effective_date": "2023-06-01"},
+            ],
+        )
+        store = ChromaStore(
+            persist_dir=temp_dir,
+            collection_name="legacy_dates",
+            embedding_function=CountingEmbedding(),
+        )
+        # Started in the background on open; this waits for it
+        store.migrate_date_metadata()
+
+        results = store.search_current_policies("policy", "2024-06-01", 10)
+
+        assert [r["id"] for r in results] == ["legacy_current"]
+        assert store.migrate_date_metadata() == 0  # Already done
+        index = PolicyMetadataIndex(
+            f"{temp_dir}/{METADATA_INDEX_FILENAME}", "legacy_dates"
+        )
+        assert index.migration_done(DATE_MIGRATION)
+
+    def test_requeries_when_results_come_back_short(self, dated_store):
+        search = dated_store.search
+        requested = []
+
+        def short_search(query, n_results=5, filters=None):
+            requested.append(n_results)
+            results = search(query, n_results, filters)
+            # Filtered ANN search returning fewer than it could, at first
+            return results[:1] if len(requested) == 1 else results
+
+        dated_store.search = short_search
+        results = dated_store.search_current_policies("policy", "2024-06-01", 2)
+
+        assert len(results) == 2
+        assert requested == [2, 4]
+
+    def test_stops_requerying_when_nothing_more_matches(self, dated_store):
+        requested = []
+        search = dated_store.search
+
+        def counting_search(query, n_results=5, filters=None):
+            requested.append(n_results)
+            return search(query, n_results, filters)
+
+        dated_store.search = counting_search
+        results = dated_store.search_current_policies("policy", "2024-06-01", 5)
+
+        assert len(results) == 3
+        assert requested == [5, 10]
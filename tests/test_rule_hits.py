@@ -0,0 +1,135 @@
+"""Tests for the normalized result_rule_hits table."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from database import Database
+from rules.rule_hits import (
+    backfill_rule_hits,
+    ensure_rule_hits_table,
+    load_rule_hits,
+    record_rule_hits,
+)
+
+HIT_A = {
+    "rule_id": "NCCI_PTP",
+    "rule_type": "ncci",
+    "description": "Procedure pair not allowed",
+    "weight": 0.2,
+    "severity": "high",
+    "flag": "ncci_ptp",
+    "citation": "NCCI PTP edits",
+    "affected_codes": ["99213", "99214"],
+    "metadata": {"modifier_allowed": False},
+}
+HIT_B = {
+    "rule_id": "OIG_EXCLUSION",
+    "rule_type": "provider",
+    "description": "Provider excluded",
+    "weight": 0.5,
+    "severity": "critical",
+    "flag": "oig_excluded",
+    "citation": None,
+    "affected_codes": [],
+    "metadata": {"npi": "1234567893"},
+}
+
+
+def _result(job_id: str, hits: list[dict], day: str = "2024-03-01") -> dict:
+    return {
+        "job_id": job_id,
+        "claim_id": f"CLM-{job_id}",
+        "created_at": f"{day}T10:00:00+00:00",
+        "rule_hits": json.dumps(hits),
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "hits.db"))
+    with database.write() as conn:
+        conn.execute("""
+            CREATE TABLE results (
+                job_id TEXT PRIMARY KEY, claim_id TEXT, created_at TEXT,
+                rule_hits TEXT
+            )
+        """)
+        ensure_rule_hits_table(conn)
+    yield database
+    database.close()
+
+
+def _hit_rows(db: Database, where: str = "1", params: tuple = ()) -> list[tuple]:
+    with db.read() as conn:
+        return conn.execute(
+            "SELECT job_id, hit_index, rule_id, provider_npi FROM result_rule_hits "
+            f"WHERE {where} ORDER BY job_id, hit_index",
+            params,
+        ).fetchall()
+
+
+class TestResultRuleHits:
+    """Tests for writing, backfilling and reassembling rule hits."""
+
+    def test_round_trips_hits_in_order(self, db: Database):
+        with db.write() as conn:
+            record_rule_hits(conn, [_result("j1", [HIT_A, HIT_B])], {"j1": "999"})
+
+        with db.read() as conn:
+            assert load_rule_hits(conn, "j1") == [HIT_A, HIT_B]
+            assert load_rule_hits(conn, "missing") == []
+        assert _hit_rows(db) == [
+            ("j1", 0, "NCCI_PTP", "999"),
+            ("j1", 1, "OIG_EXCLUSION", "999"),
+        ]
+
+    def test_rewrite_replaces_previous_hits(self, db: Database):
+        with db.write() as conn:
+            record_rule_hits(conn, [_result("j1", [HIT_A, HIT_B]), _result("j2", [])])
+        with db.write() as conn:
+            record_rule_hits(conn, [_result("j1", [HIT_B])])
+
+        # Without a provider NPI the hit's own metadata is used
+        assert _hit_rows(db) == [("j1", 0, "OIG_EXCLUSION", "1234567893")]
+
+    def test_queries_use_indexes(self, db: Database):
+        with db.read() as conn:
+            plans = {
+                column: " ".join(
+                    str(step[-1])
+                    for step in conn.execute(
+                        "EXPLAIN QUERY PLAN SELECT job_id FROM result_rule_hits "
+                        f"WHERE {column} = ? AND created_at >= ?",
+                        ("x", "2024-03-01"),
+                    )
+                )
+                for column in ("rule_id", "flag", "severity", "provider_npi")
+            }
+
+        for column, plan in plans.items():
+            assert "USING INDEX idx_rule_hits_" in plan, (column, plan)
+
+    def test_backfills_existing_results_once(self, db: Database):
+        with db.write() as conn:
+            conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?)",
+                [
+                    ("old1", "C1", "2023-01-01", json.dumps([HIT_A])),
+                    ("old2", "C2", "2023-01-02", json.dumps([HIT_B, HIT_A])),
+                    ("old3", "C3", "2023-01-03", "[]"),
+                    ("old4", "C4", "2023-01-04", "not json"),
+                ],
+            )
+            scanned = backfill_rule_hits(conn)
+            again = backfill_rule_hits(conn)
+
+        assert (scanned, again) == (3, 0)
+        assert [row[:3] for row in _hit_rows(db, "rule_id = ?", ("NCCI_PTP",))] == [
+            ("old1", 0, "NCCI_PTP"),
+            ("old2", 1, "NCCI_PTP"),
+        ]
+        with db.read() as conn:
+            assert load_rule_hits(conn, "old2") == [HIT_B, HIT_A]
@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
-from rules import evaluate_baseline, ThresholdConfig
+from rules import BatchEvaluator, evaluate_baseline, evaluate_batch, ThresholdConfig
+from rules import ruleset
+from rules.dataset_registry import SAMPLE_VERSION, DatasetRegistry
+from rules.models import RuleContext
+from rules.plan import compile_rule_plan
+from rules.reference_store import ReferenceTable, write_reference_table
+from rules.registry import RuleRegistry
 
 
 class TestRulesEngine:
@@ -97,6 +103,247 @@ class TestRulesEngine:
         assert len(outcome.rule_result.hits) > 0
 
 
+class TestBatchEvaluation:
+    """Test batch scoring over the process pool."""
+
+    def test_batch_preserves_input_order(
+        self, sample_claim: dict, clean_claim: dict, sample_datasets: dict
+    ):
+        """Test outcomes come back aligned with the input claims."""
+        claims = [sample_claim, clean_claim] * 20
+
+        with BatchEvaluator(
+            sample_datasets, max_workers=2, min_parallel_size=1
+        ) as evaluator:
+            outcomes = evaluator.evaluate(claims, config={"base_score": 0.5})
+
+        assert [o.index for o in outcomes] == list(range(len(claims)))
+        assert [o.claim_id for o in outcomes] == [c["claim_id"] for c in claims]
+        assert all(o.ok for o in outcomes)
+
+    def test_batch_matches_serial_evaluation(
+        self, sample_claim: dict, sample_datasets: dict
+    ):
+        """Test pooled scoring produces the same outcome as evaluate_baseline."""
+        expected = evaluate_baseline(
+            claim=sample_claim,
+            datasets=sample_datasets,
+            config={"base_score": 0.5},
+            threshold_config=ThresholdConfig(),
+        )
+
+        outcomes = evaluate_batch(
+            [sample_claim] * 40,
+            sample_datasets,
+            config={"base_score": 0.5},
+            max_workers=2,
+        )
+
+        for item in outcomes:
+            assert item.outcome.decision == expected.decision
+            assert item.outcome.rule_result.hits == expected.rule_result.hits
+
+    def test_batch_isolates_failed_claims(
+        self, sample_claim: dict, sample_datasets: dict
+    ):
+        """Test a malformed claim yields an error without failing the batch."""
+        outcomes = evaluate_batch(
+            [sample_claim, {"claim_id": "BAD", "items": "not-a-list"}],
+            sample_datasets,
+            max_workers=1,
+        )
+
+        assert outcomes[0].ok
+        assert not outcomes[1].ok
+        assert outcomes[1].claim_id == "BAD"
+        assert outcomes[1].error
+
+    def test_empty_batch(self, sample_datasets: dict):
+        """Test an empty batch returns no outcomes."""
+        assert evaluate_batch([], sample_datasets) == []
+
+
+class TestRulePlan:
+    """Test compiled rule plans."""
+
+    @staticmethod
+    def _registry() -> RuleRegistry:
+        registry = RuleRegistry()
+        ruleset.register_default_rules(registry)
+        return registry
+
+    def test_plan_skips_rules_without_datasets(self, sample_datasets: dict):
+        """Test rules whose datasets are not loaded are dropped."""
+        plan = compile_rule_plan(self._registry(), sample_datasets)
+
+        assert "ncci_ptp_rule" not in plan.skipped
+        assert "surgical_global_period_rule" in plan.skipped
+        assert "pricing_drg_mismatch_rule" in plan.skipped
+        # Rules without declared datasets always run
+        assert "format_missing_field_rule" not in plan.skipped
+
+    def test_plan_accepts_any_of_alternatives(self):
+        """Test a rule with alternative datasets runs when one is loaded."""
+        plan = compile_rule_plan(self._registry(), {"valid_modifiers": {"25"}})
+
+        assert "modifier_invalid_rule" not in plan.skipped
+        assert "modifier_missing_rule" in plan.skipped
+
+    def test_plan_filters_rules_by_claim_fields(self, sample_datasets: dict):
+        """Test rules needing line items are skipped for claims without them."""
+        plan = compile_rule_plan(self._registry(), sample_datasets)
+
+        names = {rule.__name__ for rule in plan.rules_for({"claim_id": "X"})}
+
+        assert "ncci_mue_rule" not in names
+        assert "format_missing_field_rule" in names
+
+    def test_plan_drops_fully_disabled_rules(self, sample_datasets: dict):
+        """Test rules are dropped when all their rule_ids are disabled."""
+        config = {"rule_overrides": {"OIG_EXCLUSION": {"enabled": False}}}
+
+        plan = compile_rule_plan(self._registry(), sample_datasets, config)
+
+        assert "oig_exclusion_rule" in plan.skipped
+        assert "OIG_EXCLUSION" in plan.disabled_rule_ids
+
+    def test_plan_matches_running_every_rule(
+        self, sample_claim: dict, clean_claim: dict, sample_datasets: dict
+    ):
+        """Test planned evaluation yields the same hits as running all rules."""
+        registry = self._registry()
+        for claim in (sample_claim, clean_claim):
+            context = RuleContext(claim=claim, datasets=sample_datasets, config={})
+            expected = [
+                hit for rule in registry.active_rules() for hit in rule(context)
+            ]
+
+            outcome = evaluate_baseline(claim=claim, datasets=sample_datasets)
+
+            assert outcome.rule_result.hits == expected
+
+    def test_overrides_applied_through_plan(
+        self, sample_claim: dict, sample_datasets: dict
+    ):
+        """Test weight/severity overrides and disabled rules still apply."""
+        config = {
+            "base_score": 0.5,
+            "rule_overrides": {
+                "NCCI_MUE": {"weight": 0.5, "severity": "low"},
+                "OIG_EXCLUSION": {"enabled": False},
+            },
+        }
+
+        outcome = evaluate_baseline(
+            claim=sample_claim, datasets=sample_datasets, config=config
+        )
+
+        mue_hits = [h for h in outcome.rule_result.hits if h.rule_id == "NCCI_MUE"]
+        assert mue_hits and all(h.weight == 0.5 for h in mue_hits)
+        assert all(h.severity == "low" for h in mue_hits)
+        assert not any(h.rule_id == "OIG_EXCLUSION" for h in outcome.rule_result.hits)
+
+
+class TestReferenceTable:
+    """Tests for memory-mapped reference dataset tables."""
+
+    def test_mapping_round_trip(self, tmp_path):
+        path = tmp_path / "ncci_mue.ref"
+        data = {
+            "99213": {"limit": 1, "unit": "services"},
+            "20100": {"limit": 2},
+            "J1100": {"limit": 3},
+        }
+        assert write_reference_table(path, data) == 3
+
+        table = ReferenceTable.load(path)
+        assert len(table) == 3
+        assert list(table) == sorted(data)
+        assert table["99213"] == {"limit": 1, "unit": "services"}
+        assert table.get("J1100") == {"limit": 3}
+        assert table.get("00000") is None
+        assert table.get(None) is None
+        assert "20100" in table
+        assert dict(table) == data
+
+    def test_key_set(self, tmp_path):
+        path = tmp_path / "oig_exclusions.ref"
+        write_reference_table(path, {"1234567890", "1111111111"})
+
+        table = ReferenceTable.load(path)
+        assert table.keys_only
+        assert "1234567890" in table
+        assert "9999999999" not in table
+
+    def test_pickles_by_path(self, tmp_path):
+        import pickle
+
+        path = tmp_path / "mpfs.ref"
+        write_reference_table(path, {"99213": {"regions": {"national": 95.0}}})
+
+        restored = pickle.loads(pickle.dumps(ReferenceTable.load(path)))
+        assert restored["99213"]["regions"]["national"] == 95.0
+
+    def test_rules_read_tables(self, tmp_path):
+        write_reference_table(tmp_path / "ncci_mue.ref", {"99213": {"limit": 1}})
+        write_reference_table(tmp_path / "oig_exclusions.ref", ["1234567890"])
+        datasets = {
+            "ncci_mue": ReferenceTable.load(tmp_path / "ncci_mue.ref"),
+            "oig_exclusions": ReferenceTable.load(tmp_path / "oig_exclusions.ref"),
+        }
+        claim = {
+            "claim_id": "REF-001",
+            "provider": {"npi": "1234567890"},
+            "items": [{"procedure_code": "99213", "quantity": 3}],
+        }
+
+        outcome = evaluate_baseline(claim, datasets, {"base_score": 0.5})
+        rule_ids = {hit.rule_id for hit in outcome.rule_result.hits}
+        assert {"NCCI_MUE", "OIG_EXCLUSION"} <= rule_ids
+
+
+class TestDatasetRegistry:
+    """Tests for versioned reference dataset reloads."""
+
+    def _registry(self, data_dir):
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return {"ncci_mue": {"99213": {"limit": len(loads)}}}
+
+        return DatasetRegistry(loader, data_dir=data_dir), loads
+
+    def test_loads_once_until_files_change(self, tmp_path):
+        (tmp_path / "ncci_mue.json").write_text("{}")
+        registry, loads = self._registry(tmp_path)
+
+        first = registry.current()
+        assert registry.current() is first
+        assert registry.check_for_changes() is False
+        assert len(loads) == 1
+
+        (tmp_path / "mpfs.json").write_text("{}")
+        assert registry.check_for_changes() is True
+        second = registry.current()
+        assert second is not first
+        assert second.version != first.version
+        assert second.datasets["ncci_mue"]["99213"]["limit"] == 2
+
+    def test_in_flight_snapshot_is_unchanged_by_reload(self, tmp_path):
+        registry, _ = self._registry(tmp_path)
+        snapshot = registry.current()
+
+        registry.reload(force=True)
+
+        assert snapshot.datasets["ncci_mue"]["99213"]["limit"] == 1
+        assert registry.current().datasets["ncci_mue"]["99213"]["limit"] == 2
+
+    def test_sample_version_without_files(self, tmp_path):
+        registry, _ = self._registry(tmp_path)
+        assert registry.current().version == SAMPLE_VERSION
+
+
 class TestThresholdConfig:
     """Test threshold configuration."""
 
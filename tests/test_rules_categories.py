@@ -285,6 +285,128 @@ class TestNCCIRules:
         assert len(hits) == 1
         assert "Mutually exclusive" in hits[0].description
 
+    def test_ptp_edit_from_pair_index(self):
+        """Test PTP edits from an index built from download_ncci records."""
+        from rules.categories.ncci_rules import ncci_ptp_rule
+        from rules.ncci_index import NCCIPairIndex
+
+        index = NCCIPairIndex.from_records(
+            [
+                {
+                    "codes": ["80048", "80053"],
+                    "column1": "80053",
+                    "column2": "80048",
+                    "modifier": "0",
+                    "effective_date": "20200101",
+                    "deletion_date": "20230101",
+                }
+            ]
+        )
+        items = [
+            {"procedure_code": "80048"},
+            {"procedure_code": "99213"},
+            {"procedure_code": "80053"},
+        ]
+
+        context = RuleContext(
+            claim={"items": items, "service_date": "2022-06-01"},
+            datasets={"ncci_ptp": index},
+            config={},
+        )
+        hits = ncci_ptp_rule(context)
+        assert len(hits) == 1
+        assert hits[0].metadata["line_indexes"] == [0, 2]
+        assert hits[0].metadata["modifier"] == "0"
+
+        # Edit deleted before the date of service
+        context = RuleContext(
+            claim={"items": items, "service_date": "2023-06-01"},
+            datasets={"ncci_ptp": index},
+            config={},
+        )
+        assert ncci_ptp_rule(context) == []
+
+
+class TestNCCIPairIndex:
+    """Tests for the NCCI code-pair index."""
+
+    def _index(self):
+        from rules.ncci_index import NCCIPairIndex
+
+        return NCCIPairIndex.from_records(
+            [
+                {"column1": "99214", "column2": "99213", "modifier": "0"},
+                {"column1": "36415", "column2": "99213", "modifier": "1"},
+                {
+                    "column1": "99213",
+                    "column2": "36415",
+                    "modifier": "0",
+                    "citation": "NCCI PTP",
+                },
+            ]
+        )
+
+    def test_lookup_either_order(self):
+        index = self._index()
+        assert len(index) == 3
+        assert index.lookup("99213", "99214").modifier == "0"
+        assert index.lookup("99214", "99213").column1 == "99214"
+        assert ("99213", "99214") in index
+        assert index.lookup("99214", "36415") is None
+        assert index.lookup("00000", "99213") is None
+
+    def test_lookup_prefers_most_restrictive_direction(self):
+        edit = self._index().lookup("36415", "99213")
+        assert edit.modifier == "0"
+        assert edit.citation == "NCCI PTP"
+
+    def test_line_pair_edits_matches_pair_loop(self):
+        index = self._index()
+        codes = ["99213", None, "99214", "36415", "99213", "70000"]
+
+        expected = []
+        for i, code_a in enumerate(codes):
+            for j in range(i + 1, len(codes)):
+                code_b = codes[j]
+                if code_a and code_b and index.lookup(code_a, code_b):
+                    expected.append((i, j))
+
+        found = [(i, j) for i, j, _ in index.line_pair_edits(codes)]
+        assert found == expected
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        import pickle
+
+        from rules.ncci_index import NCCIPairIndex
+
+        path = tmp_path / "ncci_ptp.bin"
+        self._index().save(path)
+
+        loaded = NCCIPairIndex.load(path)
+        assert len(loaded) == 3
+        assert loaded.column2_codes("99214") == ["99213"]
+        assert loaded.lookup("36415", "99213").citation == "NCCI PTP"
+
+        restored = pickle.loads(pickle.dumps(loaded))
+        assert restored.lookup("99214", "99213").modifier == "0"
+
+    def test_load_rejects_other_files(self, tmp_path):
+        from rules.ncci_index import NCCIPairIndex
+
+        path = tmp_path / "ncci_ptp.bin"
+        path.write_bytes(b"not an index" * 4)
+        with pytest.raises(ValueError):
+            NCCIPairIndex.load(path)
+
+    def test_legacy_pair_dict(self):
+        from rules.ncci_index import as_pair_index
+
+        pairs = {("99214", "99215"): {"citation": "NCCI PTP", "modifier": "25"}}
+        index = as_pair_index(pairs)
+        assert index is as_pair_index(pairs)
+        assert index.lookup("99215", "99214").modifier == "25"
+        assert not as_pair_index({})
+
 
 # ============================================================================
 # MODIFIER RULES TESTS